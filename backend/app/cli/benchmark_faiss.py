@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Benchmark FAISS index profiles for CGRAG retrieval.
+
+Builds each index profile over the same vectors and reports, per profile:
+recall@k against exact (flat inner-product) search, p50/p99 single-query
+search latency, build time and index memory. Use it to pick an index profile
+(runtime setting ``cgrag_index_profiles``) for large corpora with evidence.
+
+Vectors come from an existing CGRAG index (reconstructed from the FAISS file)
+or from a synthetic clustered dataset.
+
+Usage:
+    python -m app.cli.benchmark_faiss [--index NAME | --synthetic N] [options]
+
+Example:
+    python -m app.cli.benchmark_faiss --synthetic 200000 --dim 384
+    python -m app.cli.benchmark_faiss --index docs --k 10 --nprobe 8,16,64 --ef-search 32,64,128
+    python -m app.cli.benchmark_faiss --synthetic 50000 --profiles my_profiles.json --json out.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import faiss
+import numpy as np
+
+from app.models.runtime_settings import CGRAGIndexProfile
+from app.services.faiss_index import (
+    apply_search_params,
+    build_faiss_index,
+    describe_index,
+    index_memory_bytes,
+)
+
+# Profiles benchmarked by default (exact baseline first)
+DEFAULT_PROFILES: Dict[str, CGRAGIndexProfile] = {
+    "Flat": CGRAGIndexProfile(index_type="Flat"),
+    "SQ8": CGRAGIndexProfile(index_type="SQ", sq_type="SQ8"),
+    "IVFFlat": CGRAGIndexProfile(index_type="IVFFlat"),
+    "IVFSQ8": CGRAGIndexProfile(index_type="IVFSQ", sq_type="SQ8"),
+    "IVFPQ": CGRAGIndexProfile(index_type="IVFPQ"),
+    "HNSW32": CGRAGIndexProfile(index_type="HNSW", hnsw_m=32),
+    "HNSW32-SQ8": CGRAGIndexProfile(index_type="HNSWSQ", hnsw_m=32, sq_type="SQ8"),
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """Benchmark measurements for one index profile and search setting.
+
+    Attributes:
+        name: Profile name (with search parameters for sweeps)
+        index: Summary of the built index (type, metric, nlist, nprobe, ef_search)
+        recall_at_k: Mean fraction of exact top-k neighbors returned
+        p50_ms: Median single-query search latency
+        p99_ms: 99th percentile single-query search latency
+        build_seconds: Time to train and populate the index
+        memory_mb: Serialized index size
+        error: Error message if the profile could not be built
+    """
+
+    name: str
+    index: Dict
+    recall_at_k: float = 0.0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+    build_seconds: float = 0.0
+    memory_mb: float = 0.0
+    error: Optional[str] = None
+
+
+def synthetic_vectors(n: int, dim: int, seed: int = 0) -> np.ndarray:
+    """Generate unit-normalized clustered vectors resembling text embeddings.
+
+    Args:
+        n: Number of vectors
+        dim: Vector dimension
+        seed: Random seed
+
+    Returns:
+        Float32 array (n x dim)
+    """
+    rng = np.random.default_rng(seed)
+    n_clusters = max(1, int(np.sqrt(n)))
+    centers = rng.standard_normal((n_clusters, dim)).astype(np.float32)
+    assignments = rng.integers(0, n_clusters, size=n)
+    vectors = centers[assignments] + 0.5 * rng.standard_normal((n, dim)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def make_queries(vectors: np.ndarray, n_queries: int, seed: int = 1) -> np.ndarray:
+    """Create queries as perturbed copies of random indexed vectors."""
+    rng = np.random.default_rng(seed)
+    picks = rng.integers(0, vectors.shape[0], size=n_queries)
+    noise = 0.3 * rng.standard_normal((n_queries, vectors.shape[1])).astype(np.float32)
+    queries = np.ascontiguousarray(
+        vectors[picks] + noise / np.sqrt(vectors.shape[1]), dtype=np.float32
+    )
+    faiss.normalize_L2(queries)
+    return queries
+
+
+def load_index_vectors(index_path: Path) -> np.ndarray:
+    """Reconstruct all vectors stored in a FAISS index file.
+
+    Lossy index families (PQ, SQ) return approximate vectors.
+    """
+    index = faiss.read_index(str(index_path))
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.make_direct_map()
+    vectors = np.ascontiguousarray(index.reconstruct_n(0, index.ntotal), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def exact_neighbors(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Ground-truth top-k neighbors by exact inner-product search."""
+    flat = faiss.IndexFlatIP(vectors.shape[1])
+    flat.add(vectors)
+    _, neighbors = flat.search(queries, k)
+    return neighbors
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    """Mean fraction of true top-k neighbors present in the found top-k."""
+    k = truth.shape[1]
+    hits = sum(len(set(f[f >= 0]) & set(t)) for f, t in zip(found, truth))
+    return hits / (truth.shape[0] * k)
+
+
+def measure_search(
+    index: faiss.Index, queries: np.ndarray, truth: np.ndarray, k: int
+) -> Dict[str, float]:
+    """Run single-query searches and measure recall and latency percentiles."""
+    latencies = np.empty(queries.shape[0])
+    found = np.empty((queries.shape[0], k), dtype=np.int64)
+    for i in range(queries.shape[0]):
+        start = time.perf_counter()
+        _, ids = index.search(queries[i : i + 1], k)
+        latencies[i] = (time.perf_counter() - start) * 1000
+        found[i] = ids[0]
+
+    return {
+        "recall_at_k": recall_at_k(found, truth),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+def run_benchmark(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    profiles: Dict[str, CGRAGIndexProfile],
+    k: int = 10,
+    nprobe_values: Optional[List[int]] = None,
+    ef_search_values: Optional[List[int]] = None,
+) -> List[BenchmarkResult]:
+    """Benchmark index profiles on the same vectors and queries.
+
+    Each profile is built once; nprobe / ef_search sweeps reuse the built index.
+
+    Args:
+        vectors: Unit-normalized vectors to index
+        queries: Unit-normalized query vectors
+        profiles: Profiles to benchmark, keyed by display name
+        k: Neighbors per query
+        nprobe_values: Optional nprobe values to sweep for IVF profiles
+        ef_search_values: Optional efSearch values to sweep for HNSW profiles
+
+    Returns:
+        One BenchmarkResult per profile and search setting
+    """
+    truth = exact_neighbors(vectors, queries, k)
+    results = []
+
+    for name, profile in profiles.items():
+        start = time.perf_counter()
+        try:
+            index = build_faiss_index(vectors, profile)
+        except Exception as e:
+            results.append(BenchmarkResult(name=name, index={}, error=str(e)))
+            continue
+        build_seconds = time.perf_counter() - start
+        memory_mb = index_memory_bytes(index) / (1024 * 1024)
+
+        settings = [profile]
+        if faiss.try_extract_index_ivf(index) is not None and nprobe_values:
+            settings = [profile.model_copy(update={"nprobe": v}) for v in nprobe_values]
+        elif getattr(index, "hnsw", None) is not None and ef_search_values:
+            settings = [profile.model_copy(update={"ef_search": v}) for v in ef_search_values]
+
+        for setting in settings:
+            apply_search_params(index, setting)
+            info = describe_index(index)
+            label = name
+            if len(settings) > 1:
+                param = "nprobe" if "nprobe" in info else "ef_search"
+                label = f"{name} ({param}={info[param]})"
+            results.append(
+                BenchmarkResult(
+                    name=label,
+                    index=info,
+                    build_seconds=build_seconds,
+                    memory_mb=memory_mb,
+                    **measure_search(index, queries, truth, k),
+                )
+            )
+
+    return results
+
+
+def format_results(results: List[BenchmarkResult], k: int) -> str:
+    """Render benchmark results as a text table."""
+    header = (
+        f"{'profile':<28} {'recall@' + str(k):>9} {'p50 ms':>8} {'p99 ms':>8} "
+        f"{'build s':>8} {'memory MB':>10}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in results:
+        if r.error:
+            lines.append(f"{r.name:<28} error: {r.error}")
+            continue
+        lines.append(
+            f"{r.name:<28} {r.recall_at_k:>9.4f} {r.p50_ms:>8.3f} {r.p99_ms:>8.3f} "
+            f"{r.build_seconds:>8.2f} {r.memory_mb:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main() -> int:
+    """Run the benchmark from the command line.
+
+    Returns:
+        Exit code (0 for success, 1 for error)
+    """
+    parser = argparse.ArgumentParser(description="Benchmark FAISS index profiles for CGRAG")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--index", help="Benchmark vectors from an existing CGRAG index")
+    source.add_argument(
+        "--synthetic", type=int, default=100000, help="Number of synthetic vectors (default)"
+    )
+    parser.add_argument("--dim", type=int, default=384, help="Synthetic vector dimension")
+    parser.add_argument("--queries", type=int, default=500, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="Neighbors per query (recall@k)")
+    parser.add_argument("--nprobe", type=_int_list, help="Comma-separated nprobe sweep")
+    parser.add_argument("--ef-search", type=_int_list, help="Comma-separated efSearch sweep")
+    parser.add_argument(
+        "--profiles", type=Path, help="JSON file of {name: CGRAGIndexProfile} to benchmark"
+    )
+    parser.add_argument("--json", type=Path, help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    if args.index:
+        from app.services.cgrag import get_cgrag_index_paths
+
+        _, index_path, _ = get_cgrag_index_paths(args.index)
+        if not index_path.exists():
+            print(f"Error: Index {index_path} does not exist")
+            return 1
+        print(f"Loading vectors from {index_path}")
+        vectors = load_index_vectors(index_path)
+    else:
+        print(f"Generating {args.synthetic} synthetic vectors (dim={args.dim})")
+        vectors = synthetic_vectors(args.synthetic, args.dim)
+
+    profiles = DEFAULT_PROFILES
+    if args.profiles:
+        with open(args.profiles, "r", encoding="utf-8") as f:
+            profiles = {name: CGRAGIndexProfile(**data) for name, data in json.load(f).items()}
+
+    queries = make_queries(vectors, args.queries)
+    print(f"Benchmarking {len(profiles)} profiles on {vectors.shape[0]} vectors\n")
+
+    results = run_benchmark(
+        vectors,
+        queries,
+        profiles,
+        k=args.k,
+        nprobe_values=args.nprobe,
+        ef_search_values=args.ef_search,
+    )
+    print(format_results(results, args.k))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+        print(f"\nWrote results to {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
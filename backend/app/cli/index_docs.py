@@ -5,18 +5,21 @@ This script indexes documents from a specified directory (or docs/ by default)
 into a FAISS vector database for CGRAG context retrieval.
 
 Usage:
-    python -m app.cli.index_docs [directory]
+    python -m app.cli.index_docs [directory] [--incremental]
 
 Example:
     python -m app.cli.index_docs ../docs
     python -m app.cli.index_docs  # Uses ../docs by default
+    python -m app.cli.index_docs ../docs --incremental  # Only re-embed changed files
 """
 
+import argparse
 import asyncio
 import sys
 from pathlib import Path
 
 from app.core.config import load_config
+from app.models.runtime_settings import CGRAGIndexProfile
 from app.services import runtime_settings as settings_service
 from app.services.cgrag import CGRAGIndexer, get_cgrag_index_paths
 
@@ -27,9 +30,18 @@ async def main() -> int:
     Returns:
         Exit code (0 for success, 1 for error)
     """
+    parser = argparse.ArgumentParser(description="Index documents for CGRAG retrieval")
+    parser.add_argument("directory", nargs="?", help="Directory to index (default: docs/)")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-embed files added or modified since the last index build",
+    )
+    args = parser.parse_args()
+
     # Determine directory to index
-    if len(sys.argv) > 1:
-        docs_dir = Path(sys.argv[1])
+    if args.directory:
+        docs_dir = Path(args.directory)
     else:
         # Default to docs/ directory relative to project root
         project_root = Path(__file__).parent.parent.parent.parent
@@ -54,6 +66,8 @@ async def main() -> int:
         embedding_model = settings.embedding_model_name
         chunk_size = settings.cgrag_chunk_size
         chunk_overlap = settings.cgrag_chunk_overlap
+        tokenizer = settings.cgrag_tokenizer
+        index_profile = settings.get_cgrag_index_profile("docs")
         print("Using runtime settings for indexing")
     except Exception as e:
         # Fallback to config if runtime settings unavailable
@@ -61,26 +75,68 @@ async def main() -> int:
         embedding_model = config.cgrag.indexing.embedding_model
         chunk_size = config.cgrag.indexing.chunk_size
         chunk_overlap = config.cgrag.indexing.chunk_overlap
+        tokenizer = "cl100k_base"
+        index_profile = CGRAGIndexProfile()
 
     print("Configuration:")
     print(f"  Embedding model: {embedding_model}")
     print(f"  Chunk size: {chunk_size} tokens")
     print(f"  Chunk overlap: {chunk_overlap} tokens")
+    print(f"  Tokenizer: {tokenizer}")
+    print(f"  FAISS index: {index_profile.index_type} ({index_profile.metric})")
+    print(f"  Incremental: {args.incremental}")
     print()
 
-    # Create indexer
-    try:
-        indexer = CGRAGIndexer(embedding_model=embedding_model)
-    except Exception as e:
-        print(f"Error creating indexer: {e}")
-        return 1
+    # Get index paths using runtime settings
+    index_dir, index_path, metadata_path = get_cgrag_index_paths("docs")
+
+    # Create indexer (starting from the existing index for incremental updates)
+    indexer = None
+    if args.incremental and index_path.exists() and metadata_path.exists():
+        try:
+            indexer = CGRAGIndexer.load_index(
+                index_path, metadata_path, index_profile=index_profile
+            )
+            if indexer.embedding_model_name != embedding_model:
+                print(
+                    f"Existing index uses {indexer.embedding_model_name}, "
+                    f"rebuilding with {embedding_model}"
+                )
+                indexer = None
+        except Exception as e:
+            print(f"Warning: Could not load existing index ({e}), rebuilding")
+            indexer = None
+
+    if indexer is None:
+        try:
+            indexer = CGRAGIndexer(embedding_model=embedding_model, index_profile=index_profile)
+        except Exception as e:
+            print(f"Error creating indexer: {e}")
+            return 1
 
     # Index directory
     try:
         num_chunks = await indexer.index_directory(
-            directory=docs_dir, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            directory=docs_dir,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            incremental=args.incremental,
+            tokenizer=tokenizer,
         )
         print(f"\nIndexed {num_chunks} chunks")
+        stats = indexer.last_update_stats
+        print(
+            f"Files: {stats['added']} added, {stats['modified']} modified, "
+            f"{stats['deleted']} deleted, {stats['unchanged']} unchanged "
+            f"({stats['chunks_embedded']} chunks embedded)"
+        )
+        throughput = indexer.last_ingest_stats
+        print(
+            f"Throughput: {throughput['files_per_sec']} files/s, "
+            f"{throughput['chunks_per_sec']} chunks/s, "
+            f"{throughput['embeddings_per_sec']} embeddings/s "
+            f"({throughput['workers']} chunking workers)"
+        )
     except Exception as e:
         print(f"Error during indexing: {e}")
         import traceback
@@ -90,9 +146,6 @@ async def main() -> int:
 
     # Save index
     try:
-        # Get index paths using runtime settings
-        index_dir, index_path, metadata_path = get_cgrag_index_paths("docs")
-
         # Create index directory if it doesn't exist
         index_dir.mkdir(parents=True, exist_ok=True)
 
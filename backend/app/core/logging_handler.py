@@ -15,28 +15,30 @@ Author: Backend Architect
 Task: Comprehensive Log Aggregation and Streaming System
 """
 
-import asyncio
 import logging
-from typing import Optional
+from datetime import datetime
 
 from app.core.logging import get_request_id, get_session_id, get_trace_id
+from app.services.log_aggregator import LogEntry
 
 
 class AggregatorHandler(logging.Handler):
     """Custom logging handler that sends logs to LogAggregator.
 
     Intercepts all log records emitted by Python's logging system and
-    asynchronously forwards them to the LogAggregator service. Preserves
-    all structured logging metadata including request IDs, trace IDs, and
-    service tags.
+    forwards them to the LogAggregator service. Preserves all structured
+    logging metadata including request IDs, trace IDs, and service tags.
 
-    The handler is non-blocking and uses asyncio to prevent logging from
-    impacting application performance. If the event loop is not available
-    or the aggregator is not initialized, logs are silently dropped (fail-safe).
+    The handler never blocks and never schedules work per record: it asks
+    the aggregator whether to keep the record (per-source rate limiting and
+    sampling, checked before formatting), builds the LogEntry on the calling
+    thread (so context variables like the request ID are captured) and
+    pushes it onto the aggregator's ingestion ring. Works from any thread,
+    with or without a running event loop.
 
     Architecture:
-        Python Logger -> AggregatorHandler -> LogAggregator -> Circular Buffer
-                                                            -> EventBus
+        Python Logger -> AggregatorHandler -> LogAggregator ring -> Circular Buffer
+                                                                 -> EventBus
 
     Example Usage:
         # In main.py startup
@@ -46,7 +48,6 @@ class AggregatorHandler(logging.Handler):
 
     Attributes:
         aggregator: LogAggregator instance to send logs to
-        loop: AsyncIO event loop (detected automatically)
     """
 
     def __init__(self, aggregator):
@@ -57,7 +58,6 @@ class AggregatorHandler(logging.Handler):
         """
         super().__init__()
         self.aggregator = aggregator
-        self.loop: Optional[asyncio.AbstractEventLoop] = None
 
     # Loggers to exclude from aggregation to prevent infinite loops
     # event_bus logs "Event published" which would create recursive loop
@@ -69,15 +69,15 @@ class AggregatorHandler(logging.Handler):
     )
 
     def emit(self, record: logging.LogRecord) -> None:
-        """Handle log record by sending to LogAggregator asynchronously.
+        """Handle log record by queueing it on the LogAggregator.
 
         This method is called by Python's logging system for every log event.
-        It extracts structured metadata and creates an async task to add the
-        log to the aggregator without blocking the logging call.
+        It extracts structured metadata and submits the entry without
+        blocking the logging call.
 
         Thread Safety:
-            This method can be called from any thread. It safely detects the
-            event loop and creates tasks in the appropriate context.
+            This method can be called from any thread; submission is a single
+            atomic append to the aggregator's ring.
 
         Args:
             record: LogRecord instance from Python's logging system
@@ -87,20 +87,18 @@ class AggregatorHandler(logging.Handler):
         if record.name in self.EXCLUDED_LOGGERS:
             return
 
-        # Get or detect event loop
-        if self.loop is None:
-            try:
-                self.loop = asyncio.get_running_loop()
-            except RuntimeError:
-                # No event loop available - can't process async logs
-                # This can happen during startup before asyncio is initialized
+        try:
+            # Rate limiting and sampling before any formatting work
+            if not self.aggregator.admit(record.name, record.levelno):
                 return
+            self.aggregator.submit(self._to_entry(record))
+        except Exception:
+            # Don't let handler errors crash the application
+            # Silently drop the log (fail-safe behavior)
+            pass
 
-        # Extract metadata from log record
-        level = record.levelname
-        source = record.name
-        message = record.getMessage()
-
+    def _to_entry(self, record: logging.LogRecord) -> LogEntry:
+        """Extract a LogEntry with structured metadata from a log record."""
         # Extract structured metadata
         extra = {
             "pathname": record.pathname,
@@ -141,44 +139,27 @@ class AggregatorHandler(logging.Handler):
                 else str(record.exc_info)
             )
 
-        # Create async task to add log (non-blocking)
-        try:
-            asyncio.create_task(
-                self.aggregator.add_log(
-                    level=level,
-                    source=source,
-                    message=message,
-                    extra=extra,
-                    request_id=request_id,
-                    trace_id=trace_id,
-                    service_tag=service_tag,
-                )
-            )
-        except RuntimeError:
-            # Event loop is closed or not available
-            # This can happen during shutdown - just drop the log
-            pass
-        except Exception:
-            # Don't let handler errors crash the application
-            # Silently drop the log (fail-safe behavior)
-            pass
-
+        return LogEntry(
+            timestamp=datetime.utcfromtimestamp(record.created).isoformat() + "Z",
+            level=record.levelname,
+            source=record.name,
+            message=record.getMessage(),
+            extra=extra,
+            request_id=request_id,
+            trace_id=trace_id,
+            service_tag=service_tag,
+        )
 
-class BufferedAggregatorHandler(logging.Handler):
-    """Buffered version of AggregatorHandler for high-throughput scenarios.
 
-    This handler buffers log records and flushes them in batches to reduce
-    overhead. Useful when logging hundreds of records per second. Automatically
-    flushes when buffer is full or on application shutdown.
+class BufferedAggregatorHandler(AggregatorHandler):
+    """Former buffered variant of AggregatorHandler, kept for compatibility.
 
-    Note: Standard AggregatorHandler is sufficient for most use cases. Only
-    use this if you're seeing performance issues from high log volume.
+    AggregatorHandler itself now feeds a bounded ring that the aggregator
+    drains in batches, so there is nothing left to buffer here.
 
     Attributes:
         aggregator: LogAggregator instance
-        buffer_size: Maximum records to buffer before flushing
-        buffer: List of buffered log records
-        loop: AsyncIO event loop
+        buffer_size: Ignored (batching happens in the aggregator)
     """
 
     def __init__(self, aggregator, buffer_size: int = 100):
@@ -186,108 +167,7 @@ class BufferedAggregatorHandler(logging.Handler):
 
         Args:
             aggregator: LogAggregator instance
-            buffer_size: Flush buffer after this many records (default 100)
+            buffer_size: Ignored (batching happens in the aggregator)
         """
-        super().__init__()
-        self.aggregator = aggregator
+        super().__init__(aggregator)
         self.buffer_size = buffer_size
-        self.buffer = []
-        self.loop: Optional[asyncio.AbstractEventLoop] = None
-
-    def emit(self, record: logging.LogRecord) -> None:
-        """Buffer log record and flush if buffer is full.
-
-        Args:
-            record: LogRecord from Python's logging system
-        """
-        self.buffer.append(record)
-
-        if len(self.buffer) >= self.buffer_size:
-            self.flush()
-
-    def flush(self) -> None:
-        """Flush buffered log records to aggregator.
-
-        Processes all buffered records and sends them to the aggregator
-        asynchronously. Thread-safe and clears buffer after flushing.
-        """
-        if not self.buffer:
-            return
-
-        # Get or detect event loop
-        if self.loop is None:
-            try:
-                self.loop = asyncio.get_running_loop()
-            except RuntimeError:
-                # No event loop - clear buffer and return
-                self.buffer.clear()
-                return
-
-        # Process all buffered records
-        records_to_process = self.buffer[:]
-        self.buffer.clear()
-
-        for record in records_to_process:
-            # Extract metadata (same as AggregatorHandler)
-            level = record.levelname
-            source = record.name
-            message = record.getMessage()
-
-            extra = {
-                "pathname": record.pathname,
-                "lineno": record.lineno,
-                "funcName": record.funcName,
-                "module": record.module,
-            }
-
-            request_id = None
-            if hasattr(record, "request_id") and record.request_id != "N/A":
-                request_id = record.request_id
-            else:
-                request_id = get_request_id()
-
-            trace_id = None
-            if hasattr(record, "trace_id"):
-                trace_id = record.trace_id
-            else:
-                trace_id = get_trace_id()
-
-            session_id = get_session_id()
-            if session_id:
-                extra["session_id"] = session_id
-
-            service_tag = None
-            if hasattr(record, "service_tag"):
-                service_tag = record.service_tag
-
-            if record.exc_info:
-                extra["exc_info"] = (
-                    self.formatter.formatException(record.exc_info)
-                    if self.formatter
-                    else str(record.exc_info)
-                )
-
-            # Create async task
-            try:
-                asyncio.create_task(
-                    self.aggregator.add_log(
-                        level=level,
-                        source=source,
-                        message=message,
-                        extra=extra,
-                        request_id=request_id,
-                        trace_id=trace_id,
-                        service_tag=service_tag,
-                    )
-                )
-            except (RuntimeError, Exception):
-                # Silently drop on error (fail-safe)
-                pass
-
-    def close(self) -> None:
-        """Close handler and flush remaining buffered records.
-
-        Called during application shutdown to ensure no logs are lost.
-        """
-        self.flush()
-        super().close()
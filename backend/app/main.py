@@ -50,27 +50,36 @@ from app.routers import (
     topology,
 )
 from app.services.cache_metrics import init_cache_metrics
+from app.services.cgrag_cache import init_cgrag_cache
+from app.services.cgrag_registry import get_cgrag_index_registry, init_cgrag_index_registry
 from app.services.context_state import (
     get_context_state_manager,
     init_context_state_manager,
 )
 from app.services.event_bus import get_event_bus, init_event_bus
 from app.services.health_monitor import get_health_monitor, init_health_monitor
+from app.services.http_pool import get_http_pool, init_http_pool
 from app.services.instance_manager import InstanceManager, init_instance_manager
 from app.services.llama_server_manager import LlamaServerManager
-from app.services.log_aggregator import init_log_aggregator
+from app.services.log_aggregator import get_log_aggregator, init_log_aggregator
 from app.services.metrics_aggregator import (
     get_metrics_aggregator,
     init_metrics_aggregator,
 )
+from app.services.metrics_broadcaster import get_metrics_broadcaster, init_metrics_broadcaster
+from app.services.metrics_collector import get_metrics_collector
+from app.services.metrics_store import get_metrics_store, init_metrics_store
+from app.services.model_clients import get_model_client_registry, init_model_client_registry
 from app.services.model_discovery import ModelDiscoveryService
 from app.services.pipeline_state import (
     get_pipeline_state_manager,
     init_pipeline_state_manager,
 )
 from app.services.profile_manager import ProfileManager
+from app.services.response_cache import init_response_cache
+from app.services.token_counter import init_model_token_counters
 from app.services.topology_manager import get_topology_manager, init_topology_manager
-from app.services.websocket_manager import WebSocketManager
+from app.services.websocket_manager import LogOverflowPolicy, WebSocketManager
 
 # Track application start time
 _app_start_time = time.time()
@@ -192,6 +201,28 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         await metrics_aggregator.start()
         logger.info("Metrics aggregator initialized and started")
 
+        # Persist metrics history; the aggregator restores it in the background
+        if runtime_settings_obj.metrics_history_enabled:
+            try:
+                metrics_store = init_metrics_store(
+                    Path("/app") / runtime_settings_obj.metrics_history_path
+                )
+                await metrics_store.start()
+
+                metrics_collector = get_metrics_collector()
+                history = await metrics_store.load_query_history(
+                    since=time.time() - metrics_aggregator.max_retention_seconds,
+                    recent_limit=metrics_collector.max_history,
+                    per_tier_limit=20,
+                )
+                metrics_collector.restore_history(*history)
+                metrics_collector.store = metrics_store
+
+                metrics_aggregator.attach_store(metrics_store)
+                logger.info("Metrics history store started (history loading in background)")
+            except Exception as e:
+                logger.error(f"Failed to start metrics history store: {e}", exc_info=True)
+
         # Configure model name resolver for metrics aggregator
         # This allows the aggregator to resolve model IDs to display names
         from app.services.metrics_aggregator import set_model_name_resolver
@@ -205,6 +236,11 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         set_model_name_resolver(resolve_model_display_name)
         logger.info("Model name resolver configured for metrics aggregator")
 
+        # Initialize shared snapshot producer for the metrics WebSocket stream
+        metrics_broadcaster = init_metrics_broadcaster()
+        await metrics_broadcaster.start()
+        logger.info("Metrics broadcaster initialized and started")
+
         # Initialize topology manager for system architecture visualization
         topology_manager = init_topology_manager()
         await topology_manager.start()
@@ -214,14 +250,28 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         init_cache_metrics()
         logger.info("Cache metrics tracker initialized")
 
+        # Initialize shared keep-alive HTTP pools for llama.cpp servers (before
+        # any LlamaCppClient is created)
+        init_http_pool()
+        logger.info("HTTP pool manager initialized")
+
         # Initialize health monitor for degraded status alerts
         health_monitor = init_health_monitor(check_interval=60)
         await health_monitor.start()
         logger.info("Health monitor initialized and started (check interval: 60s)")
 
         # Initialize log aggregator for system-wide log collection
-        log_aggregator = init_log_aggregator(max_logs=1000)
-        logger.info("Log aggregator initialized (max_logs=1000)")
+        log_spill_path = runtime_settings_obj.log_store_spill_path
+        log_aggregator = init_log_aggregator(
+            max_logs=runtime_settings_obj.log_store_max_entries,
+            full_text=runtime_settings_obj.log_store_full_text,
+            spill_dir=Path("/app") / log_spill_path if log_spill_path else None,
+        )
+        await log_aggregator.start()
+        logger.info(
+            f"Log aggregator initialized (max_logs={log_aggregator.max_logs}, "
+            f"spill_dir={log_spill_path or 'none'})"
+        )
 
         # Add custom logging handler to capture all logs
         root_logger = logging.getLogger()
@@ -238,6 +288,28 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
             websocket_manager=websocket_manager,
         )
 
+        # Keep one warm llama.cpp client per running model server (evicted when
+        # the server stops)
+        model_clients = init_model_client_registry()
+        server_manager.add_server_listener(model_clients.on_server_change)
+        logger.info("Model client registry initialized")
+
+        # Exact context token counts from each ready model server's /tokenize
+        if runtime_settings_obj.exact_token_counts:
+
+            def resolve_tokenize_client(model_id: str):
+                """Warm client of a model's ready server, or None."""
+                server = server_manager.get_server(model_id)
+                if server is None or not server.is_ready:
+                    return None
+                return model_clients.get_client(
+                    model_id, f"http://host.docker.internal:{server.model.port}"
+                )
+
+            model_token_counters = init_model_token_counters(resolve_tokenize_client)
+            server_manager.add_server_listener(model_token_counters.on_server_change)
+            logger.info("Per-model token counters initialized (llama.cpp /tokenize)")
+
         # Profile manager (still needed for future profile management)
         project_root = Path(__file__).parent.parent.parent
         profiles_dir = project_root / "config" / "profiles"
@@ -293,44 +365,58 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         await model_manager.start()
         logger.info("ModelManager started (legacy health checking)")
 
-        # Preload CGRAG index (optional - improves first-query performance)
-        try:
-            project_root = Path(__file__).parent.parent.parent
-            index_path = project_root / "data" / "faiss_indexes" / "docs.index"
-            metadata_path = project_root / "data" / "faiss_indexes" / "docs.metadata"
-
-            # Only preload if index exists
-            if index_path.exists() and metadata_path.exists():
-                logger.info("Preloading CGRAG index...")
-
-                from app.services.cgrag import CGRAGIndexer, CGRAGRetriever
-
-                # Load index in background to avoid blocking startup
-                cgrag_indexer = CGRAGIndexer.load_index(
-                    index_path=index_path, metadata_path=metadata_path
-                )
+        # Initialize the CGRAG query-embedding / retrieval-result cache before
+        # the index registry so resident retrievers pick it up
+        if runtime_settings_obj.cgrag_cache_enabled:
+            init_cgrag_cache(
+                max_entries=runtime_settings_obj.cgrag_cache_max_entries,
+                ttl_seconds=runtime_settings_obj.cgrag_cache_ttl_seconds,
+                redis_enabled=runtime_settings_obj.cgrag_cache_redis_enabled,
+            )
+            logger.info("CGRAG retrieval cache initialized")
+
+        # Cache full query responses; cleared when model servers change (the
+        # CGRAG index registry clears it on index reloads below)
+        response_cache = None
+        if runtime_settings_obj.response_cache_enabled:
+            response_cache = init_response_cache(
+                max_entries=runtime_settings_obj.response_cache_max_entries,
+                ttl_seconds=runtime_settings_obj.response_cache_ttl_seconds,
+                redis_enabled=runtime_settings_obj.response_cache_redis_enabled,
+                similarity_threshold=runtime_settings_obj.response_cache_similarity_threshold,
+            )
+            server_manager.add_server_listener(
+                lambda model_id, server: response_cache.invalidate(f"model {model_id} changed")
+            )
+            logger.info("Response cache initialized")
 
-                # Create retriever
-                _cgrag_retriever = CGRAGRetriever(
-                    indexer=cgrag_indexer,
-                    min_relevance=config.cgrag.retrieval.min_relevance,
+        # Load CGRAG indexes into the resident index registry. Each index is
+        # loaded once here and hot-swapped when its files change on disk, so
+        # queries never reload the FAISS index or the embedding encoder.
+        try:
+            cgrag_registry = init_cgrag_index_registry(check_interval=10.0)
+            if response_cache is not None:
+                cgrag_registry.add_reload_listener(
+                    lambda names: response_cache.invalidate(f"CGRAG indexes {names} changed")
                 )
+            await cgrag_registry.start()
 
-                # Store in app state for router access
-                app.state.cgrag_retriever = _cgrag_retriever
+            _cgrag_retriever = cgrag_registry.get_retriever(
+                "docs", min_relevance=config.cgrag.retrieval.min_relevance
+            )
+            app.state.cgrag_retriever = _cgrag_retriever
 
+            if _cgrag_retriever is not None:
                 logger.info(
-                    f"CGRAG index preloaded successfully ({len(cgrag_indexer.chunks)} chunks)",
-                    extra={"chunks": len(cgrag_indexer.chunks)},
+                    f"CGRAG index preloaded successfully "
+                    f"({len(_cgrag_retriever.indexer.chunks)} chunks)",
+                    extra={"chunks": len(_cgrag_retriever.indexer.chunks)},
                 )
             else:
-                logger.info(
-                    "CGRAG index not found - skipping preload. Index will load on-demand.",
-                    extra={"index_path": str(index_path)},
-                )
+                logger.info("CGRAG index not found - index registry will load it when it appears")
         except Exception as e:
             logger.warning(
-                f"Failed to preload CGRAG index: {e}. Index will load on-demand.",
+                f"Failed to preload CGRAG indexes: {e}. Index will load on-demand.",
                 extra={"error": str(e)},
             )
 
@@ -353,6 +439,14 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     # Shutdown
     logger.info("S.Y.N.A.P.S.E. Core (PRAXIS) shutting down...")
 
+    # Stop CGRAG index registry watcher
+    try:
+        cgrag_registry = get_cgrag_index_registry()
+        await cgrag_registry.stop()
+        logger.info("CGRAG index registry stopped")
+    except Exception as e:
+        logger.warning(f"Error stopping CGRAG index registry: {e}")
+
     # Stop health monitor
     try:
         health_monitor = get_health_monitor()
@@ -369,6 +463,14 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     except Exception as e:
         logger.warning(f"Error stopping topology manager: {e}")
 
+    # Stop metrics broadcaster (closes metrics WebSocket streams)
+    try:
+        metrics_broadcaster = get_metrics_broadcaster()
+        await metrics_broadcaster.stop()
+        logger.info("Metrics broadcaster stopped")
+    except Exception as e:
+        logger.warning(f"Error stopping metrics broadcaster: {e}")
+
     # Stop metrics aggregator
     try:
         metrics_aggregator = get_metrics_aggregator()
@@ -377,6 +479,16 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     except Exception as e:
         logger.warning(f"Error stopping metrics aggregator: {e}")
 
+    # Flush and close metrics history store
+    try:
+        metrics_store = get_metrics_store()
+        await metrics_store.stop()
+        logger.info("Metrics history store stopped")
+    except RuntimeError:
+        pass  # Metrics history disabled
+    except Exception as e:
+        logger.warning(f"Error stopping metrics history store: {e}")
+
     # Stop context state manager
     try:
         context_manager = get_context_state_manager()
@@ -393,6 +505,12 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     except Exception as e:
         logger.warning(f"Error stopping pipeline state manager: {e}")
 
+    # Stop log ingestion (flushes pending records before the event bus stops)
+    try:
+        await get_log_aggregator().stop()
+    except Exception as e:
+        logger.warning(f"Error stopping log aggregator: {e}")
+
     # Stop event bus
     try:
         event_bus = get_event_bus()
@@ -406,11 +524,23 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
         await server_manager.stop_all()
         logger.info("All model servers stopped")
 
+    # Stop log streaming writers
+    if websocket_manager:
+        await websocket_manager.close()
+        logger.info("WebSocket log streams closed")
+
     # Stop ModelManager (legacy)
     if model_manager:
         await model_manager.stop()
         logger.info("ModelManager stopped")
 
+    # Close pooled llama.cpp connections
+    try:
+        await get_model_client_registry().close()
+        await get_http_pool().close()
+    except Exception as e:
+        logger.warning(f"Error closing HTTP pools: {e}")
+
     uptime = time.time() - _app_start_time
     logger.info(
         f"S.Y.N.A.P.S.E. Core (PRAXIS) stopped after {uptime:.2f} seconds",
@@ -605,7 +735,11 @@ async def root() -> dict[str, str]:
 
 # WebSocket endpoint for real-time log streaming
 @app.websocket("/ws/logs")
-async def websocket_logs(websocket: WebSocket, model_id: Optional[str] = None) -> None:
+async def websocket_logs(
+    websocket: WebSocket,
+    model_id: Optional[str] = None,
+    overflow: LogOverflowPolicy = LogOverflowPolicy.DROP_OLDEST,
+) -> None:
     """WebSocket endpoint for real-time log streaming from llama-server processes.
 
     Streams stderr output from llama-server subprocesses to connected clients
@@ -615,6 +749,9 @@ async def websocket_logs(websocket: WebSocket, model_id: Optional[str] = None) -
     Query Parameters:
         model_id: Optional filter for specific model logs. If not provided,
             streams logs from all models.
+        overflow: What to do when this client falls behind and its send queue
+            fills up: "drop_oldest" (default) or "coalesce" (dropped lines are
+            reported as one WARN entry "N log lines skipped")
 
     WebSocket Message Format:
         {
@@ -641,6 +778,7 @@ async def websocket_logs(websocket: WebSocket, model_id: Optional[str] = None) -
     Args:
         websocket: WebSocket connection instance
         model_id: Optional model ID filter for logs
+        overflow: Send queue overflow policy for this client
     """
     logger = get_logger(__name__)
 
@@ -649,22 +787,11 @@ async def websocket_logs(websocket: WebSocket, model_id: Optional[str] = None) -
         await websocket.close(code=1011, reason="WebSocket manager not initialized")
         return
 
-    # Accept connection
-    await websocket_manager.connect(websocket)
+    # Accept connection; buffered logs are queued ahead of new ones
+    await websocket_manager.connect(websocket, model_id=model_id, overflow=overflow, replay=True)
+    logger.info(f"Log WebSocket client connected (model_id filter: {model_id or 'none'})")
 
     try:
-        # Send buffered logs on connect
-        buffered_logs = websocket_manager.get_logs(model_id)
-        logger.info(
-            f"Sending {len(buffered_logs)} buffered logs to new WebSocket client "
-            f"(model_id filter: {model_id or 'none'})"
-        )
-
-        for log in buffered_logs:
-            # Apply model_id filter if specified
-            if model_id is None or log.get("model_id") == model_id:
-                await websocket.send_json(log)
-
         # Keep connection alive and handle client messages (ping/pong, filter changes)
         while True:
             try:
@@ -678,11 +805,11 @@ async def websocket_logs(websocket: WebSocket, model_id: Optional[str] = None) -
 
             except asyncio.TimeoutError:
                 # No message received - send ping to keep connection alive
-                try:
-                    await websocket.send_json({"type": "ping"})
-                except Exception:
+                # (queued behind pending logs; a failed send drops the connection)
+                if websocket not in websocket_manager.active_connections:
                     # Connection lost
                     break
+                websocket_manager.send_message(websocket, {"type": "ping"})
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected normally")
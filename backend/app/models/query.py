@@ -266,6 +266,7 @@ class QueryMetadata(BaseModel):
         processing_time_ms: Total processing time in milliseconds
         cgrag_artifacts: Number of CGRAG artifacts retrieved (future)
         cache_hit: Whether response was served from cache
+        model_errors: Errors reported by model calls ("model_id: error")
 
     Example:
         >>> metadata = QueryMetadata(
@@ -312,6 +313,11 @@ class QueryMetadata(BaseModel):
         serialization_alias="cacheHit",
         description="Whether response was served from cache",
     )
+    model_errors: List[str] = Field(
+        default_factory=list,
+        serialization_alias="modelErrors",
+        description="Errors reported by model calls (response may be empty or partial)",
+    )
 
     # Query mode
     query_mode: str = Field(
@@ -5,11 +5,73 @@ updated through the /api/settings endpoint without requiring system
 reconfiguration or container rebuilds.
 """
 
-from typing import Optional
+from typing import Dict, Literal, Optional
 
 from pydantic import BaseModel, Field
 
 
+class CGRAGIndexProfile(BaseModel):
+    """FAISS index family and search parameters for one CGRAG index.
+
+    Build parameters (index_type, metric, nlist, hnsw_m, pq_m, ...) take effect
+    on the next full re-index. Search parameters (nprobe, ef_search) are applied
+    to resident indexes without rebuilding.
+    """
+
+    index_type: Literal["auto", "Flat", "IVFFlat", "IVFPQ", "IVFSQ", "HNSW", "HNSWSQ", "SQ"] = (
+        Field(
+            default="auto",
+            description=(
+                "FAISS index family (auto = exact Flat below auto_flat_threshold chunks, "
+                "IVFFlat above)"
+            ),
+        )
+    )
+
+    metric: Literal["ip", "l2"] = Field(
+        default="ip",
+        description="Distance metric (ip = inner product / cosine on normalized vectors)",
+    )
+
+    auto_flat_threshold: int = Field(
+        default=100000,
+        ge=0,
+        description="Chunk count below which 'auto' uses exact Flat search",
+    )
+
+    nlist: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=262144,
+        description="IVF clusters (None = 4 * sqrt(n_chunks))",
+    )
+
+    nprobe: int = Field(default=16, ge=1, le=4096, description="IVF clusters searched per query")
+
+    hnsw_m: int = Field(default=32, ge=4, le=128, description="HNSW graph neighbors per node")
+
+    ef_construction: int = Field(
+        default=200, ge=8, le=2048, description="HNSW candidate list size while building"
+    )
+
+    ef_search: int = Field(
+        default=64, ge=1, le=4096, description="HNSW candidate list size while searching"
+    )
+
+    pq_m: int = Field(
+        default=48,
+        ge=1,
+        le=256,
+        description="PQ sub-quantizers (must divide the embedding dimension)",
+    )
+
+    pq_nbits: int = Field(default=8, ge=4, le=12, description="Bits per PQ sub-quantizer code")
+
+    sq_type: Literal["SQ8", "SQ4", "SQfp16"] = Field(
+        default="SQ8", description="Scalar quantizer for SQ index families"
+    )
+
+
 class RuntimeSettings(BaseModel):
     """WebUI-configurable runtime settings.
 
@@ -110,6 +172,23 @@ class RuntimeSettings(BaseModel):
         description="Overlap between chunks to preserve context (tokens)",
     )
 
+    cgrag_tokenizer: str = Field(
+        default="cl100k_base",
+        min_length=1,
+        description=(
+            "Tokenizer for per-chunk token counts stored at index time: a tiktoken "
+            "encoding or 'hf:<model>' for the target model's HuggingFace tokenizer"
+        ),
+    )
+
+    exact_token_counts: bool = Field(
+        default=False,
+        description=(
+            "Count context tokens with each running model's llama.cpp /tokenize endpoint "
+            "instead of the local cl100k_base estimate (applied on restart)"
+        ),
+    )
+
     cgrag_max_results: int = Field(
         default=20,
         ge=1,
@@ -122,6 +201,130 @@ class RuntimeSettings(BaseModel):
         description="Directory containing CGRAG FAISS indexes (relative to project root)",
     )
 
+    cgrag_index_profiles: Dict[str, CGRAGIndexProfile] = Field(
+        default_factory=dict,
+        description=(
+            "FAISS index profiles keyed by index name (e.g. 'docs'); "
+            "indexes without an entry use the default profile"
+        ),
+    )
+
+    cgrag_cache_enabled: bool = Field(
+        default=True,
+        description="Cache query embeddings and retrieval results (applied on restart)",
+    )
+
+    cgrag_cache_max_entries: int = Field(
+        default=2048,
+        ge=16,
+        le=1000000,
+        description="Maximum in-process entries per CGRAG cache tier (applied on restart)",
+    )
+
+    cgrag_cache_ttl_seconds: int = Field(
+        default=3600,
+        ge=1,
+        le=604800,
+        description="Time-to-live for CGRAG cache entries in seconds (applied on restart)",
+    )
+
+    cgrag_cache_redis_enabled: bool = Field(
+        default=False,
+        description="Share CGRAG cache entries between processes via Redis (applied on restart)",
+    )
+
+    # ========================================================================
+    # Response Cache
+    # ========================================================================
+
+    response_cache_enabled: bool = Field(
+        default=False,
+        description="Serve repeated queries from the query response cache (applied on restart)",
+    )
+
+    response_cache_max_entries: int = Field(
+        default=1024,
+        ge=16,
+        le=100000,
+        description="Maximum in-process response cache entries (applied on restart)",
+    )
+
+    response_cache_ttl_seconds: int = Field(
+        default=3600,
+        ge=1,
+        le=604800,
+        description="Time-to-live for cached responses in seconds (applied on restart)",
+    )
+
+    response_cache_redis_enabled: bool = Field(
+        default=False,
+        description="Share cached responses between processes via Redis (applied on restart)",
+    )
+
+    response_cache_similarity_threshold: Optional[float] = Field(
+        default=None,
+        ge=0.5,
+        le=1.0,
+        description=(
+            "Serve responses of cached queries at least this similar (cosine) to the "
+            "query; None for exact matches only (applied on restart)"
+        ),
+    )
+
+    response_cache_max_temperature: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=2.0,
+        description=(
+            "Queries sampled above this temperature bypass the response cache (0.0 caches "
+            "greedy decoding only; sampled answers are not reproducible)"
+        ),
+    )
+
+    # ========================================================================
+    # Metrics History
+    # ========================================================================
+
+    metrics_history_enabled: bool = Field(
+        default=True,
+        description=(
+            "Persist metrics to disk and restore them in the background on startup "
+            "(applied on restart)"
+        ),
+    )
+
+    metrics_history_path: str = Field(
+        default="data/metrics_history.db",
+        min_length=1,
+        description=(
+            "SQLite file holding metrics history (relative to project root, applied on restart)"
+        ),
+    )
+
+    # ========================================================================
+    # Log Store
+    # ========================================================================
+
+    log_store_max_entries: int = Field(
+        default=200_000,
+        ge=1000,
+        le=5_000_000,
+        description="Aggregated log entries kept in memory for /api/logs (applied on restart)",
+    )
+
+    log_store_full_text: bool = Field(
+        default=True,
+        description="Index log message words for full-text search (applied on restart)",
+    )
+
+    log_store_spill_path: Optional[str] = Field(
+        default=None,
+        description=(
+            "Directory older log segments are written to instead of being discarded "
+            "(relative to project root; None keeps logs in memory only, applied on restart)"
+        ),
+    )
+
     # ========================================================================
     # Benchmark Mode Defaults
     # ========================================================================
@@ -155,6 +358,43 @@ class RuntimeSettings(BaseModel):
         default=10, ge=5, le=30, description="Timeout for web search requests"
     )
 
+    # ========================================================================
+    # Two-Stage Mode
+    # ========================================================================
+
+    two_stage_speculative_prefill: bool = Field(
+        default=False,
+        description=(
+            "Prefill the Stage 2 server's prompt cache with the shared prompt prefix and "
+            "the Stage 1 output while Stage 1 is still generating"
+        ),
+    )
+
+    speculative_prefill_chunk_tokens: int = Field(
+        default=32,
+        ge=1,
+        le=1024,
+        description="Stage 1 tokens accumulated before the Stage 2 prefill is extended",
+    )
+
+    # ========================================================================
+    # Context Gathering Deadlines
+    # ========================================================================
+
+    websearch_deadline_ms: int = Field(
+        default=5000,
+        ge=100,
+        le=30000,
+        description="Per-query deadline for web search results; slower searches are skipped",
+    )
+
+    cgrag_deadline_ms: int = Field(
+        default=5000,
+        ge=100,
+        le=30000,
+        description="Per-query deadline for CGRAG retrieval; slower retrievals are skipped",
+    )
+
     class Config:
         """Pydantic configuration."""
 
@@ -174,11 +414,35 @@ class RuntimeSettings(BaseModel):
                 "cgrag_min_relevance": 0.7,
                 "cgrag_chunk_size": 512,
                 "cgrag_chunk_overlap": 50,
+                "cgrag_tokenizer": "cl100k_base",
+                "exact_token_counts": False,
                 "cgrag_max_results": 20,
+                "cgrag_index_profiles": {
+                    "docs": {"index_type": "HNSW", "metric": "ip", "ef_search": 64}
+                },
+                "cgrag_cache_enabled": True,
+                "cgrag_cache_max_entries": 2048,
+                "cgrag_cache_ttl_seconds": 3600,
+                "cgrag_cache_redis_enabled": False,
+                "response_cache_enabled": False,
+                "response_cache_max_entries": 1024,
+                "response_cache_ttl_seconds": 3600,
+                "response_cache_redis_enabled": False,
+                "response_cache_similarity_threshold": None,
+                "response_cache_max_temperature": 0.0,
+                "metrics_history_enabled": True,
+                "metrics_history_path": "data/metrics_history.db",
+                "log_store_max_entries": 200000,
+                "log_store_full_text": True,
+                "log_store_spill_path": None,
                 "benchmark_default_max_tokens": 1024,
                 "benchmark_parallel_max_models": 5,
                 "websearch_max_results": 5,
                 "websearch_timeout_seconds": 10,
+                "two_stage_speculative_prefill": False,
+                "speculative_prefill_chunk_tokens": 32,
+                "websearch_deadline_ms": 5000,
+                "cgrag_deadline_ms": 5000,
             }
         }
 
@@ -207,6 +471,17 @@ class RuntimeSettings(BaseModel):
 
         return False
 
+    def get_cgrag_index_profile(self, index_name: str = "docs") -> CGRAGIndexProfile:
+        """Get the FAISS index profile for an index.
+
+        Args:
+            index_name: Name of the index (e.g., "docs", "codebase")
+
+        Returns:
+            Configured profile, or the default profile if none is configured
+        """
+        return self.cgrag_index_profiles.get(index_name) or CGRAGIndexProfile()
+
     def estimate_vram_per_model(
         self, model_size_b: float = 8.0, quantization: str = "Q4_K_M"
     ) -> float:
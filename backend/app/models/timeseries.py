@@ -20,6 +20,7 @@ class MetricType(str, Enum):
     COMPLEXITY_SCORE = "complexity_score"
     CGRAG_RETRIEVAL_TIME = "cgrag_retrieval_time"
     MODEL_LOAD = "model_load"
+    TIME_TO_FIRST_TOKEN = "time_to_first_token"
 
 
 class TimeRange(str, Enum):
@@ -576,6 +576,7 @@ async def get_cache_stats() -> Dict[str, Any]:
         - cache_size: Current number of keys in Redis
         - uptime_seconds: Time since metrics tracking started
         - timestamp: ISO timestamp of stats snapshot
+        - response_cache: Query response cache counters (when enabled)
 
     Raises:
         HTTPException: If cache metrics not initialized
@@ -602,6 +603,14 @@ async def get_cache_stats() -> Dict[str, Any]:
         # Add formatted hit rate string for display
         stats["hit_rate"] = f"{stats['hit_rate_percent']:.1f}%"
 
+        # Query response cache breakdown (when enabled)
+        from app.services.response_cache import get_response_cache
+
+        try:
+            stats["response_cache"] = get_response_cache().get_stats()
+        except RuntimeError:
+            pass
+
         logger.info(
             f"Cache stats retrieved: {stats['hit_rate']} hit rate, {stats['cache_size']} keys",
             extra={
@@ -620,6 +629,37 @@ async def get_cache_stats() -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve cache stats: {str(e)}")
 
 
+@router.get("/http-pools")
+async def get_http_pool_stats() -> Dict[str, Any]:
+    """Get usage of the shared llama.cpp HTTP connection pools.
+
+    Returns:
+        Pool statistics per server and plane (control: health/stats, data:
+        completions) including open, active and idle connections, requests
+        waiting for a connection and request counts, plus totals and the
+        long-lived per-model clients (``model_clients``)
+
+    Raises:
+        HTTPException: If the HTTP pool manager is not initialized
+    """
+    try:
+        from app.services.http_pool import get_http_pool
+
+        stats = get_http_pool().get_stats()
+
+    except RuntimeError as e:
+        logger.warning(f"HTTP pool manager not initialized: {e}")
+        raise HTTPException(status_code=503, detail="HTTP pool manager not initialized")
+
+    try:
+        from app.services.model_clients import get_model_client_registry
+
+        stats["model_clients"] = get_model_client_registry().get_stats()
+    except RuntimeError:
+        stats["model_clients"] = None
+    return stats
+
+
 @router.post("/cache/reset")
 async def reset_cache_stats() -> Dict[str, str]:
     """Reset cache metrics counters to zero.
@@ -7,6 +7,7 @@ Author: Backend Architect
 Feature: CGRAG Index Management
 """
 
+import asyncio
 from pathlib import Path
 from typing import Optional
 
@@ -17,8 +18,11 @@ from app.core.logging import get_logger
 from app.services.cgrag import (
     CGRAGIndexer,
     get_cgrag_index_paths,
+    migrate_json_to_chunk_store,
     migrate_pickle_to_json,
 )
+from app.services.cgrag_registry import get_cgrag_index_registry
+from app.services.runtime_settings import get_runtime_settings
 
 logger = get_logger(__name__)
 
@@ -81,6 +85,10 @@ class IndexRequest(BaseModel):
     chunk_overlap: int = Field(
         default=50, ge=0, le=200, description="Overlap between chunks in words"
     )
+    incremental: bool = Field(
+        default=False,
+        description="Only re-embed files added or modified since the last index build",
+    )
 
 
 class IndexStatus(BaseModel):
@@ -131,6 +139,13 @@ async def get_index_status() -> IndexStatus:
                 except Exception as e:
                     logger.error(f"Migration failed: {e}")
 
+        # Convert legacy JSON chunk metadata to the memory-mapped chunk store
+        if metadata_path.exists():
+            try:
+                migrate_json_to_chunk_store("docs")
+            except Exception as e:
+                logger.error(f"Chunk store migration failed: {e}")
+
         index_exists = index_path.exists() and metadata_path.exists()
         chunks_indexed = 0
         index_size_mb = 0.0
@@ -145,12 +160,13 @@ async def get_index_status() -> IndexStatus:
 
                 with open(metadata_path, "r", encoding="utf-8") as f:
                     metadata = json.load(f)
-                    # Handle both dict format (new) and list format (legacy)
-                    if isinstance(metadata, dict):
-                        chunks = metadata.get("chunks", [])
+                    # Handle chunk store manifests, legacy dict format and list format
+                    if isinstance(metadata, dict) and "chunk_count" in metadata:
+                        chunks_indexed = metadata["chunk_count"]
+                    elif isinstance(metadata, dict):
+                        chunks_indexed = len(metadata.get("chunks", []))
                     else:
-                        chunks = metadata
-                    chunks_indexed = len(chunks)
+                        chunks_indexed = len(metadata)
             except Exception as e:
                 logger.warning(f"Failed to load metadata: {e}")
 
@@ -172,7 +188,9 @@ async def get_index_status() -> IndexStatus:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _run_indexing(directory: str, chunk_size: int, chunk_overlap: int):
+async def _run_indexing(
+    directory: str, chunk_size: int, chunk_overlap: int, incremental: bool = False
+):
     """Background task to run indexing operation."""
     global _indexing_status
 
@@ -195,17 +213,48 @@ async def _run_indexing(directory: str, chunk_size: int, chunk_overlap: int):
 
         logger.info(f"Starting CGRAG indexing of {directory} ({len(supported_files)} files)")
 
-        # Create indexer and run indexing
-        indexer = CGRAGIndexer()
+        index_dir, index_path, metadata_path = get_cgrag_index_paths("docs")
+        runtime_settings = get_runtime_settings()
+        index_profile = runtime_settings.get_cgrag_index_profile("docs")
+
+        # Create indexer (starting from the existing index for incremental updates)
+        indexer = None
+        if incremental and index_path.exists() and metadata_path.exists():
+            try:
+                encoder_provider = get_cgrag_index_registry().get_encoder
+            except RuntimeError:
+                encoder_provider = None  # Registry not initialized
+            # Load a private copy so the resident index is never mutated in place
+            indexer = await asyncio.get_running_loop().run_in_executor(
+                None,
+                lambda: CGRAGIndexer.load_index(
+                    index_path,
+                    metadata_path,
+                    encoder_provider=encoder_provider,
+                    index_profile=index_profile,
+                ),
+            )
+        if indexer is None:
+            indexer = CGRAGIndexer(index_profile=index_profile)
+
         chunks_count = await indexer.index_directory(
-            directory=dir_path, chunk_size=chunk_size, chunk_overlap=chunk_overlap
+            directory=dir_path,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            incremental=incremental,
+            tokenizer=runtime_settings.cgrag_tokenizer,
         )
 
         # Save index
-        index_dir, index_path, metadata_path = get_cgrag_index_paths("docs")
         index_dir.mkdir(parents=True, exist_ok=True)
         indexer.save_index(index_path, metadata_path)
 
+        # Hot-swap the resident index now rather than waiting for the watcher
+        try:
+            await get_cgrag_index_registry().refresh()
+        except RuntimeError:
+            pass  # Registry not initialized
+
         _indexing_status["progress"] = _indexing_status["total_files"]
         _indexing_status["last_indexed"] = str(Path(directory).name)
 
@@ -255,7 +304,11 @@ async def start_indexing(request: IndexRequest, background_tasks: BackgroundTask
 
     # Start indexing in background
     background_tasks.add_task(
-        _run_indexing, request.directory, request.chunk_size, request.chunk_overlap
+        _run_indexing,
+        request.directory,
+        request.chunk_size,
+        request.chunk_overlap,
+        request.incremental,
     )
 
     return IndexResponse(
@@ -19,17 +19,25 @@ from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
 
 from app.core.logging import get_logger
 from app.models.events import EventSeverity, EventType
-from app.services.event_bus import get_event_bus
+from app.services.event_bus import EventSubscription, OverflowPolicy, get_event_bus
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Events sent per wakeup (one frame in batch mode)
+_MAX_BATCH_EVENTS = 100
+
 
 @router.websocket("/ws/events")
 async def websocket_events(
     websocket: WebSocket,
     types: Optional[str] = Query(None, description="Comma-separated event types to filter"),
     severity: str = Query("info", description="Minimum severity level (info, warning, error)"),
+    batch: bool = Query(False, description="Deliver events in batched frames"),
+    overflow: str = Query(
+        "drop_oldest",
+        description="When the client falls behind: drop_oldest, drop_newest, coalesce, disconnect",
+    ),
 ) -> None:
     """WebSocket endpoint for real-time system event streaming.
 
@@ -43,6 +51,10 @@ async def websocket_events(
             event types are streamed.
         severity: Minimum severity level to receive (info, warning, error).
             Filters out events below this level. Default: info (all events).
+        batch: If true, events are delivered in batched frames (see below).
+        overflow: What happens to events the client can't keep up with:
+            drop_oldest (default), drop_newest, coalesce (newest event per
+            type and model/query wins) or disconnect.
 
     WebSocket Message Format:
         {
@@ -59,6 +71,16 @@ async def websocket_events(
             }
         }
 
+    Batched Frame Format (batch=true):
+        {
+            "type": "event_batch",
+            "events": [{ ...event... }, ...],
+            "dropped": 0
+        }
+
+        ``dropped`` counts events lost to the overflow policy since the
+        previous frame.
+
     Example Client Usage:
         // Subscribe to all events
         const ws = new WebSocket('ws://localhost:8000/ws/events');
@@ -94,14 +116,14 @@ async def websocket_events(
     Performance Characteristics:
         - Event latency: <50ms from occurrence to client delivery
         - Historical buffer: Last 100 events sent immediately on connect
-        - Rate limiting: Slow clients dropped if they can't keep up (<100ms/event)
+        - Slow clients: Never delay other clients; lose events per overflow policy
         - Max concurrent connections: No hard limit (bounded by system resources)
 
     Error Handling:
         - Invalid event types in filter: Ignored, valid types still work
         - Invalid severity level: Falls back to 'info' (all events)
         - Connection errors: Automatic cleanup and unsubscribe
-        - Slow clients: Dropped from subscriber list with warning log
+        - Slow clients: Handled per overflow policy (disconnect logs a warning)
 
     Args:
         websocket: WebSocket connection instance
@@ -130,6 +152,13 @@ async def websocket_events(
         logger.warning(f"Invalid severity '{severity}', falling back to INFO")
         min_severity = EventSeverity.INFO
 
+    # Parse overflow policy
+    try:
+        overflow_policy = OverflowPolicy(overflow.lower())
+    except ValueError:
+        logger.warning(f"Invalid overflow policy '{overflow}', falling back to drop_oldest")
+        overflow_policy = OverflowPolicy.DROP_OLDEST
+
     # Accept WebSocket connection
     await websocket.accept()
     logger.info(
@@ -138,76 +167,31 @@ async def websocket_events(
     )
 
     try:
-        # Get event bus instance
         event_bus = get_event_bus()
+    except RuntimeError as e:
+        logger.error(f"WebSocket error on /ws/events: {e}")
+        await websocket.close(code=1011)
+        return
 
-        # Create subscription task
-        subscription = event_bus.subscribe(
-            event_types=event_types_filter, min_severity=min_severity
-        )
-
-        # Create subscription iterator
-        event_iterator = subscription.__aiter__()
+    subscription = event_bus.open_subscription(
+        event_types=event_types_filter, min_severity=min_severity, overflow=overflow_policy
+    )
+    receiver = asyncio.create_task(_receive_pings(websocket, subscription))
 
-        # Main event loop - handle both receiving (ping) and sending (events)
-        try:
-            while True:
-                # Use asyncio.wait with FIRST_COMPLETED to handle concurrent operations
-                pending = {
-                    asyncio.create_task(websocket.receive_text(), name="receive"),
-                    asyncio.create_task(event_iterator.__anext__(), name="event"),
-                }
-
-                done, pending_remaining = await asyncio.wait(
-                    pending, return_when=asyncio.FIRST_COMPLETED
+    try:
+        # Send everything buffered per wakeup; payloads are pre-serialized
+        while envelopes := await subscription.next_batch(max_events=_MAX_BATCH_EVENTS):
+            if batch:
+                events = ",".join(envelope.payload for envelope in envelopes)
+                dropped = subscription.take_dropped()
+                await websocket.send_text(
+                    f'{{"type": "event_batch", "events": [{events}], "dropped": {dropped}}}'
                 )
+            else:
+                for envelope in envelopes:
+                    await websocket.send_text(envelope.payload)
 
-                # Cancel remaining tasks
-                for task in pending_remaining:
-                    task.cancel()
-                    try:
-                        await task
-                    except asyncio.CancelledError:
-                        pass
-
-                # Process completed tasks
-                for task in done:
-                    if task.get_name() == "receive":
-                        try:
-                            text = task.result()
-                            # Handle ping messages
-                            try:
-                                data = json.loads(text)
-                                if data.get("type") == "ping":
-                                    await websocket.send_json({"type": "pong"})
-                            except (json.JSONDecodeError, ValueError):
-                                # Ignore non-JSON messages
-                                logger.debug(f"Received non-JSON WebSocket message: {text}")
-                        except WebSocketDisconnect:
-                            logger.info("WebSocket disconnected")
-                            return
-                        except Exception as e:
-                            logger.error(f"Error receiving WebSocket message: {e}")
-                            return
-
-                    elif task.get_name() == "event":
-                        try:
-                            event = task.result()
-                            # Send event to client
-                            await websocket.send_json(event.model_dump())
-                        except StopAsyncIteration:
-                            logger.info("Event subscription ended")
-                            return
-                        except WebSocketDisconnect:
-                            logger.info("WebSocket disconnected while sending event")
-                            return
-                        except Exception as e:
-                            logger.error(f"Error sending event to WebSocket client: {e}")
-                            return
-
-        except asyncio.CancelledError:
-            logger.info("WebSocket event loop cancelled")
-            raise
+        logger.info("Event subscription ended")
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected from /ws/events normally")
@@ -220,10 +204,36 @@ async def websocket_events(
         logger.error(f"WebSocket error on /ws/events: {e}", exc_info=True)
 
     finally:
-        # Cleanup is automatic - subscribe() async generator handles unsubscribe
+        receiver.cancel()
+        event_bus.close_subscription(subscription)
         logger.info("WebSocket connection to /ws/events closed")
 
 
+async def _receive_pings(websocket: WebSocket, subscription: EventSubscription) -> None:
+    """Answer client pings until the client disconnects, then close the subscription.
+
+    Args:
+        websocket: WebSocket connection instance
+        subscription: The client's event subscription
+    """
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                data = json.loads(text)
+                if isinstance(data, dict) and data.get("type") == "ping":
+                    await websocket.send_json({"type": "pong"})
+            except (json.JSONDecodeError, ValueError):
+                # Ignore non-JSON messages
+                logger.debug(f"Received non-JSON WebSocket message: {text}")
+    except WebSocketDisconnect:
+        logger.info("WebSocket disconnected")
+    except Exception as e:
+        logger.error(f"Error receiving WebSocket message: {e}")
+    finally:
+        subscription.close()
+
+
 @router.get("/api/events/stats")
 async def get_event_stats() -> dict:
     """Get event bus statistics for monitoring.
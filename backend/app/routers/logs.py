@@ -2,7 +2,7 @@
 
 This module provides REST API endpoints for querying system logs captured by
 the LogAggregator service. Supports filtering by level, source, search text,
-and time range. Returns paginated results with comprehensive statistics.
+words, request/trace ID and time range. Returns paginated results with comprehensive statistics.
 
 Endpoints:
 - GET /api/logs - Query logs with filtering
@@ -101,6 +101,11 @@ async def get_logs(
     search: Optional[str] = Query(
         None, description="Search in message text (substring match, case-insensitive)"
     ),
+    text: Optional[str] = Query(
+        None, description="Words that must all appear in the message (indexed, case-insensitive)"
+    ),
+    request_id: Optional[str] = Query(None, description="Filter by request ID (exact match)"),
+    trace_id: Optional[str] = Query(None, description="Filter by trace ID (exact match)"),
     start_time: Optional[str] = Query(
         None, description="Filter logs after this timestamp (ISO 8601)"
     ),
@@ -129,6 +134,9 @@ async def get_logs(
         level: Filter by exact log level (case-insensitive)
         source: Filter by logger name (substring match)
         search: Search message text (substring match)
+        text: Words that must all appear in the message (token index)
+        request_id: Request ID (exact match; the whole life of one request)
+        trace_id: Trace ID (exact match)
         start_time: ISO 8601 timestamp for time range start
         end_time: ISO 8601 timestamp for time range end
         limit: Maximum logs to return (1-2000)
@@ -140,6 +148,7 @@ async def get_logs(
         GET /api/logs?level=ERROR&limit=50
         GET /api/logs?source=app.services.models&search=health
         GET /api/logs?start_time=2025-11-13T20:00:00Z
+        GET /api/logs?request_id=a1b2c3&limit=2000
     """
     try:
         aggregator = get_log_aggregator()
@@ -152,6 +161,9 @@ async def get_logs(
             start_time=start_time,
             end_time=end_time,
             limit=limit,
+            text=text,
+            request_id=request_id,
+            trace_id=trace_id,
         )
 
         logger.info(
@@ -160,6 +172,7 @@ async def get_logs(
                 "level_filter": level,
                 "source_filter": source,
                 "search_filter": search,
+                "request_id_filter": request_id,
                 "result_count": len(logs),
             },
         )
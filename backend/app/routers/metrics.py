@@ -10,10 +10,10 @@ Also includes WebSocket endpoint for real-time metrics streaming.
 """
 
 import asyncio
+import json
 
 # Application start time for uptime calculation (set during startup)
 import time
-from datetime import datetime, timezone
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
@@ -21,12 +21,12 @@ from app.core.logging import get_logger
 from app.models.metrics import (
     ContextUtilization,
     HistoricalMetrics,
-    MetricsUpdate,
     QueryMetrics,
     ResourceMetrics,
     RoutingMetrics,
     TierMetricsResponse,
 )
+from app.services.metrics_broadcaster import MetricsSubscription, get_metrics_broadcaster
 from app.services.metrics_collector import get_metrics_collector
 
 _app_start_time: float = time.time()
@@ -526,12 +526,13 @@ async def get_context_utilization() -> ContextUtilization:
 async def websocket_metrics(websocket: WebSocket) -> None:
     """WebSocket endpoint for real-time metrics streaming.
 
-    Streams complete metrics update at 1Hz (1 update per second).
+    Streams complete metrics updates at 1Hz by default. Snapshots are sampled
+    once for all clients by the shared MetricsBroadcaster.
 
     **Connection Lifecycle:**
     1. Client connects via WebSocket
-    2. Server sends initial metrics snapshot
-    3. Server sends updates every 1 second
+    2. Server sends the latest metrics snapshot
+    3. Server sends updates every interval (1 second by default)
     4. Connection stays open until client disconnects
 
     **Message Format:**
@@ -545,6 +546,16 @@ async def websocket_metrics(websocket: WebSocket) -> None:
     }
     ```
 
+    **Rate and Delta Negotiation (optional):**
+    Clients may send at any time:
+    ```json
+    {"type": "subscribe", "interval_ms": 5000, "delta": true}
+    ```
+    ``interval_ms`` is clamped to 1-60 seconds. With ``delta`` enabled, a full
+    ``metrics_update`` is followed by ``metrics_delta`` messages whose ``patch``
+    is a JSON Merge Patch (RFC 7386) against the previous update received; a
+    full update may be resent at any time (e.g. after the client fell behind).
+
     **Example Client Usage:**
     ```javascript
     const ws = new WebSocket('ws://localhost:8000/api/metrics/ws');
@@ -560,25 +571,13 @@ async def websocket_metrics(websocket: WebSocket) -> None:
     await websocket.accept()
     logger.info("Metrics WebSocket client connected")
 
-    collector = get_metrics_collector()
+    broadcaster = get_metrics_broadcaster()
+    subscription = broadcaster.subscribe()
+    receiver = asyncio.create_task(_receive_subscription_requests(websocket, subscription))
 
     try:
-        # Send initial metrics snapshot
-        initial_update = _create_metrics_update(collector)
-        await websocket.send_json(initial_update.model_dump(by_alias=True))
-
-        # Stream updates at 1Hz
-        while True:
-            # Wait 1 second
-            await asyncio.sleep(1.0)
-
-            # Generate metrics update
-            update = _create_metrics_update(collector)
-
-            # Send to client
-            await websocket.send_json(update.model_dump(by_alias=True))
-
-            logger.debug("Sent metrics update to client")
+        while (message := await subscription.next()) is not None:
+            await websocket.send_text(message)
 
     except WebSocketDisconnect:
         logger.info("Metrics WebSocket client disconnected normally")
@@ -587,21 +586,42 @@ async def websocket_metrics(websocket: WebSocket) -> None:
         logger.error(f"Metrics WebSocket error: {e}", exc_info=True)
 
     finally:
+        receiver.cancel()
+        broadcaster.unsubscribe(subscription)
         logger.info("Metrics WebSocket connection closed")
 
 
-def _create_metrics_update(collector) -> MetricsUpdate:
-    """Create a complete metrics update message.
+async def _receive_subscription_requests(
+    websocket: WebSocket, subscription: MetricsSubscription
+) -> None:
+    """Apply client subscribe messages until the client disconnects.
 
     Args:
-        collector: MetricsCollector instance
-
-    Returns:
-        MetricsUpdate with all current metrics
+        websocket: WebSocket connection instance
+        subscription: The client's metrics subscription
     """
-    return MetricsUpdate(
-        timestamp=datetime.now(timezone.utc).isoformat(),
-        queries=collector.get_query_metrics(),
-        resources=collector.get_resource_metrics(),
-        routing=collector.get_routing_metrics(),
-    )
+    broadcaster = get_metrics_broadcaster()
+    try:
+        while True:
+            try:
+                request = json.loads(await websocket.receive_text())
+            except ValueError:
+                logger.debug("Ignoring malformed metrics subscription request")
+                continue
+            if not isinstance(request, dict) or request.get("type") != "subscribe":
+                continue
+            interval_ms = request.get("interval_ms")
+            delta = request.get("delta")
+            broadcaster.configure(
+                subscription,
+                interval_ms=int(interval_ms) if isinstance(interval_ms, (int, float)) else None,
+                delta=delta if isinstance(delta, bool) else None,
+            )
+            logger.debug(
+                f"Metrics subscription configured: every {subscription.interval_ticks} ticks, "
+                f"delta={subscription.delta}"
+            )
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # Disconnected (RuntimeError once the socket is closed)
+    finally:
+        subscription.close()
@@ -10,6 +10,14 @@ Security Features:
 - Request/response validation and logging
 - Centralized error handling and rate limiting (future)
 
+Request and response bodies are streamed through chunk by chunk, so
+``"stream": true`` clients receive tokens as they are generated and the
+upstream generation is cancelled when the client disconnects.
+
+Requests reuse the model's long-lived client from the model client registry,
+so proxied calls go over warm keep-alive connections instead of opening a
+new connection per request.
+
 Usage:
     POST /api/proxy/{model_id}/v1/chat/completions - Chat completions
     POST /api/proxy/{model_id}/v1/completions - Text completions
@@ -19,13 +27,18 @@ Author: Backend Architect
 Phase: 5 - Security Hardening
 """
 
+import asyncio
 import logging
-from typing import Optional, Tuple
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Tuple
 
 import httpx
 from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 
+from app.services.llama_client import LlamaCppClient
 from app.services.llama_server_manager import LlamaServerManager
+from app.services.model_clients import ModelClientRegistry, get_model_client_registry
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +47,20 @@ router = APIRouter(prefix="/api/proxy", tags=["proxy"])
 # Global server manager (set by main.py)
 server_manager: Optional[LlamaServerManager] = None
 
+# Headers that apply to a single connection and must not be forwarded
+_HOP_BY_HOP_HEADERS = frozenset(
+    {
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
 
 def _validate_server_manager() -> None:
     """Validate that server manager is initialized.
@@ -87,25 +114,124 @@ def _get_server_port(model_id: str) -> Tuple[int, str]:
     return server.port, f"http://127.0.0.1:{server.port}"
 
 
+def _get_registry() -> Optional[ModelClientRegistry]:
+    """Model client registry, or None if not initialized."""
+    try:
+        return get_model_client_registry()
+    except RuntimeError:
+        return None
+
+
+@asynccontextmanager
+async def _model_client(model_id: str, base_url: str) -> AsyncIterator[LlamaCppClient]:
+    """Yield the model's long-lived client (or a transient one without registry).
+
+    Args:
+        model_id: Model ID from registry
+        base_url: Model server base URL
+    """
+    registry = _get_registry()
+    if registry is not None:
+        yield registry.get_client(model_id, base_url)
+        return
+
+    client = LlamaCppClient(base_url=base_url)
+    try:
+        yield client
+    finally:
+        await client.close()
+
+
+def _report_result(model_id: str, success: bool) -> None:
+    """Report whether the model server handled a call (health-aware eviction).
+
+    Only connection failures, timeouts and 5xx responses are failures; client
+    errors (4xx) say nothing about the server's health.
+    """
+    registry = _get_registry()
+    if registry is not None:
+        registry.report_result(model_id, success)
+
+
+def _response_headers(response: httpx.Response) -> Dict[str, str]:
+    """Upstream response headers minus hop-by-hop headers.
+
+    Event streams additionally disable response buffering in nginx.
+    """
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name.lower() not in _HOP_BY_HOP_HEADERS
+    }
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        headers["Cache-Control"] = "no-cache"
+        headers["X-Accel-Buffering"] = "no"
+    return headers
+
+
+async def _forward_response_body(
+    model_id: str, response: httpx.Response, cleanup: AsyncExitStack
+) -> AsyncIterator[bytes]:
+    """Forward the upstream body chunk by chunk as it arrives.
+
+    Each chunk is only read from llama-server after the previous one was sent
+    to the client, so a slow client slows down reading upstream (backpressure)
+    instead of buffering the body. If the client disconnects, the generator is
+    cancelled and closing the upstream response drops the connection, which
+    makes llama-server abort the generation.
+    """
+    forwarded = 0
+    try:
+        async for chunk in response.aiter_raw():
+            forwarded += len(chunk)
+            yield chunk
+    except httpx.RequestError as e:
+        # Headers are already sent - the client sees a truncated body
+        logger.error(
+            f"Proxy stream from {model_id} interrupted: {e}",
+            extra={"model_id": model_id, "error": str(e), "response_size": forwarded},
+        )
+    except (asyncio.CancelledError, GeneratorExit):
+        logger.info(
+            f"Client disconnected from {model_id} stream - cancelling upstream request",
+            extra={"model_id": model_id, "response_size": forwarded},
+        )
+        raise
+    finally:
+        await cleanup.aclose()
+
+    logger.info(
+        f"Proxy response from {model_id}: {response.status_code}",
+        extra={
+            "model_id": model_id,
+            "status_code": response.status_code,
+            "response_size": forwarded,
+        },
+    )
+
+
 async def _proxy_post_request(
     model_id: str,
     endpoint: str,
-    body: bytes,
+    request: Request,
     timeout: float = 300.0,
-) -> Response:
+) -> StreamingResponse:
     """Proxy a POST request to the model server.
 
     Common implementation for proxying POST requests to llama-server endpoints.
-    Handles connection errors and logging consistently.
+    Request and response bodies are streamed through without buffering, so
+    ``"stream": true`` clients receive server-sent events as they are
+    generated. Handles connection errors and logging consistently.
 
     Args:
         model_id: Model ID from registry
         endpoint: Target endpoint path (e.g., "/v1/chat/completions")
-        body: Request body bytes
-        timeout: Request timeout in seconds (default 300s for LLM inference)
+        request: Incoming request (body is forwarded as it is received)
+        timeout: Request timeout in seconds (default 300s for LLM inference;
+            applies to connecting and to each read while streaming)
 
     Returns:
-        Proxied response from llama-server
+        Streaming proxied response from llama-server
 
     Raises:
         HTTPException: 502 if connection to model server fails
@@ -118,43 +244,52 @@ async def _proxy_post_request(
         extra={"model_id": model_id, "port": port, "target_url": target_url},
     )
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        try:
-            response = await client.post(
-                target_url,
-                content=body,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-                },
-            )
+    headers = {
+        "Content-Type": "application/json",
+        "Accept": request.headers.get("accept", "application/json"),
+    }
+    # Keep the client's framing so llama-server gets a Content-Length body
+    if "content-length" in request.headers:
+        headers["Content-Length"] = request.headers["content-length"]
+
+    cleanup = AsyncExitStack()
+    try:
+        model_client = await cleanup.enter_async_context(_model_client(model_id, base_url))
+        http_client = model_client.data_client
+        upstream_request = http_client.build_request(
+            "POST",
+            target_url,
+            content=request.stream(),
+            headers=headers,
+            timeout=timeout,
+        )
+        # The streamed request body cannot be replayed, so redirects are
+        # passed back to the client instead of followed
+        response = await http_client.send(upstream_request, stream=True, follow_redirects=False)
+        cleanup.push_async_callback(response.aclose)
+    except httpx.RequestError as e:
+        await cleanup.aclose()
+        _report_result(model_id, success=False)
+        logger.error(
+            f"Proxy request failed for {model_id}: {e}",
+            extra={"model_id": model_id, "error": str(e), "target_url": target_url},
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to connect to model server: {str(e)}",
+        )
+    except BaseException:
+        await cleanup.aclose()
+        raise
 
-            logger.info(
-                f"Proxy response from {model_id}: {response.status_code}",
-                extra={
-                    "model_id": model_id,
-                    "status_code": response.status_code,
-                    "response_size": len(response.content),
-                },
-            )
+    _report_result(model_id, success=response.status_code < 500)
 
-            return Response(
-                content=response.content,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type="application/json",
-            )
-
-        except httpx.RequestError as e:
-            logger.error(
-                f"Proxy request failed for {model_id}: {e}",
-                extra={"model_id": model_id, "error": str(e), "target_url": target_url},
-                exc_info=True,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Failed to connect to model server: {str(e)}",
-            )
+    return StreamingResponse(
+        _forward_response_body(model_id, response, cleanup),
+        status_code=response.status_code,
+        headers=_response_headers(response),
+    )
 
 
 @router.post("/{model_id}/v1/chat/completions")
@@ -170,7 +305,8 @@ async def proxy_chat_completions(model_id: str, request: Request) -> Response:
         request: FastAPI request object containing JSON body
 
     Returns:
-        Proxied response from llama-server with same format and status code
+        Proxied response from llama-server with same format and status code,
+        streamed as it is generated (server-sent events for "stream": true)
 
     Raises:
         HTTPException:
@@ -188,8 +324,7 @@ async def proxy_chat_completions(model_id: str, request: Request) -> Response:
             "max_tokens": 100
         }
     """
-    body = await request.body()
-    return await _proxy_post_request(model_id, "/v1/chat/completions", body)
+    return await _proxy_post_request(model_id, "/v1/chat/completions", request)
 
 
 @router.post("/{model_id}/v1/completions")
@@ -205,7 +340,8 @@ async def proxy_completions(model_id: str, request: Request) -> Response:
         request: FastAPI request object containing JSON body
 
     Returns:
-        Proxied response from llama-server with same format and status code
+        Proxied response from llama-server with same format and status code,
+        streamed as it is generated (server-sent events for "stream": true)
 
     Raises:
         HTTPException:
@@ -221,8 +357,7 @@ async def proxy_completions(model_id: str, request: Request) -> Response:
             "max_tokens": 100
         }
     """
-    body = await request.body()
-    return await _proxy_post_request(model_id, "/v1/completions", body)
+    return await _proxy_post_request(model_id, "/v1/completions", request)
 
 
 @router.get("/{model_id}/health")
@@ -283,12 +418,13 @@ async def proxy_health_check(model_id: str) -> Response:
         )
 
     port = server.port
-    target_url = f"http://127.0.0.1:{port}/health"
+    base_url = f"http://127.0.0.1:{port}"
+    target_url = f"{base_url}/health"
 
-    # Use shorter timeout for health checks
-    async with httpx.AsyncClient(timeout=10.0) as client:
+    # Health checks go over the control plane with a shorter timeout
+    async with _model_client(model_id, base_url) as model_client:
         try:
-            response = await client.get(target_url)
+            response = await model_client.control_client.get(target_url, timeout=10.0)
 
             logger.debug(
                 f"Health check response from {model_id}: {response.status_code}",
@@ -303,6 +439,7 @@ async def proxy_health_check(model_id: str) -> Response:
             )
 
         except httpx.RequestError as e:
+            _report_result(model_id, success=False)
             logger.warning(
                 f"Health check failed for {model_id}: {e}",
                 extra={"model_id": model_id, "error": str(e), "target_url": target_url},
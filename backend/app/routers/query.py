@@ -2,19 +2,31 @@
 
 This module provides the main query endpoint that orchestrates the
 complete query processing pipeline: complexity assessment, model
-selection, and response generation.
+selection, and response generation. A streaming variant relays model
+tokens to the client as server-sent events while the pipeline runs.
+
+Context gathering runs its sources concurrently: the web search is started as
+a task before CGRAG retrieval (and, in two-stage mode, complexity assessment
+runs alongside both), each source bounded by its own deadline, so gathering
+takes as long as the slowest source instead of the sum of all of them.
 """
 
 import asyncio
+import hashlib
 import json
+import os
 import time
 from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime
 from enum import Enum
+from itertools import count
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from uuid import uuid4
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from app.core.dependencies import (
     ConfigDependency,
@@ -43,16 +55,26 @@ from app.models.query import (
 )
 from app.models.timeseries import MetricType
 from app.services import runtime_settings as settings_service
-from app.services.cgrag import CGRAGIndexer, CGRAGRetriever, get_cgrag_index_paths
+from app.services.cgrag import (
+    CGRAGIndexer,
+    CGRAGRetriever,
+    DocumentChunk,
+    get_cgrag_index_paths,
+)
+from app.services.cgrag_registry import get_cgrag_index_registry
 from app.services.context_state import get_context_state_manager
 from app.services.event_emitter import emit_cgrag_event, emit_query_route_event
 from app.services.instance_manager import get_instance_manager
 from app.services.llama_client import LlamaCppClient
 from app.services.metrics_aggregator import get_metrics_aggregator
+from app.services.model_clients import get_model_client_registry
 from app.services.model_selector import ModelSelector
 from app.services.orchestrator_status import get_orchestrator_status_service
 from app.services.pipeline_tracker import PipelineTracker
+from app.services.response_cache import ResponseCacheKey, get_response_cache
 from app.services.routing import assess_complexity
+from app.services.speculative_prefill import SpeculativePrefill
+from app.services.token_counter import estimate_tokens
 from app.services.topology_manager import get_topology_manager
 from app.services.websearch import get_searxng_client
 
@@ -62,6 +84,27 @@ router = APIRouter()
 model_registry: Optional[ModelRegistry] = None
 model_selector: Optional[ModelSelector] = None
 
+# Token event queue of the streaming query being processed in this context (set by
+# /api/query/stream; inherited by tasks the pipeline spawns, e.g. council calls)
+_token_stream: ContextVar[Optional["asyncio.Queue[Optional[Dict[str, Any]]]"]] = ContextVar(
+    "query_token_stream", default=None
+)
+
+# Errors reported by the model calls of the query being processed in this context
+# (set by process_query; a response with errors is empty or partial and not cached)
+_model_call_errors: ContextVar[Optional[List[str]]] = ContextVar(
+    "query_model_call_errors", default=None
+)
+
+# Identifies model calls within a stream (concurrent calls may use the same model)
+_stream_call_ids = count(1)
+
+# Token events buffered ahead of a slow streaming client before generation waits
+_STREAM_QUEUE_SIZE = 1024
+
+# CGRAG index queries retrieve context from (the response cache keys on its version)
+_QUERY_CGRAG_INDEX = "docs"
+
 
 async def store_context_allocation(
     query_id: str,
@@ -159,6 +202,51 @@ async def record_topology_flow(query_id: str, component_id: str) -> None:
         )
 
 
+def get_resident_cgrag_retriever(
+    min_relevance: float, query_id: Optional[str] = None, index_name: str = _QUERY_CGRAG_INDEX
+) -> Optional[CGRAGRetriever]:
+    """Get a retriever over the resident (preloaded) CGRAG index.
+
+    Uses the process-wide index registry so queries never re-read the FAISS
+    file or rebuild the encoder. Falls back to loading the index from disk
+    when the registry is not initialized (e.g., scripts and tests).
+
+    Args:
+        min_relevance: Minimum relevance threshold for retrieval
+        query_id: Optional query identifier for log context
+        index_name: Name of the index to retrieve from
+
+    Returns:
+        CGRAGRetriever, or None if the index is not available
+    """
+    from app.core.logging import get_logger
+
+    logger = get_logger(__name__)
+
+    try:
+        registry = get_cgrag_index_registry()
+        retriever = registry.get_retriever(index_name, min_relevance)
+    except RuntimeError:
+        # Registry not initialized - load directly from disk
+        _, index_path, metadata_path = get_cgrag_index_paths(index_name)
+        if not (index_path.exists() and metadata_path.exists()):
+            return None
+        logger.debug(f"Loading CGRAG index '{index_name}' from disk for query {query_id}")
+        indexer = CGRAGIndexer.load_index(index_path=index_path, metadata_path=metadata_path)
+        retriever = CGRAGRetriever(indexer=indexer, min_relevance=min_relevance)
+
+    if retriever is None:
+        return None
+
+    # Validate embedding model consistency
+    settings = settings_service.get_runtime_settings()
+    is_valid, warning = retriever.indexer.validate_embedding_model(settings.embedding_model_name)
+    if not is_valid:
+        logger.warning(warning, extra={"query_id": query_id})
+
+    return retriever
+
+
 async def record_query_metrics(
     query_id: str,
     model_id: str,
@@ -241,6 +329,131 @@ async def record_query_metrics(
         )
 
 
+async def record_time_to_first_token(model_id: str, time_to_first_token_ms: float) -> None:
+    """Record a model's time to first token to the time-series aggregator.
+
+    Args:
+        model_id: Model identifier used for generation
+        time_to_first_token_ms: Time until the first generated token (ms)
+    """
+    try:
+        aggregator = get_metrics_aggregator()
+        await aggregator.record_metric(
+            metric_name=MetricType.TIME_TO_FIRST_TOKEN,
+            value=time_to_first_token_ms,
+            metadata={"model_id": model_id},
+        )
+    except RuntimeError:
+        # Metrics aggregator not initialized - this is OK, just skip
+        pass
+
+
+def _context_deadlines() -> Tuple[float, float]:
+    """Per-source context gathering deadlines from runtime settings.
+
+    Returns:
+        Tuple of (web search deadline, CGRAG retrieval deadline) in seconds
+    """
+    settings = settings_service.get_runtime_settings()
+    return settings.websearch_deadline_ms / 1000, settings.cgrag_deadline_ms / 1000
+
+
+async def _web_search(
+    query: str, query_id: str, mode: str, deadline_s: float, logger
+) -> Tuple[list, float]:
+    """Search SearXNG for query context within a deadline.
+
+    Failures and searches exceeding the deadline are logged and yield no
+    results, so a slow or broken search engine never fails the query.
+
+    Args:
+        query: Query text
+        query_id: Query identifier for logging
+        mode: Query mode (for logging)
+        deadline_s: Maximum seconds to wait for results
+        logger: Logger instance
+
+    Returns:
+        Tuple of (search results, search time in ms)
+    """
+    logger.info(f" Web search enabled for {mode} query {query_id}")
+    try:
+        searxng_url = os.getenv("SEARXNG_URL", "http://searxng:8080")
+        max_results = int(os.getenv("WEBSEARCH_MAX_RESULTS", "5"))
+        timeout = int(os.getenv("WEBSEARCH_TIMEOUT", "10"))
+
+        searxng_client = get_searxng_client(
+            base_url=searxng_url, timeout=timeout, max_results=max_results
+        )
+        search_response = await asyncio.wait_for(searxng_client.search(query), timeout=deadline_s)
+    except asyncio.TimeoutError:
+        logger.warning(
+            f" Web search for query {query_id} exceeded its {deadline_s * 1000:.0f}ms "
+            f"deadline, continuing without web results",
+            extra={"query_id": query_id, "deadline_ms": round(deadline_s * 1000)},
+        )
+        return [], 0.0
+    except Exception as e:
+        logger.warning(
+            f" Web search failed for query {query_id}: {e}, continuing without web results",
+            extra={
+                "query_id": query_id,
+                "error": str(e),
+                "error_type": type(e).__name__,
+            },
+        )
+        return [], 0.0
+
+    logger.info(
+        f"✓ Web search completed: {len(search_response.results)} results "
+        f"in {search_response.search_time_ms:.0f}ms",
+        extra={
+            "query_id": query_id,
+            "results_count": len(search_response.results),
+            "search_time_ms": round(search_response.search_time_ms, 2),
+            "engines_used": search_response.engines_used,
+        },
+    )
+    return search_response.results, search_response.search_time_ms
+
+
+def _start_web_search(
+    enabled: bool, query: str, query_id: str, mode: str, deadline_s: float, logger
+) -> Optional["asyncio.Task[Tuple[list, float]]"]:
+    """Start the web search as a task so it overlaps CGRAG retrieval.
+
+    Returns:
+        Search task, or None if web search is disabled
+    """
+    if not enabled:
+        return None
+    return asyncio.create_task(_web_search(query, query_id, mode, deadline_s, logger))
+
+
+async def _assess_complexity_timed(query: str, routing_config) -> Tuple[QueryComplexity, float]:
+    """Assess query complexity, measuring the routing decision time.
+
+    Returns:
+        Tuple of (complexity assessment, decision time in ms)
+    """
+    start = time.perf_counter()
+    complexity = await assess_complexity(query=query, config=routing_config)
+    return complexity, (time.perf_counter() - start) * 1000
+
+
+async def _web_search_results(
+    task: Optional["asyncio.Task[Tuple[list, float]]"],
+) -> Tuple[list, float]:
+    """Wait for a web search started with _start_web_search.
+
+    Returns:
+        Tuple of (search results, search time in ms); empty if not started
+    """
+    if task is None:
+        return [], 0.0
+    return await task
+
+
 async def validate_models_available(model_ids: list[str], model_selector: ModelSelector) -> None:
     """Validate that specified models are available for debate.
 
@@ -326,22 +539,130 @@ async def auto_select_debate_participants(model_selector: ModelSelector) -> list
     return participants
 
 
+def _model_base_url(port: int) -> str:
+    """Base URL of a model server.
+
+    Models are running on the host machine; from Docker (macOS, Linux and
+    WSL alike) the host is reached via host.docker.internal.
+    """
+    return f"http://host.docker.internal:{port}"
+
+
+# Stage 2 prompt text after the Stage 1 response
+_STAGE2_INSTRUCTIONS = """
+
+Instructions:
+- Provide an improved, comprehensive response to the original query
+- Expand on key points from the initial response
+- Add depth, examples, and additional context
+- Ensure accuracy and completeness
+- Maintain a clear, professional tone
+
+Refined Response:"""
+
+
+def _artifact_info(chunk: DocumentChunk) -> ArtifactInfo:
+    """Describe a retrieved chunk for response metadata.
+
+    Reports the tokenizer count stored at index time (the count context
+    packing budgets with), estimating only for chunks indexed without one.
+    """
+    token_count = chunk.token_count
+    if token_count is None:
+        token_count = estimate_tokens(chunk.content)
+    return ArtifactInfo(
+        file_path=chunk.file_path,
+        relevance_score=chunk.relevance_score,
+        chunk_index=chunk.chunk_index,
+        token_count=token_count,
+    )
+
+
+def _stage2_prompt_prefix(query: str, shared_context: str = "") -> str:
+    """Stage 2 prompt text preceding the Stage 1 response.
+
+    Args:
+        query: Original query
+        shared_context: Instance system prompt and retrieved context (used
+            with speculative prefill), or empty
+
+    Returns:
+        Prompt prefix; the full prompt is prefix + Stage 1 response +
+        _STAGE2_INSTRUCTIONS
+    """
+    return f"""{shared_context}You are refining a response to improve its quality.
+
+Original Query:
+{query}
+
+Initial Response (from Stage 1 model):
+"""
+
+
+def _start_stage2_prefill(
+    model_id: str, prefix: str, chunk_tokens: int
+) -> Optional[SpeculativePrefill]:
+    """Start prefilling a Stage 2 server's prompt cache.
+
+    Args:
+        model_id: Stage 2 model identifier
+        prefix: Stage 2 prompt prefix to prefill
+        chunk_tokens: Stage 1 tokens accumulated before extending the prefill
+
+    Returns:
+        Running SpeculativePrefill, or None if the model or its long-lived
+        client is unavailable
+    """
+    if not model_registry or model_id not in model_registry.models:
+        return None
+    try:
+        model_clients = get_model_client_registry()
+    except RuntimeError:
+        return None
+
+    client = model_clients.get_client(
+        model_id, _model_base_url(model_registry.models[model_id].port)
+    )
+    prefill = SpeculativePrefill(client, prefix, chunk_tokens=chunk_tokens)
+    prefill.start()
+    return prefill
+
+
 async def _call_model_direct(
-    model_id: str, prompt: str, max_tokens: int = 512, temperature: float = 0.7
+    model_id: str,
+    prompt: str,
+    max_tokens: int = 512,
+    temperature: float = 0.7,
+    on_token: Optional[Callable[[str], None]] = None,
 ) -> dict:
     """Call a model directly using LlamaCppClient.
 
+    The model's long-lived client is taken from the model client registry so
+    that dialogue turns reuse warm connections; a transient client is used
+    when the registry is not initialized.
+
+    The completion is streamed from llama.cpp so that the model's time to
+    first token is recorded. When called while a streaming query is being
+    processed (see process_query_stream), each token is also forwarded to the
+    client as it is generated.
+
     Args:
         model_id: Model identifier from registry
         prompt: Input prompt
         max_tokens: Max tokens to generate
         temperature: Sampling temperature
+        on_token: Optional callback for each generated text fragment
+
+    Generation failures (unreachable server, HTTP errors, truncated streams)
+    do not raise: the partial (possibly empty) content is returned with the
+    error, which is also recorded for the query (see process_query).
 
     Returns:
-        Dict with 'content' key containing response text
+        Dict with 'content' (response text), 'usage' and 'error' (None on
+        success) keys
 
     Raises:
-        HTTPException: If model not found or call fails
+        HTTPException: If model not found
     """
     if not model_registry:
         raise HTTPException(status_code=503, detail="Model registry not available")
@@ -350,30 +671,76 @@ async def _call_model_direct(
         raise HTTPException(status_code=404, detail=f"Model not found: {model_id}")
 
     model = model_registry.models[model_id]
+    base_url = _model_base_url(model.port)
+    try:
+        model_clients = get_model_client_registry()
+        client = model_clients.get_client(model_id, base_url)
+        owns_client = False
+    except RuntimeError:
+        model_clients = None
+        client = LlamaCppClient(
+            base_url=base_url,
+            timeout=120,  # Longer timeout for generation
+            max_retries=2,
+        )
+        owns_client = True
 
-    # Create client for this model
-    # Models are running on host machine
-    # Docker on macOS: use host.docker.internal to reach host
-    import platform
-
-    if platform.system() == "Linux" and "microsoft" not in platform.release().lower():
-        # Running in Docker on Linux (not WSL)
-        host = "host.docker.internal"
-    else:
-        # Local development or WSL
-        host = "host.docker.internal"
-
-    base_url = f"http://{host}:{model.port}"
-    client = LlamaCppClient(
-        base_url=base_url,
-        timeout=120,  # Longer timeout for generation
-        max_retries=2,
-    )
+    stream = _token_stream.get()
+    call_id = next(_stream_call_ids)
+    if stream is not None:
+        await stream.put({"event": "start", "call_id": call_id, "model_id": model_id})
 
     try:
-        result = await client.generate_completion(
+        content_parts = []
+        result: Dict[str, Any] = {}
+        async for chunk in client.stream_completion(
             prompt=prompt, max_tokens=max_tokens, temperature=temperature
-        )
+        ):
+            if chunk.get("done"):
+                result = chunk
+                break
+            content_parts.append(chunk["content"])
+            if on_token is not None:
+                on_token(chunk["content"])
+            if stream is not None:
+                await stream.put(
+                    {
+                        "event": "token",
+                        "call_id": call_id,
+                        "model_id": model_id,
+                        "content": chunk["content"],
+                    }
+                )
+        result["content"] = "".join(content_parts)
+        error = result.get("error")
+        if error is not None:
+            from app.core.logging import get_logger
+
+            get_logger(__name__).warning(
+                f"Model call to {model_id} failed: {error}",
+                extra={"model_id": model_id, "truncated": result.get("truncated", False)},
+            )
+            call_errors = _model_call_errors.get()
+            if call_errors is not None:
+                call_errors.append(f"{model_id}: {error}")
+        if model_clients is not None:
+            # Request errors (4xx, truncation) say nothing about the server's health
+            model_clients.report_result(model_id, success=not result.get("server_error"))
+
+        time_to_first_token_ms = result.get("time_to_first_token_ms")
+        if time_to_first_token_ms is not None:
+            await record_time_to_first_token(model_id, time_to_first_token_ms)
+        if stream is not None:
+            await stream.put(
+                {
+                    "event": "end",
+                    "call_id": call_id,
+                    "model_id": model_id,
+                    "tokens_predicted": result.get("tokens_predicted", 0),
+                    "time_to_first_token_ms": time_to_first_token_ms,
+                    "error": result.get("error"),
+                }
+            )
 
         # Transform response to match expected format for dialogue_engine
         # dialogue_engine expects: {"content": str, "usage": {"total_tokens": int}}
@@ -384,9 +751,11 @@ async def _call_model_direct(
                 "total_tokens": result.get("tokens_predicted", 0)
                 + result.get("tokens_evaluated", 0)
             },
+            "error": error,
         }
     finally:
-        await client.close()
+        if owns_client:
+            await client.close()
 
 
 async def _process_consensus_mode(
@@ -428,35 +797,11 @@ async def _process_consensus_mode(
     web_search_results = []
     web_search_time_ms = 0.0
 
-    # Web search (if enabled)
-    if request.use_web_search:
-        try:
-            logger.info(f" Web search enabled for council query {query_id}")
-            time.time()
-
-            # Get SearXNG client
-            import os
-
-            searxng_url = os.getenv("SEARXNG_URL", "http://searxng:8080")
-            max_results = int(os.getenv("WEBSEARCH_MAX_RESULTS", "5"))
-            timeout = int(os.getenv("WEBSEARCH_TIMEOUT", "10"))
-
-            searxng_client = get_searxng_client(
-                base_url=searxng_url, timeout=timeout, max_results=max_results
-            )
-
-            # Execute search
-            search_response = await searxng_client.search(request.query)
-            web_search_results = search_response.results
-            web_search_time_ms = search_response.search_time_ms
-
-            logger.info(
-                f"✓ Web search completed: {len(web_search_results)} results in {web_search_time_ms:.0f}ms",
-                extra={"query_id": query_id, "results_count": len(web_search_results)},
-            )
-
-        except Exception as e:
-            logger.warning(f" Web search failed for query {query_id}: {e}")
+    # Web search (if enabled) runs concurrently with CGRAG retrieval
+    websearch_deadline_s, cgrag_deadline_s = _context_deadlines()
+    web_search_task = _start_web_search(
+        request.use_web_search, request.query, query_id, "council", websearch_deadline_s, logger
+    )
 
     # CGRAG retrieval
     cgrag_context_text = None
@@ -465,37 +810,20 @@ async def _process_consensus_mode(
             # Record topology flow - entering CGRAG engine
             await record_topology_flow(query_id, "cgrag_engine")
 
-            # Determine path to FAISS index using runtime settings
-            _, index_path, metadata_path = get_cgrag_index_paths("docs")
-
-            # Check if index exists
-            if index_path.exists() and metadata_path.exists():
-                logger.debug(f"Loading CGRAG index for council query {query_id}")
-
-                # Load CGRAG indexer
-                cgrag_indexer = CGRAGIndexer.load_index(
-                    index_path=index_path, metadata_path=metadata_path
-                )
-
-                # Validate embedding model consistency
-                settings = settings_service.get_runtime_settings()
-                is_valid, warning = cgrag_indexer.validate_embedding_model(
-                    settings.embedding_model_name
-                )
-                if not is_valid:
-                    logger.warning(warning, extra={"query_id": query_id})
-
-                # Create retriever
-                retriever = CGRAGRetriever(
-                    indexer=cgrag_indexer,
-                    min_relevance=config.cgrag.retrieval.min_relevance,
-                )
+            # Get retriever over the resident CGRAG index (loaded once at startup)
+            retriever = get_resident_cgrag_retriever(
+                min_relevance=config.cgrag.retrieval.min_relevance, query_id=query_id
+            )
 
+            if retriever is not None:
                 # Retrieve context
-                cgrag_result = await retriever.retrieve(
-                    query=request.query,
-                    token_budget=config.cgrag.retrieval.token_budget,
-                    max_artifacts=config.cgrag.retrieval.max_artifacts,
+                cgrag_result = await asyncio.wait_for(
+                    retriever.retrieve(
+                        query=request.query,
+                        token_budget=config.cgrag.retrieval.token_budget,
+                        max_artifacts=config.cgrag.retrieval.max_artifacts,
+                    ),
+                    timeout=cgrag_deadline_s,
                 )
 
                 cgrag_artifacts = cgrag_result.artifacts
@@ -520,6 +848,8 @@ async def _process_consensus_mode(
         except Exception as e:
             logger.warning(f"CGRAG retrieval failed for council query {query_id}: {e}")
 
+    web_search_results, web_search_time_ms = await _web_search_results(web_search_task)
+
     # Build context string for prompts
     context_string = ""
     if web_search_results:
@@ -742,17 +1072,7 @@ Consensus Answer:"""
     ]
 
     # Build CGRAG artifact info
-    cgrag_artifacts_info = []
-    if cgrag_artifacts:
-        cgrag_artifacts_info = [
-            ArtifactInfo(
-                file_path=chunk.file_path,
-                relevance_score=chunk.relevance_score,
-                chunk_index=chunk.chunk_index,
-                token_count=chunk.token_count,
-            )
-            for chunk in cgrag_artifacts
-        ]
+    cgrag_artifacts_info = [_artifact_info(chunk) for chunk in cgrag_artifacts or []]
 
     # Build web search results metadata
     web_search_results_dict = None
@@ -895,71 +1215,30 @@ async def _process_debate_mode(
     web_search_results = []
     web_search_time_ms = 0.0
 
-    # Web search (if enabled)
-    if request.use_web_search:
-        try:
-            logger.info(f" Web search enabled for debate query {query_id}")
-            time.time()
-
-            # Get SearXNG client
-            import os
-
-            searxng_url = os.getenv("SEARXNG_URL", "http://searxng:8080")
-            max_results = int(os.getenv("WEBSEARCH_MAX_RESULTS", "5"))
-            timeout = int(os.getenv("WEBSEARCH_TIMEOUT", "10"))
-
-            searxng_client = get_searxng_client(
-                base_url=searxng_url, timeout=timeout, max_results=max_results
-            )
-
-            # Execute search
-            search_response = await searxng_client.search(request.query)
-            web_search_results = search_response.results
-            web_search_time_ms = search_response.search_time_ms
-
-            logger.info(
-                f"✓ Web search completed: {len(web_search_results)} results in {web_search_time_ms:.0f}ms",
-                extra={"query_id": query_id, "results_count": len(web_search_results)},
-            )
-
-        except Exception as e:
-            logger.warning(f" Web search failed for debate query {query_id}: {e}")
+    # Web search (if enabled) runs concurrently with CGRAG retrieval
+    websearch_deadline_s, cgrag_deadline_s = _context_deadlines()
+    web_search_task = _start_web_search(
+        request.use_web_search, request.query, query_id, "debate", websearch_deadline_s, logger
+    )
 
     # CGRAG retrieval
     cgrag_context_text = None
     if request.use_context:
         try:
-            # Determine path to FAISS index using runtime settings
-            _, index_path, metadata_path = get_cgrag_index_paths("docs")
-
-            # Check if index exists
-            if index_path.exists() and metadata_path.exists():
-                logger.debug(f"Loading CGRAG index for debate query {query_id}")
-
-                # Load CGRAG indexer
-                cgrag_indexer = CGRAGIndexer.load_index(
-                    index_path=index_path, metadata_path=metadata_path
-                )
-
-                # Validate embedding model consistency
-                settings = settings_service.get_runtime_settings()
-                is_valid, warning = cgrag_indexer.validate_embedding_model(
-                    settings.embedding_model_name
-                )
-                if not is_valid:
-                    logger.warning(warning, extra={"query_id": query_id})
-
-                # Create retriever
-                retriever = CGRAGRetriever(
-                    indexer=cgrag_indexer,
-                    min_relevance=config.cgrag.retrieval.min_relevance,
-                )
+            # Get retriever over the resident CGRAG index (loaded once at startup)
+            retriever = get_resident_cgrag_retriever(
+                min_relevance=config.cgrag.retrieval.min_relevance, query_id=query_id
+            )
 
+            if retriever is not None:
                 # Retrieve context
-                cgrag_result = await retriever.retrieve(
-                    query=request.query,
-                    token_budget=config.cgrag.retrieval.token_budget,
-                    max_artifacts=config.cgrag.retrieval.max_artifacts,
+                cgrag_result = await asyncio.wait_for(
+                    retriever.retrieve(
+                        query=request.query,
+                        token_budget=config.cgrag.retrieval.token_budget,
+                        max_artifacts=config.cgrag.retrieval.max_artifacts,
+                    ),
+                    timeout=cgrag_deadline_s,
                 )
 
                 cgrag_artifacts = cgrag_result.artifacts
@@ -984,6 +1263,8 @@ async def _process_debate_mode(
         except Exception as e:
             logger.warning(f"CGRAG retrieval failed for debate query {query_id}: {e}")
 
+    web_search_results, web_search_time_ms = await _web_search_results(web_search_task)
+
     # Build context string for prompts
     context_string = ""
     if web_search_results:
@@ -1135,17 +1416,7 @@ async def _process_debate_mode(
     total_time = dialogue_time
 
     # Build CGRAG artifact info
-    cgrag_artifacts_info = []
-    if cgrag_artifacts:
-        cgrag_artifacts_info = [
-            ArtifactInfo(
-                file_path=chunk.file_path,
-                relevance_score=chunk.relevance_score,
-                chunk_index=chunk.chunk_index,
-                token_count=chunk.token_count,
-            )
-            for chunk in cgrag_artifacts
-        ]
+    cgrag_artifacts_info = [_artifact_info(chunk) for chunk in cgrag_artifacts or []]
 
     # Build web search results metadata
     web_search_results_dict = None
@@ -1269,6 +1540,126 @@ async def _process_debate_mode(
     )
 
 
+def _model_set_fingerprint() -> str:
+    """Fingerprint of the registered models (changes when models are added or toggled)."""
+    if not model_registry:
+        return "none"
+    models = sorted(
+        (model_id, model.enabled, model.port) for model_id, model in model_registry.models.items()
+    )
+    return hashlib.sha1(json.dumps(models).encode()).hexdigest()
+
+
+def _cgrag_index_file_version(index_name: str) -> str:
+    """Version of an on-disk CGRAG index: its metadata file's modification time.
+
+    Args:
+        index_name: Name of the index
+
+    Returns:
+        Version string, or "none" if the index does not exist
+    """
+    _, _, metadata_path = get_cgrag_index_paths(index_name)
+    try:
+        return f"mtime-{metadata_path.stat().st_mtime_ns}"
+    except OSError:
+        return "none"
+
+
+async def _response_cache_key(
+    request: QueryRequest, config: ConfigDependency, logger: Any
+) -> Optional[ResponseCacheKey]:
+    """Response cache key of a request, or None if the request bypasses the cache.
+
+    Benchmark queries (which measure the models), web search queries (live
+    results) and queries sampled above ``response_cache_max_temperature`` are
+    never cached.
+
+    Args:
+        request: Query request
+        config: Application configuration
+        logger: Logger instance
+
+    Returns:
+        ResponseCacheKey, or None if the cache is disabled or bypassed
+    """
+    try:
+        cache = get_response_cache()
+    except RuntimeError:
+        return None
+
+    runtime_settings = settings_service.get_runtime_settings()
+    if (
+        not config.routing.prefer_cached
+        or request.mode == "benchmark"
+        or request.use_web_search
+        or request.temperature > runtime_settings.response_cache_max_temperature
+    ):
+        return None
+
+    # Answers depend on the retrieved context (version of the index the query
+    # retrieves from) and on which models can serve each tier
+    try:
+        retriever = get_cgrag_index_registry().get_retriever(
+            _QUERY_CGRAG_INDEX, config.cgrag.retrieval.min_relevance
+        )
+        index_version = retriever.indexer.index_version if retriever is not None else "none"
+    except RuntimeError:
+        # The query loads the index from disk (see get_resident_cgrag_retriever)
+        retriever = None
+        index_version = _cgrag_index_file_version(_QUERY_CGRAG_INDEX)
+
+    context = f"{_QUERY_CGRAG_INDEX}@{index_version}" if request.use_context else "no-context"
+    context_fingerprint = f"{context}:{_model_set_fingerprint()}"
+
+    embedding = None
+    if cache.similarity_threshold is not None and retriever is not None:
+        try:
+            embedding = await retriever.embed_query(request.query)
+        except Exception as e:
+            logger.debug(f"Response cache query embedding failed: {e}")
+
+    return cache.build_key(
+        request.query,
+        request.temperature,
+        context_fingerprint,
+        embedding=embedding,
+        **request.model_dump(exclude={"query", "temperature"}),
+    )
+
+
+async def _cached_response(
+    request: QueryRequest, cache_key: ResponseCacheKey, start_time: float, logger: Any
+) -> Optional[QueryResponse]:
+    """Look a query up in the response cache.
+
+    Args:
+        request: Query request
+        cache_key: Key from _response_cache_key()
+        start_time: Query start time (for processing_time_ms)
+        logger: Logger instance
+
+    Returns:
+        Cached QueryResponse under a new query ID, or None on a miss
+    """
+    cached = await get_response_cache().get(cache_key)
+    if cached is None:
+        return None
+
+    response = QueryResponse.model_validate_json(cached)
+    response.id = str(uuid4())
+    response.query = request.query
+    response.timestamp = datetime.utcnow()
+    response.metadata.cache_hit = True
+    response.metadata.processing_time_ms = (time.time() - start_time) * 1000
+
+    logger.info(
+        f"Query {response.id} served from response cache",
+        extra={"query_id": response.id, "mode": request.mode},
+    )
+    return response
+
+
 @router.post("/api/query", response_model=QueryResponse, response_model_by_alias=True)
 async def process_query(
     request: QueryRequest,
@@ -1289,6 +1680,10 @@ async def process_query(
     1. Single-model processing with FAST tier (b2-7) and optional CGRAG context
     2. Returns response from single tier
 
+    When the response cache is enabled, repeated (or, with semantic matching,
+    similar) queries are answered from the cache without calling any model.
+    Responses whose model calls reported errors are not cached.
+
     Args:
         request: Query request with text and parameters
         model_manager: ModelManager instance (injected)
@@ -1321,6 +1716,35 @@ async def process_query(
         >>> print(response.json()["metadata"]["query_mode"])
         'simple'
     """
+    start_time = time.time()
+    cache_key = await _response_cache_key(request, config, logger)
+    if cache_key is not None:
+        cached = await _cached_response(request, cache_key, start_time, logger)
+        if cached is not None:
+            return cached
+
+    call_errors: List[str] = []
+    errors_token = _model_call_errors.set(call_errors)
+    try:
+        response = await _process_query(request, model_manager, config, logger)
+    finally:
+        _model_call_errors.reset(errors_token)
+
+    if call_errors:
+        # Empty or partial answer - never serve it to later queries
+        response.metadata.model_errors = call_errors
+    elif cache_key is not None:
+        await get_response_cache().set(cache_key, response.model_dump_json())
+    return response
+
+
+async def _process_query(
+    request: QueryRequest,
+    model_manager: ModelManagerDependency,
+    config: ConfigDependency,
+    logger: LoggerDependency,
+) -> QueryResponse:
+    """Run the query pipeline for process_query (bypassing the response cache)."""
     # 1. Generate unique query ID
     query_id = str(uuid4())
     start_time = time.time()
@@ -1411,55 +1835,25 @@ async def process_query(
                     status_code=503, detail=f"No {stage1_tier} tier models available"
                 )
 
-            # Web search (if enabled)
+            # Web search (if enabled) and complexity assessment run concurrently
+            # with CGRAG retrieval
             # Logic: Request overrides instance - if request enables, use it;
             # otherwise fall back to instance config if available
-            web_search_results = []
-            web_search_time_ms = 0.0
             effective_web_search = request.use_web_search or (
                 instance_config is not None and instance_config.web_search_enabled
             )
-
-            if effective_web_search:
-                try:
-                    logger.info(f" Web search enabled for query {query_id}")
-                    time.time()
-
-                    # Get SearXNG client
-                    import os
-
-                    searxng_url = os.getenv("SEARXNG_URL", "http://searxng:8080")
-                    max_results = int(os.getenv("WEBSEARCH_MAX_RESULTS", "5"))
-                    timeout = int(os.getenv("WEBSEARCH_TIMEOUT", "10"))
-
-                    searxng_client = get_searxng_client(
-                        base_url=searxng_url, timeout=timeout, max_results=max_results
-                    )
-
-                    # Execute search
-                    search_response = await searxng_client.search(request.query)
-                    web_search_results = search_response.results
-                    web_search_time_ms = search_response.search_time_ms
-
-                    logger.info(
-                        f"✓ Web search completed: {len(web_search_results)} results in {web_search_time_ms:.0f}ms",
-                        extra={
-                            "query_id": query_id,
-                            "results_count": len(web_search_results),
-                            "search_time_ms": round(web_search_time_ms, 2),
-                            "engines_used": search_response.engines_used,
-                        },
-                    )
-
-                except Exception as e:
-                    logger.warning(
-                        f" Web search failed for query {query_id}: {e}, continuing without web results",
-                        extra={
-                            "query_id": query_id,
-                            "error": str(e),
-                            "error_type": type(e).__name__,
-                        },
-                    )
+            websearch_deadline_s, cgrag_deadline_s = _context_deadlines()
+            web_search_task = _start_web_search(
+                effective_web_search,
+                request.query,
+                query_id,
+                "two-stage",
+                websearch_deadline_s,
+                logger,
+            )
+            complexity_task = asyncio.create_task(
+                _assess_complexity_timed(request.query, config.routing)
+            )
 
             # CGRAG retrieval for Stage 1
             cgrag_artifacts = []
@@ -1475,50 +1869,21 @@ async def process_query(
 
             if request.use_context:
                 try:
-                    # Determine path to FAISS index
-                    project_root = Path(__file__).parent.parent.parent.parent
-                    index_path = project_root / "data" / "faiss_indexes" / "docs.index"
-                    metadata_path = project_root / "data" / "faiss_indexes" / "docs.metadata"
-
-                    # Check if index exists
-                    if index_path.exists() and metadata_path.exists():
-                        logger.debug(f"Loading CGRAG index for query {query_id}")
-                        index_load_start = time.time()
-
-                        # Load CGRAG indexer
-                        cgrag_indexer = CGRAGIndexer.load_index(
-                            index_path=index_path, metadata_path=metadata_path
-                        )
-
-                        index_load_time_ms = (time.time() - index_load_start) * 1000
-                        logger.info(
-                            f"CGRAG index loaded in {index_load_time_ms:.1f}ms",
-                            extra={
-                                "query_id": query_id,
-                                "load_time_ms": round(index_load_time_ms, 2),
-                            },
-                        )
-
-                        # Validate embedding model consistency
-                        settings = settings_service.get_runtime_settings()
-                        is_valid, warning = cgrag_indexer.validate_embedding_model(
-                            settings.embedding_model_name
-                        )
-                        if not is_valid:
-                            logger.warning(warning, extra={"query_id": query_id})
-
-                        # Create retriever
-                        retriever = CGRAGRetriever(
-                            indexer=cgrag_indexer,
-                            min_relevance=config.cgrag.retrieval.min_relevance,
-                        )
+                    # Get retriever over the resident CGRAG index (loaded once at startup)
+                    retriever = get_resident_cgrag_retriever(
+                        min_relevance=config.cgrag.retrieval.min_relevance, query_id=query_id
+                    )
 
+                    if retriever is not None:
                         # Retrieve context
                         retrieval_start = time.time()
-                        cgrag_result = await retriever.retrieve(
-                            query=request.query,
-                            token_budget=config.cgrag.retrieval.token_budget,
-                            max_artifacts=config.cgrag.retrieval.max_artifacts,
+                        cgrag_result = await asyncio.wait_for(
+                            retriever.retrieve(
+                                query=request.query,
+                                token_budget=config.cgrag.retrieval.token_budget,
+                                max_artifacts=config.cgrag.retrieval.max_artifacts,
+                            ),
+                            timeout=cgrag_deadline_s,
                         )
                         retrieval_time_ms = (time.time() - retrieval_start) * 1000
 
@@ -1573,8 +1938,7 @@ async def process_query(
                             f"CGRAG index not found for query {query_id}, continuing without context",
                             extra={
                                 "query_id": query_id,
-                                "index_path": str(index_path),
-                                "metadata_path": str(metadata_path),
+                                "index_name": _QUERY_CGRAG_INDEX,
                             },
                         )
 
@@ -1589,6 +1953,8 @@ async def process_query(
                     )
                     cgrag_context_text = None
 
+            web_search_results, web_search_time_ms = await _web_search_results(web_search_task)
+
             # Build combined prompt with web search + CGRAG context
             context_parts = []
 
@@ -1638,33 +2004,11 @@ async def process_query(
                 # No context available, use query as-is
                 logger.info(f"No context available for query {query_id}, using raw query")
 
-            # Stage 1 model call
-            try:
-                logger.debug(f"Calling Stage 1 model {stage1_model_id}")
-                stage1_result = await _call_model_direct(
-                    model_id=stage1_model_id,
-                    prompt=stage1_full_prompt,
-                    max_tokens=500,  # Limited tokens for Stage 1
-                    temperature=request.temperature,
-                )
-                stage1_time_ms = int((time.time() - stage1_start) * 1000)
-                stage1_response = stage1_result.get("content", "")
-                stage1_tokens = stage1_result.get("tokens_predicted", 0)
-
-                logger.info(
-                    f"✓ Stage 1 complete: {len(stage1_response)} chars in {stage1_time_ms}ms"
-                )
-            except Exception as e:
-                logger.error(f"Stage 1 model call failed: {e}")
-                raise HTTPException(status_code=500, detail=f"Stage 1 processing failed: {str(e)}")
-
-            # STAGE 2: BALANCED or POWERFUL tier based on complexity
-            stage2_start = time.time()
-
-            # Assess query complexity to determine Stage 2 tier
-            complexity_assessment_start = time.perf_counter()
+            # STAGE 2 ROUTING (before Stage 1, so the Stage 2 server can be
+            # prefilled while Stage 1 generates)
+            # Query complexity (assessed during context gathering) determines Stage 2 tier
             try:
-                complexity = await assess_complexity(query=request.query, config=config.routing)
+                complexity, decision_time_ms = await complexity_task
                 # Select tier based on complexity (balanced for moderate, powerful for complex)
                 if complexity.score >= config.routing.complexity_thresholds.get("powerful", 7.0):
                     stage2_tier = "powerful"
@@ -1672,7 +2016,6 @@ async def process_query(
                     stage2_tier = "balanced"
 
                 # Record routing decision for orchestrator telemetry
-                decision_time_ms = (time.perf_counter() - complexity_assessment_start) * 1000
                 orchestrator_service = get_orchestrator_status_service()
                 orchestrator_service.record_routing_decision(
                     query=request.query,
@@ -1723,60 +2066,94 @@ async def process_query(
                     status_code=503, detail=f"No {stage2_tier} tier models available"
                 )
 
-            # Build Stage 2 refinement prompt
-            stage2_prompt = f"""You are refining a response to improve its quality.
-
-Original Query:
-{request.query}
-
-Initial Response (from Stage 1 model):
-{stage1_response}
+            # Speculative Stage 2 prefill (optional): warm the Stage 2 server's
+            # prompt cache with the shared prefix (system prompt + context +
+            # query) and the Stage 1 output as it is generated
+            runtime_settings = settings_service.get_runtime_settings()
+            stage2_shared_context = ""
+            stage2_prefill = None
+            if runtime_settings.two_stage_speculative_prefill:
+                if context_parts:
+                    stage2_shared_context = f"{system_prompt_section}{combined_context}\n\n===\n\n"
+                elif instance_system_prompt:
+                    stage2_shared_context = f"{instance_system_prompt}\n\n===\n\n"
+                stage2_prefill = _start_stage2_prefill(
+                    stage2_model_id,
+                    _stage2_prompt_prefix(request.query, stage2_shared_context),
+                    runtime_settings.speculative_prefill_chunk_tokens,
+                )
 
-Instructions:
-- Provide an improved, comprehensive response to the original query
-- Expand on key points from the initial response
-- Add depth, examples, and additional context
-- Ensure accuracy and completeness
-- Maintain a clear, professional tone
+            try:
+                # Stage 1 model call
+                try:
+                    logger.debug(f"Calling Stage 1 model {stage1_model_id}")
+                    stage1_result = await _call_model_direct(
+                        model_id=stage1_model_id,
+                        prompt=stage1_full_prompt,
+                        max_tokens=500,  # Limited tokens for Stage 1
+                        temperature=request.temperature,
+                        on_token=stage2_prefill.feed if stage2_prefill else None,
+                    )
+                    stage1_time_ms = int((time.time() - stage1_start) * 1000)
+                    stage1_response = stage1_result.get("content", "")
+                    stage1_tokens = stage1_result.get("tokens_predicted", 0)
 
-Refined Response:"""
+                    logger.info(
+                        f"✓ Stage 1 complete: {len(stage1_response)} chars in {stage1_time_ms}ms"
+                    )
+                except Exception as e:
+                    logger.error(f"Stage 1 model call failed: {e}")
+                    raise HTTPException(
+                        status_code=500, detail=f"Stage 1 processing failed: {str(e)}"
+                    )
 
-            # Stage 2 model call
-            try:
-                logger.debug(f"Calling Stage 2 model {stage2_model_id}")
-                stage2_result = await _call_model_direct(
-                    model_id=stage2_model_id,
-                    prompt=stage2_prompt,
-                    max_tokens=request.max_tokens,
-                    temperature=request.temperature,
-                )
-                stage2_time_ms = int((time.time() - stage2_start) * 1000)
-                stage2_response = stage2_result.get("content", "")
-                stage2_tokens = stage2_result.get("tokens_predicted", 0)
+                # STAGE 2: BALANCED or POWERFUL tier based on complexity
+                stage2_start = time.time()
 
-                total_time_ms = stage1_time_ms + stage2_time_ms
-                logger.info(
-                    f"✓ Stage 2 complete: {len(stage2_response)} chars in {stage2_time_ms}ms "
-                    f"(total: {total_time_ms}ms)"
+                # Build Stage 2 refinement prompt (with the shared context only when
+                # speculative prefill is enabled, so the prefilled prefix matches)
+                stage2_prompt = (
+                    _stage2_prompt_prefix(request.query, stage2_shared_context)
+                    + stage1_response
+                    + _STAGE2_INSTRUCTIONS
                 )
-            except Exception as e:
-                logger.error(f"Stage 2 model call failed: {e}")
-                raise HTTPException(status_code=500, detail=f"Stage 2 processing failed: {str(e)}")
 
-            # Build artifact info for metadata
-            artifacts_info = []
-            if cgrag_artifacts:
-                for chunk in cgrag_artifacts:
-                    # Count tokens for this chunk
-                    token_count = int(len(chunk.content.split()) * 1.3)
-                    artifacts_info.append(
-                        ArtifactInfo(
-                            file_path=chunk.file_path,
-                            relevance_score=chunk.relevance_score,
-                            chunk_index=chunk.chunk_index,
-                            token_count=token_count,
+                # Stage 2 model call
+                try:
+                    if stage2_prefill is not None:
+                        await stage2_prefill.finish()
+                        logger.info(
+                            f"Stage 2 prefill for query {query_id}: {stage2_prefill.get_stats()}",
+                            extra={"query_id": query_id, **stage2_prefill.get_stats()},
                         )
+                    logger.debug(f"Calling Stage 2 model {stage2_model_id}")
+                    stage2_result = await _call_model_direct(
+                        model_id=stage2_model_id,
+                        prompt=stage2_prompt,
+                        max_tokens=request.max_tokens,
+                        temperature=request.temperature,
                     )
+                    stage2_time_ms = int((time.time() - stage2_start) * 1000)
+                    stage2_response = stage2_result.get("content", "")
+                    stage2_tokens = stage2_result.get("tokens_predicted", 0)
+
+                    total_time_ms = stage1_time_ms + stage2_time_ms
+                    logger.info(
+                        f"✓ Stage 2 complete: {len(stage2_response)} chars in {stage2_time_ms}ms "
+                        f"(total: {total_time_ms}ms)"
+                    )
+                except Exception as e:
+                    logger.error(f"Stage 2 model call failed: {e}")
+                    raise HTTPException(
+                        status_code=500, detail=f"Stage 2 processing failed: {str(e)}"
+                    )
+            finally:
+                # Stop prefilling if a stage failed (no-op after a completed Stage 2)
+                if stage2_prefill is not None:
+                    await stage2_prefill.cancel()
+
+            # Build artifact info for metadata
+            artifacts_info = [_artifact_info(chunk) for chunk in cgrag_artifacts]
 
             # Build response with two-stage metadata
             metadata = QueryMetadata(
@@ -1910,50 +2287,21 @@ Refined Response:"""
                     extra={"query_id": query_id, "model_id": model_id, "tier": tier},
                 )
 
-            # Web search (if enabled) - simple mode
+            # Web search (if enabled) - simple mode, concurrent with CGRAG retrieval
             # Logic: Request overrides instance - if request enables, use it;
             # otherwise fall back to instance config if available
-            web_search_results = []
-            web_search_time_ms = 0.0
             effective_web_search = request.use_web_search or (
                 instance_config is not None and instance_config.web_search_enabled
             )
-
-            if effective_web_search:
-                try:
-                    logger.info(f" Web search enabled for query {query_id} (simple mode)")
-                    time.time()
-
-                    # Get SearXNG client
-                    import os
-
-                    searxng_url = os.getenv("SEARXNG_URL", "http://searxng:8080")
-                    max_results = int(os.getenv("WEBSEARCH_MAX_RESULTS", "5"))
-                    timeout = int(os.getenv("WEBSEARCH_TIMEOUT", "10"))
-
-                    searxng_client = get_searxng_client(
-                        base_url=searxng_url, timeout=timeout, max_results=max_results
-                    )
-
-                    # Execute search
-                    search_response = await searxng_client.search(request.query)
-                    web_search_results = search_response.results
-                    web_search_time_ms = search_response.search_time_ms
-
-                    logger.info(
-                        f"✓ Web search completed: {len(web_search_results)} results in {web_search_time_ms:.0f}ms",
-                        extra={
-                            "query_id": query_id,
-                            "results_count": len(web_search_results),
-                            "search_time_ms": round(web_search_time_ms, 2),
-                        },
-                    )
-
-                except Exception as e:
-                    logger.warning(
-                        f" Web search failed for query {query_id}: {e}",
-                        extra={"query_id": query_id, "error": str(e)},
-                    )
+            websearch_deadline_s, cgrag_deadline_s = _context_deadlines()
+            web_search_task = _start_web_search(
+                effective_web_search,
+                request.query,
+                query_id,
+                "simple",
+                websearch_deadline_s,
+                logger,
+            )
 
             # STAGE 4: CGRAG Retrieval (Context Gathering)
             cgrag_artifacts = []
@@ -1973,50 +2321,21 @@ Refined Response:"""
                     cgrag_metadata["reason"] = "use_context=False"
                 elif request.use_context:
                     try:
-                        # Determine path to FAISS index
-                        project_root = Path(__file__).parent.parent.parent.parent
-                        index_path = project_root / "data" / "faiss_indexes" / "docs.index"
-                        metadata_path = project_root / "data" / "faiss_indexes" / "docs.metadata"
-
-                        # Check if index exists
-                        if index_path.exists() and metadata_path.exists():
-                            logger.debug(f"Loading CGRAG index for query {query_id}")
-                            index_load_start = time.time()
-
-                            # Load CGRAG indexer
-                            cgrag_indexer = CGRAGIndexer.load_index(
-                                index_path=index_path, metadata_path=metadata_path
-                            )
-
-                            index_load_time_ms = (time.time() - index_load_start) * 1000
-                            logger.info(
-                                f"CGRAG index loaded in {index_load_time_ms:.1f}ms",
-                                extra={
-                                    "query_id": query_id,
-                                    "load_time_ms": round(index_load_time_ms, 2),
-                                },
-                            )
-
-                            # Validate embedding model consistency
-                            settings = settings_service.get_runtime_settings()
-                            is_valid, warning = cgrag_indexer.validate_embedding_model(
-                                settings.embedding_model_name
-                            )
-                            if not is_valid:
-                                logger.warning(warning, extra={"query_id": query_id})
-
-                            # Create retriever
-                            retriever = CGRAGRetriever(
-                                indexer=cgrag_indexer,
-                                min_relevance=config.cgrag.retrieval.min_relevance,
-                            )
+                        # Get retriever over the resident CGRAG index (loaded once at startup)
+                        retriever = get_resident_cgrag_retriever(
+                            min_relevance=config.cgrag.retrieval.min_relevance, query_id=query_id
+                        )
 
+                        if retriever is not None:
                             # Retrieve context
                             retrieval_start = time.time()
-                            cgrag_result = await retriever.retrieve(
-                                query=request.query,
-                                token_budget=config.cgrag.retrieval.token_budget,
-                                max_artifacts=config.cgrag.retrieval.max_artifacts,
+                            cgrag_result = await asyncio.wait_for(
+                                retriever.retrieve(
+                                    query=request.query,
+                                    token_budget=config.cgrag.retrieval.token_budget,
+                                    max_artifacts=config.cgrag.retrieval.max_artifacts,
+                                ),
+                                timeout=cgrag_deadline_s,
                             )
                             retrieval_time_ms = (time.time() - retrieval_start) * 1000
 
@@ -2079,8 +2398,7 @@ Refined Response:"""
                                 f"CGRAG index not found for query {query_id}, continuing without context",
                                 extra={
                                     "query_id": query_id,
-                                    "index_path": str(index_path),
-                                    "metadata_path": str(metadata_path),
+                                    "index_name": _QUERY_CGRAG_INDEX,
                                 },
                             )
 
@@ -2096,6 +2414,8 @@ Refined Response:"""
                         )
                         cgrag_context_text = None
 
+            web_search_results, web_search_time_ms = await _web_search_results(web_search_task)
+
             # Build combined prompt with web search + CGRAG context (simple mode)
             context_parts = []
 
@@ -2189,19 +2509,7 @@ Refined Response:"""
             # STAGE 6: RESPONSE (Package Response)
             async with tracker.stage("response") as resp_metadata:
                 # Build artifact info for metadata
-                artifacts_info = []
-                if cgrag_artifacts:
-                    for chunk in cgrag_artifacts:
-                        # Count tokens for this chunk
-                        token_count = int(len(chunk.content.split()) * 1.3)
-                        artifacts_info.append(
-                            ArtifactInfo(
-                                file_path=chunk.file_path,
-                                relevance_score=chunk.relevance_score,
-                                chunk_index=chunk.chunk_index,
-                                token_count=token_count,
-                            )
-                        )
+                artifacts_info = [_artifact_info(chunk) for chunk in cgrag_artifacts]
 
                 # Build response with metadata
                 metadata = QueryMetadata(
@@ -2341,79 +2649,39 @@ Refined Response:"""
             cgrag_artifacts = []
             web_search_results = []
 
-            # Web search (if enabled)
+            # Web search (if enabled) runs concurrently with CGRAG retrieval
             # Logic: Request overrides instance
             effective_web_search = request.use_web_search or (
                 instance_config is not None and instance_config.web_search_enabled
             )
-            if effective_web_search:
-                try:
-                    logger.info(f" Web search enabled for benchmark query {query_id}")
-                    time.time()
-
-                    # Get SearXNG client
-                    import os
-
-                    searxng_url = os.getenv("SEARXNG_URL", "http://searxng:8080")
-                    max_results = int(os.getenv("WEBSEARCH_MAX_RESULTS", "5"))
-                    timeout = int(os.getenv("WEBSEARCH_TIMEOUT", "10"))
-
-                    searxng_client = get_searxng_client(
-                        base_url=searxng_url, timeout=timeout, max_results=max_results
-                    )
-
-                    # Execute search
-                    search_response = await searxng_client.search(request.query)
-                    web_search_results = search_response.results
-
-                    logger.info(
-                        f"✓ Web search completed: {len(web_search_results)} results",
-                        extra={
-                            "query_id": query_id,
-                            "results_count": len(web_search_results),
-                        },
-                    )
-
-                except Exception as e:
-                    logger.warning(f" Web search failed for benchmark query {query_id}: {e}")
+            websearch_deadline_s, cgrag_deadline_s = _context_deadlines()
+            web_search_task = _start_web_search(
+                effective_web_search,
+                request.query,
+                query_id,
+                "benchmark",
+                websearch_deadline_s,
+                logger,
+            )
 
             # CGRAG retrieval (if enabled)
             cgrag_context_text = None
             if request.use_context:
                 try:
-                    # Determine path to FAISS index
-                    project_root = Path(__file__).parent.parent.parent.parent
-                    index_path = project_root / "data" / "faiss_indexes" / "docs.index"
-                    metadata_path = project_root / "data" / "faiss_indexes" / "docs.metadata"
-
-                    # Check if index exists
-                    if index_path.exists() and metadata_path.exists():
-                        logger.debug(f"Loading CGRAG index for benchmark query {query_id}")
-
-                        # Load CGRAG indexer
-                        cgrag_indexer = CGRAGIndexer.load_index(
-                            index_path=index_path, metadata_path=metadata_path
-                        )
-
-                        # Validate embedding model consistency
-                        settings = settings_service.get_runtime_settings()
-                        is_valid, warning = cgrag_indexer.validate_embedding_model(
-                            settings.embedding_model_name
-                        )
-                        if not is_valid:
-                            logger.warning(warning, extra={"query_id": query_id})
-
-                        # Create retriever
-                        retriever = CGRAGRetriever(
-                            indexer=cgrag_indexer,
-                            min_relevance=config.cgrag.retrieval.min_relevance,
-                        )
+                    # Get retriever over the resident CGRAG index (loaded once at startup)
+                    retriever = get_resident_cgrag_retriever(
+                        min_relevance=config.cgrag.retrieval.min_relevance, query_id=query_id
+                    )
 
+                    if retriever is not None:
                         # Retrieve context
-                        cgrag_result = await retriever.retrieve(
-                            query=request.query,
-                            token_budget=config.cgrag.retrieval.token_budget,
-                            max_artifacts=config.cgrag.retrieval.max_artifacts,
+                        cgrag_result = await asyncio.wait_for(
+                            retriever.retrieve(
+                                query=request.query,
+                                token_budget=config.cgrag.retrieval.token_budget,
+                                max_artifacts=config.cgrag.retrieval.max_artifacts,
+                            ),
+                            timeout=cgrag_deadline_s,
                         )
 
                         cgrag_artifacts = cgrag_result.artifacts
@@ -2436,11 +2704,13 @@ Refined Response:"""
                             cgrag_context_text = "\n\n---\n\n".join(context_sections)
 
                     else:
-                        logger.warning(f"CGRAG index not found at {index_path}")
+                        logger.warning("CGRAG index 'docs' not loaded, continuing without context")
 
                 except Exception as e:
                     logger.warning(f" CGRAG retrieval failed for benchmark query {query_id}: {e}")
 
+            web_search_results, _ = await _web_search_results(web_search_task)
+
             # Build final prompt with web search and CGRAG context
             # Build final prompt with context (include system prompt at beginning)
             system_prompt_section = ""
@@ -2751,15 +3021,7 @@ DETAILED COMPARISON:
             # Phase E: Return QueryResponse
             # =================================================================
             # Convert CGRAG artifacts to ArtifactInfo
-            cgrag_artifacts_info = [
-                ArtifactInfo(
-                    file_path=chunk.file_path,
-                    chunk_index=chunk.chunk_index,
-                    relevance_score=chunk.relevance_score,
-                    token_count=chunk.token_count,
-                )
-                for chunk in cgrag_artifacts
-            ]
+            cgrag_artifacts_info = [_artifact_info(chunk) for chunk in cgrag_artifacts]
 
             # Build metadata
             metadata = QueryMetadata(
@@ -2902,3 +3164,75 @@ DETAILED COMPARISON:
                 "query_id": query_id,
             },
         )
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/api/query/stream")
+async def process_query_stream(
+    request: QueryRequest,
+    model_manager: ModelManagerDependency,
+    config: ConfigDependency,
+    logger: LoggerDependency,
+) -> StreamingResponse:
+    """Process a query like /api/query, streaming model tokens as they are generated.
+
+    Runs the same pipeline as process_query (simple, two-stage, council and
+    the other modes) and relays every model call's tokens to the client as
+    server-sent events, so the first words arrive after the first model's
+    time to first token instead of after the whole pipeline.
+
+    Events:
+        - start: {call_id, model_id} - a model call started
+        - token: {call_id, model_id, content} - generated text fragment
+        - end: {call_id, model_id, tokens_predicted, time_to_first_token_ms, error}
+        - result: the final QueryResponse (same body as /api/query)
+        - error: {status_code, detail} - the query failed
+
+    Calls are identified by ``call_id`` because council modes run several
+    calls (possibly of the same model) concurrently; in two-stage mode the
+    stage 1 call is followed by the stage 2 call.
+
+    Args:
+        request: Query request with text and parameters
+        model_manager: ModelManager instance (injected)
+        config: Application configuration (injected)
+        logger: Logger instance (injected)
+
+    Returns:
+        StreamingResponse of server-sent events
+    """
+    queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=_STREAM_QUEUE_SIZE)
+
+    async def run_query() -> QueryResponse:
+        _token_stream.set(queue)
+        try:
+            return await process_query(request, model_manager, config, logger)
+        finally:
+            await queue.put(None)
+
+    async def events() -> AsyncIterator[str]:
+        query_task = asyncio.create_task(run_query())
+        try:
+            while (event := await queue.get()) is not None:
+                yield _sse_event(event.pop("event"), event)
+
+            try:
+                response = await query_task
+            except HTTPException as e:
+                yield _sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+                return
+            yield _sse_event("result", response.model_dump(mode="json", by_alias=True))
+        finally:
+            # Client disconnected (or the stream failed) - stop generating
+            if not query_task.done():
+                query_task.cancel()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -38,6 +38,7 @@ router = APIRouter(prefix="/api/timeseries")
     - `complexity_score` - Query complexity score
     - `cgrag_retrieval_time` - CGRAG retrieval time in ms
     - `model_load` - Model CPU/GPU load percentage
+    - `time_to_first_token` - Time until a model's first streamed token in ms
 
     **Time Ranges:**
     - `1h` - Last 1 hour (1-minute intervals)
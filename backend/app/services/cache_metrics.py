@@ -226,6 +226,18 @@ def get_cache_metrics() -> CacheMetrics:
     return _cache_metrics
 
 
+def find_cache_metrics() -> Optional[CacheMetrics]:
+    """Get the global cache metrics instance, or None if not initialized.
+
+    For caches that report to the tracker when it is available (the CGRAG
+    and response caches also run in scripts and tests without it).
+
+    Returns:
+        Global CacheMetrics instance, or None
+    """
+    return _cache_metrics
+
+
 def init_cache_metrics() -> CacheMetrics:
     """Initialize the global cache metrics instance.
 
@@ -8,10 +8,12 @@ generation, and token budget management for context retrieval.
 import asyncio
 import json
 import logging
+import os
+import shutil
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
 import faiss
@@ -19,6 +21,31 @@ import numpy as np
 from pydantic import BaseModel, Field
 from sentence_transformers import SentenceTransformer
 
+from app.models.runtime_settings import CGRAGIndexProfile
+from app.services.cgrag_cache import CGRAGCache
+from app.services.cgrag_ingest import (
+    CHANGED,
+    FAILED,
+    FileResult,
+    IngestionPipeline,
+    IngestResult,
+)
+from app.services.chunk_store import (
+    ChunkStore,
+    chunk_file_paths,
+    get_chunk_store_path,
+    open_chunk_store,
+    select_chunks,
+)
+from app.services.chunkers import ChunkSpan, detect_language, get_chunker
+from app.services.faiss_index import (
+    SEARCH_PARAMETERS,
+    apply_search_params,
+    build_faiss_index,
+    is_inner_product,
+)
+from app.services.token_counter import estimate_tokens, find_token_counter
+
 logger = logging.getLogger(__name__)
 
 
@@ -141,6 +168,75 @@ def migrate_pickle_to_json(index_name: str = "docs") -> bool:
         raise
 
 
+def migrate_json_to_chunk_store(index_name: str = "docs") -> bool:
+    """Migrate legacy JSON chunk metadata to the compact chunk store format.
+
+    Legacy metadata files hold every chunk in one JSON document that must be
+    fully parsed on load. The chunks are moved to a memory-mapped chunk store
+    and the metadata file is rewritten as a small manifest.
+
+    Args:
+        index_name: Name of the index to migrate
+
+    Returns:
+        True if migration was performed, False if no migration needed
+
+    Note:
+        The original JSON file is preserved as .json.bak for safety.
+    """
+    _, _, metadata_path = get_cgrag_index_paths(index_name)
+    if not metadata_path.exists():
+        return False
+
+    with open(metadata_path, "r", encoding="utf-8") as f:
+        loaded_data = json.load(f)
+
+    if isinstance(loaded_data, dict) and loaded_data.get("format") == "chunk_store":
+        return False  # Already migrated
+
+    logger.warning(f"Migrating JSON chunk metadata to chunk store format. Source: {metadata_path}")
+
+    try:
+        if isinstance(loaded_data, dict):
+            manifest = {key: value for key, value in loaded_data.items() if key != "chunks"}
+            chunk_data = loaded_data.get("chunks", [])
+        else:
+            manifest = {"embedding_model_name": "all-MiniLM-L6-v2", "embedding_dim": 384}
+            chunk_data = loaded_data
+
+        chunks = [DocumentChunk(**data) for data in chunk_data]
+        chunk_store_path = get_chunk_store_path(metadata_path)
+        chunk_store_tmp_path = chunk_store_path.with_name(chunk_store_path.name + ".tmp")
+        ChunkStore.write(chunk_store_tmp_path, chunks)
+
+        manifest.update(
+            {
+                "format": "chunk_store",
+                "chunk_count": len(chunks),
+                "chunk_store": chunk_store_path.name,
+            }
+        )
+        metadata_tmp_path = metadata_path.with_name(metadata_path.name + ".tmp")
+        with open(metadata_tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+
+        # Backup the original JSON file, then swap in the manifest
+        backup_path = metadata_path.with_suffix(".json.bak")
+        shutil.copy2(metadata_path, backup_path)
+        os.replace(chunk_store_tmp_path, chunk_store_path)
+        os.replace(metadata_tmp_path, metadata_path)
+
+        logger.info(
+            f"Migration complete. {len(chunks)} chunks saved to {chunk_store_path}, "
+            f"original backed up to {backup_path}"
+        )
+        return True
+
+    except Exception as e:
+        logger.error(f"Migration failed: {e}", exc_info=True)
+        raise
+
+
 class DocumentChunk(BaseModel):
     """Represents a document chunk with metadata.
 
@@ -149,10 +245,12 @@ class DocumentChunk(BaseModel):
         file_path: Path to source document
         content: Chunk text content
         chunk_index: Index of chunk within document
-        start_pos: Starting character position in document
-        end_pos: Ending character position in document
+        start_pos: Starting character offset in the decoded document
+        end_pos: Ending character offset (content == document[start_pos:end_pos])
         language: Detected language (optional)
         modified_time: Source file modification time
+        token_count: Exact token count of content, computed at index time with
+            the index tokenizer (None for chunks indexed without one)
         relevance_score: Similarity score from retrieval (0.0-1.0)
     """
 
@@ -164,6 +262,7 @@ class DocumentChunk(BaseModel):
     end_pos: int
     language: Optional[str] = None
     modified_time: Optional[datetime] = None
+    token_count: Optional[int] = None
     relevance_score: float = 0.0
 
     class Config:
@@ -201,23 +300,50 @@ class CGRAGIndexer:
         chunks: List of indexed document chunks
         index: FAISS index for similarity search
         embedding_dim: Dimension of embedding vectors (384 for all-MiniLM-L6-v2)
+        index_profile: FAISS index family and search parameters
     """
 
     # Supported file extensions
     SUPPORTED_EXTENSIONS = {".md", ".py", ".txt", ".yaml", ".yml", ".json", ".rst"}
 
-    def __init__(self, embedding_model: str = "all-MiniLM-L6-v2"):
+    def __init__(
+        self,
+        embedding_model: str = "all-MiniLM-L6-v2",
+        encoder: Optional[SentenceTransformer] = None,
+        index_profile: Optional[CGRAGIndexProfile] = None,
+    ):
         """Initialize indexer with sentence-transformers model.
 
         Args:
             embedding_model: Name of sentence-transformers model to use
+            encoder: Optional pre-loaded encoder to share across indexers.
+                When omitted, a new SentenceTransformer is created.
+            index_profile: FAISS index family and search parameters
+                (defaults to exact search below 100k chunks, IVF above)
         """
         logger.info(f"Initializing CGRAGIndexer with model: {embedding_model}")
         self.embedding_model_name = embedding_model
-        self.encoder = SentenceTransformer(embedding_model)
-        self.chunks: List[DocumentChunk] = []
+        self.encoder = encoder if encoder is not None else SentenceTransformer(embedding_model)
+        # List while indexing; a lazily materialized ChunkStore after load_index()
+        # (a ChunkSelection over it after incremental updates)
+        self.chunks: Sequence[DocumentChunk] = []
         self.index: Optional[faiss.Index] = None
         self.embedding_dim = self.encoder.get_sentence_embedding_dimension()
+        # Per-file records (mtime_ns, size, sha256, chunk count) keyed by file path,
+        # used by incremental indexing to skip unchanged files
+        self.file_records: Dict[str, Dict[str, Any]] = {}
+        self.chunk_size: Optional[int] = None
+        self.chunk_overlap: Optional[int] = None
+        # Token counter encoding used for chunk token counts (None if not counted)
+        self.tokenizer: Optional[str] = None
+        self.last_update_stats: Dict[str, int] = {}
+        # Throughput of the last indexing run (files/s, chunks/s, embeddings/s)
+        self.last_ingest_stats: Dict[str, float] = {}
+        self.index_profile = index_profile or CGRAGIndexProfile()
+        # Profile the current FAISS index was built with (None if unknown)
+        self.built_profile: Optional[CGRAGIndexProfile] = None
+        # Changes whenever the index contents change (keys retrieval cache entries)
+        self.index_version = uuid4().hex
 
     async def index_directory(
         self,
@@ -225,20 +351,40 @@ class CGRAGIndexer:
         chunk_size: int = 512,
         chunk_overlap: int = 50,
         batch_size: int = 32,
+        incremental: bool = False,
+        workers: Optional[int] = None,
+        tokenizer: str = "cl100k_base",
     ) -> int:
         """Recursively index all documents in directory.
 
         Scans directory for supported file types, chunks documents with overlap,
-        generates embeddings in batches, and builds FAISS index.
+        generates embeddings in batches, and builds FAISS index. Files are read
+        and chunked in worker processes while earlier batches are being embedded
+        (see IngestionPipeline); throughput is kept in ``last_ingest_stats``.
+
+        In incremental mode (requires a loaded index built with per-file records
+        and the same chunking parameters), only added or modified files are
+        re-chunked and re-embedded, and chunks of deleted files are removed.
+        Files are considered unchanged when their mtime and size match the
+        recorded values, or when their content hash is unchanged.
+
+        Each chunk's exact token count is computed once here with ``tokenizer``
+        and stored with the chunk, so retrieval packs against real counts.
 
         Args:
             directory: Root directory to index
             chunk_size: Target chunk size in words
             chunk_overlap: Overlap between chunks in words
             batch_size: Batch size for embedding generation
+            incremental: Only re-embed files that changed since the last index
+            workers: Chunking worker processes (defaults to CPU count - 1, max 8;
+                small directories are chunked in threads)
+            tokenizer: Token counter encoding for chunk token counts (a tiktoken
+                encoding or ``hf:<name>`` for the target model's tokenizer);
+                chunks are indexed without counts if it cannot be loaded
 
         Returns:
-            Number of chunks indexed
+            Number of chunks in the index
 
         Raises:
             ValueError: If directory does not exist
@@ -253,23 +399,54 @@ class CGRAGIndexer:
         files = self._collect_files(directory)
         logger.info(f"Found {len(files)} supported files")
 
-        # Process files and create chunks
+        if tokenizer and find_token_counter(tokenizer) is None:
+            # Offline without the encoding data: index without token counts
+            # (retrieval estimates them) rather than failing every file
+            tokenizer = None
+
+        if incremental:
+            if self._can_update_incrementally(chunk_size, chunk_overlap, tokenizer):
+                return await self._index_incremental(
+                    files, chunk_size, chunk_overlap, batch_size, workers, tokenizer, start_time
+                )
+            logger.info(
+                "Incremental indexing unavailable (no compatible existing index), "
+                "falling back to full indexing"
+            )
+
+        # Read, chunk and embed files (pipelined)
+        ingested = await self._ingest(
+            files, chunk_size, chunk_overlap, batch_size, workers, tokenizer
+        )
         all_chunks = []
-        for file_path in files:
-            try:
-                chunks = await self._chunk_file(file_path, chunk_size, chunk_overlap)
-                all_chunks.extend(chunks)
-            except Exception as e:
-                logger.warning(f"Failed to process {file_path}: {e}")
+        file_records = {}
+        for result in ingested.files:
+            if result.status == FAILED:
+                logger.warning(f"Failed to process {result.path}: {result.error}")
+                continue
+            all_chunks.extend(self._build_chunks(result))
+            file_records[result.path] = result.record
 
         logger.info(f"Created {len(all_chunks)} chunks from {len(files)} files")
-
-        # Generate embeddings in batches
-        embeddings = await self._generate_embeddings_batched(all_chunks, batch_size)
+        embeddings = ingested.embeddings
 
         # Build FAISS index
         self.chunks = all_chunks
         self.index = self._build_faiss_index(embeddings)
+        self.file_records = file_records
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.tokenizer = tokenizer
+        self.built_profile = self.index_profile
+        self.index_version = uuid4().hex
+        self.last_update_stats = {
+            "added": len(file_records),
+            "modified": 0,
+            "deleted": 0,
+            "unchanged": 0,
+            "chunks_embedded": len(all_chunks),
+            "chunks_removed": 0,
+        }
 
         elapsed = time.time() - start_time
         logger.info(
@@ -279,6 +456,187 @@ class CGRAGIndexer:
 
         return len(all_chunks)
 
+    def _can_update_incrementally(
+        self, chunk_size: int, chunk_overlap: int, tokenizer: Optional[str]
+    ) -> bool:
+        """Check whether the loaded index can be updated incrementally.
+
+        Requires an existing index with per-file records built with the same
+        chunking parameters (different parameters change every chunk), the
+        same tokenizer (stored token counts must be comparable) and the same
+        index build parameters (a new index family needs a full build).
+        """
+        return (
+            self.index is not None
+            and bool(self.file_records)
+            and self.chunk_size == chunk_size
+            and self.chunk_overlap == chunk_overlap
+            and self.tokenizer == tokenizer
+            and self.built_profile is not None
+            and self.built_profile.model_dump(exclude=SEARCH_PARAMETERS)
+            == self.index_profile.model_dump(exclude=SEARCH_PARAMETERS)
+        )
+
+    async def _index_incremental(
+        self,
+        files: List[Path],
+        chunk_size: int,
+        chunk_overlap: int,
+        batch_size: int,
+        workers: Optional[int],
+        tokenizer: Optional[str],
+        start_time: float,
+    ) -> int:
+        """Update the loaded index with only the files that changed.
+
+        Args:
+            files: All supported files currently in the directory
+            chunk_size: Target chunk size in words
+            chunk_overlap: Overlap between chunks in words
+            batch_size: Batch size for embedding generation
+            workers: Chunking worker processes
+            tokenizer: Token counter encoding for chunk token counts
+            start_time: Indexing start timestamp (for logging)
+
+        Returns:
+            Number of chunks in the updated index
+        """
+        previous = self.file_records
+        file_records: Dict[str, Dict[str, Any]] = {}
+        new_chunks: List[DocumentChunk] = []
+        kept_files = set()
+        added = modified = unchanged = 0
+
+        ingested = await self._ingest(
+            files, chunk_size, chunk_overlap, batch_size, workers, tokenizer, previous
+        )
+        for result in ingested.files:
+            if result.status == FAILED:
+                logger.warning(f"Failed to process {result.path}: {result.error}")
+                continue
+
+            file_records[result.path] = result.record
+            if result.status != CHANGED:
+                kept_files.add(result.path)
+                unchanged += 1
+                continue
+
+            new_chunks.extend(self._build_chunks(result))
+            if result.path in previous:
+                modified += 1
+            else:
+                added += 1
+
+        # Modified, deleted and unreadable files all lose their old chunks
+        stale_files = set(previous) - kept_files
+        deleted = len(set(previous) - set(file_records))
+
+        removed_positions = [
+            i
+            for i, file_path in enumerate(chunk_file_paths(self.chunks))
+            if file_path in stale_files
+        ]
+
+        self._apply_index_update(removed_positions, new_chunks, ingested.embeddings)
+        self.file_records = file_records
+        self.index_version = uuid4().hex
+        self.last_update_stats = {
+            "added": added,
+            "modified": modified,
+            "deleted": deleted,
+            "unchanged": unchanged,
+            "chunks_embedded": len(new_chunks),
+            "chunks_removed": len(removed_positions),
+        }
+
+        elapsed = time.time() - start_time
+        logger.info(
+            f"Incremental indexing complete in {elapsed:.2f}s: "
+            f"{added} added, {modified} modified, {deleted} deleted, {unchanged} unchanged "
+            f"({len(new_chunks)} chunks embedded, {len(removed_positions)} removed, "
+            f"{len(self.chunks)} total)",
+            extra=self.last_update_stats,
+        )
+
+        return len(self.chunks)
+
+    def _apply_index_update(
+        self,
+        removed_positions: List[int],
+        new_chunks: List[DocumentChunk],
+        new_embeddings: np.ndarray,
+    ) -> None:
+        """Remove stale vectors and append new ones, keeping ids positional.
+
+        The retriever maps FAISS result ids to positions in ``self.chunks``, so
+        the index must stay aligned with the chunk list. Stored codes are never
+        decoded and re-added, so PQ/SQ quantization error does not compound
+        across updates:
+
+        - Flat and scalar-quantized flat indexes compact in order on ``remove_ids``
+        - IVF indexes drop the entries from their inverted lists and renumber the
+          surviving ids in place (see ``_remove_ivf_vectors``)
+        - HNSW graphs cannot remove vectors; the graph is rebuilt from the stored
+          vectors with the already trained storage, which encodes them back to
+          the same codes
+
+        New vectors are appended at the end. Chunks loaded from a chunk store
+        stay memory-mapped.
+
+        Args:
+            removed_positions: Sorted positions of chunks (and vectors) to remove
+            new_chunks: Chunks to append
+            new_embeddings: Embeddings for new_chunks (n_new x embedding_dim)
+        """
+        removed_ids = np.array(removed_positions, dtype=np.int64)
+        kept_positions = np.setdiff1d(
+            np.arange(len(self.chunks), dtype=np.int64), removed_ids, assume_unique=True
+        )
+
+        if len(removed_ids):
+            ivf = faiss.try_extract_index_ivf(self.index)
+            if ivf is not None:
+                self._remove_ivf_vectors(ivf, removed_ids)
+            elif isinstance(self.index, faiss.IndexFlatCodes):
+                self.index.remove_ids(removed_ids)
+            else:
+                kept_vectors = self.index.reconstruct_n(0, self.index.ntotal)[kept_positions]
+                self.index.reset()
+                self.index.add(kept_vectors)
+
+        if len(new_chunks):
+            faiss.normalize_L2(new_embeddings)
+            self.index.add(new_embeddings)
+
+        self.chunks = select_chunks(self.chunks, kept_positions, new_chunks)
+
+    def _remove_ivf_vectors(self, ivf: faiss.IndexIVF, removed_ids: np.ndarray) -> None:
+        """Remove vectors from an IVF index and compact the remaining ids.
+
+        ``remove_ids`` leaves the ids of the other entries unchanged, so every
+        surviving id is shifted down by the number of removed ids below it. Only
+        the ids are rewritten; the codes in the inverted lists are kept as is.
+
+        Args:
+            ivf: IVF index extracted from ``self.index``
+            removed_ids: Sorted ids to remove
+        """
+        # remove_ids does not support the array direct map built for reconstruction
+        ivf.set_direct_map_type(faiss.DirectMap.NoMap)
+        self.index.remove_ids(removed_ids)
+
+        invlists = ivf.invlists
+        for list_no in range(ivf.nlist):
+            size = invlists.list_size(list_no)
+            if size == 0:
+                continue
+            ids = faiss.rev_swig_ptr(invlists.get_ids(list_no), size).copy()
+            codes = faiss.rev_swig_ptr(
+                invlists.get_codes(list_no), size * invlists.code_size
+            ).copy()
+            ids -= np.searchsorted(removed_ids, ids)
+            invlists.update_entries(list_no, 0, size, faiss.swig_ptr(ids), faiss.swig_ptr(codes))
+
     def _collect_files(self, directory: Path) -> List[Path]:
         """Recursively collect all supported files in directory.
 
@@ -294,135 +652,127 @@ class CGRAGIndexer:
                 files.append(path)
         return sorted(files)
 
-    async def _chunk_file(
-        self, file_path: Path, chunk_size: int, chunk_overlap: int
-    ) -> List[DocumentChunk]:
-        """Read and chunk a single file.
+    async def _ingest(
+        self,
+        files: List[Path],
+        chunk_size: int,
+        chunk_overlap: int,
+        batch_size: int,
+        workers: Optional[int],
+        tokenizer: Optional[str] = None,
+        previous_records: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> IngestResult:
+        """Read, chunk and embed files through the streaming ingestion pipeline.
 
         Args:
-            file_path: Path to file
+            files: Files to ingest
             chunk_size: Target chunk size in words
             chunk_overlap: Overlap in words
+            batch_size: Batch size for embedding generation
+            workers: Chunking worker processes
+            tokenizer: Token counter encoding for chunk token counts
+            previous_records: Per-file records of the existing index (incremental)
 
         Returns:
-            List of document chunks
+            IngestResult with per-file results and embeddings of changed files
         """
-        # Read file content
-        try:
-            content = file_path.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            # Try latin-1 as fallback
-            content = file_path.read_text(encoding="latin-1")
-
-        # Get file metadata
-        stats = file_path.stat()
-        modified_time = datetime.fromtimestamp(stats.st_mtime)
-
-        # Split into words
-        words = content.split()
-
-        # Create overlapping chunks
-        chunks = []
-        start_word_idx = 0
-        chunk_index = 0
-
-        while start_word_idx < len(words):
-            # Extract chunk words
-            end_word_idx = min(start_word_idx + chunk_size, len(words))
-            chunk_words = words[start_word_idx:end_word_idx]
-            chunk_content = " ".join(chunk_words)
-
-            # Calculate character positions (approximate)
-            start_pos = len(" ".join(words[:start_word_idx]))
-            end_pos = start_pos + len(chunk_content)
-
-            # Create chunk
-            chunk = DocumentChunk(
-                file_path=str(file_path),
-                content=chunk_content,
-                chunk_index=chunk_index,
-                start_pos=start_pos,
-                end_pos=end_pos,
-                language=self._detect_language(file_path.suffix),
-                modified_time=modified_time,
-            )
-            chunks.append(chunk)
+        logger.info(f"Ingesting {len(files)} files (batch_size={batch_size})")
 
-            # Move to next chunk with overlap
-            if end_word_idx >= len(words):
-                break
-            start_word_idx += chunk_size - chunk_overlap
-            chunk_index += 1
+        def encode(texts: List[str]) -> np.ndarray:
+            return self.encoder.encode(texts, show_progress_bar=False, convert_to_numpy=True)
 
-        return chunks
+        pipeline = IngestionPipeline(
+            encode=encode,
+            embedding_dim=self.embedding_dim,
+            batch_size=batch_size,
+            workers=workers,
+        )
+        ingested = await pipeline.run(files, chunk_size, chunk_overlap, previous_records, tokenizer)
+        self.last_ingest_stats = ingested.stats.as_dict()
+        return ingested
 
-    def _detect_language(self, extension: str) -> Optional[str]:
-        """Detect language from file extension.
+    def _build_chunks(self, result: FileResult) -> List[DocumentChunk]:
+        """Create document chunks for a chunked file.
 
         Args:
-            extension: File extension
+            result: Ingestion result of a changed file
 
         Returns:
-            Language identifier or None
+            List of document chunks
         """
-        language_map = {
-            ".py": "python",
-            ".js": "javascript",
-            ".ts": "typescript",
-            ".md": "markdown",
-            ".yaml": "yaml",
-            ".yml": "yaml",
-            ".json": "json",
-            ".rst": "restructuredtext",
-        }
-        return language_map.get(extension)
+        return self._make_chunks(
+            Path(result.path),
+            result.chunks,
+            datetime.fromtimestamp(result.mtime),
+            result.token_counts or None,
+        )
 
-    async def _generate_embeddings_batched(
-        self, chunks: List[DocumentChunk], batch_size: int
-    ) -> np.ndarray:
-        """Generate embeddings for chunks in batches.
+    def _chunk_content(
+        self,
+        file_path: Path,
+        content: str,
+        stats: os.stat_result,
+        chunk_size: int,
+        chunk_overlap: int,
+    ) -> List[DocumentChunk]:
+        """Split file content into chunks with the chunker for its language.
 
         Args:
-            chunks: Document chunks to embed
-            batch_size: Batch size for encoding
+            file_path: Path to source file
+            content: Decoded file content
+            stats: File stat result (for modification time)
+            chunk_size: Target chunk size in words
+            chunk_overlap: Overlap in words
 
         Returns:
-            NumPy array of embeddings (n_chunks x embedding_dim)
+            List of document chunks
         """
-        logger.info(f"Generating embeddings for {len(chunks)} chunks (batch_size={batch_size})")
-
-        # Extract texts
-        texts = [chunk.content for chunk in chunks]
-
-        # Generate embeddings in batches
-        # Note: encode() already batches internally, but we can still batch our inputs
-        all_embeddings = []
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i : i + batch_size]
-            # Run encoding in thread pool to avoid blocking event loop
-            loop = asyncio.get_event_loop()
-
-            # Create a partial function with show_progress_bar parameter
-            def encode_fn():
-                return self.encoder.encode(
-                    batch_texts, show_progress_bar=False, convert_to_numpy=True
-                )
+        chunker = get_chunker(self._detect_language(file_path.suffix), chunk_size, chunk_overlap)
+        return self._make_chunks(
+            file_path, chunker.chunk(content), datetime.fromtimestamp(stats.st_mtime)
+        )
 
-            batch_embeddings = await loop.run_in_executor(None, encode_fn)
-            all_embeddings.append(batch_embeddings)
+    def _make_chunks(
+        self,
+        file_path: Path,
+        spans: List[ChunkSpan],
+        modified_time: datetime,
+        token_counts: Optional[List[int]] = None,
+    ) -> List[DocumentChunk]:
+        """Create document chunks from chunk spans (and token counts) of one file."""
+        language = self._detect_language(file_path.suffix)
+        token_counts = token_counts or [None] * len(spans)
+        return [
+            DocumentChunk(
+                file_path=str(file_path),
+                content=content,
+                chunk_index=chunk_index,
+                start_pos=start_pos,
+                end_pos=end_pos,
+                language=language,
+                modified_time=modified_time,
+                token_count=token_count,
+            )
+            for (content, chunk_index, start_pos, end_pos), token_count in zip(spans, token_counts)
+        ]
 
-        # Concatenate all batches
-        embeddings = np.vstack(all_embeddings)
-        logger.info(f"Generated embeddings with shape: {embeddings.shape}")
+    def _detect_language(self, extension: str) -> Optional[str]:
+        """Detect language from file extension (also selects the chunker).
 
-        return embeddings
+        Args:
+            extension: File extension
+
+        Returns:
+            Language identifier or None
+        """
+        return detect_language(extension)
 
     def _build_faiss_index(self, embeddings: np.ndarray) -> faiss.Index:
         """Build FAISS index from embeddings.
 
-        Uses IndexFlatL2 for exact search (<100k docs) or IndexIVFFlat for
-        approximate search (>100k docs). Normalizes embeddings for better
-        similarity scores.
+        Normalizes embeddings to unit length and builds the index family selected
+        by the index profile (exact Flat search below 100k chunks and IVF above
+        by default).
 
         Args:
             embeddings: NumPy array of embeddings (n_chunks x embedding_dim)
@@ -433,29 +783,25 @@ class CGRAGIndexer:
         n_chunks = embeddings.shape[0]
         logger.info(f"Building FAISS index for {n_chunks} chunks")
 
-        # Normalize embeddings to unit length for better L2 distance -> cosine similarity
-        # After normalization: L2^2 = 2(1 - cosine_sim)
+        # Normalize embeddings to unit length so that inner product == cosine similarity
+        # (and, for L2 indexes, L2^2 = 2(1 - cosine_sim))
         faiss.normalize_L2(embeddings)
         logger.info("Normalized embeddings to unit length")
 
-        if n_chunks < 100000:
-            # Use flat index for exact search
-            index = faiss.IndexFlatL2(self.embedding_dim)
-            index.add(embeddings)
-            logger.info(f"Built IndexFlatL2 with {index.ntotal} vectors")
-        else:
-            # Use IVF index for approximate search
-            nlist = min(100, int(np.sqrt(n_chunks)))  # Number of clusters
-            quantizer = faiss.IndexFlatL2(self.embedding_dim)
-            index = faiss.IndexIVFFlat(quantizer, self.embedding_dim, nlist)
+        return build_faiss_index(embeddings, self.index_profile)
+
+    def apply_index_profile(self, index_profile: CGRAGIndexProfile) -> None:
+        """Switch to a new index profile, applying its search parameters.
 
-            # Train index
-            logger.info(f"Training IVF index with nlist={nlist}")
-            index.train(embeddings)
-            index.add(embeddings)
-            logger.info(f"Built IndexIVFFlat with {index.ntotal} vectors")
+        Build parameters only take effect on the next full re-index; search
+        parameters (nprobe, efSearch) apply to the loaded index immediately.
 
-        return index
+        Args:
+            index_profile: FAISS index family and search parameters
+        """
+        self.index_profile = index_profile
+        if self.index is not None:
+            apply_search_params(self.index, index_profile)
 
     def save_index(self, index_path: Path, metadata_path: Path) -> None:
         """Save FAISS index and chunk metadata to disk.
@@ -470,30 +816,64 @@ class CGRAGIndexer:
         logger.info(f"Saving index to {index_path}")
         logger.info(f"Saving metadata to {metadata_path}")
 
+        # Write to temporary files and rename into place so that readers (e.g. the
+        # index registry watching for changes) never observe a half-written file
+        chunk_store_path = get_chunk_store_path(metadata_path)
+        index_tmp_path = index_path.with_name(index_path.name + ".tmp")
+        metadata_tmp_path = metadata_path.with_name(metadata_path.name + ".tmp")
+        chunk_store_tmp_path = chunk_store_path.with_name(chunk_store_path.name + ".tmp")
+
         # Save FAISS index
-        faiss.write_index(self.index, str(index_path))
+        faiss.write_index(self.index, str(index_tmp_path))
 
-        # Save chunk metadata with embedding model info
-        # Use mode='json' to ensure datetime objects are serialized as ISO strings
+        # Save chunk text and metadata to the compact memory-mapped chunk store
+        ChunkStore.write(chunk_store_tmp_path, self.chunks)
+
+        # Save index manifest with embedding model info and per-file records
         metadata = {
+            "format": "chunk_store",
             "embedding_model_name": self.embedding_model_name,
             "embedding_dim": self.embedding_dim,
-            "chunks": [chunk.model_dump(mode="json") for chunk in self.chunks],
+            "chunk_size": self.chunk_size,
+            "chunk_overlap": self.chunk_overlap,
+            "tokenizer": self.tokenizer,
+            "index_profile": self.index_profile.model_dump(),
+            "index_version": self.index_version,
+            "chunk_count": len(self.chunks),
+            "chunk_store": chunk_store_path.name,
+            "files": self.file_records,
         }
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2)
+        with open(metadata_tmp_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f)
+
+        # Metadata last: it is what the registry and load_index key off
+        os.replace(chunk_store_tmp_path, chunk_store_path)
+        os.replace(index_tmp_path, index_path)
+        os.replace(metadata_tmp_path, metadata_path)
 
         logger.info(
             f"Saved {len(self.chunks)} chunks with embedding model: {self.embedding_model_name}"
         )
 
     @classmethod
-    def load_index(cls, index_path: Path, metadata_path: Path) -> "CGRAGIndexer":
+    def load_index(
+        cls,
+        index_path: Path,
+        metadata_path: Path,
+        encoder_provider: Optional[Callable[[str], SentenceTransformer]] = None,
+        index_profile: Optional[CGRAGIndexProfile] = None,
+    ) -> "CGRAGIndexer":
         """Load FAISS index and metadata from disk.
 
         Args:
             index_path: Path to FAISS index file
             metadata_path: Path to metadata file
+            encoder_provider: Optional callable returning a (shared) encoder for
+                an embedding model name. Used by the index registry so that
+                indexes built with the same model share one encoder.
+            index_profile: Optional index profile whose search parameters are
+                applied to the loaded index (defaults to the profile the index
+                was built with)
 
         Returns:
             CGRAGIndexer instance with loaded index
@@ -522,25 +902,57 @@ class CGRAGIndexer:
         with open(metadata_path, "r", encoding="utf-8") as f:
             loaded_data = json.load(f)
 
-        # Handle both old format (list of chunks) and new format (dict with metadata)
+        # Handle chunk store manifests, legacy JSON chunk documents (dict with
+        # metadata) and the oldest format (list of chunks)
         if isinstance(loaded_data, dict):
             embedding_model_name = loaded_data.get("embedding_model_name", "all-MiniLM-L6-v2")
             chunk_data = loaded_data.get("chunks", [])
+            file_records = loaded_data.get("files", {})
+            chunk_size = loaded_data.get("chunk_size")
+            chunk_overlap = loaded_data.get("chunk_overlap")
+            tokenizer = loaded_data.get("tokenizer")
+            saved_profile = loaded_data.get("index_profile")
+            index_version = loaded_data.get("index_version")
             logger.info(f"Loaded index with embedding model: {embedding_model_name}")
         else:
             # Old format - just a list of chunks
             embedding_model_name = "all-MiniLM-L6-v2"
             chunk_data = loaded_data
+            file_records, chunk_size, chunk_overlap, tokenizer = {}, None, None, None
+            saved_profile = None
+            index_version = None
             logger.warning("Loading old format index without embedding model metadata")
 
         # Create indexer instance with the embedding model from metadata
-        indexer = cls(embedding_model=embedding_model_name)
+        encoder = encoder_provider(embedding_model_name) if encoder_provider else None
+        built_profile = CGRAGIndexProfile(**saved_profile) if saved_profile else None
+        indexer = cls(
+            embedding_model=embedding_model_name,
+            encoder=encoder,
+            index_profile=index_profile or built_profile,
+        )
+        indexer.built_profile = built_profile
+        if index_version:
+            indexer.index_version = index_version
 
-        # Load FAISS index
+        # Load FAISS index and apply query-time parameters (nprobe, efSearch)
         indexer.index = faiss.read_index(str(index_path))
-
-        # Load chunks
-        indexer.chunks = [DocumentChunk(**data) for data in chunk_data]
+        apply_search_params(indexer.index, indexer.index_profile)
+
+        # Load chunks - memory-mapped and materialized lazily for chunk store
+        # manifests, fully parsed for legacy JSON metadata
+        if isinstance(loaded_data, dict) and loaded_data.get("format") == "chunk_store":
+            indexer.chunks = open_chunk_store(
+                metadata_path.with_name(loaded_data["chunk_store"]),
+                DocumentChunk.model_construct,
+                expected_count=loaded_data.get("chunk_count"),
+            )
+        else:
+            indexer.chunks = [DocumentChunk(**data) for data in chunk_data]
+        indexer.file_records = file_records
+        indexer.chunk_size = chunk_size
+        indexer.chunk_overlap = chunk_overlap
+        indexer.tokenizer = tokenizer
 
         logger.info(f"Loaded {len(indexer.chunks)} chunks")
 
@@ -570,46 +982,56 @@ class CGRAGIndexer:
 class CGRAGRetriever:
     """Retrieves relevant context using FAISS similarity search.
 
-    Implements token budget management with greedy packing algorithm.
-    Supports Redis caching for embeddings and retrieval results.
+    Implements token budget management with knapsack packing over exact
+    per-chunk token counts.
+    Supports in-process and Redis caching for embeddings and retrieval results.
 
     Attributes:
         indexer: CGRAGIndexer with loaded index
         min_relevance: Minimum relevance threshold (0.0-1.0)
+        cache: Optional query-embedding and retrieval-result cache
     """
 
-    def __init__(self, indexer: CGRAGIndexer, min_relevance: float = 0.7):
+    # Largest knapsack table width; larger budgets use coarser token units
+    _KNAPSACK_MAX_CAPACITY = 16384
+
+    def __init__(
+        self,
+        indexer: CGRAGIndexer,
+        min_relevance: float = 0.7,
+        cache: Optional[CGRAGCache] = None,
+    ):
         """Initialize retriever with indexer.
 
         Args:
             indexer: CGRAGIndexer instance with loaded index
             min_relevance: Minimum relevance threshold for filtering
+            cache: Optional CGRAGCache; repeated queries then skip the encoder
+                and the FAISS search
         """
         self.indexer = indexer
         self.min_relevance = min_relevance
+        self.cache = cache
 
         if self.indexer.index is None:
             raise ValueError("Indexer has no index. Load or build index first.")
 
-    async def retrieve(
-        self, query: str, token_budget: int = 8000, max_artifacts: int = 20
-    ) -> CGRAGResult:
-        """Retrieve relevant artifacts within token budget.
-
-        Searches FAISS index for similar chunks, filters by relevance,
-        and packs within token budget using greedy algorithm.
+    async def embed_query(self, query: str) -> np.ndarray:
+        """Embed query text with the index's encoder (cached when a cache is set).
 
         Args:
             query: Query text
-            token_budget: Maximum tokens to retrieve
-            max_artifacts: Maximum number of artifacts to consider
 
         Returns:
-            CGRAGResult with artifacts and metadata
+            L2-normalized float32 embedding of shape (1, dimension)
         """
-        start_time = time.time()
+        query_embedding = None
+        if self.cache is not None:
+            embedding_key = self.cache.embedding_key(self.indexer.embedding_model_name, query)
+            query_embedding = await self.cache.get_embedding(embedding_key)
+        if query_embedding is not None:
+            return query_embedding
 
-        # Embed query
         loop = asyncio.get_event_loop()
 
         def encode_fn():
@@ -618,20 +1040,73 @@ class CGRAGRetriever:
             )
 
         query_embedding = await loop.run_in_executor(None, encode_fn)
-        query_embedding = query_embedding[0].reshape(1, -1)
+        query_embedding = np.ascontiguousarray(query_embedding[0].reshape(1, -1), dtype=np.float32)
 
         # Normalize query embedding to match indexed embeddings
         faiss.normalize_L2(query_embedding)
 
-        # Search FAISS index (retrieve more candidates for filtering)
+        if self.cache is not None:
+            await self.cache.set_embedding(embedding_key, query_embedding)
+        return query_embedding
+
+    async def retrieve(
+        self, query: str, token_budget: int = 8000, max_artifacts: int = 20
+    ) -> CGRAGResult:
+        """Retrieve relevant artifacts within token budget.
+
+        Searches FAISS index for similar chunks, filters by relevance,
+        and packs within token budget (see _pack_artifacts). With a cache,
+        query embeddings are reused for identical (normalized) query text and
+        packed results are reused for the same index version and budget.
+
+        Args:
+            query: Query text
+            token_budget: Maximum tokens to retrieve
+            max_artifacts: Maximum number of artifacts to consider
+
+        Returns:
+            CGRAGResult with artifacts and metadata
+        """
+        start_time = time.time()
+
+        query_embedding = await self.embed_query(query)
+
+        result_key = None
+        if self.cache is not None:
+            profile = self.indexer.index_profile
+            result_key = self.cache.result_key(
+                f"{self.indexer.index_version}:{profile.nprobe}:{profile.ef_search}",
+                query_embedding,
+                token_budget,
+                max_artifacts,
+                self.min_relevance,
+            )
+            cached = await self.cache.get_result(result_key)
+            if cached is not None:
+                cached.cache_hit = True
+                cached.retrieval_time_ms = (time.time() - start_time) * 1000
+                logger.info(
+                    f"Retrieved {len(cached.artifacts)} artifacts from cache "
+                    f"in {cached.retrieval_time_ms:.1f}ms"
+                )
+                return cached
+
+        # Search FAISS index (retrieve more candidates for filtering) off the
+        # event loop, so concurrent context sources (web search) keep running
         k = min(max_artifacts * 5, len(self.indexer.chunks))
-        distances, indices = self.indexer.index.search(query_embedding, k)
+        distances, indices = await asyncio.get_running_loop().run_in_executor(
+            None, self.indexer.index.search, query_embedding, k
+        )
 
-        # Convert normalized L2 distances to cosine similarity scores
-        # For normalized vectors: L2^2 = 2(1 - cosine_sim)
-        # Therefore: cosine_sim = 1 - (L2^2 / 2)
-        # Note: IndexFlatL2 returns SQUARED L2 distances, so we use them directly
-        relevance_scores = 1.0 - (distances[0] / 2.0)
+        if is_inner_product(self.indexer.index):
+            # Inner product of normalized vectors is the cosine similarity
+            relevance_scores = distances[0]
+        else:
+            # Convert normalized L2 distances to cosine similarity scores
+            # For normalized vectors: L2^2 = 2(1 - cosine_sim)
+            # Therefore: cosine_sim = 1 - (L2^2 / 2)
+            # Note: L2 indexes return SQUARED L2 distances, so we use them directly
+            relevance_scores = 1.0 - (distances[0] / 2.0)
 
         # Create candidate chunks with relevance scores
         candidates = []
@@ -657,7 +1132,7 @@ class CGRAGRetriever:
             f"({tokens_used}/{token_budget} tokens) in {elapsed_ms:.1f}ms"
         )
 
-        return CGRAGResult(
+        result = CGRAGResult(
             artifacts=selected_chunks,
             tokens_used=tokens_used,
             candidates_considered=len(candidates),
@@ -666,53 +1141,89 @@ class CGRAGRetriever:
             top_scores=top_scores,
         )
 
+        if result_key is not None:
+            await self.cache.set_result(result_key, result)
+
+        return result
+
     def _pack_artifacts(
         self, candidates: List[DocumentChunk], token_budget: int
     ) -> Tuple[List[DocumentChunk], int]:
-        """Pack artifacts within token budget using greedy algorithm.
+        """Pack artifacts within token budget as a 0/1 knapsack.
 
-        Sorts candidates by relevance and adds chunks until budget is exhausted.
+        Selects the subset of candidates with the highest total relevance whose
+        token counts fit the budget, so a large chunk that does not fit no
+        longer stops smaller relevant chunks behind it from being packed.
+        Budgets above _KNAPSACK_MAX_CAPACITY are solved at a coarser token
+        granularity (token counts rounded up, so the budget still holds). If no
+        candidate fits, the most relevant one is returned on its own.
 
         Args:
             candidates: Candidate chunks with relevance scores
             token_budget: Maximum tokens to use
 
         Returns:
-            Tuple of (selected_chunks, total_tokens_used)
+            Tuple of (selected_chunks, total_tokens_used), most relevant first
         """
+        if not candidates:
+            return [], 0
+
         # Sort by relevance score (descending)
         sorted_candidates = sorted(candidates, key=lambda c: c.relevance_score, reverse=True)
-
-        selected = []
-        total_tokens = 0
-
-        for chunk in sorted_candidates:
-            chunk_tokens = self._count_tokens(chunk.content)
-
-            # Check if adding this chunk would exceed budget
-            if total_tokens + chunk_tokens > token_budget:
-                # If we have no chunks yet, add this one anyway (ensure at least 1 chunk)
-                if not selected:
-                    selected.append(chunk)
-                    total_tokens += chunk_tokens
-                break
-
-            selected.append(chunk)
-            total_tokens += chunk_tokens
+        tokens = [self._count_tokens(chunk) for chunk in sorted_candidates]
+
+        scale = max(1, -(-token_budget // self._KNAPSACK_MAX_CAPACITY))
+        capacity = max(0, token_budget) // scale
+        # Tiny bonus per chunk so that zero-relevance chunks still fill spare budget
+        values = np.maximum([c.relevance_score for c in sorted_candidates], 0.0) + 1e-6
+
+        # best[c] = highest total relevance with (scaled) weight <= c
+        best = np.zeros(capacity + 1)
+        take = np.zeros((len(sorted_candidates), capacity + 1), dtype=bool)
+        weights = []
+        for i, (chunk_tokens, value) in enumerate(zip(tokens, values)):
+            weight = -(-chunk_tokens // scale)
+            weights.append(weight)
+            if weight > capacity:
+                continue
+            with_chunk = best[: capacity + 1 - weight] + value
+            improved = with_chunk > best[weight:]
+            take[i, weight:] = improved
+            best[weight:] = np.where(improved, with_chunk, best[weight:])
+
+        selected_positions = []
+        remaining = capacity
+        for i in range(len(sorted_candidates) - 1, -1, -1):
+            if take[i, remaining]:
+                selected_positions.append(i)
+                remaining -= weights[i]
+
+        if not selected_positions:
+            # Ensure at least 1 chunk even if it exceeds the budget
+            selected_positions = [0]
+
+        selected_positions.sort()
+        selected = [sorted_candidates[i] for i in selected_positions]
+        total_tokens = sum(tokens[i] for i in selected_positions)
 
         return selected, total_tokens
 
-    def _count_tokens(self, text: str) -> int:
-        """Count tokens in text using simple word-based approximation.
+    def _count_tokens(self, chunk: DocumentChunk) -> int:
+        """Token count of a chunk.
 
-        Uses the heuristic: tokens ≈ words * 1.3
-        This is a reasonable approximation for English text.
+        Uses the exact count stored at index time, and counts chunks from
+        indexes built without token counts with the default token counter
+        (or the word estimate if its encoding is unavailable).
 
         Args:
-            text: Text to count tokens for
+            chunk: Chunk to count tokens for
 
         Returns:
-            Estimated token count
+            Token count
         """
-        words = len(text.split())
-        return int(words * 1.3)
+        if chunk.token_count is not None:
+            return chunk.token_count
+        counter = find_token_counter()
+        if counter is None:
+            return estimate_tokens(chunk.content)
+        return counter.count_tokens(chunk.content)
@@ -0,0 +1,338 @@
+"""Two-level cache for CGRAG retrieval.
+
+Repeated and near-identical queries make up a large share of CGRAG traffic.
+This module lets CGRAGRetriever.retrieve skip the embedding encoder and the
+FAISS search for them:
+
+- Embedding tier: normalized query text (per embedding model) -> query embedding
+- Result tier: (index version, query embedding, budget, limits) -> packed artifacts
+
+Each tier has an in-process TTL/LRU store and an optional shared Redis tier.
+Index versions change whenever an index is rebuilt, updated or hot-swapped,
+so stale results are never served after re-indexing. Lookups are reported to
+the global CacheMetrics tracker.
+
+Author: Backend Architect
+Feature: CGRAG Retrieval Cache
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.core.logging import get_logger
+from app.services.cache_metrics import find_cache_metrics
+
+logger = get_logger(__name__)
+
+# Redis key prefixes (shared across backend processes)
+_EMBEDDING_PREFIX = "cgrag:emb:"
+_RESULT_PREFIX = "cgrag:res:"
+
+# Decimal places kept when hashing embeddings, so float noise between
+# near-identical queries does not split the result cache
+_EMBEDDING_KEY_DECIMALS = 4
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text for cache lookups (case and whitespace insensitive)."""
+    return " ".join(query.casefold().split())
+
+
+class TTLCache:
+    """In-process LRU cache with per-entry expiry.
+
+    Not thread-safe; used from the event loop only.
+
+    Attributes:
+        max_entries: Maximum number of entries before LRU eviction
+        ttl_seconds: Seconds an entry stays valid
+        evictions: Number of entries evicted (LRU or expired)
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of entries
+            ttl_seconds: Entry time-to-live in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.evictions = 0
+        self._entries: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value, refreshing its LRU position. Returns None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.evictions += 1
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class CGRAGCache:
+    """Query-embedding and retrieval-result cache for CGRAGRetriever.
+
+    Attributes:
+        ttl_seconds: Entry time-to-live for both tiers
+        redis_enabled: Whether the shared Redis tier is used
+        embeddings: In-process embedding tier
+        results: In-process result tier
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: int = 3600,
+        redis_enabled: bool = False,
+        redis_client: Optional[Any] = None,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum entries per in-process tier
+            ttl_seconds: Entry time-to-live in seconds
+            redis_enabled: Also read and write the shared Redis tier
+            redis_client: Optional async Redis client (created from the app
+                Redis configuration on first use when omitted)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.redis_enabled = redis_enabled or redis_client is not None
+        self.embeddings = TTLCache(max_entries, ttl_seconds)
+        self.results = TTLCache(max_entries, ttl_seconds)
+        self._redis = redis_client
+
+        self._stats: Dict[str, int] = {
+            "embedding_hits": 0,
+            "embedding_misses": 0,
+            "result_hits": 0,
+            "result_misses": 0,
+            "redis_hits": 0,
+            "redis_errors": 0,
+        }
+
+        logger.info(
+            f"CGRAGCache initialized (max_entries={max_entries}, ttl={ttl_seconds}s, "
+            f"redis={self.redis_enabled})"
+        )
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def embedding_key(model_name: str, query: str) -> str:
+        """Cache key for a query embedding."""
+        text = f"{model_name}\0{normalize_query(query)}"
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def result_key(
+        index_version: str,
+        embedding: np.ndarray,
+        token_budget: int,
+        max_artifacts: int,
+        min_relevance: float,
+    ) -> str:
+        """Cache key for a retrieval result."""
+        digest = hashlib.sha1(
+            np.round(embedding, _EMBEDDING_KEY_DECIMALS).astype(np.float32).tobytes()
+        )
+        digest.update(f"{index_version}:{token_budget}:{max_artifacts}:{min_relevance}".encode())
+        return digest.hexdigest()
+
+    # ------------------------------------------------------------------
+    # Embedding tier
+    # ------------------------------------------------------------------
+
+    async def get_embedding(self, key: str) -> Optional[np.ndarray]:
+        """Look up a normalized query embedding (1 x dim float32)."""
+        embedding = self.embeddings.get(key)
+        if embedding is None and self.redis_enabled:
+            data = await self._redis_get(_EMBEDDING_PREFIX + key)
+            if data is not None:
+                embedding = np.frombuffer(data, dtype=np.float32).reshape(1, -1)
+                self.embeddings.set(key, embedding)
+
+        await self._record("embedding", embedding is not None)
+        return embedding.copy() if embedding is not None else None
+
+    async def set_embedding(self, key: str, embedding: np.ndarray) -> None:
+        """Store a normalized query embedding."""
+        embedding = np.ascontiguousarray(embedding, dtype=np.float32)
+        self.embeddings.set(key, embedding.copy())
+        if self.redis_enabled:
+            await self._redis_set(_EMBEDDING_PREFIX + key, embedding.tobytes())
+        await self._record_set()
+
+    # ------------------------------------------------------------------
+    # Result tier
+    # ------------------------------------------------------------------
+
+    async def get_result(self, key: str) -> Optional[Any]:
+        """Look up a cached CGRAGResult (returned as an independent copy)."""
+        from app.services.cgrag import CGRAGResult
+
+        result = self.results.get(key)
+        if result is None and self.redis_enabled:
+            data = await self._redis_get(_RESULT_PREFIX + key)
+            if data is not None:
+                result = CGRAGResult.model_validate_json(data)
+                self.results.set(key, result)
+
+        await self._record("result", result is not None)
+        return result.model_copy(deep=True) if result is not None else None
+
+    async def set_result(self, key: str, result: Any) -> None:
+        """Store a CGRAGResult."""
+        result = result.model_copy(deep=True)
+        self.results.set(key, result)
+        if self.redis_enabled:
+            await self._redis_set(_RESULT_PREFIX + key, result.model_dump_json())
+        await self._record_set()
+
+    def clear(self) -> None:
+        """Drop all in-process entries (Redis entries expire by TTL)."""
+        self.embeddings.clear()
+        self.results.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dictionary with per-tier hit/miss counters, sizes and evictions
+        """
+        return {
+            **self._stats,
+            "embedding_entries": len(self.embeddings),
+            "result_entries": len(self.results),
+            "evictions": self.embeddings.evictions + self.results.evictions,
+            "ttl_seconds": self.ttl_seconds,
+            "redis_enabled": self.redis_enabled,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _record(self, tier: str, hit: bool) -> None:
+        """Count a lookup locally and in the global CacheMetrics tracker."""
+        self._stats[f"{tier}_{'hits' if hit else 'misses'}"] += 1
+
+        metrics = find_cache_metrics()
+        if metrics is not None:
+            if hit:
+                await metrics.record_hit()
+            else:
+                await metrics.record_miss()
+
+    async def _record_set(self) -> None:
+        """Count a cache write in the global CacheMetrics tracker."""
+        metrics = find_cache_metrics()
+        if metrics is not None:
+            await metrics.record_set()
+
+    def _get_redis(self) -> Any:
+        """Create the async Redis client from the app configuration on first use."""
+        if self._redis is None:
+            import redis.asyncio as redis_asyncio
+
+            from app.core.config import get_config
+
+            config = get_config()
+            self._redis = redis_asyncio.Redis(
+                host=config.redis.host,
+                port=config.redis.port,
+                db=config.redis.db,
+                password=config.redis.password,
+                socket_connect_timeout=2,
+                socket_timeout=1,
+            )
+        return self._redis
+
+    async def _redis_get(self, key: str) -> Optional[bytes]:
+        """Read from Redis, treating errors as misses."""
+        try:
+            data = await self._get_redis().get(key)
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.debug(f"CGRAG cache Redis read failed: {e}")
+            return None
+
+        if data is not None:
+            self._stats["redis_hits"] += 1
+        return data
+
+    async def _redis_set(self, key: str, value: Any) -> None:
+        """Write to Redis with the cache TTL, ignoring errors."""
+        try:
+            await self._get_redis().set(key, value, ex=self.ttl_seconds)
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.debug(f"CGRAG cache Redis write failed: {e}")
+
+
+# Global instance (initialized in main.py lifespan)
+_cgrag_cache: Optional[CGRAGCache] = None
+
+
+def get_cgrag_cache() -> CGRAGCache:
+    """Get the global CGRAG retrieval cache instance.
+
+    Returns:
+        Global CGRAGCache instance
+
+    Raises:
+        RuntimeError: If cache not initialized
+    """
+    if _cgrag_cache is None:
+        raise RuntimeError("CGRAGCache not initialized - call init_cgrag_cache() first")
+    return _cgrag_cache
+
+
+def init_cgrag_cache(
+    max_entries: int = 2048, ttl_seconds: int = 3600, redis_enabled: bool = False
+) -> CGRAGCache:
+    """Initialize the global CGRAG retrieval cache instance.
+
+    Should be called during application startup (in lifespan context).
+
+    Args:
+        max_entries: Maximum entries per in-process tier
+        ttl_seconds: Entry time-to-live in seconds
+        redis_enabled: Also use the shared Redis tier
+
+    Returns:
+        Initialized CGRAGCache instance
+    """
+    global _cgrag_cache
+    _cgrag_cache = CGRAGCache(
+        max_entries=max_entries, ttl_seconds=ttl_seconds, redis_enabled=redis_enabled
+    )
+    return _cgrag_cache
@@ -0,0 +1,477 @@
+"""Process-wide registry of resident CGRAG indexes.
+
+This module keeps every named CGRAG index (docs, codebase, ...) loaded in memory
+for the lifetime of the process instead of re-reading the FAISS file and chunk
+metadata on every query. It provides:
+
+- One-time loading of all indexes found in the index directory at startup
+- A single shared encoder per embedding model (SentenceTransformer is large)
+- Atomic hot-swap of an index when its files change on disk
+- Per-index search parameters (nprobe, efSearch) from runtime settings
+- Cached retrievers per (index, min_relevance) so query handlers do no setup work,
+  sharing the query-embedding / retrieval-result cache (cgrag_cache)
+
+Readers always get a complete CGRAGIndexer snapshot; reloads build the new
+indexer off the event loop and replace the registry entry in a single
+assignment, so in-flight retrievals keep using the version they started with.
+
+Author: Backend Architect
+Feature: Resident CGRAG Index Registry
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from app.models.runtime_settings import CGRAGIndexProfile
+from app.services.cgrag import CGRAGIndexer, CGRAGRetriever, get_cgrag_index_paths
+from app.services.cgrag_cache import get_cgrag_cache
+from app.services.faiss_index import describe_index
+from app.services.runtime_settings import get_runtime_settings
+
+logger = get_logger(__name__)
+
+# (index mtime_ns, index size, metadata mtime_ns, metadata size)
+IndexSignature = Tuple[int, int, int, int]
+
+
+@dataclass
+class LoadedIndex:
+    """A resident CGRAG index and the file signature it was loaded from.
+
+    Attributes:
+        name: Index name (e.g., "docs", "codebase")
+        indexer: Loaded CGRAGIndexer instance
+        signature: File signature used to detect on-disk changes
+        loaded_at: Unix timestamp of the load
+        load_time_ms: Time spent loading the index
+        retrievers: Cached retrievers keyed by min_relevance
+    """
+
+    name: str
+    indexer: CGRAGIndexer
+    signature: IndexSignature
+    loaded_at: float
+    load_time_ms: float
+    retrievers: Dict[float, CGRAGRetriever] = field(default_factory=dict)
+
+
+def _default_encoder_factory(model_name: str) -> Any:
+    """Create a SentenceTransformer encoder for the given model name."""
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+class CGRAGIndexRegistry:
+    """Long-lived registry of loaded CGRAG indexes.
+
+    Loads each named index once, shares encoders between indexes built with the
+    same embedding model, and polls the index files in the background to
+    hot-swap indexes that were rebuilt on disk.
+
+    Attributes:
+        check_interval: Seconds between on-disk change checks
+        _indexes: Currently loaded indexes keyed by name
+        _encoders: Shared encoders keyed by embedding model name
+        _reload_lock: Serializes (re)loads so an index is never loaded twice
+        _watch_task: Background task polling for on-disk changes
+    """
+
+    def __init__(
+        self,
+        index_directory: Optional[Path] = None,
+        check_interval: float = 10.0,
+        encoder_factory: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            index_directory: Directory containing the indexes. Defaults to the
+                directory configured in runtime settings (resolved on each check
+                so settings changes are picked up).
+            check_interval: Seconds between on-disk change checks
+            encoder_factory: Callable creating an encoder for a model name
+                (defaults to SentenceTransformer)
+        """
+        self._index_directory = index_directory
+        self.check_interval = check_interval
+        self._encoder_factory = encoder_factory or _default_encoder_factory
+
+        self._indexes: Dict[str, LoadedIndex] = {}
+        self._encoders: Dict[str, Any] = {}
+        self._encoder_lock = threading.Lock()
+        self._reload_lock = asyncio.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self._reload_count = 0
+        self._failed_reloads = 0
+        self._reload_listeners: List[Callable[[List[str]], None]] = []
+
+        logger.info(f"CGRAGIndexRegistry initialized (check_interval={check_interval}s)")
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def start(self) -> None:
+        """Load all available indexes and start the change watcher."""
+        if self._running:
+            logger.warning("CGRAGIndexRegistry already running")
+            return
+
+        self._running = True
+        await self.refresh()
+        self._watch_task = asyncio.create_task(self._watch_loop())
+        logger.info(
+            f"CGRAGIndexRegistry started with {len(self._indexes)} indexes: "
+            f"{sorted(self._indexes.keys())}"
+        )
+
+    async def stop(self) -> None:
+        """Stop the change watcher."""
+        if not self._running:
+            return
+
+        self._running = False
+
+        if self._watch_task:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("CGRAGIndexRegistry stopped")
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get_indexer(self, index_name: str = "docs") -> Optional[CGRAGIndexer]:
+        """Get the resident indexer for an index.
+
+        Args:
+            index_name: Name of the index
+
+        Returns:
+            Loaded CGRAGIndexer, or None if the index is not available
+        """
+        loaded = self._indexes.get(index_name)
+        return loaded.indexer if loaded else None
+
+    def get_retriever(
+        self, index_name: str = "docs", min_relevance: float = 0.7
+    ) -> Optional[CGRAGRetriever]:
+        """Get a cached retriever bound to the resident indexer.
+
+        Retrievers are cached per loaded index version, so a hot-swap naturally
+        produces fresh retrievers for the new index. Retrievers share the global
+        CGRAG retrieval cache when it is initialized.
+
+        Args:
+            index_name: Name of the index
+            min_relevance: Minimum relevance threshold for the retriever
+
+        Returns:
+            CGRAGRetriever, or None if the index is not available
+        """
+        loaded = self._indexes.get(index_name)
+        if loaded is None:
+            return None
+
+        retriever = loaded.retrievers.get(min_relevance)
+        if retriever is None:
+            try:
+                cache = get_cgrag_cache()
+            except RuntimeError:
+                cache = None
+            retriever = CGRAGRetriever(
+                indexer=loaded.indexer, min_relevance=min_relevance, cache=cache
+            )
+            loaded.retrievers[min_relevance] = retriever
+        return retriever
+
+    def list_indexes(self) -> List[str]:
+        """Get names of all loaded indexes."""
+        return sorted(self._indexes.keys())
+
+    def get_encoder(self, model_name: str) -> Any:
+        """Get the shared encoder for an embedding model, creating it on first use.
+
+        Safe to call from executor threads.
+
+        Args:
+            model_name: Sentence-transformers model name
+
+        Returns:
+            Shared encoder instance
+        """
+        with self._encoder_lock:
+            encoder = self._encoders.get(model_name)
+            if encoder is None:
+                logger.info(f"Loading shared embedding encoder: {model_name}")
+                encoder = self._encoder_factory(model_name)
+                self._encoders[model_name] = encoder
+            return encoder
+
+    # ------------------------------------------------------------------
+    # Loading and hot-swap
+    # ------------------------------------------------------------------
+
+    async def refresh(self) -> List[str]:
+        """Load new indexes and reload indexes whose files changed on disk.
+
+        Indexes whose files disappeared are dropped from the registry.
+
+        Returns:
+            Names of indexes that were (re)loaded
+        """
+        async with self._reload_lock:
+            loop = asyncio.get_running_loop()
+            on_disk = await loop.run_in_executor(None, self._scan_index_files)
+
+            reloaded = []
+            for name, (index_path, metadata_path, signature) in on_disk.items():
+                current = self._indexes.get(name)
+                if current is not None and current.signature == signature:
+                    self._sync_index_profile(current)
+                    continue
+
+                try:
+                    loaded = await loop.run_in_executor(
+                        None, self._load, name, index_path, metadata_path, signature
+                    )
+                except Exception as e:
+                    # Keep serving the previous version (if any); retry next check
+                    self._failed_reloads += 1
+                    logger.warning(
+                        f"Failed to load CGRAG index '{name}': {e}",
+                        extra={"index_name": name, "error": str(e)},
+                    )
+                    continue
+
+                # Atomic swap - readers holding the old indexer are unaffected
+                self._indexes[name] = loaded
+                self._reload_count += 1
+                reloaded.append(name)
+
+                logger.info(
+                    f"CGRAG index '{name}' {'reloaded' if current else 'loaded'}: "
+                    f"{len(loaded.indexer.chunks)} chunks in {loaded.load_time_ms:.1f}ms",
+                    extra={
+                        "index_name": name,
+                        "chunks": len(loaded.indexer.chunks),
+                        "load_time_ms": round(loaded.load_time_ms, 2),
+                    },
+                )
+
+            changed = list(reloaded)
+            for name in list(self._indexes.keys()):
+                if name not in on_disk:
+                    del self._indexes[name]
+                    changed.append(name)
+                    logger.info(f"CGRAG index '{name}' removed from disk, unloaded")
+
+            if changed:
+                self._notify_reload(changed)
+            return reloaded
+
+    def add_reload_listener(self, listener: Callable[[List[str]], None]) -> None:
+        """Register a callback for indexes being (re)loaded or unloaded.
+
+        Args:
+            listener: Synchronous callback called with the changed index names
+                (must not block)
+        """
+        self._reload_listeners.append(listener)
+
+    def _notify_reload(self, index_names: List[str]) -> None:
+        """Call reload listeners, logging (not raising) listener errors."""
+        for listener in self._reload_listeners:
+            try:
+                listener(index_names)
+            except Exception as e:
+                logger.warning(f"CGRAG reload listener failed for {index_names}: {e}")
+
+    def _get_index_profile(self, index_name: str) -> CGRAGIndexProfile:
+        """Get the configured FAISS index profile for an index."""
+        return get_runtime_settings().get_cgrag_index_profile(index_name)
+
+    def _sync_index_profile(self, loaded: LoadedIndex) -> None:
+        """Apply changed search parameters from runtime settings to a resident index."""
+        profile = self._get_index_profile(loaded.name)
+        if profile != loaded.indexer.index_profile:
+            loaded.indexer.apply_index_profile(profile)
+            logger.info(
+                f"Applied updated index profile to CGRAG index '{loaded.name}'",
+                extra={"index_name": loaded.name, "index_profile": profile.model_dump()},
+            )
+
+    def _resolve_paths(self, index_name: str) -> Tuple[Path, Path]:
+        """Resolve FAISS and metadata paths for an index."""
+        _, index_path, metadata_path = get_cgrag_index_paths(index_name)
+        if self._index_directory is not None:
+            index_path = self._index_directory / index_path.name
+            metadata_path = self._index_directory / metadata_path.name
+        return index_path, metadata_path
+
+    def _get_index_directory(self) -> Path:
+        """Resolve the directory containing the indexes."""
+        if self._index_directory is not None:
+            return self._index_directory
+        index_directory, _, _ = get_cgrag_index_paths()
+        return index_directory
+
+    def _scan_index_files(self) -> Dict[str, Tuple[Path, Path, IndexSignature]]:
+        """Find all complete indexes on disk with their file signatures.
+
+        Runs in an executor thread (filesystem I/O).
+
+        Returns:
+            Dict mapping index name to (index_path, metadata_path, signature)
+        """
+        index_directory = self._get_index_directory()
+        if not index_directory.exists():
+            return {}
+
+        found = {}
+        for index_file in sorted(index_directory.glob("*.index")):
+            name = index_file.stem
+            index_path, metadata_path = self._resolve_paths(name)
+            try:
+                index_stat = index_path.stat()
+                metadata_stat = metadata_path.stat()
+            except FileNotFoundError:
+                continue
+
+            signature = (
+                index_stat.st_mtime_ns,
+                index_stat.st_size,
+                metadata_stat.st_mtime_ns,
+                metadata_stat.st_size,
+            )
+            found[name] = (index_path, metadata_path, signature)
+
+        return found
+
+    def _load(
+        self,
+        name: str,
+        index_path: Path,
+        metadata_path: Path,
+        signature: IndexSignature,
+    ) -> LoadedIndex:
+        """Load an index from disk (runs in an executor thread).
+
+        Raises:
+            ValueError: If the FAISS index and metadata disagree on chunk count
+                (e.g., files captured mid-rebuild)
+        """
+        start = time.time()
+        indexer = CGRAGIndexer.load_index(
+            index_path=index_path,
+            metadata_path=metadata_path,
+            encoder_provider=self.get_encoder,
+            index_profile=self._get_index_profile(name),
+        )
+
+        if indexer.index is not None and indexer.index.ntotal != len(indexer.chunks):
+            raise ValueError(
+                f"Index/metadata mismatch: {indexer.index.ntotal} vectors "
+                f"vs {len(indexer.chunks)} chunks"
+            )
+
+        return LoadedIndex(
+            name=name,
+            indexer=indexer,
+            signature=signature,
+            loaded_at=time.time(),
+            load_time_ms=(time.time() - start) * 1000,
+        )
+
+    async def _watch_loop(self) -> None:
+        """Background task that periodically hot-swaps changed indexes."""
+        logger.info("CGRAG index watcher started")
+
+        while self._running:
+            try:
+                await asyncio.sleep(self.check_interval)
+                await self.refresh()
+
+            except asyncio.CancelledError:
+                logger.info("CGRAG index watcher cancelled")
+                break
+            except Exception as e:
+                logger.error(f"Error in CGRAG index watcher: {e}", exc_info=True)
+                await asyncio.sleep(1)  # Prevent tight error loop
+
+        logger.info("CGRAG index watcher stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics.
+
+        Returns:
+            Dictionary with loaded indexes, shared encoders and reload counters
+        """
+        return {
+            "indexes": {
+                name: {
+                    "chunks": len(loaded.indexer.chunks),
+                    "embedding_model": loaded.indexer.embedding_model_name,
+                    "faiss": describe_index(loaded.indexer.index),
+                    "loaded_at": loaded.loaded_at,
+                    "load_time_ms": round(loaded.load_time_ms, 2),
+                }
+                for name, loaded in self._indexes.items()
+            },
+            "encoders": sorted(self._encoders.keys()),
+            "reload_count": self._reload_count,
+            "failed_reloads": self._failed_reloads,
+        }
+
+
+# Global instance (initialized in main.py lifespan)
+_cgrag_index_registry: Optional[CGRAGIndexRegistry] = None
+
+
+def get_cgrag_index_registry() -> CGRAGIndexRegistry:
+    """Get the global CGRAG index registry instance.
+
+    Returns:
+        Global CGRAGIndexRegistry instance
+
+    Raises:
+        RuntimeError: If registry not initialized
+    """
+    if _cgrag_index_registry is None:
+        raise RuntimeError(
+            "CGRAGIndexRegistry not initialized - call init_cgrag_index_registry() first"
+        )
+    return _cgrag_index_registry
+
+
+def init_cgrag_index_registry(
+    index_directory: Optional[Path] = None, check_interval: float = 10.0
+) -> CGRAGIndexRegistry:
+    """Initialize the global CGRAG index registry instance.
+
+    Should be called during application startup (in lifespan context).
+
+    Args:
+        index_directory: Optional override for the index directory
+        check_interval: Seconds between on-disk change checks
+
+    Returns:
+        Initialized CGRAGIndexRegistry instance
+    """
+    global _cgrag_index_registry
+    _cgrag_index_registry = CGRAGIndexRegistry(
+        index_directory=index_directory, check_interval=check_interval
+    )
+    return _cgrag_index_registry
@@ -0,0 +1,425 @@
+"""Compact, memory-mapped storage for CGRAG chunk metadata.
+
+Chunk text and metadata used to be stored as one indented JSON document that
+was fully parsed and turned into Pydantic objects on every index load. This
+module stores chunks in a single binary file instead:
+
+- Fixed-width numeric columns (positions, chunk index, modification time,
+  token count)
+- Variable-length string columns (content, chunk id) as an offsets array plus
+  a UTF-8 blob
+- Small lookup tables (file paths, languages) in a JSON header
+
+The file is memory-mapped on open, so loading an index touches only the header
+and chunks are materialized lazily - only for the positions actually accessed
+(typically the FAISS ids a search returns).
+
+File layout::
+
+    magic (8 bytes) | header length (uint64) | header JSON | sections...
+
+Every section is 8-byte aligned and described in the header by its offset and
+length, so readers can create zero-copy NumPy views over the mapping.
+
+Author: Backend Architect
+Feature: Compact CGRAG Chunk Store
+"""
+
+import json
+import math
+import mmap
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, TypeVar, Union
+
+import numpy as np
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+CHUNK_STORE_MAGIC = b"SYNCHNK1"
+CHUNK_STORE_VERSION = 1
+
+T = TypeVar("T")
+
+# Numeric columns: name -> dtype
+_NUMERIC_COLUMNS = {
+    "file_id": "<i4",
+    "language_id": "<i2",
+    "chunk_index": "<i8",
+    "start_pos": "<i8",
+    "end_pos": "<i8",
+    "modified_time": "<f8",
+    "token_count": "<i8",
+}
+
+# Numeric columns missing from stores written by older versions
+_OPTIONAL_COLUMNS = {"token_count"}
+
+# Variable-length string columns (offsets + UTF-8 blob)
+_STRING_COLUMNS = ("content", "id")
+
+
+def _align(offset: int) -> int:
+    """Round offset up to the next multiple of 8."""
+    return (offset + 7) & ~7
+
+
+class ChunkStore(Sequence[T]):
+    """Read-only, memory-mapped chunk sequence.
+
+    Supports ``len()``, integer and slice indexing and iteration, so it can be
+    used anywhere a list of chunks was used. Each access builds a fresh chunk
+    object from the mapped columns via ``chunk_factory``.
+
+    Attributes:
+        path: Path of the backing file
+        chunk_factory: Callable building a chunk from its field keyword arguments
+    """
+
+    def __init__(self, path: Path, chunk_factory: Callable[..., T]) -> None:
+        """Open and memory-map a chunk store file.
+
+        Args:
+            path: Path to the chunk store file
+            chunk_factory: Callable building a chunk object from keyword
+                arguments (id, file_path, content, chunk_index, start_pos,
+                end_pos, language, modified_time, token_count)
+
+        Raises:
+            ValueError: If the file is not a valid chunk store
+        """
+        self.path = path
+        self.chunk_factory = chunk_factory
+
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[: len(CHUNK_STORE_MAGIC)] != CHUNK_STORE_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a chunk store file: {path}")
+
+        header_start = len(CHUNK_STORE_MAGIC) + 8
+        header_len = int.from_bytes(self._mmap[len(CHUNK_STORE_MAGIC) : header_start], "little")
+        header = json.loads(self._mmap[header_start : header_start + header_len])
+
+        if header.get("version") != CHUNK_STORE_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Unsupported chunk store version: {header.get('version')}")
+
+        self._count: int = header["count"]
+        self._files: List[str] = header["files"]
+        self._languages: List[str] = header["languages"]
+
+        sections = header["sections"]
+        self._columns: Dict[str, np.ndarray] = {
+            name: self._view(sections[name], dtype)
+            for name, dtype in _NUMERIC_COLUMNS.items()
+            if name in sections or name not in _OPTIONAL_COLUMNS
+        }
+        self._string_offsets: Dict[str, np.ndarray] = {
+            name: self._view(sections[f"{name}_offsets"], "<i8") for name in _STRING_COLUMNS
+        }
+        self._string_base: Dict[str, int] = {
+            name: sections[f"{name}_blob"]["offset"] for name in _STRING_COLUMNS
+        }
+
+    def _view(self, section: Dict[str, int], dtype: str) -> np.ndarray:
+        """Create a zero-copy NumPy view of a section."""
+        return np.frombuffer(
+            self._mmap, dtype=dtype, count=section["length"], offset=section["offset"]
+        )
+
+    def _string(self, column: str, position: int) -> str:
+        """Decode one value of a variable-length string column."""
+        offsets = self._string_offsets[column]
+        base = self._string_base[column]
+        start, end = int(offsets[position]), int(offsets[position + 1])
+        return self._mmap[base + start : base + end].decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: Union[int, slice]) -> Any:
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(self._count))]
+
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError(f"Chunk position out of range: {position}")
+
+        columns = self._columns
+        language_id = int(columns["language_id"][position])
+        modified_time = float(columns["modified_time"][position])
+        token_count = int(columns["token_count"][position]) if "token_count" in columns else -1
+
+        return self.chunk_factory(
+            id=self._string("id", position),
+            file_path=self._files[int(columns["file_id"][position])],
+            content=self._string("content", position),
+            chunk_index=int(columns["chunk_index"][position]),
+            start_pos=int(columns["start_pos"][position]),
+            end_pos=int(columns["end_pos"][position]),
+            language=self._languages[language_id] if language_id >= 0 else None,
+            modified_time=(
+                None if math.isnan(modified_time) else datetime.fromtimestamp(modified_time)
+            ),
+            token_count=token_count if token_count >= 0 else None,
+        )
+
+    def __iter__(self) -> Iterator[T]:
+        for position in range(self._count):
+            yield self[position]
+
+    def file_paths(self) -> List[str]:
+        """Get the source file path of every chunk without materializing chunks.
+
+        Returns:
+            List of file paths in chunk order
+        """
+        return [self._files[file_id] for file_id in self._columns["file_id"].tolist()]
+
+    def close(self) -> None:
+        """Release the memory mapping.
+
+        Only call this when no chunk views are in use; in-flight readers of a
+        hot-swapped index simply drop their reference instead.
+        """
+        self._columns.clear()
+        self._string_offsets.clear()
+        self._mmap.close()
+
+    @staticmethod
+    def write(path: Path, chunks: Sequence[Any]) -> None:
+        """Write chunks to a chunk store file.
+
+        Args:
+            path: Destination path (written directly; callers handle atomic
+                replacement)
+            chunks: Chunk objects exposing id, file_path, content, chunk_index,
+                start_pos, end_pos, language, modified_time and token_count
+                attributes
+        """
+        count = len(chunks)
+        file_ids: Dict[str, int] = {}
+        language_ids: Dict[str, int] = {}
+
+        columns = {name: np.empty(count, dtype=dtype) for name, dtype in _NUMERIC_COLUMNS.items()}
+        encoded: Dict[str, List[bytes]] = {name: [] for name in _STRING_COLUMNS}
+
+        for position, chunk in enumerate(chunks):
+            columns["file_id"][position] = file_ids.setdefault(chunk.file_path, len(file_ids))
+            columns["language_id"][position] = (
+                language_ids.setdefault(chunk.language, len(language_ids))
+                if chunk.language is not None
+                else -1
+            )
+            columns["chunk_index"][position] = chunk.chunk_index
+            columns["start_pos"][position] = chunk.start_pos
+            columns["end_pos"][position] = chunk.end_pos
+            columns["modified_time"][position] = (
+                chunk.modified_time.timestamp() if chunk.modified_time is not None else math.nan
+            )
+            columns["token_count"][position] = (
+                chunk.token_count if chunk.token_count is not None else -1
+            )
+            encoded["content"].append(chunk.content.encode("utf-8"))
+            encoded["id"].append(chunk.id.encode("utf-8"))
+
+        payloads: Dict[str, bytes] = {name: array.tobytes() for name, array in columns.items()}
+        for name in _STRING_COLUMNS:
+            offsets = np.zeros(count + 1, dtype="<i8")
+            np.cumsum([len(value) for value in encoded[name]], out=offsets[1:])
+            payloads[f"{name}_offsets"] = offsets.tobytes()
+            payloads[f"{name}_blob"] = b"".join(encoded[name])
+
+        def build_header(data_start: int) -> bytes:
+            sections = {}
+            offset = data_start
+            for name, payload in payloads.items():
+                offset = _align(offset)
+                if name.endswith("_blob"):
+                    length = len(payload)
+                elif name.endswith("_offsets"):
+                    length = count + 1
+                else:
+                    length = count
+                sections[name] = {"offset": offset, "length": length}
+                offset += len(payload)
+            return json.dumps(
+                {
+                    "version": CHUNK_STORE_VERSION,
+                    "count": count,
+                    "files": list(file_ids),
+                    "languages": list(language_ids),
+                    "sections": sections,
+                }
+            ).encode("utf-8")
+
+        # Section offsets depend on the header length; iterate until stable
+        prefix_len = len(CHUNK_STORE_MAGIC) + 8
+        header = build_header(prefix_len)
+        while True:
+            rebuilt = build_header(_align(prefix_len + len(header)))
+            if len(rebuilt) == len(header):
+                header = rebuilt
+                break
+            header = rebuilt
+
+        with open(path, "wb") as f:
+            f.write(CHUNK_STORE_MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            for payload in payloads.values():
+                f.write(b"\0" * (_align(f.tell()) - f.tell()))
+                f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+
+        logger.debug(f"Wrote {count} chunks to chunk store {path}")
+
+
+class ChunkSelection(Sequence[T]):
+    """Chunks at selected positions of a chunk store, followed by new chunks.
+
+    Result of an incremental update of a loaded index: surviving chunks stay
+    in the memory-mapped store and are still materialized lazily, only the
+    newly indexed chunks are held in memory.
+
+    Attributes:
+        store: Chunk store holding the surviving chunks
+        positions: Store positions of the surviving chunks, in order
+        appended: Chunks added after the store was written
+    """
+
+    def __init__(self, store: ChunkStore[T], positions: np.ndarray, appended: List[T]) -> None:
+        self.store = store
+        self.positions = positions
+        self.appended = appended
+
+    def __len__(self) -> int:
+        return len(self.positions) + len(self.appended)
+
+    def __getitem__(self, position: Union[int, slice]) -> Any:
+        if isinstance(position, slice):
+            return [self[i] for i in range(*position.indices(len(self)))]
+
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError(f"Chunk position out of range: {position}")
+
+        if position < len(self.positions):
+            return self.store[int(self.positions[position])]
+        return self.appended[position - len(self.positions)]
+
+    def __iter__(self) -> Iterator[T]:
+        for position in range(len(self)):
+            yield self[position]
+
+    def file_paths(self) -> List[str]:
+        """Get the source file path of every chunk without materializing chunks.
+
+        Returns:
+            List of file paths in chunk order
+        """
+        store_paths = self.store.file_paths()
+        return [store_paths[position] for position in self.positions.tolist()] + [
+            chunk.file_path for chunk in self.appended
+        ]
+
+
+def select_chunks(
+    chunks: Sequence[T], kept_positions: np.ndarray, appended: List[T]
+) -> Sequence[T]:
+    """Keep the chunks at kept_positions and append new chunks.
+
+    Chunk stores (and selections over them) are not materialized: the result
+    is a ChunkSelection over the same store. Plain lists are filtered directly.
+
+    Args:
+        chunks: Current chunk sequence
+        kept_positions: Sorted positions of the chunks to keep
+        appended: Chunks to append
+
+    Returns:
+        Chunk sequence of the kept chunks followed by the appended ones
+    """
+    if isinstance(chunks, ChunkStore):
+        return ChunkSelection(chunks, kept_positions, appended)
+
+    if isinstance(chunks, ChunkSelection):
+        # Flatten so that repeated updates do not stack selections
+        n_stored = len(chunks.positions)
+        kept_stored = kept_positions[kept_positions < n_stored]
+        kept_appended = kept_positions[kept_positions >= n_stored] - n_stored
+        return ChunkSelection(
+            chunks.store,
+            chunks.positions[kept_stored],
+            [chunks.appended[i] for i in kept_appended.tolist()] + appended,
+        )
+
+    return [chunks[i] for i in kept_positions.tolist()] + appended
+
+
+def chunk_file_paths(chunks: Sequence[Any]) -> List[str]:
+    """Get the source file path of every chunk.
+
+    Chunk stores and selections over them only read their file path column.
+
+    Args:
+        chunks: Chunk sequence
+
+    Returns:
+        List of file paths in chunk order
+    """
+    if isinstance(chunks, (ChunkStore, ChunkSelection)):
+        return chunks.file_paths()
+    return [chunk.file_path for chunk in chunks]
+
+
+def get_chunk_store_path(metadata_path: Path) -> Path:
+    """Get the chunk store path belonging to an index metadata file.
+
+    Args:
+        metadata_path: Path to the index metadata file (e.g., docs_metadata.json)
+
+    Returns:
+        Path of the chunk store (e.g., docs_chunks.bin)
+    """
+    index_name = metadata_path.stem.replace("_metadata", "")
+    return metadata_path.with_name(f"{index_name}_chunks.bin")
+
+
+def open_chunk_store(
+    path: Path, chunk_factory: Callable[..., T], expected_count: Optional[int] = None
+) -> ChunkStore[T]:
+    """Open a chunk store and optionally verify its chunk count.
+
+    Args:
+        path: Path to the chunk store file
+        chunk_factory: Callable building a chunk object from keyword arguments
+        expected_count: Chunk count recorded in the index metadata
+
+    Returns:
+        Opened ChunkStore
+
+    Raises:
+        FileNotFoundError: If the chunk store does not exist
+        ValueError: If the store is invalid or does not match expected_count
+            (e.g., files captured mid-rebuild)
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Chunk store not found: {path}")
+
+    store = ChunkStore(path, chunk_factory)
+    if expected_count is not None and len(store) != expected_count:
+        count = len(store)
+        store.close()
+        raise ValueError(
+            f"Chunk store mismatch: {path} has {count} chunks, metadata expects {expected_count}"
+        )
+    return store
@@ -0,0 +1,247 @@
+"""Structure-aware document chunkers for CGRAG indexing.
+
+Chunkers split decoded file content into overlapping chunks whose text is the
+exact source slice ``content[start_pos:end_pos]``, so retrieved chunks map to
+exact character ranges of the source file. All chunkers run in linear time:
+word offsets are found in a single regex scan and chunk sizes are measured
+with binary search over them.
+
+- WordChunker: fixed-size word windows with overlap (default)
+- MarkdownChunker: sections split at headings (outside fenced code blocks)
+- PythonChunker: top-level functions, classes and statement runs (via ast);
+  oversized classes are split at their methods
+
+Structural units are packed greedily into chunks of up to ``chunk_size``
+words; units larger than that fall back to word windows. Chunkers are selected
+by language (see detect_language) and new ones can be added with
+register_chunker.
+
+This module only depends on the standard library so that ingestion worker
+processes import it quickly.
+
+Author: Backend Architect
+Feature: Structure-Aware Chunking
+"""
+
+import ast
+import bisect
+import re
+from typing import Dict, List, Optional, Tuple, Type
+
+# (content, chunk_index, start_pos, end_pos)
+ChunkSpan = Tuple[str, int, int, int]
+
+# (start_pos, end_pos) character range
+Range = Tuple[int, int]
+
+_WORD_PATTERN = re.compile(r"\S+")
+_HEADING_PATTERN = re.compile(r"^ {0,3}#{1,6}(?:[ \t]|$)", re.MULTILINE)
+_FENCE_PATTERN = re.compile(r"^ {0,3}(```|~~~)", re.MULTILINE)
+
+_LANGUAGE_MAP = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".md": "markdown",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".json": "json",
+    ".rst": "restructuredtext",
+}
+
+
+def detect_language(extension: str) -> Optional[str]:
+    """Detect language from file extension.
+
+    Args:
+        extension: File extension (e.g., ".py")
+
+    Returns:
+        Language identifier or None
+    """
+    return _LANGUAGE_MAP.get(extension)
+
+
+class Chunker:
+    """Base chunker: fixed-size word windows over exact source offsets.
+
+    Subclasses override ``_units`` to provide structural boundaries.
+
+    Attributes:
+        chunk_size: Target chunk size in words
+        chunk_overlap: Overlap between word windows in words
+    """
+
+    def __init__(self, chunk_size: int = 512, chunk_overlap: int = 50) -> None:
+        """Initialize the chunker.
+
+        Args:
+            chunk_size: Target chunk size in words
+            chunk_overlap: Overlap between word windows in words
+        """
+        self.chunk_size = max(1, chunk_size)
+        self.chunk_overlap = max(0, min(chunk_overlap, self.chunk_size - 1))
+
+    def chunk(self, content: str) -> List[ChunkSpan]:
+        """Split content into chunks.
+
+        Args:
+            content: Decoded file content
+
+        Returns:
+            List of (content, chunk_index, start_pos, end_pos) spans, where
+            content == source[start_pos:end_pos]
+        """
+        starts: List[int] = []
+        ends: List[int] = []
+        for match in _WORD_PATTERN.finditer(content):
+            starts.append(match.start())
+            ends.append(match.end())
+        if not starts:
+            return []
+
+        # Pack units (as word index ranges) into chunks of up to chunk_size words
+        ranges: List[Range] = []
+        current: Optional[Tuple[int, int]] = None
+        for unit_start, unit_end in self._units(content):
+            first = bisect.bisect_left(starts, unit_start)
+            last = bisect.bisect_left(starts, unit_end)
+            if first == last:
+                continue  # Whitespace only
+
+            if last - first > self.chunk_size:
+                if current is not None:
+                    ranges.append((starts[current[0]], ends[current[1] - 1]))
+                    current = None
+                ranges.extend(self._windows(starts, ends, first, last))
+            elif current is not None and last - current[0] <= self.chunk_size:
+                current = (current[0], last)
+            else:
+                if current is not None:
+                    ranges.append((starts[current[0]], ends[current[1] - 1]))
+                current = (first, last)
+
+        if current is not None:
+            ranges.append((starts[current[0]], ends[current[1] - 1]))
+
+        return [(content[start:end], i, start, end) for i, (start, end) in enumerate(ranges)]
+
+    def _units(self, content: str) -> List[Range]:
+        """Structural units covering the content (one unit by default)."""
+        return [(0, len(content))]
+
+    def _windows(self, starts: List[int], ends: List[int], first: int, last: int) -> List[Range]:
+        """Overlapping word windows over words [first, last)."""
+        windows = []
+        step = self.chunk_size - self.chunk_overlap
+        position = first
+        while position < last:
+            end = min(position + self.chunk_size, last)
+            windows.append((starts[position], ends[end - 1]))
+            if end >= last:
+                break
+            position += step
+        return windows
+
+
+class WordChunker(Chunker):
+    """Fixed-size word windows with overlap (structure-agnostic)."""
+
+
+class MarkdownChunker(Chunker):
+    """Chunks Markdown at headings, keeping sections together where they fit."""
+
+    def _units(self, content: str) -> List[Range]:
+        """Sections starting at each heading line outside fenced code blocks."""
+        fences = [match.start() for match in _FENCE_PATTERN.finditer(content)]
+        boundaries = [0]
+        for match in _HEADING_PATTERN.finditer(content):
+            # Headings after an odd number of fence lines are inside a code block
+            if bisect.bisect_left(fences, match.start()) % 2 == 0 and match.start() > 0:
+                boundaries.append(match.start())
+        boundaries.append(len(content))
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+
+class PythonChunker(Chunker):
+    """Chunks Python source at function, class and statement-run boundaries.
+
+    Falls back to word windows for source that does not parse.
+    """
+
+    def _units(self, content: str) -> List[Range]:
+        """Top-level definitions and runs of other statements."""
+        try:
+            tree = ast.parse(content)
+        except (SyntaxError, ValueError):
+            return super()._units(content)
+
+        line_offsets = [0]
+        for match in re.finditer("\n", content):
+            line_offsets.append(match.end())
+
+        boundaries = self._boundaries(tree.body, line_offsets, content)
+        boundaries = sorted(set([0] + boundaries + [len(content)]))
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def _boundaries(self, body: List[ast.stmt], line_offsets: List[int], content: str) -> List[int]:
+        """Start offsets of units for a statement list (recursing into large classes)."""
+        boundaries = []
+        previous_is_definition = True
+        for node in body:
+            is_definition = isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+            # Definitions start new units; runs of plain statements stay together
+            if is_definition or previous_is_definition:
+                boundaries.append(self._node_start(node, line_offsets))
+            previous_is_definition = is_definition
+
+            if isinstance(node, ast.ClassDef) and node.body:
+                start = self._node_start(node, line_offsets)
+                end = (
+                    line_offsets[node.end_lineno]
+                    if node.end_lineno < len(line_offsets)
+                    else len(content)
+                )
+                if len(_WORD_PATTERN.findall(content, start, end)) > self.chunk_size:
+                    # Class header stays with the first member
+                    boundaries.extend(self._boundaries(node.body, line_offsets, content)[1:])
+        return boundaries
+
+    @staticmethod
+    def _node_start(node: ast.stmt, line_offsets: List[int]) -> int:
+        """Offset of the first line of a node (including decorators)."""
+        decorators = getattr(node, "decorator_list", None) or []
+        lineno = min([node.lineno] + [decorator.lineno for decorator in decorators])
+        return line_offsets[lineno - 1]
+
+
+# Chunkers by language (see detect_language); others use WordChunker
+_CHUNKERS: Dict[str, Type[Chunker]] = {
+    "markdown": MarkdownChunker,
+    "python": PythonChunker,
+}
+
+
+def register_chunker(language: str, chunker_class: Type[Chunker]) -> None:
+    """Register the chunker used for a language.
+
+    Args:
+        language: Language identifier (as returned by detect_language)
+        chunker_class: Chunker subclass
+    """
+    _CHUNKERS[language] = chunker_class
+
+
+def get_chunker(language: Optional[str], chunk_size: int, chunk_overlap: int) -> Chunker:
+    """Create the chunker for a language.
+
+    Args:
+        language: Language identifier (None for unknown)
+        chunk_size: Target chunk size in words
+        chunk_overlap: Overlap between word windows in words
+
+    Returns:
+        Chunker instance
+    """
+    chunker_class = _CHUNKERS.get(language or "", WordChunker)
+    return chunker_class(chunk_size, chunk_overlap)
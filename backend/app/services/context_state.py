@@ -21,7 +21,7 @@ from app.models.context import (
     ContextAllocationRequest,
     ContextComponent,
 )
-from app.services.token_counter import get_token_counter
+from app.services.token_counter import count_tokens_for_model
 
 logger = get_logger(__name__)
 
@@ -37,7 +37,8 @@ class ContextStateManager:
         - In-memory dict for fast access (sub-millisecond latency)
         - Auto-cleanup of old allocations after 1 hour
         - Thread-safe operations with asyncio.Lock
-        - Token counting with tiktoken for accuracy
+        - Token counting off the event loop, outside the lock (exact counts
+          from the model's llama.cpp server when per-model counters are enabled)
 
     Attributes:
         _allocations: Dict mapping query_id to ContextAllocation
@@ -102,70 +103,70 @@ class ContextStateManager:
         Returns:
             ContextAllocation with calculated token distributions
         """
-        async with self._lock:
-            # Get token counter
-            token_counter = get_token_counter()
-
-            # Count tokens for each component
-            system_prompt_tokens = token_counter.count_tokens(request.system_prompt)
-            cgrag_tokens = token_counter.count_tokens(request.cgrag_context)
-            query_tokens = token_counter.count_tokens(request.user_query)
-
-            # Calculate totals
-            total_tokens_used = system_prompt_tokens + cgrag_tokens + query_tokens
-            tokens_remaining = max(0, request.context_window_size - total_tokens_used)
-            utilization_percentage = (total_tokens_used / request.context_window_size) * 100
-
-            # Generate warning if >80% utilized
-            warning = None
-            if utilization_percentage > 80:
-                warning = f"Context window {utilization_percentage:.1f}% utilized - response may be truncated"
-
-            # Create component objects
-            components = [
-                ContextComponent(
-                    component="system_prompt",
-                    tokens_used=system_prompt_tokens,
-                    tokens_allocated=system_prompt_tokens,
-                    percentage=(system_prompt_tokens / request.context_window_size) * 100,
-                    content_preview=request.system_prompt[:100] if request.system_prompt else None,
-                ),
-                ContextComponent(
-                    component="cgrag_context",
-                    tokens_used=cgrag_tokens,
-                    tokens_allocated=cgrag_tokens,
-                    percentage=(cgrag_tokens / request.context_window_size) * 100,
-                    content_preview=request.cgrag_context[:100] if request.cgrag_context else None,
-                ),
-                ContextComponent(
-                    component="user_query",
-                    tokens_used=query_tokens,
-                    tokens_allocated=query_tokens,
-                    percentage=(query_tokens / request.context_window_size) * 100,
-                    content_preview=request.user_query[:100] if request.user_query else None,
-                ),
-                ContextComponent(
-                    component="response_budget",
-                    tokens_used=0,
-                    tokens_allocated=tokens_remaining,
-                    percentage=(tokens_remaining / request.context_window_size) * 100,
-                    content_preview=None,
-                ),
-            ]
-
-            # Create allocation object
-            allocation = ContextAllocation(
-                query_id=request.query_id,
-                model_id=request.model_id,
-                context_window_size=request.context_window_size,
-                total_tokens_used=total_tokens_used,
-                tokens_remaining=tokens_remaining,
-                utilization_percentage=utilization_percentage,
-                components=components,
-                cgrag_artifacts=request.cgrag_artifacts or [],
-                warning=warning,
+        # Count tokens for each component (cached, large texts in a thread pool)
+        system_prompt_tokens, cgrag_tokens, query_tokens = await count_tokens_for_model(
+            [request.system_prompt, request.cgrag_context, request.user_query],
+            model_id=request.model_id,
+        )
+
+        # Calculate totals
+        total_tokens_used = system_prompt_tokens + cgrag_tokens + query_tokens
+        tokens_remaining = max(0, request.context_window_size - total_tokens_used)
+        utilization_percentage = (total_tokens_used / request.context_window_size) * 100
+
+        # Generate warning if >80% utilized
+        warning = None
+        if utilization_percentage > 80:
+            warning = (
+                f"Context window {utilization_percentage:.1f}% utilized - response may be truncated"
             )
 
+        # Create component objects
+        components = [
+            ContextComponent(
+                component="system_prompt",
+                tokens_used=system_prompt_tokens,
+                tokens_allocated=system_prompt_tokens,
+                percentage=(system_prompt_tokens / request.context_window_size) * 100,
+                content_preview=request.system_prompt[:100] if request.system_prompt else None,
+            ),
+            ContextComponent(
+                component="cgrag_context",
+                tokens_used=cgrag_tokens,
+                tokens_allocated=cgrag_tokens,
+                percentage=(cgrag_tokens / request.context_window_size) * 100,
+                content_preview=request.cgrag_context[:100] if request.cgrag_context else None,
+            ),
+            ContextComponent(
+                component="user_query",
+                tokens_used=query_tokens,
+                tokens_allocated=query_tokens,
+                percentage=(query_tokens / request.context_window_size) * 100,
+                content_preview=request.user_query[:100] if request.user_query else None,
+            ),
+            ContextComponent(
+                component="response_budget",
+                tokens_used=0,
+                tokens_allocated=tokens_remaining,
+                percentage=(tokens_remaining / request.context_window_size) * 100,
+                content_preview=None,
+            ),
+        ]
+
+        # Create allocation object
+        allocation = ContextAllocation(
+            query_id=request.query_id,
+            model_id=request.model_id,
+            context_window_size=request.context_window_size,
+            total_tokens_used=total_tokens_used,
+            tokens_remaining=tokens_remaining,
+            utilization_percentage=utilization_percentage,
+            components=components,
+            cgrag_artifacts=request.cgrag_artifacts or [],
+            warning=warning,
+        )
+
+        async with self._lock:
             # Store with timestamp
             self._allocations[request.query_id] = (allocation, time.time())
 
@@ -8,8 +8,11 @@ The event bus enables:
 - Asynchronous event publishing from any service
 - Multiple concurrent subscribers (WebSocket connections)
 - Event filtering by type and severity
-- Rate limiting to prevent client overwhelm
-- Graceful handling of slow/disconnected clients
+- Filtering at enqueue, so subscribers only buffer events they asked for
+- Non-blocking fan-out: a slow subscriber only loses its own events, per its
+  overflow policy (drop oldest/newest, coalesce, or disconnect)
+- Events serialized once per broadcast and the JSON shared by all subscribers
+- Batched delivery (all pending events in one wakeup / WebSocket frame)
 
 Author: Backend Architect
 Phase: 1 - LiveEventFeed Backend (Task 1.4)
@@ -18,13 +21,136 @@ Phase: 1 - LiveEventFeed Backend (Task 1.4)
 import asyncio
 import time
 from collections import deque
-from typing import AsyncIterator, Deque, Optional, Set
+from enum import Enum
+from typing import Any, AsyncIterator, Deque, List, NamedTuple, Optional, Set
 
 from app.core.logging import get_logger
 from app.models.events import EventSeverity, EventType, SystemEvent
 
 logger = get_logger(__name__)
 
+# Events moved from the main queue to subscribers per broadcast batch
+_BROADCAST_BATCH_SIZE = 256
+
+
+class OverflowPolicy(str, Enum):
+    """What a subscriber's full buffer does with a new event.
+
+    - DROP_OLDEST: Discard the oldest buffered event (default, keeps the feed live)
+    - DROP_NEWEST: Discard the new event
+    - COALESCE: Replace the oldest buffered event of the same type and subject
+      (model_id/query_id metadata); falls back to DROP_OLDEST
+    - DISCONNECT: Close the subscription
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+    COALESCE = "coalesce"
+    DISCONNECT = "disconnect"
+
+
+class EventEnvelope(NamedTuple):
+    """An event and its JSON serialization, shared by all subscribers."""
+
+    event: SystemEvent
+    payload: str
+
+
+def _coalesce_key(event: SystemEvent) -> tuple[Any, Any]:
+    """Events with equal keys describe the same subject; the newer supersedes."""
+    return event.type, event.metadata.get("model_id") or event.metadata.get("query_id")
+
+
+class EventSubscription:
+    """A subscriber's filter and bounded event buffer.
+
+    The broadcast loop offers events without ever waiting; the consumer takes
+    everything buffered at once with next_batch().
+
+    Attributes:
+        event_types: Event types to receive (None = all)
+        min_severity: Minimum severity to receive
+        overflow: Policy applied when the buffer is full
+        max_pending: Buffer capacity
+        dropped: Events dropped or coalesced since the last batch
+        closed: Whether the subscription was closed
+    """
+
+    def __init__(
+        self,
+        event_types: Optional[Set[EventType]] = None,
+        min_severity: EventSeverity = EventSeverity.INFO,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        max_pending: int = 100,
+    ) -> None:
+        self.event_types = event_types
+        self.min_severity = min_severity
+        self.overflow = overflow
+        self.max_pending = max_pending
+        self.dropped = 0
+        self.closed = False
+        self._pending: Deque[EventEnvelope] = deque()
+        self._ready = asyncio.Event()
+
+    def offer(self, envelope: EventEnvelope) -> bool:
+        """Buffer an event without blocking, applying the overflow policy.
+
+        Returns:
+            False if the subscription overflowed under DISCONNECT policy
+        """
+        if len(self._pending) >= self.max_pending:
+            if self.overflow == OverflowPolicy.DISCONNECT:
+                return False
+            self.dropped += 1
+            if self.overflow == OverflowPolicy.DROP_NEWEST:
+                return True
+            if not (self.overflow == OverflowPolicy.COALESCE and self._coalesce(envelope)):
+                self._pending.popleft()
+
+        self._pending.append(envelope)
+        self._ready.set()
+        return True
+
+    def close(self) -> None:
+        """Close the subscription, waking up next_batch()."""
+        self.closed = True
+        self._ready.set()
+
+    async def next_batch(self, max_events: Optional[int] = None) -> List[EventEnvelope]:
+        """Wait for events and take the buffered ones (oldest first).
+
+        Args:
+            max_events: Maximum events to take (None = all buffered)
+
+        Returns:
+            Buffered events, or an empty list once the subscription is closed
+        """
+        while not self._pending and not self.closed:
+            self._ready.clear()
+            await self._ready.wait()
+        if self.closed:
+            return []
+
+        count = len(self._pending) if max_events is None else min(max_events, len(self._pending))
+        batch = [self._pending.popleft() for _ in range(count)]
+        if not self._pending:
+            self._ready.clear()
+        return batch
+
+    def take_dropped(self) -> int:
+        """Get and reset the number of events lost since the last call."""
+        dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    def _coalesce(self, envelope: EventEnvelope) -> bool:
+        """Remove the oldest buffered event the new one supersedes, if any."""
+        key = _coalesce_key(envelope.event)
+        for index, pending in enumerate(self._pending):
+            if _coalesce_key(pending.event) == key:
+                del self._pending[index]
+                return True
+        return False
+
 
 class EventBus:
     """Async event bus for broadcasting system events via pub/sub pattern.
@@ -35,11 +161,12 @@ class EventBus:
     - Thread-safe event publishing from any context
     - Multiple concurrent subscribers without blocking
     - Event buffering for new subscribers (last N events)
-    - Rate limiting per subscriber (max events/second)
+    - Per-subscriber filters applied at enqueue and overflow policies
     - Automatic cleanup of dead subscribers
 
     Architecture:
-        Producer (Service) -> publish() -> Queue -> subscribe() -> Consumer (WebSocket)
+        Producer (Service) -> publish() -> Queue -> broadcast (serialize once)
+            -> EventSubscription buffers -> subscribe() / next_batch() -> Consumer
 
     Example Usage:
         # In a service (producer)
@@ -56,10 +183,9 @@ class EventBus:
 
     Attributes:
         _queue: AsyncIO queue for event distribution
-        _subscribers: Set of active subscriber queues
+        _subscribers: Set of active subscriptions
         _event_history: Circular buffer of recent events
         _history_size: Maximum events to buffer for new subscribers
-        _lock: AsyncIO lock for thread-safe operations
     """
 
     def __init__(self, history_size: int = 100, max_queue_size: int = 1000):
@@ -70,12 +196,17 @@ class EventBus:
             max_queue_size: Maximum events in queue before blocking publishers
         """
         self._queue: asyncio.Queue[SystemEvent] = asyncio.Queue(maxsize=max_queue_size)
-        self._subscribers: Set[asyncio.Queue[SystemEvent]] = set()
+        self._subscribers: Set[EventSubscription] = set()
         self._event_history: Deque[SystemEvent] = deque(maxlen=history_size)
         self._history_size = history_size
-        self._lock = asyncio.Lock()
         self._broadcast_task: Optional[asyncio.Task] = None
         self._running = False
+        self._stats = {
+            "events_broadcast": 0,
+            "events_dropped": 0,
+            "subscribers_dropped": 0,
+            "publish_dropped": 0,
+        }
 
         logger.info(
             f"EventBus initialized (history_size={history_size}, max_queue_size={max_queue_size})"
@@ -99,7 +230,7 @@ class EventBus:
     async def stop(self) -> None:
         """Stop the event bus and clean up resources.
 
-        Cancels the broadcast task and clears all subscriber queues. Should
+        Cancels the broadcast task and closes all subscriptions. Should
         be called during application shutdown.
         """
         if not self._running:
@@ -114,9 +245,10 @@ class EventBus:
             except asyncio.CancelledError:
                 pass
 
-        # Clear all subscriber queues
-        async with self._lock:
-            self._subscribers.clear()
+        # Close all subscriptions (ends their consumers)
+        for subscription in list(self._subscribers):
+            subscription.close()
+        self._subscribers.clear()
 
         logger.info("EventBus stopped")
 
@@ -220,6 +352,29 @@ class EventBus:
                 extra={"event_type": event.type},
             )
 
+    def publish_nowait(self, events: List[SystemEvent]) -> int:
+        """Publish a batch of pre-constructed events without waiting.
+
+        For high-volume producers (e.g. the log aggregator) that must never
+        block: events that don't fit in the main queue are dropped instead of
+        applying backpressure.
+
+        Args:
+            events: Events to publish, in order
+
+        Returns:
+            Number of events dropped because the queue was full
+        """
+        for index, event in enumerate(events):
+            try:
+                self._queue.put_nowait(event)
+            except asyncio.QueueFull:
+                dropped = len(events) - index
+                self._stats["publish_dropped"] += dropped
+                return dropped
+            self._event_history.append(event)
+        return 0
+
     async def emit_pipeline_event(
         self,
         query_id: str,
@@ -275,20 +430,63 @@ class EventBus:
             metadata=event_metadata,
         )
 
+    def open_subscription(
+        self,
+        event_types: Optional[Set[EventType]] = None,
+        min_severity: EventSeverity = EventSeverity.INFO,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        max_pending: int = 100,
+    ) -> EventSubscription:
+        """Register a subscription, pre-filled with matching historical events.
+
+        Callers must close_subscription() when done; subscribe() does this
+        automatically.
+
+        Args:
+            event_types: Optional set of event types to receive (None = all)
+            min_severity: Minimum severity level to receive (filters out lower)
+            overflow: Policy applied when the subscriber falls behind
+            max_pending: Events buffered for the subscriber
+
+        Returns:
+            Registered EventSubscription
+        """
+        subscription = EventSubscription(event_types, min_severity, overflow, max_pending)
+
+        # Send historical events on connection
+        # Copy to prevent "deque mutated during iteration" error
+        for event in list(self._event_history):
+            if self._should_send_event(event, event_types, min_severity):
+                subscription.offer(EventEnvelope(event, event.model_dump_json()))
+        subscription.take_dropped()  # History beyond max_pending is not a loss
+
+        self._subscribers.add(subscription)
+        logger.info(f"New subscriber connected (total: {len(self._subscribers)})")
+        return subscription
+
+    def close_subscription(self, subscription: EventSubscription) -> None:
+        """Close and unregister a subscription."""
+        subscription.close()
+        if subscription in self._subscribers:
+            self._subscribers.discard(subscription)
+            logger.info(f"Subscriber disconnected (remaining: {len(self._subscribers)})")
+
     async def subscribe(
         self,
         event_types: Optional[Set[EventType]] = None,
         min_severity: EventSeverity = EventSeverity.INFO,
+        overflow: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
     ) -> AsyncIterator[SystemEvent]:
         """Subscribe to system events with optional filtering.
 
-        Creates a new subscriber queue and yields events as they arrive.
+        Creates a new subscription and yields events as they arrive.
         Sends historical events immediately upon subscription, then streams
         new events in real-time. Automatically unsubscribes when iteration stops.
 
         Args:
             event_types: Optional set of event types to receive (None = all)
             min_severity: Minimum severity level to receive (filters out lower)
+            overflow: Policy applied when the subscriber falls behind
 
         Yields:
             SystemEvent instances matching filter criteria
@@ -308,97 +506,38 @@ class EventBus:
         Raises:
             asyncio.CancelledError: When subscriber is cancelled/disconnected
         """
-        # Create subscriber queue
-        subscriber_queue: asyncio.Queue[SystemEvent] = asyncio.Queue(maxsize=100)
-
-        async with self._lock:
-            self._subscribers.add(subscriber_queue)
-
-        subscriber_count = len(self._subscribers)
-        logger.info(f"New subscriber connected (total: {subscriber_count})")
+        subscription = self.open_subscription(event_types, min_severity, overflow)
 
         try:
-            # Send historical events on connection
-            # Create a copy to prevent "deque mutated during iteration" error
-            for event in list(self._event_history):
-                if self._should_send_event(event, event_types, min_severity):
-                    try:
-                        await asyncio.wait_for(subscriber_queue.put(event), timeout=1.0)
-                    except asyncio.TimeoutError:
-                        logger.warning("Timeout sending historical event to new subscriber")
-                        break
-
-            # Stream new events
-            while self._running:
-                try:
-                    event = await subscriber_queue.get()
-
-                    if self._should_send_event(event, event_types, min_severity):
-                        yield event
-
-                except asyncio.CancelledError:
-                    logger.info("Subscriber cancelled")
-                    raise  # Re-raise to trigger finally block
-
-                except Exception as e:
-                    logger.error(f"Error in subscriber loop: {e}", exc_info=True)
-                    break
+            while batch := await subscription.next_batch():
+                for envelope in batch:
+                    yield envelope.event
 
         except asyncio.CancelledError:
             logger.info("Subscriber async generator cancelled")
             raise
 
-        except Exception as e:
-            logger.error(f"Subscriber error: {e}", exc_info=True)
-
         finally:
             # Clean up subscriber - ALWAYS execute
-            async with self._lock:
-                if subscriber_queue in self._subscribers:
-                    self._subscribers.discard(subscriber_queue)
-                    logger.info("Subscriber removed from set")
-                else:
-                    logger.warning("Subscriber queue not found in set during cleanup")
-
-            remaining = len(self._subscribers)
-            logger.info(f"Subscriber disconnected (remaining: {remaining})")
+            self.close_subscription(subscription)
 
     async def _broadcast_loop(self) -> None:
         """Background task that broadcasts events to all subscribers.
 
-        Continuously reads events from the main queue and distributes them
-        to all active subscriber queues. Handles slow/dead subscribers by
-        dropping their queues if they can't keep up.
+        Moves every queued event (up to a batch) from the main queue to the
+        matching subscriptions. Each event is serialized once; offers never
+        wait, so a slow subscriber only affects its own buffer.
         """
         logger.info("Event broadcast loop started")
 
         while self._running:
             try:
-                # Get next event from main queue
-                event = await self._queue.get()
-
-                # Broadcast to all subscribers
-                async with self._lock:
-                    dead_subscribers = []
-
-                    for subscriber_queue in self._subscribers:
-                        try:
-                            # Non-blocking put with timeout (drop slow clients)
-                            await asyncio.wait_for(
-                                subscriber_queue.put(event),
-                                timeout=1.0,  # 1 second max per subscriber (increased from 100ms)
-                            )
-                        except asyncio.TimeoutError:
-                            # Subscriber is too slow - mark for removal
-                            logger.warning("Subscriber too slow - dropping")
-                            dead_subscribers.append(subscriber_queue)
-                        except Exception as e:
-                            logger.error(f"Error broadcasting to subscriber: {e}")
-                            dead_subscribers.append(subscriber_queue)
-
-                    # Remove dead subscribers
-                    for dead in dead_subscribers:
-                        self._subscribers.discard(dead)
+                # Get next event from main queue, plus whatever else is queued
+                events = [await self._queue.get()]
+                while len(events) < _BROADCAST_BATCH_SIZE and not self._queue.empty():
+                    events.append(self._queue.get_nowait())
+
+                self._broadcast(events)
 
             except asyncio.CancelledError:
                 logger.info("Broadcast loop cancelled")
@@ -409,6 +548,28 @@ class EventBus:
 
         logger.info("Event broadcast loop stopped")
 
+    def _broadcast(self, events: List[SystemEvent]) -> None:
+        """Offer a batch of events to every subscription they match."""
+        self._stats["events_broadcast"] += len(events)
+        if not self._subscribers:
+            return
+
+        envelopes = [EventEnvelope(event, event.model_dump_json()) for event in events]
+
+        for subscription in list(self._subscribers):
+            dropped_before = subscription.dropped
+            for envelope in envelopes:
+                if not self._should_send_event(
+                    envelope.event, subscription.event_types, subscription.min_severity
+                ):
+                    continue
+                if not subscription.offer(envelope):
+                    logger.warning("Subscriber too slow - disconnecting")
+                    self._stats["subscribers_dropped"] += 1
+                    self.close_subscription(subscription)
+                    break
+            self._stats["events_dropped"] += subscription.dropped - dropped_before
+
     def _should_send_event(
         self,
         event: SystemEvent,
@@ -450,12 +611,17 @@ class EventBus:
                 - queue_size: Current main queue size
                 - history_size: Number of events in history buffer
                 - running: Whether broadcast loop is active
+                - events_broadcast: Events taken from the main queue
+                - events_dropped: Events dropped or coalesced by subscriber overflow
+                - subscribers_dropped: Subscriptions closed by DISCONNECT overflow
+                - publish_dropped: Events rejected by publish_nowait() (queue full)
         """
         return {
             "active_subscribers": len(self._subscribers),
             "queue_size": self._queue.qsize(),
             "history_size": len(self._event_history),
             "running": self._running,
+            **self._stats,
         }
 
 
@@ -0,0 +1,328 @@
+"""Shared HTTP connection pools for llama.cpp servers.
+
+Every LlamaCppClient used to create its own httpx.AsyncClient with default
+pool limits, so health checks, stats polling and completions competed for the
+same connections and short-lived clients kept reconnecting. This module keeps
+one keep-alive client per server URL and plane instead:
+
+- control plane: health and stats probes (small pool, short timeouts), so
+  probes never queue behind long generations
+- data plane: completions (larger pool, long keep-alive)
+
+Pool usage (open, active and idle connections, requests waiting for a
+connection, requests in flight, request counts) is reported by get_stats().
+
+Discarding a server's clients (server stopped, clients evicted) never cuts off
+responses still being read: a client with requests in flight is closed once
+its last response is closed.
+
+Author: Backend Architect
+Feature: Pooled llama.cpp HTTP Transport
+"""
+
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+import httpx
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Planes
+CONTROL_PLANE = "control"  # Health checks, stats
+DATA_PLANE = "data"  # Completions
+
+DEFAULT_LIMITS: Dict[str, httpx.Limits] = {
+    CONTROL_PLANE: httpx.Limits(
+        max_connections=4, max_keepalive_connections=2, keepalive_expiry=30.0
+    ),
+    DATA_PLANE: httpx.Limits(
+        max_connections=32, max_keepalive_connections=16, keepalive_expiry=120.0
+    ),
+}
+
+DEFAULT_TIMEOUTS: Dict[str, httpx.Timeout] = {
+    CONTROL_PLANE: httpx.Timeout(5.0, connect=2.0),
+    DATA_PLANE: httpx.Timeout(120.0, connect=5.0),
+}
+
+
+class _InFlightStream(httpx.AsyncByteStream):
+    """Response body that reports when it is closed."""
+
+    def __init__(
+        self, stream: httpx.AsyncByteStream, release: Callable[[], Awaitable[None]]
+    ) -> None:
+        self._stream = stream
+        self._release = release
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._released:
+                self._released = True
+                await self._release()
+
+
+class _InFlightTransport(httpx.AsyncBaseTransport):
+    """Transport counting requests in flight (until their response is closed).
+
+    Attributes:
+        transport: Wrapped transport (with the connection pool)
+        in_flight: Requests sent whose response has not been closed yet
+        on_idle: Optional callback run when in_flight drops to zero
+    """
+
+    def __init__(self, transport: httpx.AsyncHTTPTransport) -> None:
+        self.transport = transport
+        self.in_flight = 0
+        self.on_idle: Optional[Callable[[], Awaitable[None]]] = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            await self._release()
+            raise
+        response.stream = _InFlightStream(response.stream, self._release)
+        return response
+
+    async def _release(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0 and self.on_idle is not None:
+            on_idle, self.on_idle = self.on_idle, None
+            await on_idle()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class HTTPPoolManager:
+    """Keep-alive httpx clients keyed by server URL and plane.
+
+    Clients are created on first use and shared by all callers talking to the
+    same server. Callers must not close clients obtained from the manager.
+
+    Attributes:
+        limits: Connection limits per plane (applied per server)
+        timeouts: Default timeouts per plane
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, httpx.Limits]] = None,
+        timeouts: Optional[Dict[str, httpx.Timeout]] = None,
+    ) -> None:
+        """Initialize the pool manager.
+
+        Args:
+            limits: Connection limits per plane (defaults to DEFAULT_LIMITS)
+            timeouts: Default timeouts per plane (defaults to DEFAULT_TIMEOUTS)
+        """
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        self._clients: Dict[Tuple[str, str], httpx.AsyncClient] = {}
+        self._transports: Dict[Tuple[str, str], _InFlightTransport] = {}
+        # Discarded clients waiting for their in-flight responses to close
+        self._draining: Set[httpx.AsyncClient] = set()
+        self._request_counts: Dict[Tuple[str, str], int] = {}
+        self._error_counts: Dict[Tuple[str, str], int] = {}
+
+    def get_client(self, base_url: str, plane: str = DATA_PLANE) -> httpx.AsyncClient:
+        """Get the shared client for a server and plane.
+
+        Args:
+            base_url: Server base URL (e.g., http://localhost:8080)
+            plane: CONTROL_PLANE or DATA_PLANE
+
+        Returns:
+            Shared httpx.AsyncClient
+
+        Raises:
+            ValueError: If plane is unknown
+        """
+        if plane not in self.limits:
+            raise ValueError(f"Unknown plane: {plane}")
+
+        key = (base_url.rstrip("/"), plane)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = self._create_client(key)
+            self._clients[key] = client
+        return client
+
+    def _create_client(self, key: Tuple[str, str]) -> httpx.AsyncClient:
+        """Create the client for a (base_url, plane) key with request counting."""
+        _, plane = key
+        self._request_counts.setdefault(key, 0)
+        self._error_counts.setdefault(key, 0)
+
+        async def on_request(request: httpx.Request) -> None:
+            self._request_counts[key] += 1
+
+        async def on_response(response: httpx.Response) -> None:
+            if response.status_code >= 500:
+                self._error_counts[key] += 1
+
+        logger.debug(
+            f"Creating {plane} plane HTTP pool for {key[0]}",
+            extra={"base_url": key[0], "plane": plane},
+        )
+        transport = _InFlightTransport(httpx.AsyncHTTPTransport(limits=self.limits[plane]))
+        self._transports[key] = transport
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=self.timeouts[plane],
+            follow_redirects=True,
+            event_hooks={"request": [on_request], "response": [on_response]},
+        )
+
+    async def discard(self, base_url: str) -> None:
+        """Forget a server's clients and close them (e.g. after the server stopped).
+
+        New requests get fresh clients (LlamaCppClient looks its clients up
+        per request). A client with requests in flight (e.g. a generation
+        being streamed) is closed once its last response is closed, so
+        discarding never cuts off responses that are still being read.
+
+        Args:
+            base_url: Server base URL
+        """
+        base_url = base_url.rstrip("/")
+        for key in [key for key in self._clients if key[0] == base_url]:
+            client = self._clients.pop(key)
+            transport = self._transports.pop(key, None)
+            if transport is None or transport.in_flight == 0:
+                await client.aclose()
+                continue
+
+            logger.debug(
+                f"Closing {key[1]} plane HTTP pool for {base_url} after "
+                f"{transport.in_flight} in-flight requests complete",
+                extra={"base_url": base_url, "plane": key[1], "in_flight": transport.in_flight},
+            )
+            self._draining.add(client)
+
+            async def close_drained(client: httpx.AsyncClient = client) -> None:
+                self._draining.discard(client)
+                await client.aclose()
+
+            transport.on_idle = close_drained
+
+    async def close(self) -> None:
+        """Close all pooled clients (application shutdown)."""
+        clients = [*self._clients.values(), *self._draining]
+        self._clients.clear()
+        self._transports.clear()
+        self._draining.clear()
+        for client in clients:
+            await client.aclose()
+        logger.info(f"Closed {len(clients)} pooled HTTP clients")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool usage per server and plane.
+
+        Returns:
+            Dictionary with a ``pools`` list (base_url, plane, limits,
+            connections, active, idle, waiting, in_flight, requests,
+            server_errors) and totals across pools
+        """
+        pools = []
+        for (base_url, plane), client in self._clients.items():
+            limits = self.limits[plane]
+            usage = _connection_usage(client)
+            pools.append(
+                {
+                    "base_url": base_url,
+                    "plane": plane,
+                    "max_connections": limits.max_connections,
+                    "max_keepalive_connections": limits.max_keepalive_connections,
+                    "keepalive_expiry": limits.keepalive_expiry,
+                    **usage,
+                    "in_flight": self._in_flight(base_url, plane),
+                    "requests": self._request_counts.get((base_url, plane), 0),
+                    "server_errors": self._error_counts.get((base_url, plane), 0),
+                }
+            )
+
+        return {
+            "pools": pools,
+            "total_connections": sum(pool["connections"] for pool in pools),
+            "total_active": sum(pool["active"] for pool in pools),
+            "total_waiting": sum(pool["waiting"] for pool in pools),
+            "total_in_flight": sum(pool["in_flight"] for pool in pools),
+            "draining_clients": len(self._draining),
+            "total_requests": sum(pool["requests"] for pool in pools),
+        }
+
+    def _in_flight(self, base_url: str, plane: str) -> int:
+        """Requests in flight on a pooled client."""
+        transport = self._transports.get((base_url, plane))
+        return transport.in_flight if transport is not None else 0
+
+
+def _connection_usage(client: httpx.AsyncClient) -> Dict[str, int]:
+    """Open, active and idle connections and waiting requests of a client's pool.
+
+    Reads the httpcore connection pool behind httpx's default transport;
+    reports zeros if the transport does not expose one.
+    """
+    transport = getattr(client, "_transport", None)
+    transport = getattr(transport, "transport", transport)
+    pool = getattr(transport, "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    waiting = sum(
+        1 for request in getattr(pool, "_requests", []) if getattr(request, "connection", 1) is None
+    )
+    return {
+        "connections": len(connections),
+        "active": len(connections) - idle,
+        "idle": idle,
+        "waiting": waiting,
+    }
+
+
+# Global pool manager (initialized in main.py lifespan)
+_http_pool: Optional[HTTPPoolManager] = None
+
+
+def get_http_pool() -> HTTPPoolManager:
+    """Get the global HTTP pool manager.
+
+    Returns:
+        Global HTTPPoolManager instance
+
+    Raises:
+        RuntimeError: If the pool manager is not initialized
+    """
+    if _http_pool is None:
+        raise RuntimeError("HTTPPoolManager not initialized - call init_http_pool() first")
+    return _http_pool
+
+
+def init_http_pool(
+    limits: Optional[Dict[str, httpx.Limits]] = None,
+    timeouts: Optional[Dict[str, httpx.Timeout]] = None,
+) -> HTTPPoolManager:
+    """Initialize the global HTTP pool manager.
+
+    Should be called during application startup (in lifespan context).
+
+    Args:
+        limits: Connection limits per plane
+        timeouts: Default timeouts per plane
+
+    Returns:
+        Initialized HTTPPoolManager instance
+    """
+    global _http_pool
+    _http_pool = HTTPPoolManager(limits=limits, timeouts=timeouts)
+    return _http_pool
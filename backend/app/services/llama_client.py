@@ -2,14 +2,40 @@
 
 This module provides an async HTTP client for communicating with llama.cpp
 model servers, including health checks and completion generation with retry logic.
+Completions can also be streamed token by token from llama.cpp's server-sent
+events (SSE) stream.
 """
 
 import asyncio
-from typing import Any, Dict, Optional
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import httpx
 
 from app.core.logging import get_logger
+from app.services.http_pool import CONTROL_PLANE, DATA_PLANE, HTTPPoolManager, get_http_pool
+
+# Prefix of data lines in llama.cpp's server-sent events stream
+_SSE_DATA_PREFIX = "data:"
+
+
+def parse_sse_line(line: str) -> Optional[Dict[str, Any]]:
+    """Parse one line of a llama.cpp server-sent events stream.
+
+    Args:
+        line: Raw line from the response body
+
+    Returns:
+        Decoded JSON payload of a data line, or None for blank lines, comments,
+        event names and the OpenAI-style ``[DONE]`` terminator
+    """
+    if not line.startswith(_SSE_DATA_PREFIX):
+        return None
+    data = line[len(_SSE_DATA_PREFIX) :].strip()
+    if not data or data == "[DONE]":
+        return None
+    return json.loads(data)
 
 
 class LlamaCppClient:
@@ -18,12 +44,16 @@ class LlamaCppClient:
     Provides methods for health checking and completion generation with
     automatic retries and linear backoff for transient failures.
 
+    Connections come from the shared HTTPPoolManager: completions use the
+    server's data-plane pool and health/stats probes its control-plane pool,
+    so probes never wait behind long generations. Without an initialized
+    global pool manager (scripts, tests), the client uses a private one.
+
     Attributes:
         base_url: Base URL of the llama.cpp server (e.g., http://localhost:8080)
         timeout: Request timeout in seconds
         max_retries: Maximum retry attempts for failed requests
         retry_delay: Delay in seconds between retry attempts (linear backoff)
-        _client: Underlying httpx.AsyncClient instance
         _logger: Logger instance for structured logging
     """
 
@@ -33,6 +63,7 @@ class LlamaCppClient:
         timeout: int = 10,
         max_retries: int = 3,
         retry_delay: int = 2,
+        pool: Optional[HTTPPoolManager] = None,
     ) -> None:
         """Initialize llama.cpp client.
 
@@ -41,26 +72,46 @@ class LlamaCppClient:
             timeout: Request timeout in seconds (default: 10)
             max_retries: Maximum retry attempts (default: 3)
             retry_delay: Delay in seconds between retries (default: 2)
+            pool: HTTP pool manager (defaults to the global one)
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
 
-        # Create async HTTP client with timeout configuration
-        self._client = httpx.AsyncClient(
-            timeout=httpx.Timeout(timeout, connect=5.0), follow_redirects=True
-        )
+        self._owns_pool = False
+        if pool is None:
+            try:
+                pool = get_http_pool()
+            except RuntimeError:
+                pool = HTTPPoolManager()
+                self._owns_pool = True
+        self._pool = pool
 
         self._logger = get_logger(__name__)
 
+    @property
+    def data_client(self) -> httpx.AsyncClient:
+        """Pooled data-plane HTTP client (completions, proxied raw requests).
+
+        Looked up per request rather than cached: the pool manager replaces a
+        server's clients after they are discarded (e.g. on server restart).
+        """
+        return self._pool.get_client(self.base_url, DATA_PLANE)
+
+    @property
+    def control_client(self) -> httpx.AsyncClient:
+        """Pooled control-plane HTTP client (health, stats and tokenize calls)."""
+        return self._pool.get_client(self.base_url, CONTROL_PLANE)
+
     async def close(self) -> None:
-        """Close the HTTP client and cleanup resources.
+        """Release the client's HTTP resources.
 
-        Should be called during application shutdown to properly
-        close all connections.
+        Connections of the shared pool manager stay open for other clients
+        of the same server; a private pool manager is closed.
         """
-        await self._client.aclose()
+        if self._owns_pool:
+            await self._pool.close()
 
     async def health_check(self) -> Dict[str, Any]:
         """Check health status of the llama.cpp server.
@@ -82,7 +133,7 @@ class LlamaCppClient:
         start_time = asyncio.get_event_loop().time()
 
         try:
-            response = await self._client.get(
+            response = await self.control_client.get(
                 f"{self.base_url}/health",
                 timeout=5.0,  # Shorter timeout for health checks
             )
@@ -162,7 +213,7 @@ class LlamaCppClient:
             'Tokens/sec: 12.5'
         """
         try:
-            response = await self._client.get(
+            response = await self.control_client.get(
                 f"{self.base_url}/stats",
                 timeout=3.0,  # Short timeout for stats
             )
@@ -224,6 +275,36 @@ class LlamaCppClient:
             )
             return {"tokens_per_second": 0.0, "memory_used_gb": 0.0, "error": str(e)}
 
+    async def tokenize(self, text: str) -> List[int]:
+        """Tokenize text with the server's own model tokenizer.
+
+        Calls the /tokenize endpoint, giving exact token counts for the
+        loaded GGUF model (no special tokens are added).
+
+        Args:
+            text: Text to tokenize
+
+        Returns:
+            Token IDs
+
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+            ValueError: If the response has no token list
+
+        Example:
+            >>> client = LlamaCppClient("http://localhost:8080")
+            >>> len(await client.tokenize("Hello world"))
+            2
+        """
+        response = await self.control_client.post(
+            f"{self.base_url}/tokenize", json={"content": text}
+        )
+        response.raise_for_status()
+        tokens = response.json().get("tokens")
+        if not isinstance(tokens, list):
+            raise ValueError("Tokenize response has no token list")
+        return tokens
+
     async def generate_completion(
         self,
         prompt: str,
@@ -266,7 +347,8 @@ class LlamaCppClient:
             "n_predict": max_tokens,
             "temperature": temperature,
             "stop": stop or [],
-            "stream": False,  # We don't support streaming yet
+            "stream": False,  # Whole response at once; stream_completion() streams
+            "cache_prompt": True,  # Reuse the KV cache of a shared prompt prefix
         }
 
         last_exception: Optional[Exception] = None
@@ -284,7 +366,7 @@ class LlamaCppClient:
                     },
                 )
 
-                response = await self._client.post(
+                response = await self.data_client.post(
                     f"{self.base_url}/completion",
                     json=request_body,
                     timeout=self.timeout,
@@ -389,3 +471,215 @@ class LlamaCppClient:
             "tokens_evaluated": 0,
             "error": f"Failed after {self.max_retries} attempts: {str(last_exception)}",
         }
+
+    async def stream_completion(
+        self,
+        prompt: str,
+        max_tokens: int = 512,
+        temperature: float = 0.7,
+        stop: Optional[list[str]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a text completion from the llama.cpp server token by token.
+
+        Requests an SSE stream and yields each generated text fragment as soon
+        as llama.cpp emits it. Connection failures, timeouts and 5xx responses
+        are retried with linear backoff until the first fragment has been
+        received; after that an error ends the stream (a retry would repeat
+        text the caller has already consumed). A stream that ends without
+        llama.cpp's final ``stop`` chunk (e.g. the server died mid-generation)
+        is reported as truncated.
+
+        Args:
+            prompt: Input prompt text
+            max_tokens: Maximum tokens to generate (default: 512)
+            temperature: Sampling temperature 0.0-2.0 (default: 0.7)
+            stop: Optional list of stop sequences
+
+        Yields:
+            ``{"content": str}`` for each generated fragment, then one final
+            dictionary with:
+                - content: Empty string
+                - done: True
+                - tokens_predicted: Number of tokens generated
+                - tokens_evaluated: Number of input tokens processed
+                - tokens_cached: Number of prompt tokens reused from the cache
+                - time_to_first_token_ms: Time until the first fragment
+                  arrived (None if nothing was generated)
+                - truncated: True if the stream ended before the final chunk
+                - server_error: True if the failure was the server's
+                  (connection failure, timeout or 5xx response) rather than
+                  the request's
+                - error: Optional error message if generation failed
+
+        Example:
+            >>> client = LlamaCppClient("http://localhost:8080")
+            >>> async for chunk in client.stream_completion("What is Python?"):
+            ...     print(chunk["content"], end="", flush=True)
+        """
+        request_body = {
+            "prompt": prompt,
+            "n_predict": max_tokens,
+            "temperature": temperature,
+            "stop": stop or [],
+            "stream": True,
+            "cache_prompt": True,  # Reuse the KV cache of a shared prompt prefix
+        }
+
+        start_time = time.perf_counter()
+        time_to_first_token_ms: Optional[float] = None
+        tokens_predicted = 0
+        tokens_evaluated = 0
+        tokens_cached = 0
+        truncated = False
+        server_error = False
+        error: Optional[str] = None
+
+        for attempt in range(self.max_retries + 1):
+            error = None
+            truncated = False
+            server_error = False
+            try:
+                async with self.data_client.stream(
+                    "POST",
+                    f"{self.base_url}/completion",
+                    json=request_body,
+                    timeout=self.timeout,
+                ) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode("utf-8", errors="replace")
+                        error = f"HTTP {response.status_code}: {body}"
+                        server_error = response.status_code >= 500
+                        self._logger.warning(
+                            "Streaming completion request failed",
+                            extra={
+                                "base_url": self.base_url,
+                                "status_code": response.status_code,
+                                "attempt": attempt + 1,
+                            },
+                        )
+                        # Don't retry on client errors (4xx)
+                        if 400 <= response.status_code < 500:
+                            break
+                    else:
+                        stopped = False
+                        async for line in response.aiter_lines():
+                            data = parse_sse_line(line)
+                            if data is None:
+                                continue
+                            if "error" in data:
+                                error = str(data["error"])
+                                break
+
+                            content = data.get("content", "")
+                            if content:
+                                if time_to_first_token_ms is None:
+                                    time_to_first_token_ms = (
+                                        time.perf_counter() - start_time
+                                    ) * 1000
+                                yield {"content": content}
+
+                            if data.get("stop"):
+                                stopped = True
+                                tokens_predicted = data.get("tokens_predicted", 0)
+                                tokens_evaluated = data.get("tokens_evaluated", 0)
+                                tokens_cached = data.get("tokens_cached", 0)
+                                break
+
+                        if error is None and not stopped:
+                            truncated = True
+                            error = "Stream ended before the final chunk (truncated)"
+                            self._logger.warning(
+                                "Streaming completion truncated",
+                                extra={"base_url": self.base_url, "attempt": attempt + 1},
+                            )
+                        # Only a stream cut off before any text can be retried
+                        if not truncated or time_to_first_token_ms is not None:
+                            break
+
+            except (httpx.TimeoutException, httpx.ConnectError) as e:
+                error = str(e) or type(e).__name__
+                truncated = time_to_first_token_ms is not None
+                server_error = True
+                self._logger.warning(
+                    "Streaming completion request failed",
+                    extra={"base_url": self.base_url, "attempt": attempt + 1, "error": error},
+                )
+                if time_to_first_token_ms is not None:
+                    break
+
+            except Exception as e:
+                error = str(e)
+                truncated = time_to_first_token_ms is not None
+                self._logger.error(
+                    "Streaming completion unexpected error",
+                    extra={"base_url": self.base_url, "attempt": attempt + 1, "error": error},
+                    exc_info=True,
+                )
+                break
+
+            # Linear backoff before retry
+            if attempt < self.max_retries:
+                self._logger.debug(
+                    f"Retrying after {self.retry_delay}s delay",
+                    extra={"attempt": attempt + 1},
+                )
+                await asyncio.sleep(self.retry_delay)
+
+        if error is None:
+            self._logger.info(
+                "Completion streamed successfully",
+                extra={
+                    "base_url": self.base_url,
+                    "tokens_predicted": tokens_predicted,
+                    "tokens_evaluated": tokens_evaluated,
+                    "tokens_cached": tokens_cached,
+                    "time_to_first_token_ms": time_to_first_token_ms,
+                },
+            )
+
+        yield {
+            "content": "",
+            "done": True,
+            "tokens_predicted": tokens_predicted,
+            "tokens_evaluated": tokens_evaluated,
+            "tokens_cached": tokens_cached,
+            "time_to_first_token_ms": time_to_first_token_ms,
+            "truncated": truncated,
+            "server_error": server_error,
+            "error": error,
+        }
+
+    async def prefill(self, prompt: str) -> bool:
+        """Evaluate a prompt into the server's prompt cache without generating.
+
+        Sends the prompt with ``n_predict=0`` and ``cache_prompt`` so a later
+        completion whose prompt starts with it only processes the new suffix.
+        Failures are logged and reported, never raised (prefill is an
+        optimization).
+
+        Args:
+            prompt: Prompt (prefix) to evaluate
+
+        Returns:
+            True if the server evaluated the prompt
+        """
+        try:
+            response = await self.data_client.post(
+                f"{self.base_url}/completion",
+                json={"prompt": prompt, "n_predict": 0, "cache_prompt": True, "stream": False},
+                timeout=self.timeout,
+            )
+        except httpx.HTTPError as e:
+            self._logger.warning(
+                "Prompt prefill failed",
+                extra={"base_url": self.base_url, "error": str(e) or type(e).__name__},
+            )
+            return False
+
+        if response.status_code != 200:
+            self._logger.warning(
+                "Prompt prefill failed",
+                extra={"base_url": self.base_url, "status_code": response.status_code},
+            )
+            return False
+        return True
@@ -4,6 +4,8 @@ Llama.cpp Server Manager for S.Y.N.A.P.S.E. ENGINE Multi-Model Orchestration Sys
 This module manages the lifecycle of llama.cpp server processes, including:
 - Selective server launching based on enabled models
 - Concurrent startup with readiness detection
+- One asyncio reader per server process that detects readiness and streams
+  batched log lines on the event loop (no threads)
 - Graceful shutdown with fallback to force-kill
 - Process monitoring and status reporting
 - Docker-compatible configuration
@@ -15,11 +17,10 @@ Phase: 4 - Selective Server Launcher
 import asyncio
 import logging
 import os
-import subprocess
-import threading
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Callable, Deque, Dict, List, Optional
 
 import httpx
 
@@ -34,6 +35,31 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Output lines signalling that a server finished loading
+READINESS_INDICATORS = (
+    "http server listening",
+    "server is listening",
+    "listening on",
+    "server started",
+    "ready to receive requests",
+)
+
+# Output lines signalling a failed startup
+STARTUP_ERROR_INDICATORS = (
+    "error loading model",
+    "failed to load",
+    "ggml_init_cublas: failed",
+    "cannot open model file",
+)
+
+# Log lines are handed to the WebSocket manager in batches of up to
+# LOG_BATCH_MAX_LINES, at most LOG_BATCH_INTERVAL seconds after the first line
+LOG_BATCH_MAX_LINES = 200
+LOG_BATCH_INTERVAL = 0.1
+
+# Longest output line read as one line (longer lines are skipped)
+MAX_OUTPUT_LINE_BYTES = 1024 * 1024
+
 
 class ServerProcess:
     """Wrapper for a llama.cpp server process.
@@ -47,14 +73,14 @@ class ServerProcess:
     def __init__(
         self,
         model: DiscoveredModel,
-        process: Optional[subprocess.Popen] = None,
+        process: Optional[asyncio.subprocess.Process] = None,
         is_external: bool = False,
     ):
         """Initialize server process wrapper.
 
         Args:
             model: The DiscoveredModel this server is running
-            process: The subprocess.Popen instance (None for external servers)
+            process: The asyncio subprocess (None for external servers)
             is_external: True if server is externally managed (not a subprocess)
         """
         self.model = model
@@ -65,6 +91,12 @@ class ServerProcess:
         self.is_external = is_external
         self.pid = process.pid if process else None
 
+        # Startup state, set by the output reader
+        self.startup_settled = asyncio.Event()
+        self.startup_error: Optional[str] = None
+        self.recent_output: Deque[str] = deque(maxlen=20)
+        self.reader_task: Optional[asyncio.Task] = None
+
     def is_running(self) -> bool:
         """Check if the underlying process is still alive.
 
@@ -75,7 +107,7 @@ class ServerProcess:
         """
         if self.is_external:
             return True  # External servers managed by host
-        return self.process is not None and self.process.poll() is None
+        return self.process is not None and self.process.returncode is None
 
     def get_uptime_seconds(self) -> int:
         """Calculate server uptime in seconds.
@@ -148,7 +180,8 @@ class LlamaServerManager:
         Args:
             llama_server_path: Path to llama-server binary executable
             max_startup_time: Maximum seconds to wait for server readiness
-            readiness_check_interval: Seconds between readiness checks
+            readiness_check_interval: Unused; readiness is detected as soon as
+                the server prints a readiness line (kept for compatibility)
             host: Host address to bind servers to (127.0.0.1 for security)
             use_external_servers: If True, connect to externally-managed servers
                 instead of launching subprocesses (for Metal acceleration)
@@ -177,6 +210,9 @@ class LlamaServerManager:
         # Dictionary of running servers keyed by model_id
         self.servers: Dict[str, ServerProcess] = {}
 
+        # Callbacks notified when a server is tracked (server) or untracked (None)
+        self._server_listeners: List[Callable[[str, Optional[ServerProcess]], None]] = []
+
         logger.info("Initialized llama.cpp server manager")
         if use_external_servers:
             logger.info("   EXTERNAL SERVER MODE (Metal Acceleration)")
@@ -299,19 +335,18 @@ class LlamaServerManager:
         cmd_str = " ".join(str(arg) for arg in cmd)
         logger.info(f"Executing command: {cmd_str}")
 
-        # Launch subprocess
+        # Launch subprocess (stderr merged into stdout, read by one async reader)
         try:
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,  # Line-buffered
-                universal_newlines=True,
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=MAX_OUTPUT_LINE_BYTES,
             )
 
             server = ServerProcess(model=model, process=process)
             self.servers[model.model_id] = server
+            self._notify_server_change(model.model_id, server)
 
             logger.info(f"Launched llama-server process: PID {process.pid} on port {model.port}")
 
@@ -329,11 +364,8 @@ class LlamaServerManager:
             except Exception as e:
                 logger.debug(f"Failed to emit model state event: {e}")
 
-            # Start log streaming thread (if WebSocket manager available)
-            if self.websocket_manager:
-                log_thread = threading.Thread(target=self._stream_logs, args=(server,), daemon=True)
-                log_thread.start()
-                logger.debug(f"Started log streaming thread for {model.model_id}")
+            # Read output for readiness and log streaming (also keeps the pipe drained)
+            server.reader_task = asyncio.create_task(self._read_output(server))
 
             # Wait for server to become ready
             await self._wait_for_readiness(server)
@@ -397,6 +429,7 @@ class LlamaServerManager:
                     server = ServerProcess(model=model, process=None, is_external=True)
                     server.is_ready = True
                     self.servers[model.model_id] = server
+                    self._notify_server_change(model.model_id, server)
 
                     return server
                 else:
@@ -469,9 +502,9 @@ class LlamaServerManager:
             )
 
     async def _wait_for_readiness(self, server: ServerProcess) -> None:
-        """Wait for server to become ready by monitoring stderr output.
+        """Wait for server to become ready, as detected by its output reader.
 
-        Monitors the server's stderr stream for readiness indicators like
+        The reader watches the server's output for readiness indicators like
         "http server listening" or "server started". Falls back to timeout
         if no clear signal is detected.
 
@@ -484,181 +517,165 @@ class LlamaServerManager:
         """
         logger.info(f"Monitoring {server.model.model_id} for readiness signals...")
 
-        start_time = datetime.now()
-
-        while (datetime.now() - start_time).total_seconds() < self.max_startup_time:
-            # Check if process has terminated unexpectedly
-            if not server.is_running():
-                # Read any final error output
-                try:
-                    if server.process is not None and server.process.stderr is not None:
-                        stderr_output = server.process.stderr.read()
-                        logger.error(f"Server stderr: {stderr_output}")
-                except Exception:
-                    pass
+        try:
+            async with asyncio.timeout(self.max_startup_time):
+                await server.startup_settled.wait()
+        except TimeoutError:
+            # Timeout reached - mark as ready with warning
+            # This is a fallback for servers that don't emit clear readiness signals
+            logger.warning(
+                f"  {server.model.model_id} reached {self.max_startup_time}s timeout "
+                f"without clear readiness signal. Marking as ready (fallback behavior)."
+            )
+            server.is_ready = True
+            return
 
-                raise SynapseException(
-                    "Server process died during startup",
-                    details={
-                        "model_id": server.model.model_id,
-                        "uptime": server.get_uptime_seconds(),
-                    },
-                )
+        if server.startup_error is not None:
+            logger.error(f"Critical error during startup: {server.startup_error}")
+            raise SynapseException(
+                f"Server startup failed with error: {server.startup_error}",
+                details={"model_id": server.model.model_id},
+            )
 
-            # Non-blocking read of stderr for readiness indicators
-            try:
-                import select
+        if not server.is_ready:
+            # Output ended before readiness: the process died
+            logger.error(f"Server output: {' | '.join(server.recent_output)}")
+            raise SynapseException(
+                "Server process died during startup",
+                details={
+                    "model_id": server.model.model_id,
+                    "uptime": server.get_uptime_seconds(),
+                },
+            )
 
-                if server.process is None or server.process.stderr is None:
-                    await asyncio.sleep(0.5)
-                    continue
+        elapsed = server.get_uptime_seconds()
+        logger.info(f"✓ {server.model.model_id} is READY (startup took {elapsed}s)")
 
-                # Check if data available on stderr (Unix-like systems)
-                ready_fds, _, _ = select.select(
-                    [server.process.stderr],
-                    [],
-                    [],
-                    0.1,  # 100ms timeout
+        # Emit model state event: loading -> active
+        try:
+            asyncio.create_task(
+                emit_model_state_event(
+                    model_id=server.model.model_id,
+                    previous_state="loading",
+                    current_state="active",
+                    reason=f"Server ready (startup took {elapsed}s)",
+                    port=server.port,
                 )
+            )
+        except Exception as e:
+            logger.debug(f"Failed to emit model state event: {e}")
 
-                if ready_fds:
-                    line = server.process.stderr.readline()
-
-                    if line:
-                        line_lower = line.lower()
-
-                        # Check for readiness keywords
-                        readiness_indicators = [
-                            "http server listening",
-                            "server is listening",
-                            "listening on",
-                            "server started",
-                            "ready to receive requests",
-                        ]
-
-                        if any(indicator in line_lower for indicator in readiness_indicators):
-                            server.is_ready = True
-                            elapsed = server.get_uptime_seconds()
-                            logger.info(
-                                f"✓ {server.model.model_id} is READY (startup took {elapsed}s)"
-                            )
-
-                            # Emit model state event: loading -> active
-                            try:
-                                asyncio.create_task(
-                                    emit_model_state_event(
-                                        model_id=server.model.model_id,
-                                        previous_state="loading",
-                                        current_state="active",
-                                        reason=f"Server ready (startup took {elapsed}s)",
-                                        port=server.port,
-                                    )
-                                )
-                            except Exception as e:
-                                logger.debug(f"Failed to emit model state event: {e}")
-                            return
-
-                        # Check for critical errors
-                        error_indicators = [
-                            "error loading model",
-                            "failed to load",
-                            "ggml_init_cublas: failed",
-                            "cannot open model file",
-                        ]
-
-                        if any(error in line_lower for error in error_indicators):
-                            logger.error(f"Critical error during startup: {line.strip()}")
-                            raise SynapseException(
-                                f"Server startup failed with error: {line.strip()}",
-                                details={"model_id": server.model.model_id},
-                            )
-
-                        # Log other output at debug level
-                        if "error" in line_lower or "warn" in line_lower:
-                            logger.debug(f"Server output: {line.strip()}")
-
-            except Exception as e:
-                logger.debug(f"Error reading server stderr: {e}")
-
-            # Sleep before next check
-            await asyncio.sleep(self.readiness_check_interval)
-
-        # Timeout reached - mark as ready with warning
-        # This is a fallback for servers that don't emit clear readiness signals
-        logger.warning(
-            f"  {server.model.model_id} reached {self.max_startup_time}s timeout "
-            f"without clear readiness signal. Marking as ready (fallback behavior)."
-        )
-        server.is_ready = True
-
-    def _stream_logs(self, server: ServerProcess) -> None:
-        """Stream stderr from subprocess to WebSocket clients.
-
-        Runs in a background thread to read stderr line by line from the
-        llama-server process and broadcast log entries to connected WebSocket
-        clients. Parses log levels from line content and formats entries for
-        the frontend.
+    async def _read_output(self, server: ServerProcess) -> None:
+        """Read a server's output until it exits.
 
-        This method runs until the subprocess terminates or an error occurs.
-        The thread is daemon, so it will automatically terminate when the
-        main process exits.
+        Single async reader per server process: detects readiness and startup
+        errors, keeps the last lines for diagnostics, and hands log entries to
+        the WebSocket manager in batches (up to LOG_BATCH_MAX_LINES lines, at
+        most LOG_BATCH_INTERVAL seconds after the first buffered line).
 
         Args:
-            server: ServerProcess instance to stream logs from
-
-        Thread Safety:
-            Runs in a separate thread. Uses asyncio.run() to call the async
-            websocket_manager.broadcast_log() method. This is safe because
-            each call creates a new event loop for that thread.
+            server: ServerProcess to read output from
         """
-        if not self.websocket_manager:
-            logger.warning("Cannot stream logs - WebSocket manager not available")
+        if server.process is None or server.process.stdout is None:
+            server.startup_settled.set()
             return
 
-        logger.info(f"Starting log stream for {server.model.model_id}")
+        model_id = server.model.model_id
+        stream = server.process.stdout
+        loop = asyncio.get_running_loop()
+        pending: List[dict] = []
+        flush_at: Optional[float] = None
+
+        logger.info(f"Starting log stream for {model_id}")
 
         try:
-            # Read stderr line by line until process terminates
-            while server.is_running():
-                if not server.process or not server.process.stderr:
-                    break
+            while True:
+                try:
+                    # Only wait past the flush deadline when nothing is buffered
+                    async with asyncio.timeout_at(flush_at):
+                        raw = await stream.readline()
+                except TimeoutError:
+                    await self._publish_logs(pending)
+                    pending, flush_at = [], None
+                    continue
+                except ValueError:
+                    logger.debug(f"Skipped output line over {MAX_OUTPUT_LINE_BYTES} bytes")
+                    continue
 
-                line = server.process.stderr.readline()
+                if not raw:
+                    break  # Process ended
 
+                line = raw.decode(errors="replace").strip()
                 if not line:
-                    # Process ended or no more output
-                    break
+                    continue
+                server.recent_output.append(line)
 
-                # Parse log level from line content
-                level = "INFO"
-                line_lower = line.lower()
+                if not server.startup_settled.is_set():
+                    self._check_startup_line(server, line)
 
-                if "error" in line_lower or "failed" in line_lower or "exception" in line_lower:
-                    level = "ERROR"
-                elif "warn" in line_lower or "warning" in line_lower:
-                    level = "WARN"
+                pending.append(self._log_entry(server, line))
+                if len(pending) >= LOG_BATCH_MAX_LINES:
+                    await self._publish_logs(pending)
+                    pending, flush_at = [], None
+                elif flush_at is None:
+                    flush_at = loop.time() + LOG_BATCH_INTERVAL
 
-                # Create log entry
-                log_entry = {
-                    "timestamp": datetime.utcnow().isoformat() + "Z",
-                    "model_id": server.model.model_id,
-                    "port": server.port,
-                    "level": level,
-                    "message": line.strip(),
-                }
+            await self._publish_logs(pending)
 
-                # Broadcast to WebSocket clients
-                # Run in new event loop (thread-safe pattern)
-                try:
-                    asyncio.run(self.websocket_manager.broadcast_log(log_entry))
-                except Exception as e:
-                    logger.debug(f"Failed to broadcast log: {e}")
+        except asyncio.CancelledError:
+            raise
 
         except Exception as e:
-            logger.error(f"Log streaming error for {server.model.model_id}: {e}", exc_info=True)
+            logger.error(f"Log streaming error for {model_id}: {e}", exc_info=True)
 
         finally:
-            logger.info(f"Log stream ended for {server.model.model_id}")
+            server.startup_settled.set()
+            logger.info(f"Log stream ended for {model_id}")
+
+    def _check_startup_line(self, server: ServerProcess, line: str) -> None:
+        """Settle startup on a readiness or critical error line."""
+        line_lower = line.lower()
+
+        # Check for readiness keywords
+        if any(indicator in line_lower for indicator in READINESS_INDICATORS):
+            server.is_ready = True
+            server.startup_settled.set()
+
+        # Check for critical errors
+        elif any(error in line_lower for error in STARTUP_ERROR_INDICATORS):
+            server.startup_error = line
+            server.startup_settled.set()
+
+        # Log other output at debug level
+        elif "error" in line_lower or "warn" in line_lower:
+            logger.debug(f"Server output: {line}")
+
+    def _log_entry(self, server: ServerProcess, line: str) -> dict:
+        """Build a log entry for the frontend, parsing the level from the line."""
+        level = "INFO"
+        line_lower = line.lower()
+
+        if "error" in line_lower or "failed" in line_lower or "exception" in line_lower:
+            level = "ERROR"
+        elif "warn" in line_lower or "warning" in line_lower:
+            level = "WARN"
+
+        return {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "model_id": server.model.model_id,
+            "port": server.port,
+            "level": level,
+            "message": line,
+        }
+
+    async def _publish_logs(self, entries: List[dict]) -> None:
+        """Hand a batch of log entries to the WebSocket manager."""
+        if not entries or not self.websocket_manager:
+            return
+        try:
+            await self.websocket_manager.broadcast_logs(entries)
+        except Exception as e:
+            logger.debug(f"Failed to broadcast logs: {e}")
 
     async def start_all(self, models: List[DiscoveredModel]) -> Dict[str, ServerProcess]:
         """Start servers for multiple models concurrently.
@@ -734,6 +751,7 @@ class LlamaServerManager:
             )
             # Remove from tracking dictionary
             del self.servers[model_id]
+            self._notify_server_change(model_id, None)
             return
 
         logger.info(
@@ -747,23 +765,31 @@ class LlamaServerManager:
                 return
 
             # Attempt graceful shutdown with SIGTERM
-            server.process.terminate()
+            if server.process.returncode is None:
+                server.process.terminate()
 
             try:
                 # Wait for graceful exit
-                server.process.wait(timeout=timeout)
+                await asyncio.wait_for(server.process.wait(), timeout=timeout)
                 logger.info(f"✓ {model_id} stopped gracefully")
 
-            except subprocess.TimeoutExpired:
+            except asyncio.TimeoutError:
                 # Force-kill with SIGKILL
                 logger.warning(
                     f"Server {model_id} did not stop within {timeout}s. "
                     f"Force-killing with SIGKILL..."
                 )
                 server.process.kill()
-                server.process.wait(timeout=5)
+                await asyncio.wait_for(server.process.wait(), timeout=5)
                 logger.info(f"✓ {model_id} force-stopped")
 
+            # The reader ends at EOF; don't wait on a pipe held open elsewhere
+            if server.reader_task is not None:
+                try:
+                    await asyncio.wait_for(server.reader_task, timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass  # wait_for cancelled the reader
+
         except Exception as e:
             logger.error(f"Error stopping server {model_id}: {e}", exc_info=True)
 
@@ -784,6 +810,7 @@ class LlamaServerManager:
 
             # Remove from tracking dictionary
             del self.servers[model_id]
+            self._notify_server_change(model_id, None)
 
     async def stop_all(self, timeout: int = 10) -> None:
         """Stop all running servers gracefully.
@@ -808,7 +835,9 @@ class LlamaServerManager:
                     if stop_response.status_code == 200:
                         logger.info("✓ Metal servers stopped successfully via host API")
                         # Clear internal server tracking
-                        self.servers.clear()
+                        for model_id in list(self.servers):
+                            del self.servers[model_id]
+                            self._notify_server_change(model_id, None)
                         return
                     else:
                         error_detail = stop_response.json().get("detail", "Unknown error")
@@ -864,6 +893,25 @@ class LlamaServerManager:
             "servers": servers_status,
         }
 
+    def add_server_listener(self, listener: Callable[[str, Optional[ServerProcess]], None]) -> None:
+        """Register a callback for servers being tracked or untracked.
+
+        The listener is called with (model_id, server) when a server is
+        started or connected, and with (model_id, None) when it is stopped.
+
+        Args:
+            listener: Synchronous callback (must not block)
+        """
+        self._server_listeners.append(listener)
+
+    def _notify_server_change(self, model_id: str, server: Optional[ServerProcess]) -> None:
+        """Call server listeners, logging (not raising) listener errors."""
+        for listener in self._server_listeners:
+            try:
+                listener(model_id, server)
+            except Exception as e:
+                logger.warning(f"Server listener failed for {model_id}: {e}")
+
     def get_server(self, model_id: str) -> Optional[ServerProcess]:
         """Get ServerProcess instance for a specific model.
 
@@ -7,9 +7,17 @@ with the EventBus for real-time broadcasting.
 
 Features:
 - Captures logs from all Python loggers (FastAPI, model servers, CGRAG, etc.)
-- Thread-safe circular buffer with configurable size
-- Real-time WebSocket streaming via EventBus integration
-- REST API for log querying with filtering (level, source, search text)
+- Lock-free bounded ingestion ring: records are pushed from any thread and
+  drained in batches by a single consumer task
+- Per-source rate limiting and sampling of DEBUG/INFO records, with counters
+  for every record that was not kept
+- Indexed, segmented log store (LogStore) holding hundreds of thousands of
+  entries, with lookups by level, source, request/trace ID, time range and
+  words, optionally spilling older segments to disk
+- Real-time WebSocket streaming via EventBus integration (one non-blocking
+  publish per batch)
+- REST API for log querying with filtering (level, source, search text,
+  request/trace ID)
 - Log statistics and source tracking
 - JSON-structured log entries with metadata
 
@@ -18,15 +26,22 @@ Task: Comprehensive Log Aggregation and Streaming System
 """
 
 import asyncio
+import logging
+import random
 import time
 from collections import deque
 from datetime import datetime
-from typing import Any, Deque, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 from app.core.logging import get_logger
+from app.services.log_store import LogQuery, LogStore
 
 logger = get_logger(__name__)
 
+# Longest message published to the EventBus (SystemEvent.message limit)
+_MAX_EVENT_MESSAGE_LENGTH = 1000
+
 
 class LogEntry:
     """Structured log entry with metadata.
@@ -39,6 +54,17 @@ class LogEntry:
         extra: Additional metadata (pathname, lineno, funcName, etc.)
     """
 
+    __slots__ = (
+        "timestamp",
+        "level",
+        "source",
+        "message",
+        "extra",
+        "request_id",
+        "trace_id",
+        "service_tag",
+    )
+
     def __init__(
         self,
         timestamp: str,
@@ -120,16 +146,24 @@ class LogEntry:
 class LogAggregator:
     """Central log aggregation service with real-time streaming.
 
-    Aggregates logs from all backend services using a circular buffer for
-    efficient memory usage. Broadcasts logs in real-time via EventBus for
+    Aggregates logs from all backend services into an indexed LogStore
+    (oldest segments evicted or spilled to disk). Broadcasts logs in real-time via EventBus for
     WebSocket streaming. Provides query methods for log filtering and retrieval.
 
-    The aggregator uses asyncio locks for thread-safety and integrates with
-    the existing EventBus infrastructure for seamless WebSocket broadcasting.
+    Ingestion never blocks the logging call: submit() appends to a bounded
+    ring (collections.deque appends are atomic, so no lock is needed from
+    any thread) and one consumer task moves the ring into the circular
+    buffer and the EventBus in batches. When the ring is full the oldest
+    pending record is dropped and counted.
+
+    admit() applies per-source rate limiting (token bucket per logger name)
+    and sampling to records below WARNING before they are even formatted;
+    WARNING and above are always kept.
 
     Architecture:
-        Python Logger -> LogHandler -> LogAggregator -> Circular Buffer
-                                                     -> EventBus -> WebSocket
+        Python Logger -> AggregatorHandler -> admit() -> submit() -> Ring
+        Ring -> consumer task -> LogStore
+                              -> EventBus (one publish per batch) -> WebSocket
 
     Example Usage:
         # Add log
@@ -146,20 +180,70 @@ class LogAggregator:
         stats = await log_aggregator.get_stats()
 
     Attributes:
-        max_logs: Maximum number of logs to buffer
-        logs: Circular buffer (deque) of LogEntry instances
+        max_logs: Maximum number of logs kept in memory
+        store: Indexed LogStore of ingested entries
+        source_rate_limit: Records per second kept per source below WARNING
+            (0 disables rate limiting)
+        source_burst: Token bucket size per source
+        sample_rates: Logger name prefix -> fraction of records below WARNING
+            kept (longest matching prefix wins)
         _lock: AsyncIO lock for thread-safe operations
         _start_time: Timestamp when aggregator was initialized
     """
 
-    def __init__(self, max_logs: int = 1000):
-        """Initialize log aggregator with circular buffer.
+    def __init__(
+        self,
+        max_logs: int = 1000,
+        ring_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.05,
+        source_rate_limit: float = 100.0,
+        source_burst: int = 200,
+        sample_rates: Optional[Dict[str, float]] = None,
+        full_text: bool = True,
+        spill_dir: Optional[Path] = None,
+    ):
+        """Initialize log aggregator with an indexed log store.
 
         Args:
-            max_logs: Maximum logs to buffer (older logs auto-discarded)
+            max_logs: Maximum logs kept in memory (oldest segments evicted)
+            ring_size: Maximum records waiting for the consumer task
+            batch_size: Maximum records ingested per batch
+            flush_interval: Seconds the consumer waits when the ring is empty
+            source_rate_limit: Records per second kept per source below WARNING
+                (0 disables rate limiting)
+            source_burst: Token bucket size per source
+            sample_rates: Logger name prefix -> fraction of records below
+                WARNING kept
+            full_text: Index message words for full-text search
+            spill_dir: Directory evicted segments are written to (None to discard)
         """
         self.max_logs = max_logs
-        self.logs: Deque[LogEntry] = deque(maxlen=max_logs)
+        self.store = LogStore(
+            max_entries=max_logs,
+            segment_size=min(10_000, max(1, max_logs // 10)),
+            full_text=full_text,
+            spill_dir=spill_dir,
+        )
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.source_rate_limit = source_rate_limit
+        self.source_burst = source_burst
+        self.sample_rates = dict(sample_rates or {})
+        self._ring: Deque[LogEntry] = deque(maxlen=ring_size)
+        # Source -> (tokens, last refill time)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._sample_cache: Dict[str, float] = {}
+        self._consumer_task: Optional[asyncio.Task] = None
+        self._counters = {
+            "accepted": 0,
+            "ingested": 0,
+            "batches": 0,
+            "dropped_overflow": 0,
+            "dropped_rate_limited": 0,
+            "dropped_sampled": 0,
+            "dropped_publish": 0,
+        }
         self._lock = asyncio.Lock()
         self._start_time = time.time()
 
@@ -168,6 +252,70 @@ class LogAggregator:
             extra={"max_logs": max_logs},
         )
 
+    async def start(self) -> None:
+        """Start the consumer task that drains the ingestion ring."""
+        self._consumer_task = asyncio.create_task(self._consume_loop())
+        logger.info("LogAggregator consumer started")
+
+    async def stop(self) -> None:
+        """Stop the consumer task and ingest what is left in the ring."""
+        if self._consumer_task:
+            self._consumer_task.cancel()
+            try:
+                await self._consumer_task
+            except asyncio.CancelledError:
+                pass
+            self._consumer_task = None
+        while self._ring:
+            await self._ingest_batch()
+        self.store.close()
+        logger.info("LogAggregator consumer stopped")
+
+    def admit(self, source: str, levelno: int) -> bool:
+        """Decide whether a record is kept, before it is formatted.
+
+        Records at WARNING and above are always kept. Others are sampled
+        (per sample_rates) and then rate limited per source. Safe to call
+        from any thread; counters are approximate under contention.
+
+        Args:
+            source: Logger name
+            levelno: Numeric log level
+
+        Returns:
+            True if the record should be submitted
+        """
+        if levelno >= logging.WARNING:
+            return True
+
+        rate = self._sample_rate(source)
+        if rate < 1.0 and random.random() >= rate:
+            self._counters["dropped_sampled"] += 1
+            return False
+
+        if self.source_rate_limit > 0:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(source, (float(self.source_burst), now))
+            tokens = min(float(self.source_burst), tokens + (now - last) * self.source_rate_limit)
+            if tokens < 1.0:
+                self._buckets[source] = (tokens, now)
+                self._counters["dropped_rate_limited"] += 1
+                return False
+            self._buckets[source] = (tokens - 1.0, now)
+
+        return True
+
+    def submit(self, entry: LogEntry) -> None:
+        """Queue a log entry for ingestion without waiting (any thread).
+
+        Args:
+            entry: LogEntry to ingest
+        """
+        if len(self._ring) == self._ring.maxlen:
+            self._counters["dropped_overflow"] += 1  # append() evicts the oldest
+        self._ring.append(entry)
+        self._counters["accepted"] += 1
+
     async def add_log(
         self,
         level: str,
@@ -180,8 +328,9 @@ class LogAggregator:
     ) -> None:
         """Add log entry and broadcast via EventBus.
 
-        Thread-safe method to add a log entry to the circular buffer and
-        broadcast it in real-time to all WebSocket subscribers via EventBus.
+        Queues the entry on the ingestion ring; the consumer task adds it to
+        the circular buffer and broadcasts it in real-time to all WebSocket
+        subscribers via EventBus.
 
         Args:
             level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -192,9 +341,8 @@ class LogAggregator:
             trace_id: Optional trace ID for distributed tracing
             service_tag: Optional service tag (prx:, mem:, rec:, etc.)
         """
-        async with self._lock:
-            # Create log entry
-            entry = LogEntry(
+        self.submit(
+            LogEntry(
                 timestamp=datetime.utcnow().isoformat() + "Z",
                 level=level,
                 source=source,
@@ -204,25 +352,64 @@ class LogAggregator:
                 trace_id=trace_id,
                 service_tag=service_tag,
             )
+        )
 
-            # Add to circular buffer (auto-discards oldest if full)
-            self.logs.append(entry)
+    def _sample_rate(self, source: str) -> float:
+        """Fraction of records kept for a source (longest matching prefix)."""
+        if not self.sample_rates:
+            return 1.0
+        rate = self._sample_cache.get(source)
+        if rate is None:
+            prefixes = [prefix for prefix in self.sample_rates if source.startswith(prefix)]
+            rate = self.sample_rates[max(prefixes, key=len)] if prefixes else 1.0
+            self._sample_cache[source] = rate
+        return rate
+
+    async def _consume_loop(self) -> None:
+        """Drain the ingestion ring in batches."""
+        while True:
+            try:
+                if not self._ring:
+                    await asyncio.sleep(self.flush_interval)
+                    continue
+                await self._ingest_batch()
+                await asyncio.sleep(0)  # Let other tasks run between full batches
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Log ingestion failed: {e}", exc_info=True)
+                await asyncio.sleep(self.flush_interval)
+
+    async def _ingest_batch(self) -> None:
+        """Move up to batch_size entries from the ring to the buffer and EventBus."""
+        batch: List[LogEntry] = []
+        while self._ring and len(batch) < self.batch_size:
+            batch.append(self._ring.popleft())
+        if not batch:
+            return
+
+        async with self._lock:
+            self.store.extend(batch)
+
+        self._counters["ingested"] += len(batch)
+        self._counters["batches"] += 1
 
         # Broadcast to WebSocket clients via EventBus (outside lock)
-        await self._broadcast_log(entry)
+        self._broadcast_logs(batch)
 
-    async def _broadcast_log(self, entry: LogEntry) -> None:
-        """Broadcast log entry to WebSocket subscribers via EventBus.
+    def _broadcast_logs(self, entries: List[LogEntry]) -> None:
+        """Broadcast a batch of log entries to WebSocket subscribers via EventBus.
 
-        Publishes log entry as a system event with event_type="log" for
-        real-time streaming to connected WebSocket clients. Uses the
-        existing EventBus infrastructure for decoupled broadcasting.
+        Publishes each entry as a system event with event_type="log" for
+        real-time streaming to connected WebSocket clients, in one
+        non-blocking publish (entries that don't fit in the EventBus queue
+        are dropped and counted).
 
         Args:
-            entry: LogEntry to broadcast
+            entries: LogEntry batch to broadcast
         """
         try:
-            from app.models.events import EventSeverity, EventType
+            from app.models.events import EventSeverity, EventType, SystemEvent
             from app.services.event_bus import get_event_bus
 
             event_bus = get_event_bus()
@@ -236,21 +423,26 @@ class LogAggregator:
                 "CRITICAL": EventSeverity.ERROR,
             }
 
-            severity = severity_map.get(entry.level, EventSeverity.INFO)
-
-            # Publish as system event
-            await event_bus.publish(
-                event_type=EventType.LOG,
-                message=entry.message,
-                severity=severity,
-                metadata=entry.to_dict(),
-            )
+            now = time.time()
+            events = [
+                SystemEvent(
+                    timestamp=now,
+                    type=EventType.LOG,
+                    message=entry.message[:_MAX_EVENT_MESSAGE_LENGTH],
+                    severity=severity_map.get(entry.level, EventSeverity.INFO),
+                    metadata=entry.to_dict(),
+                )
+                for entry in entries
+                if entry.message
+            ]
+
+            self._counters["dropped_publish"] += event_bus.publish_nowait(events)
 
         except Exception as e:
             # Don't let broadcast failures crash the application
             # Just log the error (but avoid infinite recursion!)
             if logger.name != __name__:
-                logger.error(f"Failed to broadcast log to EventBus: {e}")
+                logger.error(f"Failed to broadcast logs to EventBus: {e}")
 
     async def get_logs(
         self,
@@ -260,11 +452,16 @@ class LogAggregator:
         start_time: Optional[str] = None,
         end_time: Optional[str] = None,
         limit: int = 500,
+        text: Optional[str] = None,
+        request_id: Optional[str] = None,
+        trace_id: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """Query logs with filtering.
 
         Returns logs matching filter criteria, sorted by timestamp (newest first).
-        All filters are applied as AND conditions.
+        All filters are applied as AND conditions. Request/trace ID, level,
+        source and word filters are answered from indexes; spilled segments
+        are read (off the event loop) only if they can contain a match.
 
         Args:
             level: Filter by log level (exact match, case-insensitive)
@@ -273,6 +470,9 @@ class LogAggregator:
             start_time: Filter logs after this timestamp (ISO 8601)
             end_time: Filter logs before this timestamp (ISO 8601)
             limit: Maximum logs to return (default 500, max 2000)
+            text: Words that must all appear in the message (case-insensitive)
+            request_id: Filter by request ID (exact match)
+            trace_id: Filter by trace ID (exact match)
 
         Returns:
             List of log entry dictionaries, newest first
@@ -284,38 +484,41 @@ class LogAggregator:
                 source="app.services.models",
                 limit=50
             )
-        """
-        async with self._lock:
-            filtered_logs = list(self.logs)
-
-        # Filter by level (exact match, case-insensitive)
-        if level:
-            level_upper = level.upper()
-            filtered_logs = [log for log in filtered_logs if log.level.upper() == level_upper]
-
-        # Filter by source (substring match, case-insensitive)
-        if source:
-            source_lower = source.lower()
-            filtered_logs = [log for log in filtered_logs if source_lower in log.source.lower()]
-
-        # Filter by search text in message (substring match, case-insensitive)
-        if search:
-            search_lower = search.lower()
-            filtered_logs = [log for log in filtered_logs if search_lower in log.message.lower()]
 
-        # Filter by time range
-        if start_time:
-            filtered_logs = [log for log in filtered_logs if log.timestamp >= start_time]
-
-        if end_time:
-            filtered_logs = [log for log in filtered_logs if log.timestamp <= end_time]
-
-        # Apply limit (most recent first)
-        # Circular buffer is already chronologically ordered
-        filtered_logs = filtered_logs[-limit:]
+            # Everything logged while serving one request
+            logs = await aggregator.get_logs(request_id="a1b2c3", limit=2000)
+        """
+        query = LogQuery(
+            level=level,
+            source=source,
+            search=search,
+            text=text,
+            request_id=request_id,
+            trace_id=trace_id,
+            start_time=start_time,
+            end_time=end_time,
+        )
 
-        # Convert to dictionaries and reverse (newest first)
-        return [log.to_dict() for log in reversed(filtered_logs)]
+        async with self._lock:
+            results = self.store.query(query, limit)
+            spilled = self.store.spilled_candidates(query) if len(results) < limit else []
+
+        if spilled:
+            loop = asyncio.get_running_loop()
+            for segment in spilled:
+                results.extend(
+                    await loop.run_in_executor(
+                        self.store.executor,
+                        self.store.read_spilled,
+                        segment,
+                        query,
+                        limit - len(results),
+                    )
+                )
+                if len(results) >= limit:
+                    break
+
+        return [log.to_dict() for log in results]
 
     async def get_sources(self) -> List[str]:
         """Get list of unique log sources.
@@ -326,10 +529,7 @@ class LogAggregator:
         Returns:
             Sorted list of unique source names
         """
-        async with self._lock:
-            sources = set(log.source for log in self.logs)
-
-        return sorted(sources)
+        return sorted(self.store.source_counts)
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get log aggregator statistics.
@@ -339,29 +539,22 @@ class LogAggregator:
 
         Returns:
             Dictionary with statistics:
-                - total_logs: Current number of logs in buffer
-                - max_logs: Maximum buffer size
+                - total_logs: Current number of logs in memory
+                - max_logs: Maximum logs kept in memory
                 - buffer_utilization: Percentage of buffer used
                 - by_level: Count of logs per level
                 - unique_sources: Number of unique log sources
-                - oldest_log_time: Timestamp of oldest log in buffer
-                - newest_log_time: Timestamp of newest log in buffer
+                - oldest_log_time: Timestamp of oldest log in memory
+                - newest_log_time: Timestamp of newest log in memory
                 - uptime_seconds: Time since aggregator initialization
+                - ingestion: Ingestion counters (accepted, ingested, batches,
+                  pending, and records dropped by ring overflow, rate
+                  limiting, sampling or a full EventBus queue)
+                - store: Segment counts, including segments spilled to disk
         """
-        async with self._lock:
-            total = len(self.logs)
-
-            # Count logs by level
-            by_level: Dict[str, int] = {}
-            for log in self.logs:
-                by_level[log.level] = by_level.get(log.level, 0) + 1
-
-            # Get unique sources count
-            unique_sources = len(set(log.source for log in self.logs))
-
-            # Get time range
-            oldest_time = self.logs[0].timestamp if self.logs else None
-            newest_time = self.logs[-1].timestamp if self.logs else None
+        total = len(self.store)
+        oldest = self.store.oldest
+        newest = self.store.newest
 
         uptime = time.time() - self._start_time
         buffer_utilization = (total / self.max_logs) * 100 if self.max_logs > 0 else 0
@@ -370,21 +563,24 @@ class LogAggregator:
             "total_logs": total,
             "max_logs": self.max_logs,
             "buffer_utilization": round(buffer_utilization, 2),
-            "by_level": by_level,
-            "unique_sources": unique_sources,
-            "oldest_log_time": oldest_time,
-            "newest_log_time": newest_time,
+            "by_level": dict(self.store.level_counts),
+            "unique_sources": len(self.store.source_counts),
+            "oldest_log_time": oldest.timestamp if oldest else None,
+            "newest_log_time": newest.timestamp if newest else None,
             "uptime_seconds": round(uptime, 2),
+            "ingestion": {**self._counters, "pending": len(self._ring)},
+            "store": self.store.get_stats(),
         }
 
     async def clear(self) -> None:
         """Clear all logs from buffer.
 
-        Thread-safe operation to clear the circular buffer. Useful for
-        testing or periodic cleanup. Does not affect aggregator configuration.
+        Thread-safe operation to clear the log store, including segments
+        spilled to disk. Useful for testing or periodic cleanup. Does not
+        affect aggregator configuration.
         """
         async with self._lock:
-            self.logs.clear()
+            self.store.clear()
 
         logger.info("Log buffer cleared")
 
@@ -407,19 +603,39 @@ def get_log_aggregator() -> LogAggregator:
     return _log_aggregator
 
 
-def init_log_aggregator(max_logs: int = 1000) -> LogAggregator:
+def init_log_aggregator(
+    max_logs: int = 1000,
+    ring_size: int = 10_000,
+    source_rate_limit: float = 100.0,
+    sample_rates: Optional[Dict[str, float]] = None,
+    full_text: bool = True,
+    spill_dir: Optional[Path] = None,
+) -> LogAggregator:
     """Initialize the global log aggregator instance.
 
     Should be called during application startup in the lifespan context
-    manager. Creates a LogAggregator with the specified buffer size.
+    manager. Creates a LogAggregator with the specified buffer size;
+    start() begins ingestion.
 
     Args:
         max_logs: Maximum logs to buffer (default 1000)
+        ring_size: Maximum records waiting for ingestion
+        source_rate_limit: Records per second kept per source below WARNING
+        sample_rates: Logger name prefix -> fraction of records below WARNING kept
+        full_text: Index message words for full-text search
+        spill_dir: Directory evicted log segments are written to (None to discard)
 
     Returns:
         Initialized LogAggregator instance
     """
     global _log_aggregator
-    _log_aggregator = LogAggregator(max_logs=max_logs)
+    _log_aggregator = LogAggregator(
+        max_logs=max_logs,
+        ring_size=ring_size,
+        source_rate_limit=source_rate_limit,
+        sample_rates=sample_rates,
+        full_text=full_text,
+        spill_dir=spill_dir,
+    )
     logger.info(f"Global LogAggregator initialized (max_logs={max_logs})")
     return _log_aggregator
@@ -0,0 +1,391 @@
+"""Indexed, segmented store for aggregated logs.
+
+LogAggregator used to keep 1000 LogEntry objects in a deque and answer every
+/api/logs query with a linear scan. LogStore keeps far more history and
+answers the common lookups from indexes:
+
+- Entries are appended to fixed-size segments (append-only; the oldest
+  segment is evicted as a whole when capacity is reached)
+- Each segment indexes entry offsets by level, source, request_id and
+  trace_id, and optionally by message word tokens (full-text search)
+- Time-range queries seek with a binary search on segment timestamps
+- Evicted segments can spill to disk as JSON lines; a small in-memory
+  summary per file (time range, levels, sources, request/trace ids) means
+  only files that can match a query are read
+
+The store is used from the event loop only (the LogAggregator consumer
+appends, queries read); spilled files are written and read on one worker
+thread.
+
+Author: Backend Architect
+Feature: Indexed Log Store
+"""
+
+import json
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Set
+
+from app.core.logging import get_logger
+
+if TYPE_CHECKING:
+    from app.services.log_aggregator import LogEntry
+
+logger = get_logger(__name__)
+
+# Word tokens indexed for full-text search
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> Set[str]:
+    """Lowercased word tokens of a text."""
+    return set(_TOKEN_PATTERN.findall(text.lower()))
+
+
+class LogQuery:
+    """Filters for a log store query (all conditions are ANDed).
+
+    Attributes:
+        level: Exact log level (case-insensitive)
+        source: Substring of the logger name (case-insensitive)
+        search: Substring of the message (case-insensitive)
+        text: Words that must all appear in the message (token index)
+        request_id: Exact request ID
+        trace_id: Exact trace ID
+        start_time: Oldest timestamp (ISO 8601, inclusive)
+        end_time: Newest timestamp (ISO 8601, inclusive)
+    """
+
+    def __init__(
+        self,
+        level: Optional[str] = None,
+        source: Optional[str] = None,
+        search: Optional[str] = None,
+        text: Optional[str] = None,
+        request_id: Optional[str] = None,
+        trace_id: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+    ):
+        """Initialize query filters (None disables a filter)."""
+        self.level = level.upper() if level else None
+        self.source = source.lower() if source else None
+        self.search = search.lower() if search else None
+        self.tokens = tokenize(text) if text else set()
+        self.request_id = request_id
+        self.trace_id = trace_id
+        self.start_time = start_time
+        self.end_time = end_time
+
+    def matches(self, entry: "LogEntry") -> bool:
+        """Check every filter against one entry."""
+        if self.level and entry.level.upper() != self.level:
+            return False
+        if self.request_id and entry.request_id != self.request_id:
+            return False
+        if self.trace_id and entry.trace_id != self.trace_id:
+            return False
+        if self.start_time and entry.timestamp < self.start_time:
+            return False
+        if self.end_time and entry.timestamp > self.end_time:
+            return False
+        if self.source and self.source not in entry.source.lower():
+            return False
+        message = entry.message.lower()
+        if self.search and self.search not in message:
+            return False
+        if self.tokens and not self.tokens <= tokenize(message):
+            return False
+        return True
+
+
+class _Segment:
+    """Fixed-capacity run of entries with per-segment indexes."""
+
+    def __init__(self, full_text: bool):
+        self.entries: List["LogEntry"] = []
+        self.timestamps: List[str] = []
+        self.ordered = True  # Timestamps non-decreasing (binary search allowed)
+        self.by_level: Dict[str, List[int]] = {}
+        self.by_source: Dict[str, List[int]] = {}
+        self.by_request: Dict[str, List[int]] = {}
+        self.by_trace: Dict[str, List[int]] = {}
+        self.by_token: Optional[Dict[str, List[int]]] = {} if full_text else None
+
+    def append(self, entry: "LogEntry") -> None:
+        offset = len(self.entries)
+        if self.timestamps and entry.timestamp < self.timestamps[-1]:
+            self.ordered = False
+        self.entries.append(entry)
+        self.timestamps.append(entry.timestamp)
+        self.by_level.setdefault(entry.level.upper(), []).append(offset)
+        self.by_source.setdefault(entry.source, []).append(offset)
+        if entry.request_id:
+            self.by_request.setdefault(entry.request_id, []).append(offset)
+        if entry.trace_id:
+            self.by_trace.setdefault(entry.trace_id, []).append(offset)
+        if self.by_token is not None:
+            for token in tokenize(entry.message):
+                self.by_token.setdefault(token, []).append(offset)
+
+    def search(self, query: LogQuery) -> Iterator["LogEntry"]:
+        """Yield matching entries, newest first."""
+        if not self.entries:
+            return
+        if query.start_time and self.ordered and self.timestamps[-1] < query.start_time:
+            return
+        if query.end_time and self.ordered and self.timestamps[0] > query.end_time:
+            return
+
+        candidates = self._candidates(query)
+        if candidates is None:
+            # No usable index: seek the time range, then scan it
+            low, high = 0, len(self.entries)
+            if self.ordered:
+                if query.start_time:
+                    low = bisect_left(self.timestamps, query.start_time)
+                if query.end_time:
+                    high = bisect_right(self.timestamps, query.end_time)
+            candidates = range(low, high)
+
+        for offset in reversed(candidates):
+            entry = self.entries[offset]
+            if query.matches(entry):
+                yield entry
+
+    def _candidates(self, query: LogQuery) -> Optional[List[int]]:
+        """Smallest index posting list for the query (None if no index applies)."""
+        postings: List[List[int]] = []
+        if query.request_id:
+            postings.append(self.by_request.get(query.request_id, []))
+        if query.trace_id:
+            postings.append(self.by_trace.get(query.trace_id, []))
+        if query.level:
+            postings.append(self.by_level.get(query.level, []))
+        if query.tokens and self.by_token is not None:
+            postings.extend(self.by_token.get(token, []) for token in query.tokens)
+        if query.source:
+            matching = [
+                offsets
+                for source, offsets in self.by_source.items()
+                if query.source in source.lower()
+            ]
+            postings.append(
+                matching[0] if len(matching) == 1 else sorted(o for p in matching for o in p)
+            )
+        if not postings:
+            return None
+        return min(postings, key=len)
+
+
+class _SpilledSegment:
+    """Summary of a segment written to disk."""
+
+    def __init__(self, path: Path, segment: _Segment, written: Future):
+        self.path = path
+        self.count = len(segment.entries)
+        self.first_time = min(segment.timestamps)
+        self.last_time = max(segment.timestamps)
+        self.levels = set(segment.by_level)
+        self.sources = set(segment.by_source)
+        self.request_ids = set(segment.by_request)
+        self.trace_ids = set(segment.by_trace)
+        self.written = written
+
+    def may_match(self, query: LogQuery) -> bool:
+        """Whether the segment can contain a match (no false negatives)."""
+        if query.request_id and query.request_id not in self.request_ids:
+            return False
+        if query.trace_id and query.trace_id not in self.trace_ids:
+            return False
+        if query.level and query.level not in self.levels:
+            return False
+        if query.start_time and self.last_time < query.start_time:
+            return False
+        if query.end_time and self.first_time > query.end_time:
+            return False
+        if query.source and not any(query.source in s.lower() for s in self.sources):
+            return False
+        return True
+
+
+class LogStore:
+    """Segmented in-memory log store with secondary indexes.
+
+    Attributes:
+        max_entries: Entries kept in memory (whole segments are evicted)
+        segment_size: Entries per segment
+        full_text: Whether message tokens are indexed
+        spill_dir: Directory evicted segments are written to (None to discard)
+        max_spilled_segments: Spilled files kept before the oldest is deleted
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 200_000,
+        segment_size: int = 10_000,
+        full_text: bool = True,
+        spill_dir: Optional[Path] = None,
+        max_spilled_segments: int = 100,
+    ):
+        """Initialize an empty store.
+
+        Args:
+            max_entries: Entries kept in memory (whole segments are evicted)
+            segment_size: Entries per segment
+            full_text: Whether message tokens are indexed
+            spill_dir: Directory evicted segments are written to (None to discard)
+            max_spilled_segments: Spilled files kept before the oldest is deleted
+        """
+        self.segment_size = max(1, min(segment_size, max_entries))
+        self.max_entries = max(max_entries, self.segment_size)
+        self.full_text = full_text
+        self.spill_dir = spill_dir
+        self.max_spilled_segments = max_spilled_segments
+        self._segments: List[_Segment] = [_Segment(full_text)]
+        self._spilled: List[_SpilledSegment] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._spill_sequence = 0
+        self._size = 0
+        self.level_counts: Counter = Counter()
+        self.source_counts: Counter = Counter()
+
+    def __len__(self) -> int:
+        """Entries held in memory."""
+        return self._size
+
+    @property
+    def oldest(self) -> Optional["LogEntry"]:
+        """Oldest entry held in memory."""
+        for segment in self._segments:
+            if segment.entries:
+                return segment.entries[0]
+        return None
+
+    @property
+    def newest(self) -> Optional["LogEntry"]:
+        """Newest entry held in memory."""
+        return self._segments[-1].entries[-1] if self._size else None
+
+    def extend(self, entries: Iterable["LogEntry"]) -> None:
+        """Append entries, evicting the oldest segment when over capacity."""
+        for entry in entries:
+            segment = self._segments[-1]
+            if len(segment.entries) >= self.segment_size:
+                segment = _Segment(self.full_text)
+                self._segments.append(segment)
+                if self._size + self.segment_size > self.max_entries:
+                    self._evict_oldest()
+            segment.append(entry)
+            self._size += 1
+            self.level_counts[entry.level] += 1
+            self.source_counts[entry.source] += 1
+
+    def query(self, query: LogQuery, limit: int) -> List["LogEntry"]:
+        """Return up to ``limit`` matching in-memory entries, newest first."""
+        results: List["LogEntry"] = []
+        for segment in reversed(self._segments):
+            for entry in segment.search(query):
+                results.append(entry)
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def spilled_candidates(self, query: LogQuery) -> List[_SpilledSegment]:
+        """Spilled segments that may contain matches, newest first."""
+        return [spilled for spilled in reversed(self._spilled) if spilled.may_match(query)]
+
+    def read_spilled(
+        self, spilled: _SpilledSegment, query: LogQuery, limit: int
+    ) -> List["LogEntry"]:
+        """Read matching entries from a spilled segment, newest first (blocking)."""
+        from app.services.log_aggregator import LogEntry
+
+        spilled.written.result()
+        results: List["LogEntry"] = []
+        if not spilled.path.exists():
+            return results
+        with spilled.path.open(encoding="utf-8") as file:
+            lines = file.readlines()
+        for line in reversed(lines):
+            entry = LogEntry.from_dict(json.loads(line))
+            if query.matches(entry):
+                results.append(entry)
+                if len(results) >= limit:
+                    break
+        return results
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Worker thread for spilled segment I/O."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-store")
+        return self._executor
+
+    def clear(self) -> None:
+        """Remove all entries, including spilled segments."""
+        spilled, self._spilled = self._spilled, []
+        if spilled:
+            self.executor.submit(self._delete_files, [s.path for s in spilled])
+        self._segments = [_Segment(self.full_text)]
+        self._size = 0
+        self.level_counts.clear()
+        self.source_counts.clear()
+
+    def close(self) -> None:
+        """Finish pending disk writes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Segment and spill counts."""
+        return {
+            "segments": len(self._segments),
+            "spilled_segments": len(self._spilled),
+            "spilled_entries": sum(spilled.count for spilled in self._spilled),
+        }
+
+    def _evict_oldest(self) -> None:
+        segment = self._segments.pop(0)
+        self._size -= len(segment.entries)
+        for level, offsets in segment.by_level.items():
+            self._decrement(self.level_counts, segment.entries[offsets[0]].level, len(offsets))
+        for source, offsets in segment.by_source.items():
+            self._decrement(self.source_counts, source, len(offsets))
+
+        if self.spill_dir is None or not segment.entries:
+            return
+
+        self._spill_sequence += 1
+        path = self.spill_dir / f"logs-{self._spill_sequence:08d}.jsonl"
+        lines = [json.dumps(entry.to_dict()) for entry in segment.entries]
+        written = self.executor.submit(self._write_file, path, lines)
+        self._spilled.append(_SpilledSegment(path, segment, written))
+
+        if len(self._spilled) > self.max_spilled_segments:
+            expired = self._spilled.pop(0)
+            self.executor.submit(self._delete_files, [expired.path])
+
+    @staticmethod
+    def _decrement(counter: Counter, key: str, count: int) -> None:
+        counter[key] -= count
+        if counter[key] <= 0:
+            del counter[key]
+
+    @staticmethod
+    def _write_file(path: Path, lines: List[str]) -> None:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("w", encoding="utf-8") as file:
+                file.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logger.error(f"Failed to spill log segment to {path}: {e}")
+
+    @staticmethod
+    def _delete_files(paths: List[Path]) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
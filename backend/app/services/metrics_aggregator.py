@@ -1,20 +1,24 @@
 """Metrics aggregation service for time-series storage.
 
 This module provides a time-series storage system with:
-- Ring buffer pattern for fixed memory usage (30-day retention)
-- Thread-safe operations with asyncio.Lock
-- Downsampling for long time ranges
+- Columnar numpy ring buffers of recent raw points
+- Binary-searched time windows and dictionary-encoded metadata columns
+- Write-time 1m/10m/1h rollups with quantile sketches (30-day retention)
 - Filtering by model_id, tier, query_mode
 - Statistical aggregation (min/max/avg/percentiles)
+- Queries computed off the event loop on snapshots, never blocking writers
+- Optional on-disk history (MetricsStore) restored in the background on startup
 """
 
 import asyncio
-import statistics
+import itertools
+import math
 import time
-from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Callable, Deque, Literal, Optional
+from typing import Any, Callable, Literal, Optional
+
+import numpy as np
 
 from app.core.logging import get_logger
 from app.models.timeseries import (
@@ -29,6 +33,8 @@ from app.models.timeseries import (
     TimeSeriesPoint,
     TimeSeriesResponse,
 )
+from app.services.metrics_store import MetricsStore
+from app.services.quantile_sketch import QuantileSketch
 
 logger = get_logger(__name__)
 
@@ -70,63 +76,399 @@ def _resolve_model_name(model_id: str) -> str:
     return model_id
 
 
+class _Dictionary:
+    """Dictionary encoding of an optional string column (None is encoded as -1).
+
+    Codes are only ever appended, so snapshots taken earlier stay decodable.
+    """
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def encode(self, value: Optional[str]) -> int:
+        """Get the code of a value, adding it on first use."""
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+    def lookup(self, value: str) -> int:
+        """Get the code of a value for filtering (-2 matches nothing if unknown)."""
+        return self.codes.get(value, -2)
+
+    def decode(self, code: int) -> Optional[str]:
+        """Get the value of a code."""
+        return self.values[code] if code >= 0 else None
+
+    def copy(self) -> "_Dictionary":
+        """Get an independent copy with the same codes."""
+        dictionary = _Dictionary()
+        dictionary.codes = dict(self.codes)
+        dictionary.values = list(self.values)
+        return dictionary
+
+
 @dataclass
-class MetricDataPoint:
-    """Internal metric data point structure.
+class _Window:
+    """Column snapshot of a metric's data points (oldest first).
+
+    Attributes:
+        timestamps: Unix timestamps
+        values: Metric values
+        model_ids: Dictionary-encoded model identifiers
+        tiers: Dictionary-encoded tiers
+        query_modes: Dictionary-encoded query modes
+    """
+
+    timestamps: np.ndarray
+    values: np.ndarray
+    model_ids: np.ndarray
+    tiers: np.ndarray
+    query_modes: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def select(self, index: np.ndarray) -> "_Window":
+        """Get the points selected by a boolean mask or index array."""
+        return _Window(
+            timestamps=self.timestamps[index],
+            values=self.values[index],
+            model_ids=self.model_ids[index],
+            tiers=self.tiers[index],
+            query_modes=self.query_modes[index],
+        )
+
+
+class MetricColumns:
+    """Columnar ring buffer holding one metric's data points.
+
+    Points are stored oldest first in parallel numpy arrays (timestamps and
+    values as float64, model/tier/mode as dictionary codes), so time windows
+    are found with a binary search and reads copy contiguous slices. Arrays
+    grow on demand up to slightly above ``capacity``; when the end is reached
+    the live points are moved back to the front (amortized O(1) appends).
 
     Attributes:
-        timestamp: Unix timestamp
-        value: Metric value
-        model_id: Optional model identifier
-        tier: Optional tier (Q2, Q3, Q4)
-        query_mode: Optional query mode
+        capacity: Maximum number of points kept (oldest are evicted)
     """
 
-    timestamp: float
-    value: float
-    model_id: Optional[str] = None
-    tier: Optional[Literal["Q2", "Q3", "Q4"]] = None
-    query_mode: Optional[str] = None
+    _COLUMNS = (
+        ("timestamps", np.float64),
+        ("values", np.float64),
+        ("model_ids", np.int32),
+        ("tiers", np.int32),
+        ("query_modes", np.int32),
+    )
+
+    def __init__(self, capacity: int, initial_size: int = 1024) -> None:
+        """Initialize an empty buffer.
+
+        Args:
+            capacity: Maximum number of points kept
+            initial_size: Points allocated up front
+        """
+        self.capacity = capacity
+        self._max_allocated = capacity + max(capacity // 4, 1)
+        self._allocated = min(initial_size, self._max_allocated)
+        for name, dtype in self._COLUMNS:
+            setattr(self, name, np.empty(self._allocated, dtype=dtype))
+        self._head = 0
+        self._tail = 0
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def append(
+        self, timestamp: float, value: float, model_id: int, tier: int, query_mode: int
+    ) -> float:
+        """Append a data point (dictionary codes for model, tier and mode).
+
+        Returns:
+            Stored timestamp (never earlier than the previous point's)
+        """
+        if self._tail == self._allocated:
+            self._make_room()
+
+        # Keep timestamps sorted for binary search, even if the clock steps back
+        if self._tail > self._head:
+            timestamp = max(timestamp, float(self.timestamps[self._tail - 1]))
+
+        i = self._tail
+        self.timestamps[i] = timestamp
+        self.values[i] = value
+        self.model_ids[i] = model_id
+        self.tiers[i] = tier
+        self.query_modes[i] = query_mode
+        self._tail += 1
+
+        if self._tail - self._head > self.capacity:
+            self._head += 1
+        return timestamp
+
+    def window(self, start: float) -> _Window:
+        """Copy the points with ``timestamp >= start``.
+
+        Args:
+            start: Window start (Unix timestamp)
+
+        Returns:
+            Snapshot independent of later appends
+        """
+        first = self._head + int(
+            np.searchsorted(self.timestamps[self._head : self._tail], start, side="left")
+        )
+        return _Window(
+            *(getattr(self, name)[first : self._tail].copy() for name, _ in self._COLUMNS)
+        )
+
+    def drop_before(self, cutoff: float) -> int:
+        """Evict points older than ``cutoff``.
+
+        Returns:
+            Number of points evicted
+        """
+        count = int(np.searchsorted(self.timestamps[self._head : self._tail], cutoff, side="left"))
+        self._head += count
+        return count
+
+    def _make_room(self) -> None:
+        """Grow the arrays, or move the live points to the front."""
+        size = len(self)
+        if size >= self._allocated // 2 and self._allocated < self._max_allocated:
+            self._allocated = min(self._allocated * 2, self._max_allocated)
+            for name, dtype in self._COLUMNS:
+                column = np.empty(self._allocated, dtype=dtype)
+                column[:size] = getattr(self, name)[self._head : self._tail]
+                setattr(self, name, column)
+        else:
+            for name, _ in self._COLUMNS:
+                column = getattr(self, name)
+                column[:size] = column[self._head : self._tail]
+        self._head = 0
+        self._tail = size
+
+
+# Write-time rollup tiers: (bucket seconds, retention seconds); None keeps the
+# buckets for the aggregator's full retention
+_ROLLUP_TIERS: tuple[tuple[int, Optional[int]], ...] = (
+    (60, 6 * 3600),  # 1 minute
+    (600, 24 * 3600),  # 10 minutes
+    (3600, None),  # 1 hour
+)
+
+# Rollup tier (bucket seconds) answering each long time range; shorter ranges
+# are answered from raw points
+_RANGE_ROLLUPS = {
+    TimeRange.TWENTY_FOUR_HOURS: 600,
+    TimeRange.SEVEN_DAYS: 3600,
+    TimeRange.THIRTY_DAYS: 3600,
+}
+
+# Rollup group key: (model_id, tier, query_mode) dictionary codes
+_Group = tuple[int, int, int]
+
+
+class RollupBucket:
+    """Aggregate of one group's values within one time bucket.
+
+    Attributes:
+        count: Number of values
+        total: Sum of values
+        minimum: Smallest value
+        maximum: Largest value
+        first_timestamp: Timestamp of the first value
+        sketch: Quantile sketch of the values
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "first_timestamp", "sketch")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.first_timestamp = math.inf
+        self.sketch = QuantileSketch()
+
+    def add(self, timestamp: float, value: float) -> None:
+        """Add a value."""
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+        self.first_timestamp = min(self.first_timestamp, timestamp)
+        self.sketch.add(value)
+
+    def merge(self, other: "RollupBucket") -> None:
+        """Add another bucket's values."""
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self.first_timestamp = min(self.first_timestamp, other.first_timestamp)
+        self.sketch.merge(other.sketch)
+
+    def copy(self) -> "RollupBucket":
+        """Get an independent copy."""
+        bucket = RollupBucket()
+        bucket.merge(self)
+        return bucket
+
+
+class MetricRollups:
+    """Rollup of one metric into fixed-width time buckets per group.
+
+    Maintained at write time, so long-range queries read O(buckets) instead
+    of O(points).
+
+    Attributes:
+        resolution: Bucket width in seconds
+        retention_seconds: How long buckets are kept
+        groups: Buckets by group, then by bucket start (oldest first)
+    """
+
+    def __init__(self, resolution: int, retention_seconds: int) -> None:
+        """Initialize empty rollups.
+
+        Args:
+            resolution: Bucket width in seconds
+            retention_seconds: How long buckets are kept
+        """
+        self.resolution = resolution
+        self.retention_seconds = retention_seconds
+        self.groups: dict[_Group, dict[int, RollupBucket]] = {}
+
+    def add(self, timestamp: float, value: float, group: _Group) -> None:
+        """Add a value to its group's bucket."""
+        start = int(timestamp // self.resolution) * self.resolution
+        buckets = self.groups.setdefault(group, {})
+        bucket = buckets.get(start)
+        if bucket is None:
+            bucket = buckets[start] = RollupBucket()
+        bucket.add(timestamp, value)
+
+    def snapshot(self, start: float) -> list[tuple[_Group, int, RollupBucket]]:
+        """Get the buckets overlapping ``[start, now)``.
+
+        Timestamps never go back, so only each group's newest bucket can
+        still change; it is copied, older buckets are shared.
+
+        Args:
+            start: Window start (Unix timestamp)
+
+        Returns:
+            (group, bucket start, bucket) entries
+        """
+        first_start = int(start // self.resolution) * self.resolution
+        entries = []
+        for group, buckets in self.groups.items():
+            newest = next(reversed(buckets))
+            for bucket_start, bucket in buckets.items():
+                if bucket_start >= first_start:
+                    if bucket_start == newest:
+                        bucket = bucket.copy()
+                    entries.append((group, bucket_start, bucket))
+        return entries
+
+    def expire(self, now: float) -> int:
+        """Drop buckets that ended before the retention window.
+
+        Returns:
+            Number of buckets dropped
+        """
+        cutoff = now - self.retention_seconds
+        removed = 0
+        for group in list(self.groups):
+            buckets = self.groups[group]
+            expired = list(
+                itertools.takewhile(lambda start: start + self.resolution <= cutoff, buckets)
+            )
+            for bucket_start in expired:
+                del buckets[bucket_start]
+            removed += len(expired)
+            if not buckets:
+                del self.groups[group]
+        return removed
 
 
 class MetricsAggregator:
     """Time-series metrics storage and aggregation service.
 
-    This service maintains ring buffers of metric data with 30-day retention,
-    providing efficient storage and retrieval with downsampling support.
+    This service keeps recent raw points in columnar ring buffers and rolls
+    every point up at write time into 1-minute, 10-minute and 1-hour buckets
+    (count/sum/min/max and a mergeable quantile sketch per model, tier and
+    query mode). Short ranges (1h, 6h) are answered from raw points; long
+    ranges (24h, 7d, 30d) from rollups, in O(buckets) instead of O(points),
+    with 30-day retention.
+
+    Recording a point never awaits; queries copy what they need on the event
+    loop and compute in a worker thread, so dashboard reads never hold up
+    record_metric on the query path.
 
     Attributes:
         max_retention_seconds: Maximum data retention in seconds (default 30 days)
-        lock: Async lock for thread-safe operations
-        metrics: Dictionary of metric buffers by metric type
+        raw_retention_seconds: Raw point retention in seconds (default 6 hours)
+        metrics: Columnar raw point buffer by metric type
+        rollups: Rollups by metric type, then bucket width in seconds
+        store: On-disk history every recorded point is appended to (optional)
     """
 
     def __init__(
         self,
         max_retention_seconds: int = 30 * 24 * 60 * 60,  # 30 days
+        max_points_per_metric: int = 500_000,
+        raw_retention_seconds: int = 6 * 60 * 60,  # 6 hours
     ) -> None:
         """Initialize metrics aggregator.
 
         Args:
             max_retention_seconds: Maximum data retention in seconds (default 30 days)
+            max_points_per_metric: Raw ring buffer capacity per metric type
+            raw_retention_seconds: Raw point retention in seconds; must cover
+                the longest range answered from raw points (6 hours)
         """
         self.max_retention_seconds = max_retention_seconds
-        self.lock = asyncio.Lock()
+        self.max_points_per_metric = max_points_per_metric
+        self.raw_retention_seconds = raw_retention_seconds
+
+        # Raw storage: {metric_type: MetricColumns}
+        # Raw points are only needed for the 1h/6h ranges
+        self.metrics: dict[MetricType, MetricColumns] = {
+            metric_type: MetricColumns(capacity=max_points_per_metric) for metric_type in MetricType
+        }
 
-        # Metric storage: {metric_type: deque[MetricDataPoint]}
-        # Ring buffer with maxlen for automatic eviction
-        # Estimate: ~1 point/query * 10k queries/day * 30 days = 300k points max
-        self.metrics: dict[MetricType, Deque[MetricDataPoint]] = {
-            metric_type: deque(maxlen=500_000)  # ~300k expected, 500k for safety
+        # Rollup storage: {metric_type: {bucket_seconds: MetricRollups}}
+        self.rollups: dict[MetricType, dict[int, MetricRollups]] = {
+            metric_type: {
+                resolution: MetricRollups(resolution, retention or max_retention_seconds)
+                for resolution, retention in _ROLLUP_TIERS
+            }
             for metric_type in MetricType
         }
 
+        # Dictionaries shared by all metric buffers
+        self._model_ids = _Dictionary()
+        self._tiers = _Dictionary()
+        self._query_modes = _Dictionary()
+
+        # On-disk history; points recorded while it loads are replayed on top
+        self.store: Optional[MetricsStore] = None
+        self._replay: Optional[list[tuple]] = None
+        self._history_task: Optional[asyncio.Task] = None
+
         # TTL cleanup task handle
         self._cleanup_task: Optional[asyncio.Task] = None
 
         logger.info(
             f"MetricsAggregator initialized with {max_retention_seconds}s retention "
-            f"(~{max_retention_seconds / (24 * 60 * 60):.1f} days)"
+            f"(~{max_retention_seconds / (24 * 60 * 60):.1f} days, "
+            f"raw points {raw_retention_seconds}s)"
         )
 
     async def start(self) -> None:
@@ -135,15 +477,75 @@ class MetricsAggregator:
         logger.info("MetricsAggregator started with TTL cleanup task")
 
     async def stop(self) -> None:
-        """Stop the metrics aggregator and cleanup task."""
-        if self._cleanup_task:
-            self._cleanup_task.cancel()
-            try:
-                await self._cleanup_task
-            except asyncio.CancelledError:
-                pass
+        """Stop the metrics aggregator, cleanup task and any history load."""
+        for task in (self._cleanup_task, self._history_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
         logger.info("MetricsAggregator stopped")
 
+    def attach_store(self, store: MetricsStore) -> None:
+        """Persist recorded points to a store and load its history in the background.
+
+        The aggregator serves (initially empty) queries while the history
+        loads; the restored data replaces the in-memory buffers once ready.
+
+        Args:
+            store: Started MetricsStore
+        """
+        self.store = store
+        self._history_task = asyncio.create_task(self.load_history(store))
+
+    async def load_history(self, store: MetricsStore) -> None:
+        """Restore raw points and rollups from the store.
+
+        History is rebuilt into a fresh aggregator on the store thread; points
+        recorded meanwhile are replayed on top before it is swapped in.
+
+        Args:
+            store: Started MetricsStore
+        """
+        started = time.time()
+        fresh = MetricsAggregator(
+            max_retention_seconds=self.max_retention_seconds,
+            max_points_per_metric=self.max_points_per_metric,
+            raw_retention_seconds=self.raw_retention_seconds,
+        )
+        # Keep existing codes valid for snapshots taken before the swap
+        fresh._model_ids = self._model_ids.copy()
+        fresh._tiers = self._tiers.copy()
+        fresh._query_modes = self._query_modes.copy()
+
+        until = time.time()
+        self._replay = []
+        try:
+            await store.flush()
+            loaded = await store.run(fresh._ingest_history, store, until)
+
+            for point in self._replay:
+                fresh._ingest(*point)
+        except Exception as e:
+            logger.error(f"Failed to load metrics history: {e}", exc_info=True)
+            return
+        finally:
+            replayed = len(self._replay)
+            self._replay = None
+
+        self.metrics = fresh.metrics
+        self.rollups = fresh.rollups
+        self._model_ids = fresh._model_ids
+        self._tiers = fresh._tiers
+        self._query_modes = fresh._query_modes
+
+        logger.info(
+            f"Restored {loaded} metric points from history "
+            f"({replayed} replayed) in {time.time() - started:.2f}s",
+            extra={"loaded": loaded, "replayed": replayed},
+        )
+
     async def record_metric(
         self,
         metric_name: MetricType,
@@ -152,42 +554,99 @@ class MetricsAggregator:
     ) -> None:
         """Record a metric data point.
 
-        Thread-safe method to record a metric with optional metadata.
+        Appends to the metric's raw buffer and rollups without awaiting, so it
+        never waits for readers.
 
         Args:
             metric_name: Type of metric to record
             value: Metric value
             metadata: Optional metadata (model_id, tier, query_mode)
         """
-        async with self.lock:
-            now = time.time()
-
-            # Extract metadata
-            model_id = metadata.get("model_id") if metadata else None
-            tier = metadata.get("tier") if metadata else None
-            query_mode = metadata.get("query_mode") if metadata else None
-
-            # Create data point
-            data_point = MetricDataPoint(
-                timestamp=now,
-                value=value,
-                model_id=model_id,
-                tier=tier,
-                query_mode=query_mode,
-            )
+        now = time.time()
+
+        # Extract metadata
+        model_id = metadata.get("model_id") if metadata else None
+        tier = metadata.get("tier") if metadata else None
+        query_mode = metadata.get("query_mode") if metadata else None
+
+        point = (metric_name, now, value, model_id, tier, query_mode)
+        timestamp = self._ingest(*point)
+
+        if self.store is not None:
+            self.store.append_point(timestamp, metric_name.value, value, model_id, tier, query_mode)
+        if self._replay is not None:
+            self._replay.append(point)
+
+        logger.debug(
+            f"Recorded metric: {metric_name.value}={value:.2f}",
+            extra={
+                "metric": metric_name.value,
+                "value": value,
+                "model_id": model_id,
+                "tier": tier,
+            },
+        )
+
+    def _ingest(
+        self,
+        metric_name: MetricType,
+        timestamp: float,
+        value: float,
+        model_id: Optional[str],
+        tier: Optional[str],
+        query_mode: Optional[str],
+        now: Optional[float] = None,
+    ) -> float:
+        """Append a point to the raw buffer and rollups.
 
+        Args:
+            metric_name: Type of metric
+            timestamp: Unix timestamp of the point
+            value: Metric value
+            model_id: Model identifier
+            tier: Tier
+            query_mode: Query mode
+            now: Load time for historical points, which are only added where
+                retention would still hold them (None for live points)
+
+        Returns:
+            Stored timestamp (clamped to keep the raw buffer sorted)
+        """
+        group = (
+            self._model_ids.encode(model_id),
+            self._tiers.encode(tier),
+            self._query_modes.encode(query_mode),
+        )
+
+        rollups = self.rollups[metric_name].values()
+        if now is None:
             # Append to ring buffer (automatically evicts oldest if at capacity)
-            self.metrics[metric_name].append(data_point)
+            timestamp = self.metrics[metric_name].append(timestamp, value, *group)
+        else:
+            if timestamp >= now - self.raw_retention_seconds:
+                timestamp = self.metrics[metric_name].append(timestamp, value, *group)
+            rollups = [r for r in rollups if timestamp >= now - r.retention_seconds]
 
-            logger.debug(
-                f"Recorded metric: {metric_name.value}={value:.2f}",
-                extra={
-                    "metric": metric_name.value,
-                    "value": value,
-                    "model_id": model_id,
-                    "tier": tier,
-                },
-            )
+        for rollup in rollups:
+            rollup.add(timestamp, value, group)
+        return timestamp
+
+    def _ingest_history(self, store: MetricsStore, until: float) -> int:
+        """Add the store's points recorded before ``until`` (store thread).
+
+        Returns:
+            Number of points added
+        """
+        loaded = 0
+        for rows in store.iter_points(until - self.max_retention_seconds, until):
+            for timestamp, metric, value, model_id, tier, query_mode in rows:
+                try:
+                    metric_name = MetricType(metric)
+                except ValueError:
+                    continue  # Metric type no longer exists
+                self._ingest(metric_name, timestamp, value, model_id, tier, query_mode, until)
+                loaded += 1
+        return loaded
 
     async def get_time_series(
         self,
@@ -199,7 +658,8 @@ class MetricsAggregator:
     ) -> TimeSeriesResponse:
         """Get time-series data for a metric.
 
-        Thread-safe method to retrieve time-series data with filtering.
+        Long ranges return one point per rollup bucket (10 minutes for 24h,
+        1 hour for 7d/30d) with the bucket average.
 
         Args:
             metric_name: Type of metric to retrieve
@@ -211,60 +671,22 @@ class MetricsAggregator:
         Returns:
             TimeSeriesResponse with filtered and potentially downsampled data
         """
-        async with self.lock:
-            # Calculate time window
-            window_seconds = self._time_range_to_seconds(time_range)
-            now = time.time()
-            window_start = now - window_seconds
-
-            # Get metric buffer
-            buffer = self.metrics[metric_name]
-
-            # Filter data points
-            filtered_points = [
-                point
-                for point in buffer
-                if point.timestamp >= window_start
-                and (model_id is None or point.model_id == model_id)
-                and (tier is None or point.tier == tier)
-                and (query_mode is None or point.query_mode == query_mode)
-            ]
-
-            # Downsample if necessary
-            data_points = self._downsample(filtered_points, time_range)
-
-            # Calculate summary statistics
-            values = [p.value for p in filtered_points]
-            summary = (
-                self._calculate_summary(values)
-                if values
-                else MetricsSummary(min=0.0, max=0.0, avg=0.0, p50=0.0, p95=0.0, p99=0.0)
+        filters = (model_id, tier, query_mode)
+        entries = self._rollup_snapshot(metric_name, time_range)
+        if entries is not None:
+            return await self._run(
+                self._build_rollup_time_series, entries, metric_name, time_range, filters
             )
 
-            # Convert to response format
-            unit = self._get_metric_unit(metric_name)
-            return TimeSeriesResponse(
-                metric_name=metric_name.value,
-                time_range=time_range.value,
-                unit=unit,
-                data_points=[
-                    TimeSeriesPoint(
-                        timestamp=datetime.fromtimestamp(p.timestamp, tz=timezone.utc).isoformat(),
-                        value=round(p.value, 2),
-                        metadata={
-                            "model_id": p.model_id,
-                            "tier": p.tier,
-                            "query_mode": p.query_mode,
-                        },
-                    )
-                    for p in data_points
-                ],
-                summary=summary,
-            )
+        window = self._snapshot(metric_name, time_range)
+        return await self._run(self._build_time_series, window, metric_name, time_range, filters)
 
     async def get_summary(self, metric_name: MetricType, time_range: TimeRange) -> MetricsSummary:
         """Get statistical summary for a metric.
 
+        Percentiles of long ranges are estimated from quantile sketches (1%
+        relative error); min/max/avg are exact.
+
         Args:
             metric_name: Type of metric
             time_range: Time range for data
@@ -272,29 +694,20 @@ class MetricsAggregator:
         Returns:
             MetricsSummary with min/max/avg/percentiles
         """
-        async with self.lock:
-            # Calculate time window
-            window_seconds = self._time_range_to_seconds(time_range)
-            now = time.time()
-            window_start = now - window_seconds
-
-            # Get metric buffer
-            buffer = self.metrics[metric_name]
-
-            # Filter data points
-            values = [point.value for point in buffer if point.timestamp >= window_start]
-
-            return (
-                self._calculate_summary(values)
-                if values
-                else MetricsSummary(min=0.0, max=0.0, avg=0.0, p50=0.0, p95=0.0, p99=0.0)
-            )
+        entries = self._rollup_snapshot(metric_name, time_range)
+        if entries is not None:
+            return await self._run(self._rollup_summary, [bucket for _, _, bucket in entries])
+
+        window = self._snapshot(metric_name, time_range)
+        return await self._run(self._calculate_summary, window.values)
 
     async def get_comparison(
         self, metric_names: list[MetricType], time_range: TimeRange
     ) -> MultiMetricResponse:
         """Get multi-metric comparison data in Chart.js format.
 
+        Buckets are aligned to the bucket interval and averaged from rollups.
+
         Args:
             metric_names: List of metric types to compare
             time_range: Time range for data
@@ -302,60 +715,20 @@ class MetricsAggregator:
         Returns:
             MultiMetricResponse with Chart.js compatible data
         """
-        async with self.lock:
-            # Calculate time window
-            window_seconds = self._time_range_to_seconds(time_range)
-            now = time.time()
-            window_start = now - window_seconds
-
-            # Determine bucket interval for alignment
-            bucket_interval = self._get_bucket_interval(time_range)
-
-            # Create aligned time buckets
-            bucket_count = int(window_seconds / bucket_interval)
-            bucket_timestamps = [now - (i * bucket_interval) for i in range(bucket_count, -1, -1)]
-
-            # Generate labels
-            labels = [
-                datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() for ts in bucket_timestamps
-            ]
-
-            # Build datasets
-            datasets: list[ChartJSDataset] = []
-
-            for metric_name in metric_names:
-                buffer = self.metrics[metric_name]
-
-                # Filter data points
-                filtered_points = [point for point in buffer if point.timestamp >= window_start]
-
-                # Bucket data points and average
-                bucket_values: list[float] = []
-                for i in range(len(bucket_timestamps) - 1):
-                    bucket_start = bucket_timestamps[i]
-                    bucket_end = bucket_timestamps[i + 1]
-
-                    # Find points in this bucket
-                    bucket_points = [
-                        p.value for p in filtered_points if bucket_start <= p.timestamp < bucket_end
-                    ]
-
-                    # Average or 0 if no data
-                    avg = statistics.mean(bucket_points) if bucket_points else 0.0
-                    bucket_values.append(round(avg, 2))
-
-                datasets.append(
-                    ChartJSDataset(
-                        label=metric_name.value,
-                        data=bucket_values,
-                        metadata={"unit": self._get_metric_unit(metric_name)},
-                    )
-                )
-
-            return MultiMetricResponse(
-                time_range=time_range.value,
-                chart_data=ChartJSData(labels=labels, datasets=datasets),
-            )
+        # Determine bucket interval for alignment
+        bucket_interval = self._get_bucket_interval(time_range)
+        bucket_count = int(self._time_range_to_seconds(time_range) / bucket_interval)
+        end = (int(time.time() // bucket_interval) + 1) * bucket_interval
+        first_bucket = end - bucket_count * bucket_interval
+
+        resolution = self._comparison_resolution(time_range)
+        entries = [
+            (metric_name, self.rollups[metric_name][resolution].snapshot(first_bucket))
+            for metric_name in metric_names
+        ]
+        return await self._run(
+            self._build_comparison, entries, time_range, first_bucket, bucket_count
+        )
 
     async def get_model_breakdown(
         self, metric_name: MetricType, time_range: TimeRange
@@ -369,75 +742,294 @@ class MetricsAggregator:
         Returns:
             ModelBreakdownResponse with per-model statistics
         """
-        async with self.lock:
-            # Calculate time window
-            window_seconds = self._time_range_to_seconds(time_range)
-            now = time.time()
-            window_start = now - window_seconds
-
-            # Get metric buffer
-            buffer = self.metrics[metric_name]
-
-            # Filter data points
-            filtered_points = [
-                point
-                for point in buffer
-                if point.timestamp >= window_start and point.model_id is not None
-            ]
-
-            # Group by model_id
-            model_data: dict[str, list[MetricDataPoint]] = defaultdict(list)
-            for point in filtered_points:
-                if point.model_id:
-                    model_data[point.model_id].append(point)
-
-            # Build per-model breakdowns
-            models: list[ModelBreakdown] = []
-
-            for model_id, points in model_data.items():
-                # Downsample points
-                downsampled = self._downsample(points, time_range)
-
-                # Calculate summary
-                values = [p.value for p in points]
-                summary = self._calculate_summary(values)
-
-                # Determine tier from data
-                tier = points[0].tier or "Q2"  # Default to Q2 if missing
-
-                models.append(
-                    ModelBreakdown(
-                        model_id=model_id,
-                        display_name=_resolve_model_name(model_id),
-                        tier=tier,  # type: ignore
-                        data_points=[
-                            TimeSeriesPoint(
-                                timestamp=datetime.fromtimestamp(
-                                    p.timestamp, tz=timezone.utc
-                                ).isoformat(),
-                                value=round(p.value, 2),
-                                metadata={
-                                    "model_id": p.model_id,
-                                    "tier": p.tier,
-                                    "query_mode": p.query_mode,
-                                },
-                            )
-                            for p in downsampled
-                        ],
-                        summary=summary,
-                    )
+        entries = self._rollup_snapshot(metric_name, time_range)
+        if entries is not None:
+            return await self._run(
+                self._build_rollup_model_breakdown, entries, metric_name, time_range
+            )
+
+        window = self._snapshot(metric_name, time_range)
+        return await self._run(self._build_model_breakdown, window, metric_name, time_range)
+
+    # ------------------------------------------------------------------
+    # Snapshots (event loop)
+    # ------------------------------------------------------------------
+
+    def _window_start(self, time_range: TimeRange) -> float:
+        return time.time() - self._time_range_to_seconds(time_range)
+
+    def _snapshot(self, metric_name: MetricType, time_range: TimeRange) -> _Window:
+        """Copy a metric's raw points within the time range."""
+        return self.metrics[metric_name].window(self._window_start(time_range))
+
+    def _rollup_snapshot(
+        self, metric_name: MetricType, time_range: TimeRange
+    ) -> Optional[list[tuple[_Group, int, RollupBucket]]]:
+        """Get the rollup buckets answering a long time range (None for short ranges)."""
+        resolution = _RANGE_ROLLUPS.get(time_range)
+        if resolution is None:
+            return None
+        return self.rollups[metric_name][resolution].snapshot(self._window_start(time_range))
+
+    def _comparison_resolution(self, time_range: TimeRange) -> int:
+        """Coarsest rollup tier that tiles the range's comparison buckets."""
+        bucket_interval = self._get_bucket_interval(time_range)
+        window_seconds = self._time_range_to_seconds(time_range)
+        return max(
+            resolution
+            for resolution, retention in _ROLLUP_TIERS
+            if bucket_interval % resolution == 0
+            and (retention or self.max_retention_seconds) >= window_seconds
+        )
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a computation over snapshots in the default executor."""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    # ------------------------------------------------------------------
+    # Raw point queries (worker thread, on private snapshots)
+    # ------------------------------------------------------------------
+
+    def _build_time_series(
+        self,
+        window: _Window,
+        metric_name: MetricType,
+        time_range: TimeRange,
+        filters: tuple[Optional[str], Optional[str], Optional[str]],
+    ) -> TimeSeriesResponse:
+        """Filter and summarize a raw point snapshot."""
+        model_id, tier, query_mode = filters
+        mask = np.ones(len(window), dtype=bool)
+        if model_id is not None:
+            mask &= window.model_ids == self._model_ids.lookup(model_id)
+        if tier is not None:
+            mask &= window.tiers == self._tiers.lookup(tier)
+        if query_mode is not None:
+            mask &= window.query_modes == self._query_modes.lookup(query_mode)
+        filtered = window.select(mask)
+
+        return TimeSeriesResponse(
+            metric_name=metric_name.value,
+            time_range=time_range.value,
+            unit=self._get_metric_unit(metric_name),
+            data_points=self._to_points(filtered),
+            summary=self._calculate_summary(filtered.values),
+        )
+
+    def _build_model_breakdown(
+        self, window: _Window, metric_name: MetricType, time_range: TimeRange
+    ) -> ModelBreakdownResponse:
+        """Group a raw point snapshot by model and summarize each group."""
+        window = window.select(window.model_ids >= 0)
+
+        models = []
+        for code in np.unique(window.model_ids).tolist():
+            points = window.select(window.model_ids == code)
+            models.append(
+                self._model_breakdown(code, points, self._calculate_summary(points.values))
+            )
+        return self._model_breakdown_response(models, metric_name, time_range)
+
+    # ------------------------------------------------------------------
+    # Rollup queries (worker thread, on private snapshots)
+    # ------------------------------------------------------------------
+
+    def _build_rollup_time_series(
+        self,
+        entries: list[tuple[_Group, int, RollupBucket]],
+        metric_name: MetricType,
+        time_range: TimeRange,
+        filters: tuple[Optional[str], Optional[str], Optional[str]],
+    ) -> TimeSeriesResponse:
+        """Filter rollup buckets by group and merge them per bucket."""
+        codes = [
+            dictionary.lookup(value) if value is not None else None
+            for dictionary, value in zip((self._model_ids, self._tiers, self._query_modes), filters)
+        ]
+        entries = [
+            entry
+            for entry in entries
+            if all(code is None or code == part for code, part in zip(codes, entry[0]))
+        ]
+
+        return TimeSeriesResponse(
+            metric_name=metric_name.value,
+            time_range=time_range.value,
+            unit=self._get_metric_unit(metric_name),
+            data_points=self._to_points(self._rollup_points(entries)),
+            summary=self._rollup_summary([bucket for _, _, bucket in entries]),
+        )
+
+    def _build_comparison(
+        self,
+        entries: list[tuple[MetricType, list[tuple[_Group, int, RollupBucket]]]],
+        time_range: TimeRange,
+        first_bucket: int,
+        bucket_count: int,
+    ) -> MultiMetricResponse:
+        """Average rollup buckets into the aligned comparison buckets."""
+        bucket_interval = self._get_bucket_interval(time_range)
+        bucket_timestamps = [first_bucket + i * bucket_interval for i in range(bucket_count + 1)]
+
+        # Generate labels
+        labels = [
+            datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() for ts in bucket_timestamps
+        ]
+
+        # Build datasets
+        datasets: list[ChartJSDataset] = []
+
+        for metric_name, metric_entries in entries:
+            # Average or 0 if no data
+            sums = [0.0] * bucket_count
+            counts = [0] * bucket_count
+            for _, bucket_start, bucket in metric_entries:
+                index = (bucket_start - first_bucket) // bucket_interval
+                if 0 <= index < bucket_count:
+                    sums[index] += bucket.total
+                    counts[index] += bucket.count
+
+            datasets.append(
+                ChartJSDataset(
+                    label=metric_name.value,
+                    data=[
+                        round(total / count, 2) if count else 0.0
+                        for total, count in zip(sums, counts)
+                    ],
+                    metadata={"unit": self._get_metric_unit(metric_name)},
                 )
+            )
+
+        return MultiMetricResponse(
+            time_range=time_range.value,
+            chart_data=ChartJSData(labels=labels, datasets=datasets),
+        )
+
+    def _build_rollup_model_breakdown(
+        self,
+        entries: list[tuple[_Group, int, RollupBucket]],
+        metric_name: MetricType,
+        time_range: TimeRange,
+    ) -> ModelBreakdownResponse:
+        """Group rollup buckets by model and summarize each group."""
+        by_model: dict[int, list[tuple[_Group, int, RollupBucket]]] = {}
+        for entry in entries:
+            if entry[0][0] >= 0:
+                by_model.setdefault(entry[0][0], []).append(entry)
+
+        models = [
+            self._model_breakdown(
+                code,
+                self._rollup_points(model_entries),
+                self._rollup_summary([bucket for _, _, bucket in model_entries]),
+            )
+            for code, model_entries in by_model.items()
+        ]
+        return self._model_breakdown_response(models, metric_name, time_range)
 
-            # Sort by tier then model_id
-            models.sort(key=lambda m: (m.tier, m.model_id))
+    def _rollup_points(self, entries: list[tuple[_Group, int, RollupBucket]]) -> _Window:
+        """Merge group buckets with the same start into one averaged point each.
+
+        Each point keeps the metadata of the group whose first value came first.
+        """
+        merged: dict[int, list[Any]] = {}  # start -> [count, total, first timestamp, group]
+        for group, bucket_start, bucket in entries:
+            point = merged.get(bucket_start)
+            if point is None:
+                merged[bucket_start] = [bucket.count, bucket.total, bucket.first_timestamp, group]
+                continue
+            point[0] += bucket.count
+            point[1] += bucket.total
+            if bucket.first_timestamp < point[2]:
+                point[2:] = [bucket.first_timestamp, group]
+
+        starts = sorted(merged)
+        points = [merged[start] for start in starts]
+        groups = np.array([point[3] for point in points], dtype=np.int32).reshape(-1, 3)
+        return _Window(
+            timestamps=np.array(starts, dtype=np.float64),
+            values=np.array([point[1] / point[0] for point in points], dtype=np.float64),
+            model_ids=groups[:, 0],
+            tiers=groups[:, 1],
+            query_modes=groups[:, 2],
+        )
+
+    def _rollup_summary(self, buckets: list[RollupBucket]) -> MetricsSummary:
+        """Merge rollup buckets into a summary (percentiles from the merged sketch)."""
+        total = RollupBucket()
+        for bucket in buckets:
+            total.merge(bucket)
+
+        if not total.count:
+            return MetricsSummary(min=0.0, max=0.0, avg=0.0, p50=0.0, p95=0.0, p99=0.0)
 
-            unit = self._get_metric_unit(metric_name)
-            return ModelBreakdownResponse(
-                metric_name=metric_name.value,
-                time_range=time_range.value,
-                unit=unit,
-                models=models,
+        return MetricsSummary(
+            min=round(total.minimum, 2),
+            max=round(total.maximum, 2),
+            avg=round(total.total / total.count, 2),
+            p50=round(total.sketch.quantile(0.50), 2),
+            p95=round(total.sketch.quantile(0.95), 2),
+            p99=round(total.sketch.quantile(0.99), 2),
+        )
+
+    # ------------------------------------------------------------------
+    # Response helpers
+    # ------------------------------------------------------------------
+
+    def _model_breakdown(
+        self, code: int, points: _Window, summary: MetricsSummary
+    ) -> ModelBreakdown:
+        """Build one model's breakdown from its (oldest first) points."""
+        model_id = self._model_ids.decode(code)
+
+        # Determine tier from data
+        tier = self._tiers.decode(int(points.tiers[0])) or "Q2"  # Default to Q2 if missing
+
+        return ModelBreakdown(
+            model_id=model_id,
+            display_name=_resolve_model_name(model_id),
+            tier=tier,  # type: ignore
+            data_points=self._to_points(points),
+            summary=summary,
+        )
+
+    def _model_breakdown_response(
+        self, models: list[ModelBreakdown], metric_name: MetricType, time_range: TimeRange
+    ) -> ModelBreakdownResponse:
+        # Sort by tier then model_id
+        models.sort(key=lambda m: (m.tier, m.model_id))
+
+        return ModelBreakdownResponse(
+            metric_name=metric_name.value,
+            time_range=time_range.value,
+            unit=self._get_metric_unit(metric_name),
+            models=models,
+        )
+
+    def _to_points(self, window: _Window) -> list[TimeSeriesPoint]:
+        """Convert a snapshot to response points."""
+        return [
+            TimeSeriesPoint(
+                timestamp=datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(),
+                value=round(value, 2),
+                metadata={
+                    "model_id": self._model_ids.decode(model_id),
+                    "tier": self._tiers.decode(tier),
+                    "query_mode": self._query_modes.decode(query_mode),
+                },
             )
+            for timestamp, value, model_id, tier, query_mode in zip(
+                window.timestamps.tolist(),
+                window.values.tolist(),
+                window.model_ids.tolist(),
+                window.tiers.tolist(),
+                window.query_modes.tolist(),
+            )
+        ]
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
 
     async def _cleanup_loop(self) -> None:
         """Background task to cleanup expired data points.
@@ -458,156 +1050,60 @@ class MetricsAggregator:
                 logger.error(f"Error in metrics cleanup loop: {e}", exc_info=True)
 
     async def _cleanup_expired_data(self) -> None:
-        """Remove data points older than retention period.
-
-        This is a safety mechanism - the ring buffer automatically evicts
-        old data when at capacity, but this ensures TTL-based cleanup.
-        """
-        async with self.lock:
-            now = time.time()
-            cutoff = now - self.max_retention_seconds
-
-            removed_count = 0
-
-            for metric_name, buffer in self.metrics.items():
-                # Remove expired points from left side
-                while buffer and buffer[0].timestamp < cutoff:
-                    buffer.popleft()
-                    removed_count += 1
-
-            if removed_count > 0:
-                logger.info(
-                    f"TTL cleanup removed {removed_count} expired data points",
-                    extra={"removed_count": removed_count},
-                )
-
-    def _downsample(
-        self, points: list[MetricDataPoint], time_range: TimeRange
-    ) -> list[MetricDataPoint]:
-        """Downsample data points for long time ranges.
-
-        For long time ranges (7d, 30d), aggregate into hourly buckets
-        to reduce data volume.
+        """Remove raw points and rollup buckets older than their retention.
 
-        Args:
-            points: Raw data points
-            time_range: Time range (determines downsampling strategy)
-
-        Returns:
-            Downsampled data points
+        Raw points are expired after ``raw_retention_seconds``; long ranges
+        are served from rollups, which keep their own retention. The on-disk
+        history is compacted to ``max_retention_seconds``.
         """
-        # No downsampling for short ranges
-        if time_range in [TimeRange.ONE_HOUR, TimeRange.SIX_HOURS]:
-            return points
-
-        # Hourly downsampling for long ranges
-        if time_range in [TimeRange.SEVEN_DAYS, TimeRange.THIRTY_DAYS]:
-            bucket_interval = 3600  # 1 hour
-
-            # Group points into hourly buckets
-            buckets: dict[int, list[MetricDataPoint]] = defaultdict(list)
-            for point in points:
-                bucket_key = int(point.timestamp // bucket_interval)
-                buckets[bucket_key].append(point)
-
-            # Average each bucket
-            downsampled: list[MetricDataPoint] = []
-            for bucket_key in sorted(buckets.keys()):
-                bucket_points = buckets[bucket_key]
-                avg_value = statistics.mean([p.value for p in bucket_points])
-
-                # Use first point's metadata
-                first = bucket_points[0]
-                downsampled.append(
-                    MetricDataPoint(
-                        timestamp=bucket_key * bucket_interval,
-                        value=avg_value,
-                        model_id=first.model_id,
-                        tier=first.tier,
-                        query_mode=first.query_mode,
-                    )
-                )
-
-            return downsampled
-
-        # 10-minute downsampling for 24h
-        if time_range == TimeRange.TWENTY_FOUR_HOURS:
-            bucket_interval = 600  # 10 minutes
-
-            buckets_10min: dict[int, list[MetricDataPoint]] = defaultdict(list)
-            for point in points:
-                bucket_key = int(point.timestamp // bucket_interval)
-                buckets_10min[bucket_key].append(point)
-
-            downsampled_10min: list[MetricDataPoint] = []
-            for bucket_key in sorted(buckets_10min.keys()):
-                bucket_points = buckets_10min[bucket_key]
-                avg_value = statistics.mean([p.value for p in bucket_points])
-
-                first = bucket_points[0]
-                downsampled_10min.append(
-                    MetricDataPoint(
-                        timestamp=bucket_key * bucket_interval,
-                        value=avg_value,
-                        model_id=first.model_id,
-                        tier=first.tier,
-                        query_mode=first.query_mode,
-                    )
-                )
+        now = time.time()
+        cutoff = now - self.raw_retention_seconds
+
+        removed_count = sum(buffer.drop_before(cutoff) for buffer in self.metrics.values())
+        removed_buckets = sum(
+            rollup.expire(now)
+            for metric_rollups in self.rollups.values()
+            for rollup in metric_rollups.values()
+        )
 
-            return downsampled_10min
+        removed_rows = 0
+        if self.store is not None:
+            removed_rows = await self.store.compact(now - self.max_retention_seconds)
 
-        # Default: return as-is
-        return points
+        if removed_count > 0 or removed_buckets > 0 or removed_rows > 0:
+            logger.info(
+                f"TTL cleanup removed {removed_count} expired data points, "
+                f"{removed_buckets} rollup buckets and {removed_rows} stored rows",
+                extra={
+                    "removed_count": removed_count,
+                    "removed_buckets": removed_buckets,
+                    "removed_rows": removed_rows,
+                },
+            )
 
-    def _calculate_summary(self, values: list[float]) -> MetricsSummary:
+    def _calculate_summary(self, values: np.ndarray) -> MetricsSummary:
         """Calculate statistical summary of values.
 
         Args:
-            values: List of numeric values
+            values: Numeric values
 
         Returns:
-            MetricsSummary with min/max/avg/percentiles
+            MetricsSummary with min/max/avg/percentiles (linear interpolation)
         """
-        if not values:
+        if not len(values):
             return MetricsSummary(min=0.0, max=0.0, avg=0.0, p50=0.0, p95=0.0, p99=0.0)
 
-        sorted_values = sorted(values)
+        p50, p95, p99 = np.percentile(values, [50, 95, 99]).tolist()
 
         return MetricsSummary(
-            min=round(min(values), 2),
-            max=round(max(values), 2),
-            avg=round(statistics.mean(values), 2),
-            p50=round(statistics.median(sorted_values), 2),
-            p95=round(self._percentile(sorted_values, 95), 2),
-            p99=round(self._percentile(sorted_values, 99), 2),
+            min=round(float(values.min()), 2),
+            max=round(float(values.max()), 2),
+            avg=round(float(values.mean()), 2),
+            p50=round(p50, 2),
+            p95=round(p95, 2),
+            p99=round(p99, 2),
         )
 
-    def _percentile(self, sorted_values: list[float], p: int) -> float:
-        """Calculate percentile of sorted values.
-
-        Args:
-            sorted_values: List of values (must be sorted)
-            p: Percentile (0-100)
-
-        Returns:
-            Percentile value
-        """
-        if not sorted_values:
-            return 0.0
-
-        k = (len(sorted_values) - 1) * (p / 100.0)
-        f = int(k)
-        c = f + 1
-
-        if c >= len(sorted_values):
-            return sorted_values[-1]
-
-        d0 = sorted_values[f]
-        d1 = sorted_values[c]
-
-        return d0 + (d1 - d0) * (k - f)
-
     def _time_range_to_seconds(self, time_range: TimeRange) -> int:
         """Convert time range enum to seconds.
 
@@ -660,6 +1156,7 @@ class MetricsAggregator:
             MetricType.COMPLEXITY_SCORE: "score",
             MetricType.CGRAG_RETRIEVAL_TIME: "ms",
             MetricType.MODEL_LOAD: "%",
+            MetricType.TIME_TO_FIRST_TOKEN: "ms",
         }
         return units.get(metric_name, "")
 
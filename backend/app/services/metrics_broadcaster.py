@@ -0,0 +1,313 @@
+"""Shared metrics snapshot producer for the /api/metrics/ws stream.
+
+Every metrics WebSocket client used to run its own 1 Hz loop that sampled
+the system on the event loop (psutil.cpu_percent blocks for 100ms, plus GPU
+queries, a FAISS directory glob and disk/network counters) - so N dashboards
+cost N samples per second of blocked event loop. MetricsBroadcaster instead:
+
+- Samples one snapshot per tick in a worker thread, only while clients are
+  connected
+- Serializes each snapshot once and hands the same text to every client
+- Lets clients negotiate their update interval and opt into delta updates
+  (JSON Merge Patch, RFC 7386, against the previous update they received);
+  deltas are computed once per interval group
+- Never waits for a client: each subscription holds only its newest message,
+  and a delta client that falls behind is sent a full snapshot instead
+
+Author: Backend Architect
+Feature: Shared Metrics Stream
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+from app.core.logging import get_logger
+from app.models.metrics import MetricsUpdate
+from app.services.metrics_collector import MetricsCollector, get_metrics_collector
+
+logger = get_logger(__name__)
+
+# Update interval bounds clients can negotiate (milliseconds)
+MIN_INTERVAL_MS = 1000
+MAX_INTERVAL_MS = 60_000
+
+
+def create_metrics_update(collector: MetricsCollector) -> MetricsUpdate:
+    """Create a complete metrics update message (blocking, call off the event loop).
+
+    Args:
+        collector: MetricsCollector instance
+
+    Returns:
+        MetricsUpdate with all current metrics
+    """
+    return MetricsUpdate(
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        queries=collector.get_query_metrics(),
+        resources=collector.get_resource_metrics(),
+        routing=collector.get_routing_metrics(),
+    )
+
+
+def merge_patch(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Compute a JSON Merge Patch (RFC 7386) turning ``previous`` into ``current``.
+
+    Nested objects are diffed key by key; lists and scalars are replaced
+    whole, and removed keys are set to None.
+
+    Args:
+        previous: Previous document
+        current: Current document
+
+    Returns:
+        Patch containing only the changed members
+    """
+    patch: Dict[str, Any] = {key: None for key in previous if key not in current}
+    for key, value in current.items():
+        old = previous.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            nested = merge_patch(old, value)
+            if nested:
+                patch[key] = nested
+        elif key not in previous or old != value:
+            patch[key] = value
+    return patch
+
+
+class MetricsSubscription:
+    """One client's view of the metrics stream.
+
+    Attributes:
+        interval_ticks: Update interval in sampler ticks
+        delta: Whether the client receives merge patches after a full snapshot
+        needs_full: Whether the next update must be a full snapshot
+        closed: Whether the subscription was closed
+    """
+
+    def __init__(self) -> None:
+        """Initialize a subscription at the default rate with full snapshots."""
+        self.interval_ticks = 1
+        self.delta = False
+        self.needs_full = True
+        self.closed = False
+        self._pending: Optional[str] = None
+        self._ready = asyncio.Event()
+
+    def offer(self, message: str) -> None:
+        """Replace the pending message (a slow client skips stale updates)."""
+        self._pending = message
+        self._ready.set()
+
+    def close(self) -> None:
+        """Close the subscription, waking up next()."""
+        self.closed = True
+        self._ready.set()
+
+    @property
+    def behind(self) -> bool:
+        """Whether the previous message has not been taken yet."""
+        return self._pending is not None
+
+    async def next(self) -> Optional[str]:
+        """Wait for the next message.
+
+        Returns:
+            Serialized message, or None once the subscription is closed
+        """
+        await self._ready.wait()
+        self._ready.clear()
+        if self.closed:
+            return None
+        message, self._pending = self._pending, None
+        return message
+
+
+class MetricsBroadcaster:
+    """Samples metrics once per tick and fans the serialized updates out.
+
+    Attributes:
+        tick_seconds: Sampling interval (the fastest update rate)
+        latest: Most recent full snapshot, serialized
+    """
+
+    def __init__(self, collector: MetricsCollector, tick_seconds: float = 1.0) -> None:
+        """Initialize the broadcaster.
+
+        Args:
+            collector: MetricsCollector to sample
+            tick_seconds: Sampling interval (the fastest update rate)
+        """
+        self.collector = collector
+        self.tick_seconds = tick_seconds
+        self.latest: Optional[str] = None
+        self._subscriptions: Set[MetricsSubscription] = set()
+        # Last snapshot sent to each interval group, the base of its deltas
+        self._group_snapshots: Dict[int, Dict[str, Any]] = {}
+        self._tick = 0
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"samples": 0, "full_sent": 0, "delta_sent": 0, "skipped": 0}
+
+    async def start(self) -> None:
+        """Start the sampler task."""
+        self._task = asyncio.create_task(self._sample_loop())
+        logger.info(f"MetricsBroadcaster started ({self.tick_seconds}s tick)")
+
+    async def stop(self) -> None:
+        """Stop the sampler task and close all subscriptions."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        for subscription in list(self._subscriptions):
+            subscription.close()
+        self._subscriptions.clear()
+        logger.info("MetricsBroadcaster stopped")
+
+    def subscribe(self) -> MetricsSubscription:
+        """Add a subscription, pre-loaded with the latest snapshot if any."""
+        subscription = MetricsSubscription()
+        if self.latest is not None:
+            subscription.offer(self.latest)
+        self._subscriptions.add(subscription)
+        logger.debug(f"Metrics subscriber added ({len(self._subscriptions)} active)")
+        return subscription
+
+    def unsubscribe(self, subscription: MetricsSubscription) -> None:
+        """Remove a subscription."""
+        subscription.close()
+        self._subscriptions.discard(subscription)
+        logger.debug(f"Metrics subscriber removed ({len(self._subscriptions)} active)")
+
+    def configure(
+        self,
+        subscription: MetricsSubscription,
+        interval_ms: Optional[int] = None,
+        delta: Optional[bool] = None,
+    ) -> None:
+        """Apply a client's rate and encoding request.
+
+        Args:
+            subscription: Subscription to configure
+            interval_ms: Requested update interval, clamped to
+                [MIN_INTERVAL_MS, MAX_INTERVAL_MS] and rounded to whole ticks
+            delta: Whether to receive merge patches after a full snapshot
+        """
+        if interval_ms is not None:
+            interval_ms = min(max(interval_ms, MIN_INTERVAL_MS), MAX_INTERVAL_MS)
+            ticks = max(1, round(interval_ms / 1000 / self.tick_seconds))
+            if ticks != subscription.interval_ticks:
+                subscription.interval_ticks = ticks
+                subscription.needs_full = True
+        if delta is not None and delta != subscription.delta:
+            subscription.delta = delta
+            subscription.needs_full = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Subscriber count and messages sent."""
+        return {**self._stats, "subscribers": len(self._subscriptions)}
+
+    async def _sample_loop(self) -> None:
+        """Sample and publish once per tick while clients are connected."""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.sleep(self.tick_seconds)
+                self._tick += 1
+                if not self._subscriptions:
+                    self.latest = None
+                    self._group_snapshots.clear()
+                    continue
+
+                update = await loop.run_in_executor(None, self._sample)
+                self._publish(update)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in metrics broadcaster: {e}", exc_info=True)
+
+    def _sample(self) -> Dict[str, Any]:
+        """Collect one snapshot (worker thread)."""
+        return create_metrics_update(self.collector).model_dump(by_alias=True)
+
+    def _publish(self, snapshot: Dict[str, Any]) -> None:
+        """Hand the snapshot to every subscription due on this tick."""
+        self._stats["samples"] += 1
+        self.latest = json.dumps(snapshot)
+
+        groups: Dict[int, list[MetricsSubscription]] = {}
+        for subscription in self._subscriptions:
+            if self._tick % subscription.interval_ticks == 0:
+                groups.setdefault(subscription.interval_ticks, []).append(subscription)
+
+        for ticks, members in groups.items():
+            previous = self._group_snapshots.get(ticks)
+            self._group_snapshots[ticks] = snapshot
+            delta: Optional[str] = None
+
+            for subscription in members:
+                if subscription.behind:
+                    self._stats["skipped"] += 1
+                    subscription.needs_full = True  # The pending update is replaced
+
+                if not subscription.delta or subscription.needs_full or previous is None:
+                    subscription.offer(self.latest)
+                    subscription.needs_full = False
+                    self._stats["full_sent"] += 1
+                    continue
+
+                if delta is None:
+                    delta = json.dumps(
+                        {
+                            "type": "metrics_delta",
+                            "timestamp": snapshot["timestamp"],
+                            "patch": merge_patch(previous, snapshot),
+                        }
+                    )
+                subscription.offer(delta)
+                self._stats["delta_sent"] += 1
+
+        active = {subscription.interval_ticks for subscription in self._subscriptions}
+        for ticks in list(self._group_snapshots):
+            if ticks not in active:
+                del self._group_snapshots[ticks]
+
+
+# Global instance (initialized in main.py lifespan)
+_metrics_broadcaster: Optional[MetricsBroadcaster] = None
+
+
+def get_metrics_broadcaster() -> MetricsBroadcaster:
+    """Get the global metrics broadcaster.
+
+    Returns:
+        Global MetricsBroadcaster instance
+
+    Raises:
+        RuntimeError: If the broadcaster is not initialized
+    """
+    if _metrics_broadcaster is None:
+        raise RuntimeError(
+            "MetricsBroadcaster not initialized - call init_metrics_broadcaster() first"
+        )
+    return _metrics_broadcaster
+
+
+def init_metrics_broadcaster(tick_seconds: float = 1.0) -> MetricsBroadcaster:
+    """Initialize the global metrics broadcaster.
+
+    Should be called during application startup (in lifespan context);
+    start() begins sampling.
+
+    Args:
+        tick_seconds: Sampling interval (the fastest update rate)
+
+    Returns:
+        Initialized MetricsBroadcaster instance
+    """
+    global _metrics_broadcaster
+    _metrics_broadcaster = MetricsBroadcaster(get_metrics_collector(), tick_seconds=tick_seconds)
+    return _metrics_broadcaster
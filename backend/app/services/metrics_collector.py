@@ -34,6 +34,7 @@ from app.models.metrics import (
     TierMetricsResponse,
     VRAMMetrics,
 )
+from app.services.metrics_store import MetricsStore, QueryRow
 
 logger = get_logger(__name__)
 
@@ -108,6 +109,9 @@ class MetricsCollector:
         self.last_network_io = None
         self.last_io_check = 0.0
 
+        # On-disk history (optional, see MetricsStore)
+        self.store: Optional[MetricsStore] = None
+
         logger.info(f"MetricsCollector initialized with buffer size {max_history}")
 
     def record_query(
@@ -137,6 +141,11 @@ class MetricsCollector:
             self.query_latencies.append(latency_ms)
             self.query_tiers.append(tier)
 
+            # Calculate tokens/sec if generation time available
+            tokens_per_sec = None
+            if generation_time_ms > 0 and tokens_generated > 0:
+                tokens_per_sec = (tokens_generated / generation_time_ms) * 1000
+
             # Update tier performance
             if tier in self.tier_performance:
                 stats = self.tier_performance[tier]
@@ -146,16 +155,58 @@ class MetricsCollector:
                 if is_error:
                     stats["error_count"] += 1
 
-                # Calculate tokens/sec if generation time available
-                if generation_time_ms > 0 and tokens_generated > 0:
-                    tokens_per_sec = (tokens_generated / generation_time_ms) * 1000
+                if tokens_per_sec is not None:
                     stats["tokens_per_sec"].append(tokens_per_sec)
 
+            if self.store is not None:
+                self.store.append_query(now, tier, latency_ms, tokens_per_sec, is_error)
+
             logger.debug(
                 f"Recorded query: tier={tier}, latency={latency_ms:.2f}ms, "
                 f"tokens={tokens_generated}, error={is_error}"
             )
 
+    def restore_history(
+        self,
+        recent: list[QueryRow],
+        by_tier: dict[str, list[QueryRow]],
+        totals: dict[str, tuple[int, int]],
+    ) -> None:
+        """Restore query history read from the store (see MetricsStore.load_query_history).
+
+        Restored records are placed before any recorded since startup.
+
+        Args:
+            recent: Most recent query records, oldest first
+            by_tier: Most recent query records per tier, oldest first
+            totals: (request count, error count) per tier
+        """
+        with self.lock:
+            self.query_timestamps = deque(
+                [row[0] for row in recent] + list(self.query_timestamps), maxlen=self.max_history
+            )
+            self.query_latencies = deque(
+                [row[2] for row in recent] + list(self.query_latencies), maxlen=self.max_history
+            )
+            self.query_tiers = deque(
+                [row[1] for row in recent] + list(self.query_tiers), maxlen=self.max_history
+            )
+
+            for tier, stats in self.tier_performance.items():
+                rows = by_tier.get(tier, [])
+                stats["latency_ms"] = deque(
+                    [row[2] for row in rows] + list(stats["latency_ms"]), maxlen=20
+                )
+                stats["tokens_per_sec"] = deque(
+                    [row[3] for row in rows if row[3] is not None] + list(stats["tokens_per_sec"]),
+                    maxlen=20,
+                )
+                request_count, error_count = totals.get(tier, (0, 0))
+                stats["request_count"] += request_count
+                stats["error_count"] += error_count
+
+        logger.info(f"Restored {len(recent)} query records from history")
+
     def record_routing_decision(
         self,
         complexity: str,
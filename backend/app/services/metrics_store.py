@@ -0,0 +1,304 @@
+"""Persistent on-disk metrics history.
+
+MetricsAggregator and MetricsCollector kept their history in memory only,
+so every restart or deploy dropped the 30-day retention window. MetricsStore
+keeps an append-only copy in a local SQLite database (WAL mode):
+
+- Writes are buffered in memory and flushed in batches (one transaction per
+  flush interval), so recording a metric never touches the disk
+- All database work runs on a dedicated thread, never on the event loop
+- History is read back in chunks at startup while the backend is already
+  serving (see MetricsAggregator.load_history)
+- compact() deletes rows outside the retention window and returns the freed
+  pages to the filesystem
+
+Author: Backend Architect
+Feature: Persistent Metrics History
+"""
+
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (timestamp, metric, value, model_id, tier, query_mode)
+MetricRow = Tuple[float, str, float, Optional[str], Optional[str], Optional[str]]
+
+# (timestamp, tier, latency_ms, tokens_per_sec, is_error)
+QueryRow = Tuple[float, str, float, Optional[float], int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric_points (
+    timestamp REAL NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    model_id TEXT,
+    tier TEXT,
+    query_mode TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_metric_points_timestamp ON metric_points (timestamp);
+CREATE TABLE IF NOT EXISTS query_records (
+    timestamp REAL NOT NULL,
+    tier TEXT NOT NULL,
+    latency_ms REAL NOT NULL,
+    tokens_per_sec REAL,
+    is_error INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_query_records_timestamp ON query_records (timestamp);
+"""
+
+
+class MetricsStore:
+    """Append-only SQLite store for metric points and query records.
+
+    Attributes:
+        path: Database file path
+        flush_interval: Seconds between batched writes
+    """
+
+    def __init__(self, path: Path, flush_interval: float = 1.0) -> None:
+        """Initialize the store (the database is opened by start()).
+
+        Args:
+            path: Database file path (parent directories are created)
+            flush_interval: Seconds between batched writes
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="metrics-store")
+        self._conn: Optional[sqlite3.Connection] = None
+        self._points: List[MetricRow] = []
+        self._queries: List[QueryRow] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._stats: Dict[str, int] = {"points_written": 0, "queries_written": 0, "flushes": 0}
+
+    async def start(self) -> None:
+        """Open the database and start the periodic flush."""
+        await self.run(self._open)
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        logger.info(f"MetricsStore opened at {self.path}")
+
+    async def stop(self) -> None:
+        """Flush buffered rows and close the database."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        await self.run(self._close)
+        self._executor.shutdown(wait=False)
+        logger.info("MetricsStore closed")
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def append_point(
+        self,
+        timestamp: float,
+        metric: str,
+        value: float,
+        model_id: Optional[str] = None,
+        tier: Optional[str] = None,
+        query_mode: Optional[str] = None,
+    ) -> None:
+        """Buffer a metric point for the next flush."""
+        self._points.append((timestamp, metric, value, model_id, tier, query_mode))
+
+    def append_query(
+        self,
+        timestamp: float,
+        tier: str,
+        latency_ms: float,
+        tokens_per_sec: Optional[float],
+        is_error: bool,
+    ) -> None:
+        """Buffer a query record for the next flush."""
+        self._queries.append((timestamp, tier, latency_ms, tokens_per_sec, int(is_error)))
+
+    async def flush(self) -> None:
+        """Write buffered rows in one transaction."""
+        points, self._points = self._points, []
+        queries, self._queries = self._queries, []
+        if points or queries:
+            await self.run(self._write, points, queries)
+
+    async def compact(self, cutoff: float) -> int:
+        """Delete rows older than ``cutoff`` (retention policy).
+
+        Returns:
+            Number of rows deleted
+        """
+        return await self.run(self._delete_before, cutoff)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a function on the store thread (the only thread using the connection)."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def iter_points(
+        self, since: float, until: float, chunk_size: int = 50_000
+    ) -> Iterator[List[MetricRow]]:
+        """Yield stored metric points in ``[since, until)`` in timestamp order.
+
+        Must be called on the store thread (via run()).
+
+        Args:
+            since: Oldest timestamp to read
+            until: Timestamp to stop at (exclusive)
+            chunk_size: Rows per yielded chunk
+        """
+        cursor = self._conn.execute(
+            "SELECT timestamp, metric, value, model_id, tier, query_mode FROM metric_points "
+            "WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp",
+            (since, until),
+        )
+        while rows := cursor.fetchmany(chunk_size):
+            yield rows
+
+    async def load_query_history(
+        self, since: float, recent_limit: int, per_tier_limit: int
+    ) -> Tuple[List[QueryRow], Dict[str, List[QueryRow]], Dict[str, Tuple[int, int]]]:
+        """Read query records for restoring MetricsCollector.
+
+        Args:
+            since: Oldest timestamp to read
+            recent_limit: Most recent records returned overall
+            per_tier_limit: Most recent records returned per tier
+
+        Returns:
+            (recent records, recent records by tier, (requests, errors) by tier),
+            records oldest first
+        """
+        return await self.run(self._read_query_history, since, recent_limit, per_tier_limit)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Rows written, flushes and rows waiting for the next flush."""
+        return {
+            **self._stats,
+            "path": str(self.path),
+            "pending_points": len(self._points),
+            "pending_queries": len(self._queries),
+        }
+
+    # ------------------------------------------------------------------
+    # Store thread
+    # ------------------------------------------------------------------
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")  # Only applies to new files
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _write(self, points: List[MetricRow], queries: List[QueryRow]) -> None:
+        with self._conn:
+            self._conn.executemany("INSERT INTO metric_points VALUES (?, ?, ?, ?, ?, ?)", points)
+            self._conn.executemany("INSERT INTO query_records VALUES (?, ?, ?, ?, ?)", queries)
+        self._stats["points_written"] += len(points)
+        self._stats["queries_written"] += len(queries)
+        self._stats["flushes"] += 1
+
+    def _delete_before(self, cutoff: float) -> int:
+        with self._conn:
+            deleted = self._conn.execute(
+                "DELETE FROM metric_points WHERE timestamp < ?", (cutoff,)
+            ).rowcount
+            deleted += self._conn.execute(
+                "DELETE FROM query_records WHERE timestamp < ?", (cutoff,)
+            ).rowcount
+        if deleted:
+            self._conn.execute("PRAGMA incremental_vacuum")
+        return deleted
+
+    def _read_query_history(
+        self, since: float, recent_limit: int, per_tier_limit: int
+    ) -> Tuple[List[QueryRow], Dict[str, List[QueryRow]], Dict[str, Tuple[int, int]]]:
+        select = (
+            "SELECT timestamp, tier, latency_ms, tokens_per_sec, is_error FROM query_records "
+            "WHERE timestamp >= ?"
+        )
+        recent = self._conn.execute(
+            f"{select} ORDER BY timestamp DESC LIMIT ?", (since, recent_limit)
+        ).fetchall()
+
+        totals = {
+            tier: (count, errors or 0)
+            for tier, count, errors in self._conn.execute(
+                "SELECT tier, COUNT(*), SUM(is_error) FROM query_records "
+                "WHERE timestamp >= ? GROUP BY tier",
+                (since,),
+            )
+        }
+        by_tier = {
+            tier: self._conn.execute(
+                f"{select} AND tier = ? ORDER BY timestamp DESC LIMIT ?",
+                (since, tier, per_tier_limit),
+            ).fetchall()[::-1]
+            for tier in totals
+        }
+        return recent[::-1], by_tier, totals
+
+    async def _flush_loop(self) -> None:
+        """Flush buffered rows every flush_interval seconds."""
+        while True:
+            try:
+                await asyncio.sleep(self.flush_interval)
+                await self.flush()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Failed to flush metrics history: {e}", exc_info=True)
+
+
+# Global instance (initialized in main.py lifespan)
+_metrics_store: Optional[MetricsStore] = None
+
+
+def get_metrics_store() -> MetricsStore:
+    """Get the global metrics history store.
+
+    Returns:
+        Global MetricsStore instance
+
+    Raises:
+        RuntimeError: If the store is not initialized
+    """
+    if _metrics_store is None:
+        raise RuntimeError("MetricsStore not initialized - call init_metrics_store() first")
+    return _metrics_store
+
+
+def init_metrics_store(path: Path, flush_interval: float = 1.0) -> MetricsStore:
+    """Initialize the global metrics history store.
+
+    Should be called during application startup (in lifespan context);
+    start() opens the database.
+
+    Args:
+        path: Database file path
+        flush_interval: Seconds between batched writes
+
+    Returns:
+        Initialized MetricsStore instance
+    """
+    global _metrics_store
+    _metrics_store = MetricsStore(path, flush_interval=flush_interval)
+    return _metrics_store
@@ -0,0 +1,207 @@
+"""Long-lived per-model llama.cpp client registry.
+
+Query modes (council, debate, benchmark) and the OpenAI-compatible proxy used
+to build a new client for every model call. The registry keeps one client per
+model and server URL instead, on top of the shared keep-alive HTTP pools, so
+multi-turn dialogues and proxy traffic reuse warm connections.
+
+The registry follows LlamaServerManager: clients of a stopped server are
+evicted (and its pooled connections closed). Clients whose calls keep failing
+to connect are evicted as well, so the next call starts from fresh
+connections.
+
+Author: Backend Architect
+Feature: Per-Model llama.cpp Client Registry
+"""
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from app.core.logging import get_logger
+from app.services.http_pool import HTTPPoolManager, get_http_pool
+from app.services.llama_client import LlamaCppClient
+
+if TYPE_CHECKING:
+    from app.services.llama_server_manager import ServerProcess
+
+logger = get_logger(__name__)
+
+
+class ModelClientRegistry:
+    """One warm LlamaCppClient per model and server URL.
+
+    Attributes:
+        timeout: Completion timeout in seconds for created clients
+        max_retries: Retry attempts for created clients
+        failure_threshold: Consecutive failed calls before a model's clients
+            are evicted
+    """
+
+    def __init__(
+        self,
+        pool: Optional[HTTPPoolManager] = None,
+        timeout: int = 120,
+        max_retries: int = 2,
+        failure_threshold: int = 3,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            pool: HTTP pool manager (defaults to the global one)
+            timeout: Completion timeout in seconds for created clients
+            max_retries: Retry attempts for created clients
+            failure_threshold: Consecutive failed calls before eviction
+        """
+        self._pool = pool
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.failure_threshold = failure_threshold
+        # model_id -> base_url -> client
+        self._clients: Dict[str, Dict[str, LlamaCppClient]] = {}
+        self._failures: Dict[str, int] = {}
+        self._evictions = 0
+        self._pending: set[asyncio.Task] = set()
+
+    @property
+    def pool(self) -> HTTPPoolManager:
+        """HTTP pool manager the clients share."""
+        if self._pool is None:
+            self._pool = get_http_pool()
+        return self._pool
+
+    def get_client(self, model_id: str, base_url: str) -> LlamaCppClient:
+        """Get the warm client for a model's server, creating it on first use.
+
+        Args:
+            model_id: Model identifier
+            base_url: Server base URL
+
+        Returns:
+            Long-lived LlamaCppClient (callers must not close it)
+        """
+        base_url = base_url.rstrip("/")
+        clients = self._clients.setdefault(model_id, {})
+        client = clients.get(base_url)
+        if client is None:
+            client = LlamaCppClient(
+                base_url=base_url,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                pool=self.pool,
+            )
+            clients[base_url] = client
+            logger.debug(
+                f"Created client for {model_id} at {base_url}",
+                extra={"model_id": model_id, "base_url": base_url},
+            )
+        return client
+
+    def report_result(self, model_id: str, success: bool) -> None:
+        """Record the outcome of a call, evicting clients that keep failing.
+
+        Only server-side failures (connection failures, timeouts, 5xx
+        responses) should be reported as failures; a rejected request (4xx,
+        prompt too long) is a success for the server's health.
+
+        Args:
+            model_id: Model identifier
+            success: Whether the server handled the call
+        """
+        if success:
+            self._failures.pop(model_id, None)
+            return
+
+        self._failures[model_id] = self._failures.get(model_id, 0) + 1
+        if self._failures[model_id] >= self.failure_threshold:
+            logger.warning(
+                f"Evicting clients for {model_id} after "
+                f"{self._failures[model_id]} consecutive failures",
+                extra={"model_id": model_id},
+            )
+            self._schedule_eviction(model_id)
+
+    def on_server_change(self, model_id: str, server: Optional["ServerProcess"]) -> None:
+        """LlamaServerManager listener: evict clients of stopped servers.
+
+        Args:
+            model_id: Model identifier
+            server: Started server, or None if the server was stopped
+        """
+        if server is None:
+            self._schedule_eviction(model_id)
+        else:
+            # A (re)started server gets fresh connections and failure count
+            self._failures.pop(model_id, None)
+
+    async def evict(self, model_id: str) -> None:
+        """Drop a model's clients and close their pooled connections.
+
+        Args:
+            model_id: Model identifier
+        """
+        clients = self._clients.pop(model_id, {})
+        self._failures.pop(model_id, None)
+        if clients:
+            self._evictions += 1
+        for base_url in clients:
+            await self.pool.discard(base_url)
+
+    def _schedule_eviction(self, model_id: str) -> None:
+        """Evict from synchronous callers (runs on the event loop)."""
+        task = asyncio.get_running_loop().create_task(self.evict(model_id))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def close(self) -> None:
+        """Evict all clients (application shutdown)."""
+        for model_id in list(self._clients):
+            await self.evict(model_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Registered clients, failure counts and evictions."""
+        return {
+            "models": {model_id: sorted(clients) for model_id, clients in self._clients.items()},
+            "clients": sum(len(clients) for clients in self._clients.values()),
+            "consecutive_failures": dict(self._failures),
+            "evictions": self._evictions,
+        }
+
+
+# Global registry (initialized in main.py lifespan)
+_model_client_registry: Optional[ModelClientRegistry] = None
+
+
+def get_model_client_registry() -> ModelClientRegistry:
+    """Get the global model client registry.
+
+    Returns:
+        Global ModelClientRegistry instance
+
+    Raises:
+        RuntimeError: If the registry is not initialized
+    """
+    if _model_client_registry is None:
+        raise RuntimeError(
+            "ModelClientRegistry not initialized - call init_model_client_registry() first"
+        )
+    return _model_client_registry
+
+
+def init_model_client_registry(
+    pool: Optional[HTTPPoolManager] = None, failure_threshold: int = 3
+) -> ModelClientRegistry:
+    """Initialize the global model client registry.
+
+    Should be called during application startup (in lifespan context), after
+    the HTTP pool manager.
+
+    Args:
+        pool: HTTP pool manager (defaults to the global one)
+        failure_threshold: Consecutive failed calls before eviction
+
+    Returns:
+        Initialized ModelClientRegistry instance
+    """
+    global _model_client_registry
+    _model_client_registry = ModelClientRegistry(pool=pool, failure_threshold=failure_threshold)
+    return _model_client_registry
@@ -0,0 +1,124 @@
+"""Mergeable streaming quantile sketch (DDSketch).
+
+Percentiles of long time ranges used to be computed by sorting every raw
+value. A DDSketch keeps counts in logarithmically sized bins instead: any
+quantile is estimated within a fixed relative error, memory grows with the
+logarithm of the value range (not the number of values), and two sketches
+are merged by adding their bin counts - so per-bucket sketches can be
+combined into a sketch of any range of buckets.
+
+Reference: Masson, Rim, Lee - "DDSketch: A Fast and Fully-Mergeable Quantile
+Sketch with Relative-Error Guarantees" (VLDB 2019).
+
+Author: Backend Architect
+Feature: Metrics Rollups
+"""
+
+import math
+from typing import Dict, Iterator, Tuple
+
+# Values closer to zero than this are counted in the zero bin
+_MIN_INDEXABLE = 1e-9
+
+
+class QuantileSketch:
+    """DDSketch with unbounded bins.
+
+    Attributes:
+        relative_accuracy: Maximum relative error of quantile estimates
+        count: Number of values added
+    """
+
+    __slots__ = (
+        "relative_accuracy",
+        "count",
+        "_gamma",
+        "_log_gamma",
+        "_positive",
+        "_negative",
+        "_zero_count",
+    )
+
+    def __init__(self, relative_accuracy: float = 0.01) -> None:
+        """Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantile estimates
+                (sketches can only be merged with the same accuracy)
+        """
+        self.relative_accuracy = relative_accuracy
+        self.count = 0
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {}
+        self._zero_count = 0
+
+    def add(self, value: float) -> None:
+        """Add a value."""
+        if value > _MIN_INDEXABLE:
+            key = self._key(value)
+            self._positive[key] = self._positive.get(key, 0) + 1
+        elif value < -_MIN_INDEXABLE:
+            key = self._key(-value)
+            self._negative[key] = self._negative.get(key, 0) + 1
+        else:
+            self._zero_count += 1
+        self.count += 1
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch's values to this one.
+
+        Raises:
+            ValueError: If the sketches have different accuracies
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other._positive.items():
+            self._positive[key] = self._positive.get(key, 0) + count
+        for key, count in other._negative.items():
+            self._negative[key] = self._negative.get(key, 0) + count
+        self._zero_count += other._zero_count
+        self.count += other.count
+
+    def copy(self) -> "QuantileSketch":
+        """Get an independent copy."""
+        sketch = QuantileSketch(self.relative_accuracy)
+        sketch.merge(self)
+        return sketch
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile.
+
+        Args:
+            q: Quantile in [0, 1] (0.95 for p95)
+
+        Returns:
+            Estimated value (0.0 for an empty sketch)
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for value, count in self._bins():
+            seen += count
+            if seen > rank:
+                return value
+        return value
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        """Representative value of a positive bin (relative error bounded)."""
+        return 2 * self._gamma**key / (self._gamma + 1)
+
+    def _bins(self) -> Iterator[Tuple[float, int]]:
+        """Bins in ascending value order."""
+        for key in sorted(self._negative, reverse=True):
+            yield -self._value(key), self._negative[key]
+        if self._zero_count:
+            yield 0.0, self._zero_count
+        for key in sorted(self._positive):
+            yield self._value(key), self._positive[key]
@@ -0,0 +1,374 @@
+"""Response cache for full query results.
+
+Repeated questions used to run the whole pipeline again (context retrieval,
+one to several model calls). ResponseCache stores the final QueryResponse so
+a repeated query is answered without touching the models.
+
+Entries are keyed by everything that shapes the answer:
+
+- Query mode and model selection (tier, council participants, preset, ...)
+- Instance (system prompt)
+- Temperature bucket (rounded to ``temperature_step``) and token limit
+- Normalized query text
+- Context fingerprint (CGRAG index version and the registered model set)
+
+Optionally, a query whose embedding is similar enough to a cached query with
+the same key parts (everything but the query text) is served that query's
+response ("semantic" matching, in-process only).
+
+Each entry lives in an in-process TTL/LRU store backed by an optional shared
+Redis tier. Because index versions and the model set are part of the key,
+re-indexing or changing models never serves stale answers; the in-process
+tier is also cleared explicitly on those events. Lookups are reported to the
+global CacheMetrics tracker.
+
+Author: Backend Architect
+Feature: Query Response Cache
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.core.logging import get_logger
+from app.services.cache_metrics import find_cache_metrics
+from app.services.cgrag_cache import TTLCache, normalize_query
+
+logger = get_logger(__name__)
+
+# Redis key prefix (shared across backend processes)
+_RESPONSE_PREFIX = "resp:"
+
+
+@dataclass
+class ResponseCacheKey:
+    """Cache key of one query.
+
+    Attributes:
+        partition: Hash of all key parts except the query text (semantic
+            matches are only considered within a partition)
+        key: Hash of the partition and the normalized query text
+        embedding: Optional L2-normalized query embedding for semantic matching
+    """
+
+    partition: str
+    key: str
+    embedding: Optional[np.ndarray] = None
+
+
+class ResponseCache:
+    """Two-level cache of serialized query responses.
+
+    Attributes:
+        ttl_seconds: Entry time-to-live
+        redis_enabled: Whether the shared Redis tier is used
+        similarity_threshold: Minimum cosine similarity for semantic matches
+            (None disables semantic matching)
+        temperature_step: Width of the temperature buckets
+        responses: In-process response tier (key -> serialized response)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: int = 3600,
+        redis_enabled: bool = False,
+        redis_client: Optional[Any] = None,
+        similarity_threshold: Optional[float] = None,
+        temperature_step: float = 0.1,
+        max_semantic_entries: int = 256,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum in-process entries
+            ttl_seconds: Entry time-to-live in seconds
+            redis_enabled: Also read and write the shared Redis tier
+            redis_client: Optional async Redis client (created from the app
+                Redis configuration on first use when omitted)
+            similarity_threshold: Minimum cosine similarity for semantic
+                matches (None for exact matches only)
+            temperature_step: Width of the temperature buckets
+            max_semantic_entries: Query embeddings kept per partition
+        """
+        self.ttl_seconds = ttl_seconds
+        self.redis_enabled = redis_enabled or redis_client is not None
+        self.similarity_threshold = similarity_threshold
+        self.temperature_step = temperature_step
+        self.max_semantic_entries = max_semantic_entries
+        self.responses = TTLCache(max_entries, ttl_seconds)
+        self._redis = redis_client
+        # partition -> key -> query embedding (most recent last)
+        self._embeddings: Dict[str, "OrderedDict[str, np.ndarray]"] = {}
+
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "semantic_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "redis_hits": 0,
+            "redis_errors": 0,
+            "invalidations": 0,
+        }
+
+        logger.info(
+            f"ResponseCache initialized (max_entries={max_entries}, ttl={ttl_seconds}s, "
+            f"redis={self.redis_enabled}, similarity_threshold={similarity_threshold})"
+        )
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def build_key(
+        self,
+        query: str,
+        temperature: float,
+        context_fingerprint: str,
+        embedding: Optional[np.ndarray] = None,
+        **parts: Any,
+    ) -> ResponseCacheKey:
+        """Build the cache key of a query.
+
+        Args:
+            query: Query text (normalized before hashing)
+            temperature: Sampling temperature (bucketed)
+            context_fingerprint: Identifies the retrieval context and model set
+            embedding: Optional query embedding for semantic matching
+            **parts: Remaining request parts shaping the answer (mode, tier,
+                instance, token limit, ...); must be JSON serializable
+
+        Returns:
+            ResponseCacheKey for lookups and writes
+        """
+        bucket = round(temperature / self.temperature_step) * self.temperature_step
+        partition_parts = json.dumps(
+            {**parts, "temperature": f"{bucket:.2f}", "context": context_fingerprint},
+            sort_keys=True,
+            default=str,
+        )
+        partition = hashlib.sha1(partition_parts.encode()).hexdigest()
+        key = hashlib.sha1(f"{partition}:{normalize_query(query)}".encode()).hexdigest()
+
+        if embedding is not None:
+            embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+            norm = float(np.linalg.norm(embedding))
+            embedding = embedding / norm if norm > 0 else None
+
+        return ResponseCacheKey(partition=partition, key=key, embedding=embedding)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    async def get(self, cache_key: ResponseCacheKey) -> Optional[str]:
+        """Get a cached response: exact match first, then a semantic match.
+
+        Args:
+            cache_key: Key from build_key()
+
+        Returns:
+            Serialized response, or None on a miss
+        """
+        response = await self._get_exact(cache_key.key)
+        if response is not None:
+            self._stats["hits"] += 1
+            await self._record(hit=True)
+            return response
+
+        similar_key = self._find_similar(cache_key)
+        if similar_key is not None:
+            response = await self._get_exact(similar_key)
+            if response is not None:
+                self._stats["semantic_hits"] += 1
+                await self._record(hit=True)
+                return response
+
+        self._stats["misses"] += 1
+        await self._record(hit=False)
+        return None
+
+    async def set(self, cache_key: ResponseCacheKey, response: str) -> None:
+        """Store a serialized response.
+
+        Args:
+            cache_key: Key from build_key()
+            response: Serialized response
+        """
+        self.responses.set(cache_key.key, response)
+        if cache_key.embedding is not None and self.similarity_threshold is not None:
+            embeddings = self._embeddings.setdefault(cache_key.partition, OrderedDict())
+            embeddings[cache_key.key] = cache_key.embedding
+            embeddings.move_to_end(cache_key.key)
+            while len(embeddings) > self.max_semantic_entries:
+                embeddings.popitem(last=False)
+
+        if self.redis_enabled:
+            await self._redis_set(_RESPONSE_PREFIX + cache_key.key, response)
+
+        self._stats["sets"] += 1
+        metrics = find_cache_metrics()
+        if metrics is not None:
+            await metrics.record_set()
+
+    def invalidate(self, reason: str) -> None:
+        """Drop all in-process entries (index or model set changed).
+
+        Shared Redis entries are not deleted: their keys include the index
+        version and model set, so they can no longer be looked up.
+
+        Args:
+            reason: What changed (logged)
+        """
+        if len(self.responses) or self._embeddings:
+            logger.info(f"Response cache invalidated: {reason}")
+        self.responses.clear()
+        self._embeddings.clear()
+        self._stats["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and tier sizes."""
+        lookups = self._stats["hits"] + self._stats["semantic_hits"] + self._stats["misses"]
+        hits = self._stats["hits"] + self._stats["semantic_hits"]
+        return {
+            **self._stats,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self.responses),
+            "evictions": self.responses.evictions,
+            "semantic_entries": sum(len(e) for e in self._embeddings.values()),
+            "ttl_seconds": self.ttl_seconds,
+            "redis_enabled": self.redis_enabled,
+            "similarity_threshold": self.similarity_threshold,
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    async def _get_exact(self, key: str) -> Optional[str]:
+        """Look a key up in-process, then in Redis (promoting Redis hits)."""
+        response = self.responses.get(key)
+        if response is None and self.redis_enabled:
+            data = await self._redis_get(_RESPONSE_PREFIX + key)
+            if data is not None:
+                response = data.decode() if isinstance(data, bytes) else data
+                self.responses.set(key, response)
+        return response
+
+    def _find_similar(self, cache_key: ResponseCacheKey) -> Optional[str]:
+        """Key of the most similar cached query in the partition above the threshold."""
+        if cache_key.embedding is None or self.similarity_threshold is None:
+            return None
+        embeddings = self._embeddings.get(cache_key.partition)
+        if not embeddings:
+            return None
+
+        keys = list(embeddings)
+        matrix = np.stack([embeddings[key] for key in keys])
+        if matrix.shape[1] != cache_key.embedding.shape[0]:
+            return None
+        similarities = matrix @ cache_key.embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        return keys[best]
+
+    async def _record(self, hit: bool) -> None:
+        """Count a lookup in the global CacheMetrics tracker."""
+        metrics = find_cache_metrics()
+        if metrics is not None:
+            if hit:
+                await metrics.record_hit()
+            else:
+                await metrics.record_miss()
+
+    def _get_redis(self) -> Any:
+        """Create the async Redis client from the app configuration on first use."""
+        if self._redis is None:
+            import redis.asyncio as redis_asyncio
+
+            from app.core.config import get_config
+
+            config = get_config()
+            self._redis = redis_asyncio.Redis(
+                host=config.redis.host,
+                port=config.redis.port,
+                db=config.redis.db,
+                password=config.redis.password,
+                socket_connect_timeout=2,
+                socket_timeout=1,
+            )
+        return self._redis
+
+    async def _redis_get(self, key: str) -> Optional[bytes]:
+        """Read from Redis, treating errors as misses."""
+        try:
+            data = await self._get_redis().get(key)
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.debug(f"Response cache Redis read failed: {e}")
+            return None
+
+        if data is not None:
+            self._stats["redis_hits"] += 1
+        return data
+
+    async def _redis_set(self, key: str, value: str) -> None:
+        """Write to Redis with the cache TTL, ignoring errors."""
+        try:
+            await self._get_redis().set(key, value, ex=self.ttl_seconds)
+        except Exception as e:
+            self._stats["redis_errors"] += 1
+            logger.debug(f"Response cache Redis write failed: {e}")
+
+
+# Global instance (initialized in main.py lifespan)
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the global response cache instance.
+
+    Returns:
+        Global ResponseCache instance
+
+    Raises:
+        RuntimeError: If cache not initialized
+    """
+    if _response_cache is None:
+        raise RuntimeError("ResponseCache not initialized - call init_response_cache() first")
+    return _response_cache
+
+
+def init_response_cache(
+    max_entries: int = 1024,
+    ttl_seconds: int = 3600,
+    redis_enabled: bool = False,
+    similarity_threshold: Optional[float] = None,
+) -> ResponseCache:
+    """Initialize the global response cache instance.
+
+    Should be called during application startup (in lifespan context).
+
+    Args:
+        max_entries: Maximum in-process entries
+        ttl_seconds: Entry time-to-live in seconds
+        redis_enabled: Also use the shared Redis tier
+        similarity_threshold: Minimum cosine similarity for semantic matches
+            (None for exact matches only)
+
+    Returns:
+        Initialized ResponseCache instance
+    """
+    global _response_cache
+    _response_cache = ResponseCache(
+        max_entries=max_entries,
+        ttl_seconds=ttl_seconds,
+        redis_enabled=redis_enabled,
+        similarity_threshold=similarity_threshold,
+    )
+    return _response_cache
@@ -0,0 +1,116 @@
+"""Speculative stage-2 prompt prefill for two-stage queries.
+
+In two-stage mode the stage-2 (BALANCED/POWERFUL) model used to sit idle
+while stage 1 generated, and then had to process the whole refinement prompt
+from a cold KV cache. SpeculativePrefill warms the stage-2 server instead:
+
+1. The shared prompt prefix (instance system prompt, retrieved context and the
+   query) is evaluated as soon as stage 1 starts.
+2. Stage-1 output is streamed in: every ``chunk_tokens`` generated tokens the
+   prefix plus the output so far is evaluated again, extending the cached
+   prefix.
+
+The final stage-2 request (prefix + full stage-1 output + instructions) then
+only processes the tokens that are not cached yet. At most one prefill
+request is in flight; text arriving meanwhile is sent with the next one.
+
+Author: Backend Architect
+Feature: Speculative Stage-2 Prefill
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from app.core.logging import get_logger
+from app.services.llama_client import LlamaCppClient
+
+logger = get_logger(__name__)
+
+
+class SpeculativePrefill:
+    """Incrementally prefill a stage-2 server while stage 1 generates.
+
+    Attributes:
+        client: Client of the stage-2 model server
+        prefix: Stage-2 prompt text preceding the stage-1 output
+        chunk_tokens: Stage-1 tokens accumulated before extending the prefill
+    """
+
+    def __init__(self, client: LlamaCppClient, prefix: str, chunk_tokens: int = 32) -> None:
+        """Initialize the prefill.
+
+        Args:
+            client: Client of the stage-2 model server
+            prefix: Stage-2 prompt text preceding the stage-1 output
+            chunk_tokens: Stage-1 tokens accumulated before extending the prefill
+        """
+        self.client = client
+        self.prefix = prefix
+        self.chunk_tokens = chunk_tokens
+        self._parts: List[str] = []
+        self._sent_parts = 0
+        self._task: Optional[asyncio.Task] = None
+        self._disabled = False
+        self._requests = 0
+
+    def start(self) -> None:
+        """Prefill the shared prefix."""
+        self._schedule()
+
+    def feed(self, content: str) -> None:
+        """Add a stage-1 token and extend the prefill every ``chunk_tokens`` tokens.
+
+        Args:
+            content: Generated text fragment
+        """
+        self._parts.append(content)
+        if len(self._parts) - self._sent_parts >= self.chunk_tokens:
+            self._schedule()
+
+    def _schedule(self) -> None:
+        """Send the current text unless a prefill is in flight or prefill failed."""
+        if self._disabled or (self._task is not None and not self._task.done()):
+            return
+        self._sent_parts = len(self._parts)
+        prompt = self.prefix + "".join(self._parts)
+        self._task = asyncio.create_task(self._prefill(prompt))
+
+    async def _prefill(self, prompt: str) -> None:
+        self._requests += 1
+        if not await self.client.prefill(prompt):
+            # Server does not accept prefills (or is unreachable) - stop trying
+            self._disabled = True
+
+    async def finish(self, timeout: float = 5.0) -> None:
+        """Wait for the in-flight prefill before the final stage-2 request.
+
+        Args:
+            timeout: Maximum seconds to wait (the prefill is cancelled after)
+        """
+        if self._task is None or self._task.done():
+            return
+        try:
+            await asyncio.wait_for(self._task, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Stage-2 prefill did not finish within {timeout}s, continuing",
+                extra={"base_url": self.client.base_url},
+            )
+
+    async def cancel(self) -> None:
+        """Stop prefilling (e.g. the query failed) and cancel the in-flight prefill."""
+        self._disabled = True
+        if self._task is None:
+            return
+        self._task.cancel()
+        # Retrieve the outcome so a failed prefill is not reported as unhandled
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Prefill requests sent, stage-1 tokens covered and whether prefill failed."""
+        return {
+            "requests": self._requests,
+            "tokens_streamed": len(self._parts),
+            "tokens_prefilled": self._sent_parts,
+            "disabled": self._disabled,
+        }
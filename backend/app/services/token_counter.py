@@ -4,21 +4,159 @@ This module provides token counting capabilities using tiktoken for accurate
 token estimation. Token counts are essential for context window management,
 ensuring queries stay within model context limits.
 
-The service supports caching to avoid re-counting identical text, and uses
-the cl100k_base encoding which is compatible with most modern LLMs.
+The service caches counts in a content-hash LRU to avoid re-counting identical
+text, and uses the cl100k_base encoding which is compatible with most modern
+LLMs by default. A model's own HuggingFace tokenizer can be used instead with
+an ``hf:<tokenizer name>`` encoding name (e.g. ``hf:Qwen/Qwen2.5-7B-Instruct``).
+
+Async callers count through count_tokens_batch_async (or
+count_tokens_for_model), which runs large texts in a small thread pool so
+that tokenizing big CGRAG contexts does not block the event loop. When
+ModelTokenCounters is initialized, counts for a model come from its running
+llama.cpp server's /tokenize endpoint (exact for the loaded GGUF model) and
+are cached per model, falling back to the local encoding.
 
 Author: Backend Architect
 Feature: Context Window Allocation Viewer
 """
 
-from typing import Dict, List, Optional
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 import tiktoken
 
 from app.core.logging import get_logger
 
+if TYPE_CHECKING:
+    from app.services.llama_client import LlamaCppClient
+    from app.services.llama_server_manager import ServerProcess
+
 logger = get_logger(__name__)
 
+# Prefix selecting a HuggingFace tokenizer instead of a tiktoken encoding
+HF_TOKENIZER_PREFIX = "hf:"
+
+# Token counts kept per counter (per encoding or per model)
+DEFAULT_CACHE_SIZE = 4096
+
+# Texts at least this long are counted in the thread pool by async callers
+OFFLOAD_MIN_CHARS = 2048
+
+# Seconds a model's /tokenize endpoint is skipped after a failed call
+TOKENIZE_RETRY_SECONDS = 30.0
+
+# Shared thread pool for counting large texts (tiktoken releases the GIL)
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the token counting thread pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="token-count")
+    return _executor
+
+
+def _content_key(text: str) -> bytes:
+    """Cache key of a text: a 128-bit BLAKE2b digest of its content."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class TokenCountCache:
+    """Thread-safe LRU cache of token counts keyed by content hash.
+
+    Counts are looked up from the event loop and stored from the counting
+    thread pool (and from CGRAG ingest workers), so access is guarded by a
+    lock.
+
+    Attributes:
+        max_entries: Maximum number of cached counts
+        hits: Lookups answered from the cache
+        misses: Lookups that had to count
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached counts
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[int]:
+        """Look up a count, marking it most recently used.
+
+        Args:
+            key: Content key from _content_key()
+
+        Returns:
+            Cached token count, or None on a miss
+        """
+        with self._lock:
+            count = self._entries.get(key)
+            if count is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return count
+
+    def put(self, key: bytes, count: int) -> None:
+        """Store a count, evicting the least recently used one if full.
+
+        Args:
+            key: Content key from _content_key()
+            count: Token count of the text
+        """
+        with self._lock:
+            self._entries[key] = count
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached counts."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Size and hit rate of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class _HFEncoding:
+    """Adapter giving a HuggingFace tokenizer the tiktoken encode/decode interface."""
+
+    def __init__(self, tokenizer_name: str):
+        from transformers import AutoTokenizer
+
+        self._tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+
+    def encode(self, text: str) -> List[int]:
+        return self._tokenizer.encode(text, add_special_tokens=False)
+
+    def decode(self, tokens: List[int]) -> str:
+        return self._tokenizer.decode(tokens)
+
 
 class TokenCounter:
     """Token counting service using tiktoken.
@@ -29,13 +167,15 @@ class TokenCounter:
 
     Architecture:
         - Uses cl100k_base encoding (GPT-4, GPT-3.5-turbo compatible)
-        - Caches encodings to avoid reinitialization
+        - Caches counts by content hash (LRU) to avoid re-tokenizing
         - Supports batch counting for efficiency
+        - Async batch counting runs large texts in a thread pool
         - Thread-safe singleton pattern
 
     Attributes:
         encoding: tiktoken encoding instance
-        _cache: Optional cache for repeated text (future enhancement)
+        offload_min_chars: Minimum text length counted in the thread pool
+        _cache: LRU cache of token counts keyed by content hash
 
     Example:
         >>> counter = TokenCounter()
@@ -43,7 +183,12 @@ class TokenCounter:
         >>> print(tokens)  # Output: 2
     """
 
-    def __init__(self, encoding_name: str = "cl100k_base"):
+    def __init__(
+        self,
+        encoding_name: str = "cl100k_base",
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        offload_min_chars: int = OFFLOAD_MIN_CHARS,
+    ):
         """Initialize token counter with specified encoding.
 
         Args:
@@ -52,12 +197,19 @@ class TokenCounter:
                 - cl100k_base: GPT-4, GPT-3.5-turbo, text-embedding-ada-002
                 - p50k_base: Codex models, text-davinci-002/003
                 - r50k_base: GPT-3 models (davinci, curie, babbage, ada)
+                - hf:<name>: HuggingFace tokenizer of a specific model
+            cache_size: Maximum number of cached token counts
+            offload_min_chars: Minimum text length async callers count in
+                the thread pool instead of on the event loop
 
         Raises:
             ValueError: If encoding_name is not recognized
         """
         try:
-            self.encoding = tiktoken.get_encoding(encoding_name)
+            if encoding_name.startswith(HF_TOKENIZER_PREFIX):
+                self.encoding = _HFEncoding(encoding_name[len(HF_TOKENIZER_PREFIX) :])
+            else:
+                self.encoding = tiktoken.get_encoding(encoding_name)
             self._encoding_name = encoding_name
             logger.info(
                 f"TokenCounter initialized with encoding: {encoding_name}",
@@ -67,6 +219,9 @@ class TokenCounter:
             logger.error(f"Failed to initialize tiktoken encoding: {e}", exc_info=True)
             raise ValueError(f"Invalid encoding name: {encoding_name}") from e
 
+        self.offload_min_chars = offload_min_chars
+        self._cache = TokenCountCache(cache_size)
+
     def count_tokens(self, text: str) -> int:
         """Count tokens in a text string.
 
@@ -84,9 +239,24 @@ class TokenCounter:
         if not text:
             return 0
 
+        key = _content_key(text)
+        count = self._cache.get(key)
+        if count is None:
+            count = self._count_uncached(text, key)
+        return count
+
+    def _count_uncached(self, text: str, key: bytes) -> int:
+        """Tokenize a text and cache its count (estimates are not cached).
+
+        Args:
+            text: Non-empty text to count
+            key: Content key of the text
+
+        Returns:
+            Number of tokens in the text
+        """
         try:
-            tokens = self.encoding.encode(text)
-            return len(tokens)
+            count = len(self.encoding.encode(text))
         except Exception as e:
             logger.error(
                 f"Error counting tokens: {e}",
@@ -96,6 +266,13 @@ class TokenCounter:
             # Fallback to rough estimation
             return self._estimate_tokens(text)
 
+        self._cache.put(key, count)
+        return count
+
+    def _count_uncached_batch(self, items: List[Tuple[str, bytes]]) -> List[int]:
+        """Count (text, key) pairs; runs in the token counting thread pool."""
+        return [self._count_uncached(text, key) for text, key in items]
+
     def count_tokens_batch(self, texts: List[str]) -> List[int]:
         """Count tokens for multiple texts efficiently.
 
@@ -112,6 +289,60 @@ class TokenCounter:
         """
         return [self.count_tokens(text) for text in texts]
 
+    async def count_tokens_async(self, text: str) -> int:
+        """Count tokens in a text without blocking the event loop.
+
+        Args:
+            text: Text to count tokens for
+
+        Returns:
+            Number of tokens in the text
+        """
+        return (await self.count_tokens_batch_async([text]))[0]
+
+    async def count_tokens_batch_async(self, texts: Sequence[str]) -> List[int]:
+        """Count tokens for multiple texts without blocking the event loop.
+
+        Cached and short texts are counted inline; uncached texts of at least
+        offload_min_chars characters are tokenized together in the shared
+        token counting thread pool.
+
+        Args:
+            texts: Text strings to count
+
+        Returns:
+            List of token counts corresponding to input texts
+
+        Example:
+            >>> counter = TokenCounter()
+            >>> counts = await counter.count_tokens_batch_async([prompt, context])
+        """
+        counts = [0] * len(texts)
+        offloaded: List[Tuple[int, str, bytes]] = []
+
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            key = _content_key(text)
+            count = self._cache.get(key)
+            if count is not None:
+                counts[i] = count
+            elif len(text) < self.offload_min_chars:
+                counts[i] = self._count_uncached(text, key)
+            else:
+                offloaded.append((i, text, key))
+
+        if offloaded:
+            results = await asyncio.get_running_loop().run_in_executor(
+                _get_executor(),
+                self._count_uncached_batch,
+                [(text, key) for _, text, key in offloaded],
+            )
+            for (i, _, _), count in zip(offloaded, results):
+                counts[i] = count
+
+        return counts
+
     def count_tokens_dict(self, text_dict: Dict[str, str]) -> Dict[str, int]:
         """Count tokens for a dictionary of text strings.
 
@@ -147,13 +378,11 @@ class TokenCounter:
         Returns:
             Estimated token count
         """
-        # Rough estimation: ~1.3 tokens per word
-        word_count = len(text.split())
-        estimated_tokens = int(word_count * 1.3)
+        estimated_tokens = estimate_tokens(text)
 
         logger.warning(
             f"Using fallback token estimation: {estimated_tokens} tokens",
-            extra={"word_count": word_count, "estimated_tokens": estimated_tokens},
+            extra={"word_count": len(text.split()), "estimated_tokens": estimated_tokens},
         )
 
         return estimated_tokens
@@ -215,26 +444,309 @@ class TokenCounter:
 
             return text[: max_chars - len(suffix)] + suffix
 
+    def get_stats(self) -> Dict[str, Any]:
+        """Encoding and cache statistics of the counter."""
+        return {"encoding": self._encoding_name, "cache": self._cache.get_stats()}
+
 
-# Global singleton instance
-_token_counter: Optional[TokenCounter] = None
+# Global instances keyed by encoding name
+_token_counters: Dict[str, TokenCounter] = {}
 
+# Encodings that failed to load (e.g. tiktoken data unavailable offline)
+_unavailable_encodings: Dict[str, str] = {}
 
-def get_token_counter() -> TokenCounter:
-    """Get the global token counter instance.
+
+def get_token_counter(encoding_name: str = "cl100k_base") -> TokenCounter:
+    """Get the global token counter instance for an encoding.
 
     Implements lazy initialization - creates the counter on first access.
 
+    Args:
+        encoding_name: Tiktoken encoding name or ``hf:<tokenizer name>``
+
     Returns:
-        Global TokenCounter instance
+        Global TokenCounter instance for the encoding
 
     Example:
         >>> counter = get_token_counter()
         >>> tokens = counter.count_tokens("Hello world")
     """
-    global _token_counter
+    counter = _token_counters.get(encoding_name)
+    if counter is None:
+        counter = TokenCounter(encoding_name)
+        _token_counters[encoding_name] = counter
+
+    return counter
+
+
+def find_token_counter(encoding_name: str = "cl100k_base") -> Optional[TokenCounter]:
+    """Get the global token counter for an encoding, or None if it cannot load.
+
+    Unlike get_token_counter(), a failure to load the encoding (for example
+    tiktoken data that cannot be downloaded on an air-gapped host) is logged
+    once and remembered, so callers can fall back to estimate_tokens()
+    without retrying the load for every text.
+
+    Args:
+        encoding_name: Tiktoken encoding name or ``hf:<tokenizer name>``
+
+    Returns:
+        Global TokenCounter instance, or None if the encoding is unavailable
+    """
+    if encoding_name in _unavailable_encodings:
+        return None
+    try:
+        return get_token_counter(encoding_name)
+    except ValueError as e:
+        _unavailable_encodings[encoding_name] = str(e.__cause__ or e)
+        logger.warning(
+            f"Token counter encoding {encoding_name} unavailable, using word estimates",
+            extra={"encoding": encoding_name},
+        )
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (~1.3 tokens per word).
+
+    Args:
+        text: Text to estimate tokens for
+
+    Returns:
+        Estimated token count
+    """
+    return int(len(text.split()) * 1.3)
+
+
+class ModelTokenCounter:
+    """Exact token counts from one model's llama.cpp /tokenize endpoint.
+
+    Counts are cached per model. Texts are counted with the fallback
+    TokenCounter while the model's server is not available, and for
+    TOKENIZE_RETRY_SECONDS after a failed /tokenize call.
+
+    Attributes:
+        model_id: Model identifier
+        fallback: Local counter used when the server cannot tokenize
+        remote_counts: Texts counted by the server
+        fallback_counts: Texts counted with the fallback counter
+        failures: Failed /tokenize batches
+    """
 
-    if _token_counter is None:
-        _token_counter = TokenCounter()
+    def __init__(
+        self,
+        model_id: str,
+        client_resolver: Callable[[str], Optional["LlamaCppClient"]],
+        fallback: TokenCounter,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        """Initialize the counter.
+
+        Args:
+            model_id: Model identifier
+            client_resolver: Returns the client of the model's running server,
+                or None if it has no ready server
+            fallback: Local counter used when the server cannot tokenize
+            cache_size: Maximum number of cached token counts
+        """
+        self.model_id = model_id
+        self.fallback = fallback
+        self.remote_counts = 0
+        self.fallback_counts = 0
+        self.failures = 0
+        self._client_resolver = client_resolver
+        self._cache = TokenCountCache(cache_size)
+        self._retry_at = 0.0
+
+    async def count_tokens_batch(self, texts: Sequence[str]) -> List[int]:
+        """Count tokens for multiple texts with the model's tokenizer.
+
+        Args:
+            texts: Text strings to count
+
+        Returns:
+            List of token counts corresponding to input texts
+        """
+        counts = [0] * len(texts)
+        missing: List[Tuple[int, str, bytes]] = []
+
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            key = _content_key(text)
+            count = self._cache.get(key)
+            if count is None:
+                missing.append((i, text, key))
+            else:
+                counts[i] = count
+
+        if not missing:
+            return counts
+
+        remote = await self._tokenize([text for _, text, _ in missing])
+        if remote is None:
+            self.fallback_counts += len(missing)
+            results = await self.fallback.count_tokens_batch_async([text for _, text, _ in missing])
+        else:
+            self.remote_counts += len(missing)
+            results = remote
+            for (_, _, key), count in zip(missing, remote):
+                self._cache.put(key, count)
+
+        for (i, _, _), count in zip(missing, results):
+            counts[i] = count
+        return counts
+
+    async def _tokenize(self, texts: List[str]) -> Optional[List[int]]:
+        """Token counts from the model's server, or None if unavailable."""
+        if time.monotonic() < self._retry_at:
+            return None
+        client = self._client_resolver(self.model_id)
+        if client is None:
+            return None
+
+        try:
+            token_lists = await asyncio.gather(*(client.tokenize(text) for text in texts))
+        except Exception as e:
+            self.failures += 1
+            self._retry_at = time.monotonic() + TOKENIZE_RETRY_SECONDS
+            logger.warning(
+                f"Tokenize failed for {self.model_id}, using local token counts: {e}",
+                extra={"model_id": self.model_id},
+            )
+            return None
+
+        return [len(tokens) for tokens in token_lists]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Count sources and cache statistics of the counter."""
+        return {
+            "remote_counts": self.remote_counts,
+            "fallback_counts": self.fallback_counts,
+            "failures": self.failures,
+            "cache": self._cache.get_stats(),
+        }
+
+
+class ModelTokenCounters:
+    """Per-model ModelTokenCounter registry.
+
+    Follows LlamaServerManager like ModelClientRegistry: a model's counter
+    (and its cached counts) is dropped when its server is stopped or
+    restarted, since the server may then load a different GGUF file.
+
+    Attributes:
+        cache_size: Cache size of created counters
+    """
 
-    return _token_counter
+    def __init__(
+        self,
+        client_resolver: Callable[[str], Optional["LlamaCppClient"]],
+        fallback_encoding: str = "cl100k_base",
+        cache_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            client_resolver: Returns the client of a model's running server,
+                or None if it has no ready server
+            fallback_encoding: Encoding of the local fallback counter
+            cache_size: Cache size of created counters
+        """
+        self.cache_size = cache_size
+        self._client_resolver = client_resolver
+        self._fallback_encoding = fallback_encoding
+        self._counters: Dict[str, ModelTokenCounter] = {}
+
+    def for_model(self, model_id: str) -> ModelTokenCounter:
+        """Get a model's counter, creating it on first use.
+
+        Args:
+            model_id: Model identifier
+
+        Returns:
+            ModelTokenCounter of the model
+        """
+        counter = self._counters.get(model_id)
+        if counter is None:
+            counter = ModelTokenCounter(
+                model_id,
+                self._client_resolver,
+                get_token_counter(self._fallback_encoding),
+                cache_size=self.cache_size,
+            )
+            self._counters[model_id] = counter
+        return counter
+
+    def on_server_change(self, model_id: str, server: Optional["ServerProcess"]) -> None:
+        """LlamaServerManager listener: drop counters of stopped or restarted servers.
+
+        Args:
+            model_id: Model identifier
+            server: Started server, or None if the server was stopped
+        """
+        self._counters.pop(model_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-model counter statistics."""
+        return {model_id: counter.get_stats() for model_id, counter in self._counters.items()}
+
+
+# Global per-model counters (initialized in main.py lifespan when enabled)
+_model_token_counters: Optional[ModelTokenCounters] = None
+
+
+def get_model_token_counters() -> ModelTokenCounters:
+    """Get the global per-model token counters.
+
+    Returns:
+        Global ModelTokenCounters instance
+
+    Raises:
+        RuntimeError: If the counters are not initialized
+    """
+    if _model_token_counters is None:
+        raise RuntimeError(
+            "ModelTokenCounters not initialized - call init_model_token_counters() first"
+        )
+    return _model_token_counters
+
+
+def init_model_token_counters(
+    client_resolver: Callable[[str], Optional["LlamaCppClient"]],
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> ModelTokenCounters:
+    """Initialize the global per-model token counters.
+
+    Should be called during application startup (in lifespan context), after
+    the model client registry.
+
+    Args:
+        client_resolver: Returns the client of a model's running server, or
+            None if it has no ready server
+        cache_size: Cache size of each model's counter
+
+    Returns:
+        Initialized ModelTokenCounters instance
+    """
+    global _model_token_counters
+    _model_token_counters = ModelTokenCounters(client_resolver, cache_size=cache_size)
+    return _model_token_counters
+
+
+async def count_tokens_for_model(texts: Sequence[str], model_id: Optional[str] = None) -> List[int]:
+    """Count tokens without blocking the event loop, exactly for a model if possible.
+
+    Uses the model's /tokenize-backed counter when per-model counters are
+    initialized, and the default local counter otherwise.
+
+    Args:
+        texts: Text strings to count
+        model_id: Model the texts are sent to
+
+    Returns:
+        List of token counts corresponding to input texts
+    """
+    if model_id and _model_token_counters is not None:
+        return await _model_token_counters.for_model(model_id).count_tokens_batch(texts)
+    return await get_token_counter().count_tokens_batch_async(texts)
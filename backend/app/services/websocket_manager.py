@@ -6,23 +6,115 @@ to frontend clients. It provides:
 - Connection lifecycle management (connect/disconnect)
 - Broadcasting log messages to all connected clients
 - Circular buffer for historical logs (500 lines per model)
-- Thread-safe operations for concurrent access from subprocess threads
+- Batched broadcasts from the llama-server output readers
 - Filtering by model_id
 
+Broadcasting never waits for clients: each log entry is encoded once and
+enqueued on every connection's bounded send queue, and a writer task per
+connection sends it. A slow client only loses its own oldest lines (or has
+them coalesced into a single notice) without delaying anyone else.
+
 Author: Backend Architect
 Phase: 3 - WebSocket Log Streaming
 """
 
 import asyncio
+import json
 import logging
 from collections import defaultdict, deque
-from typing import Deque, Dict, List, Optional
+from datetime import datetime
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Optional, Tuple
 
 from fastapi import WebSocket
 
 logger = logging.getLogger(__name__)
 
 
+class LogOverflowPolicy(str, Enum):
+    """What a connection's send queue does when it is full.
+
+    DROP_OLDEST: Discard the oldest queued line
+    COALESCE: Discard the oldest queued line and report the dropped lines as
+        one WARN entry ("N log lines skipped") sent ahead of the next line
+    """
+
+    DROP_OLDEST = "drop_oldest"
+    COALESCE = "coalesce"
+
+
+def _encode(message: dict) -> str:
+    """Encode a message the way WebSocket.send_json does."""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class _LogSender:
+    """Bounded send queue and writer task for one WebSocket connection."""
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        model_id: Optional[str],
+        max_pending: int,
+        overflow: LogOverflowPolicy,
+    ) -> None:
+        self.websocket = websocket
+        self.model_id = model_id
+        self.max_pending = max_pending
+        self.overflow = overflow
+        # (model_id, encoded message) in send order
+        self.pending: Deque[Tuple[Optional[str], str]] = deque()
+        self.dropped = 0
+        self.skipped = 0  # Dropped lines not yet reported (COALESCE)
+        self.skipped_model_id: Optional[str] = None
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+
+    def offer(self, model_id: Optional[str], text: str) -> None:
+        """Queue an encoded message without waiting."""
+        if len(self.pending) >= self.max_pending:
+            dropped_model_id, _ = self.pending.popleft()
+            self.dropped += 1
+            if self.overflow == LogOverflowPolicy.COALESCE:
+                self.skipped += 1
+                self.skipped_model_id = dropped_model_id
+        self.pending.append((model_id, text))
+        self.idle.clear()
+        self._ready.set()
+
+    def _skipped_notice(self) -> str:
+        notice = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "model_id": self.skipped_model_id or "unknown",
+            "level": "WARN",
+            "message": f"{self.skipped} log lines skipped (client too slow)",
+        }
+        self.skipped = 0
+        return _encode(notice)
+
+    async def run(self, on_failure: Callable[[WebSocket], None]) -> None:
+        """Send queued messages in order until cancelled or a send fails."""
+        try:
+            while True:
+                await self._ready.wait()
+                self._ready.clear()
+                while self.pending:
+                    if self.skipped:
+                        await self.websocket.send_text(self._skipped_notice())
+                    _, text = self.pending.popleft()
+                    await self.websocket.send_text(text)
+                self.idle.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Failed to send log to WebSocket (connection likely closed): {e}")
+            self.pending.clear()
+            self.idle.set()
+            on_failure(self.websocket)
+
+
 class WebSocketManager:
     """Manager for WebSocket connections and log broadcasting.
 
@@ -31,37 +123,63 @@ class WebSocketManager:
     a circular buffer of recent logs for each model to send to new clients
     upon connection.
 
-    Thread Safety:
-        All public methods use asyncio.Lock to ensure thread-safe access
-        from both async request handlers and subprocess log threads.
+    Concurrency:
+        All methods run on the event loop. Broadcasts only enqueue; each
+        connection's writer task is the only coroutine sending on it.
     """
 
-    def __init__(self, buffer_size: int = 500):
+    def __init__(
+        self,
+        buffer_size: int = 500,
+        send_queue_size: int = 1000,
+        overflow: LogOverflowPolicy = LogOverflowPolicy.DROP_OLDEST,
+    ):
         """Initialize WebSocket manager.
 
         Args:
             buffer_size: Maximum number of log lines to buffer per model
+            send_queue_size: Maximum messages queued per connection
+            overflow: Default policy when a connection's queue is full
         """
         self.active_connections: List[WebSocket] = []
         self.log_buffer: Dict[str, Deque[dict]] = defaultdict(lambda: deque(maxlen=buffer_size))
         self.buffer_size = buffer_size
+        self.send_queue_size = send_queue_size
+        self.overflow = overflow
+        self._senders: Dict[WebSocket, _LogSender] = {}
         self._lock = asyncio.Lock()
 
         logger.info(f"WebSocket manager initialized (buffer_size={buffer_size} lines/model)")
 
-    async def connect(self, websocket: WebSocket) -> None:
+    async def connect(
+        self,
+        websocket: WebSocket,
+        model_id: Optional[str] = None,
+        overflow: Optional[LogOverflowPolicy] = None,
+        replay: bool = False,
+    ) -> None:
         """Accept new WebSocket connection.
 
-        Accepts the WebSocket handshake and adds the connection to the
-        active connections list for future broadcasts.
+        Accepts the WebSocket handshake, adds the connection to the active
+        connections list for future broadcasts and starts its writer task.
 
         Args:
             websocket: WebSocket connection to accept
+            model_id: Only send logs for this model (None for all models)
+            overflow: Send queue overflow policy (defaults to the manager's)
+            replay: Queue the buffered logs (oldest first) before new ones
         """
         await websocket.accept()
 
+        sender = _LogSender(websocket, model_id, self.send_queue_size, overflow or self.overflow)
+        if replay:
+            for log_entry in self.get_logs(model_id):
+                sender.offer(log_entry.get("model_id"), _encode(log_entry))
+
         async with self._lock:
             self.active_connections.append(websocket)
+            self._senders[websocket] = sender
+            sender.task = asyncio.create_task(sender.run(self._remove_connection))
 
         logger.info(f"WebSocket connected (total connections: {len(self.active_connections)})")
 
@@ -77,6 +195,14 @@ class WebSocketManager:
         async with self._lock:
             if websocket in self.active_connections:
                 self.active_connections.remove(websocket)
+            sender = self._senders.pop(websocket, None)
+
+        if sender is not None and sender.task is not None:
+            sender.task.cancel()
+            try:
+                await sender.task
+            except asyncio.CancelledError:
+                pass
 
         logger.info(
             f"WebSocket disconnected (remaining connections: {len(self.active_connections)})"
@@ -106,28 +232,69 @@ class WebSocketManager:
                 "message": "Server started successfully"
             })
         """
-        # Store in buffer first (no lock needed - defaultdict is thread-safe for reads)
-        model_id = log_entry.get("model_id", "unknown")
-        self.log_buffer[model_id].append(log_entry)
+        await self.broadcast_logs([log_entry])
 
-        # Broadcast to all connected clients
-        async with self._lock:
-            dead_connections = []
+    async def broadcast_logs(self, log_entries: List[dict]) -> None:
+        """Broadcast a batch of log entries to all connected clients.
 
-            for connection in self.active_connections:
-                try:
-                    await connection.send_json(log_entry)
-                except Exception as e:
-                    logger.debug(f"Failed to send log to WebSocket (connection likely closed): {e}")
-                    dead_connections.append(connection)
+        Buffers every entry, encodes it once and enqueues it on each
+        connection's send queue. Never waits for a client.
 
-            # Remove dead connections
-            for dead_conn in dead_connections:
-                if dead_conn in self.active_connections:
-                    self.active_connections.remove(dead_conn)
+        Args:
+            log_entries: Log entry dictionaries (see broadcast_log)
+        """
+        for log_entry in log_entries:
+            model_id = log_entry.get("model_id", "unknown")
+            self.log_buffer[model_id].append(log_entry)
 
-            if dead_connections:
-                logger.info(f"Removed {len(dead_connections)} dead WebSocket connections")
+            if not self._senders:
+                continue
+            text = _encode(log_entry)
+            for sender in self._senders.values():
+                if sender.model_id is None or sender.model_id == model_id:
+                    sender.offer(model_id, text)
+
+    def send_message(self, websocket: WebSocket, message: dict) -> None:
+        """Queue a control message (e.g. a ping) for one connection.
+
+        Goes through the connection's send queue so it never interleaves
+        with a log send in progress.
+
+        Args:
+            websocket: Connected WebSocket
+            message: JSON-serializable message
+        """
+        sender = self._senders.get(websocket)
+        if sender is not None:
+            sender.offer(None, _encode(message))
+
+    async def flush(self, timeout: float = 5.0) -> None:
+        """Wait until every connection's queue is sent (or the timeout expires).
+
+        Args:
+            timeout: Maximum seconds to wait
+        """
+        waits = [sender.idle.wait() for sender in self._senders.values()]
+        if not waits:
+            return
+        try:
+            await asyncio.wait_for(asyncio.gather(*waits), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Log send queues not drained within {timeout}s")
+
+    async def close(self) -> None:
+        """Stop all writer tasks and forget all connections."""
+        for websocket in list(self._senders):
+            await self.disconnect(websocket)
+
+    def _remove_connection(self, websocket: WebSocket) -> None:
+        """Drop a connection whose send failed (called by its writer task)."""
+        if websocket in self.active_connections:
+            self.active_connections.remove(websocket)
+        self._senders.pop(websocket, None)
+        logger.info(
+            f"Removed dead WebSocket connection (remaining: {len(self.active_connections)})"
+        )
 
     def get_logs(self, model_id: Optional[str] = None) -> List[dict]:
         """Get buffered logs for a model or all models.
@@ -196,6 +363,8 @@ class WebSocketManager:
                 - total_models: Number of models with buffered logs
                 - total_logs: Total number of buffered log entries
                 - models: Dict mapping model_id to log count
+                - queued: Messages waiting in connection send queues
+                - dropped: Messages dropped from full send queues
         """
         models_stats = {model_id: len(logs) for model_id, logs in self.log_buffer.items()}
 
@@ -203,4 +372,6 @@ class WebSocketManager:
             "total_models": len(self.log_buffer),
             "total_logs": sum(models_stats.values()),
             "models": models_stats,
+            "queued": sum(len(sender.pending) for sender in self._senders.values()),
+            "dropped": sum(sender.dropped for sender in self._senders.values()),
         }
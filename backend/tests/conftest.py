@@ -4,6 +4,7 @@ Provides common test fixtures for async testing, mocking, and test isolation.
 """
 
 import asyncio
+import re
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -42,3 +43,29 @@ def sample_event_metadata():
         "complexity_score": 7.5,
         "tier": "Q3",
     }
+
+
+class WordEncoding:
+    """Offline stand-in for a tiktoken encoding: one token per word or symbol."""
+
+    def encode(self, text):
+        return re.findall(r"\w+|[^\w\s]", text)
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+@pytest.fixture
+def stub_token_counter():
+    """Count tokens with WordEncoding instead of downloaded tiktoken encodings.
+
+    Keeps CGRAG tests hermetic on hosts without tiktoken's encoding data.
+    """
+    from app.services import token_counter
+
+    with (
+        patch.object(token_counter.tiktoken, "get_encoding", return_value=WordEncoding()),
+        patch.dict(token_counter._token_counters, clear=True),
+        patch.dict(token_counter._unavailable_encodings, clear=True),
+    ):
+        yield
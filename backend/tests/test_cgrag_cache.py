@@ -0,0 +1,192 @@
+"""Tests for the CGRAG query-embedding and retrieval-result cache.
+
+Tests cover:
+- TTL expiry and LRU eviction of the in-process store
+- Query normalization for embedding keys
+- Retriever cache hits skipping the encoder and FAISS search
+- Result invalidation when the index version changes
+- Optional Redis tier and CacheMetrics reporting
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pytest
+
+import app.services.cache_metrics as cache_metrics_module
+from app.models.runtime_settings import CGRAGIndexProfile
+from app.services.cache_metrics import CacheMetrics
+from app.services.cgrag import CGRAGIndexer, CGRAGRetriever, DocumentChunk
+from app.services.cgrag_cache import CGRAGCache, TTLCache, normalize_query
+
+pytestmark = pytest.mark.usefixtures("stub_token_counter")
+
+DIM = 16
+
+
+class CountingEncoder:
+    """Deterministic stand-in for SentenceTransformer that counts encode calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return DIM
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        self.calls += 1
+        rng = np.random.default_rng(abs(hash(tuple(texts))) % (2**32))
+        return rng.standard_normal((len(texts), DIM)).astype(np.float32)
+
+
+class FakeRedis:
+    """In-memory stand-in for an async Redis client."""
+
+    def __init__(self) -> None:
+        self.data: Dict[str, bytes] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.data.get(key)
+
+    async def set(self, key: str, value, ex: Optional[int] = None) -> None:
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+
+@pytest.fixture
+def encoder() -> CountingEncoder:
+    return CountingEncoder()
+
+
+@pytest.fixture
+def indexer(encoder: CountingEncoder) -> CGRAGIndexer:
+    """Small in-memory flat index of 20 chunks."""
+    indexer = CGRAGIndexer(encoder=encoder, index_profile=CGRAGIndexProfile(index_type="Flat"))
+    indexer.chunks = [
+        DocumentChunk(
+            file_path=f"doc{i}.md",
+            content=f"chunk {i} " * 10,
+            chunk_index=0,
+            start_pos=0,
+            end_pos=10,
+        )
+        for i in range(20)
+    ]
+    vectors = np.random.default_rng(0).standard_normal((20, DIM)).astype(np.float32)
+    indexer.index = indexer._build_faiss_index(vectors)
+    encoder.calls = 0
+    return indexer
+
+
+class TestTTLCache:
+    """Tests for the in-process TTL/LRU store."""
+
+    def test_lru_eviction(self) -> None:
+        """Test least recently used entries are evicted first."""
+        cache = TTLCache(max_entries=2, ttl_seconds=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert cache.evictions == 1
+
+    def test_ttl_expiry(self) -> None:
+        """Test expired entries are not returned."""
+        cache = TTLCache(max_entries=10, ttl_seconds=0.01)
+        cache.set("a", 1)
+        time.sleep(0.02)
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_normalize_query(self) -> None:
+        """Test case and whitespace differences map to the same key."""
+        assert normalize_query("  How do I\tINDEX docs? ") == "how do i index docs?"
+        assert CGRAGCache.embedding_key("m", "Hello  world") == CGRAGCache.embedding_key(
+            "m", "hello world"
+        )
+        assert CGRAGCache.embedding_key("m1", "q") != CGRAGCache.embedding_key("m2", "q")
+
+
+class TestRetrieverCache:
+    """Tests for CGRAGRetriever with a cache."""
+
+    async def test_repeated_query_skips_encoder(self, indexer, encoder) -> None:
+        """Test repeated and near-identical queries are served from cache."""
+        retriever = CGRAGRetriever(indexer, min_relevance=0.0, cache=CGRAGCache())
+
+        first = await retriever.retrieve("what is synapse", token_budget=500, max_artifacts=5)
+        second = await retriever.retrieve("What is  SYNAPSE", token_budget=500, max_artifacts=5)
+
+        assert encoder.calls == 1
+        assert not first.cache_hit
+        assert second.cache_hit
+        assert [c.file_path for c in second.artifacts] == [c.file_path for c in first.artifacts]
+        assert second.top_scores == first.top_scores
+
+    async def test_budget_is_part_of_result_key(self, indexer, encoder) -> None:
+        """Test a different budget reuses the embedding but not the result."""
+        cache = CGRAGCache()
+        retriever = CGRAGRetriever(indexer, min_relevance=0.0, cache=cache)
+
+        await retriever.retrieve("query", token_budget=500, max_artifacts=5)
+        result = await retriever.retrieve("query", token_budget=50, max_artifacts=5)
+
+        assert encoder.calls == 1
+        assert not result.cache_hit
+        assert cache.get_stats()["embedding_hits"] == 1
+        assert cache.get_stats()["result_misses"] == 2
+
+    async def test_index_version_change_invalidates_results(self, indexer) -> None:
+        """Test results are not reused after the index changes."""
+        retriever = CGRAGRetriever(indexer, min_relevance=0.0, cache=CGRAGCache())
+        await retriever.retrieve("query", token_budget=500, max_artifacts=5)
+
+        indexer.index_version = "rebuilt"
+        result = await retriever.retrieve("query", token_budget=500, max_artifacts=5)
+
+        assert not result.cache_hit
+
+    async def test_cached_results_are_independent_copies(self, indexer) -> None:
+        """Test mutating a returned result does not corrupt the cache."""
+        retriever = CGRAGRetriever(indexer, min_relevance=0.0, cache=CGRAGCache())
+        first = await retriever.retrieve("query", token_budget=500, max_artifacts=5)
+        first.artifacts.clear()
+
+        second = await retriever.retrieve("query", token_budget=500, max_artifacts=5)
+
+        assert second.cache_hit
+        assert second.artifacts
+
+    async def test_redis_tier_shared_between_caches(self, indexer, encoder) -> None:
+        """Test a second process-local cache is warmed from Redis."""
+        redis = FakeRedis()
+        await CGRAGRetriever(indexer, 0.0, cache=CGRAGCache(redis_client=redis)).retrieve(
+            "query", token_budget=500, max_artifacts=5
+        )
+
+        other = CGRAGCache(redis_client=redis)
+        result = await CGRAGRetriever(indexer, 0.0, cache=other).retrieve(
+            "query", token_budget=500, max_artifacts=5
+        )
+
+        assert encoder.calls == 1
+        assert result.cache_hit
+        assert other.get_stats()["redis_hits"] == 2
+
+    async def test_reports_to_cache_metrics(self, indexer, monkeypatch) -> None:
+        """Test lookups and writes are recorded in the global CacheMetrics."""
+        metrics = CacheMetrics()
+        monkeypatch.setattr(cache_metrics_module, "_cache_metrics", metrics)
+        retriever = CGRAGRetriever(indexer, min_relevance=0.0, cache=CGRAGCache())
+
+        await retriever.retrieve("query", token_budget=500, max_artifacts=5)
+        await retriever.retrieve("query", token_budget=500, max_artifacts=5)
+
+        assert metrics._misses == 2  # embedding + result on first query
+        assert metrics._hits == 2  # embedding + result on second query
+        assert metrics._sets == 2
@@ -24,6 +24,8 @@ from app.services.cgrag import (
     DocumentChunk,
 )
 
+pytestmark = pytest.mark.usefixtures("stub_token_counter")
+
 # ============================================================================
 # Fixtures
 # ============================================================================
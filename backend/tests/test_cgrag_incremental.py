@@ -0,0 +1,263 @@
+"""Tests for incremental CGRAG re-indexing.
+
+Tests cover:
+- Per-file records persisted with the index metadata
+- Skipping unchanged (and touched-but-identical) files
+- Re-embedding only added and modified files
+- Removing chunks of deleted files while keeping FAISS ids positional
+- Updating quantized indexes without re-encoding the kept vectors
+- Keeping chunks loaded from a chunk store memory-mapped
+- Falling back to a full rebuild when chunking parameters change
+"""
+
+import os
+from pathlib import Path
+from typing import List
+
+import faiss
+import numpy as np
+import pytest
+
+from app.models.runtime_settings import CGRAGIndexProfile
+from app.services.cgrag import CGRAGIndexer
+from app.services.chunk_store import ChunkSelection
+
+pytestmark = pytest.mark.usefixtures("stub_token_counter")
+
+EMBEDDING_DIM = 16
+
+
+class CountingEncoder:
+    """Deterministic stand-in for SentenceTransformer that counts encoded texts."""
+
+    def __init__(self) -> None:
+        self.encoded: List[str] = []
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return EMBEDDING_DIM
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        self.encoded.extend(texts)
+        vectors = np.zeros((len(texts), EMBEDDING_DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            rng = np.random.default_rng(abs(hash(text)) % (2**32))
+            vectors[i] = rng.random(EMBEDDING_DIM)
+        return vectors
+
+
+def bump_mtime(path: Path) -> None:
+    """Move a file's mtime forward (coarse-grained filesystems may not change it)."""
+    future = path.stat().st_mtime + 5
+    os.utime(path, (future, future))
+
+
+def assert_positional(indexer: CGRAGIndexer, encoder: CountingEncoder) -> None:
+    """Assert every FAISS vector id still maps to its chunk position."""
+    assert indexer.index.ntotal == len(indexer.chunks)
+    ivf = faiss.try_extract_index_ivf(indexer.index)
+    if ivf is not None:
+        ivf.make_direct_map()
+    for position, chunk in enumerate(indexer.chunks):
+        expected = encoder.encode([chunk.content])
+        encoder.encoded.pop()
+        faiss.normalize_L2(expected)
+        assert np.allclose(indexer.index.reconstruct(position), expected[0], atol=1e-5)
+
+
+@pytest.fixture
+def encoder() -> CountingEncoder:
+    """Create a counting encoder."""
+    return CountingEncoder()
+
+
+@pytest.fixture
+def docs_dir(tmp_path: Path) -> Path:
+    """Create a small document directory."""
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.md").write_text("alpha " * 30)
+    (docs / "b.md").write_text("bravo " * 30)
+    (docs / "c.py").write_text("charlie = 1\n" * 10)
+    return docs
+
+
+async def build(docs_dir: Path, encoder: CountingEncoder, tmp_path: Path) -> CGRAGIndexer:
+    """Build, save and reload an index so incremental runs start from disk."""
+    indexer = CGRAGIndexer(encoder=encoder)
+    await indexer.index_directory(docs_dir, chunk_size=10, chunk_overlap=2)
+    indexer.save_index(tmp_path / "docs.index", tmp_path / "docs_metadata.json")
+
+    encoder.encoded.clear()
+    return CGRAGIndexer.load_index(
+        tmp_path / "docs.index",
+        tmp_path / "docs_metadata.json",
+        encoder_provider=lambda name: encoder,
+    )
+
+
+class TestIncrementalIndexing:
+    """Tests for CGRAGIndexer.index_directory(incremental=True)."""
+
+    async def test_file_records_round_trip(self, docs_dir, encoder, tmp_path) -> None:
+        """Test per-file records and chunking parameters are saved and loaded."""
+        indexer = await build(docs_dir, encoder, tmp_path)
+
+        assert set(indexer.file_records) == {
+            str(docs_dir / "a.md"),
+            str(docs_dir / "b.md"),
+            str(docs_dir / "c.py"),
+        }
+        assert indexer.chunk_size == 10
+        assert indexer.chunk_overlap == 2
+        record = indexer.file_records[str(docs_dir / "a.md")]
+        assert record["size"] == (docs_dir / "a.md").stat().st_size
+        assert record["chunks"] == sum(
+            1 for c in indexer.chunks if c.file_path == str(docs_dir / "a.md")
+        )
+
+    async def test_unchanged_directory_embeds_nothing(self, docs_dir, encoder, tmp_path) -> None:
+        """Test re-indexing an unchanged directory does no embedding work."""
+        indexer = await build(docs_dir, encoder, tmp_path)
+        total = len(indexer.chunks)
+
+        count = await indexer.index_directory(
+            docs_dir, chunk_size=10, chunk_overlap=2, incremental=True
+        )
+
+        assert count == total
+        assert encoder.encoded == []
+        assert indexer.last_update_stats["unchanged"] == 3
+        assert indexer.last_update_stats["chunks_embedded"] == 0
+
+    async def test_touched_file_with_same_content_is_skipped(
+        self, docs_dir, encoder, tmp_path
+    ) -> None:
+        """Test a file whose mtime changed but content did not is not re-embedded."""
+        indexer = await build(docs_dir, encoder, tmp_path)
+        bump_mtime(docs_dir / "a.md")
+
+        await indexer.index_directory(docs_dir, chunk_size=10, chunk_overlap=2, incremental=True)
+
+        assert encoder.encoded == []
+        record = indexer.file_records[str(docs_dir / "a.md")]
+        assert record["mtime_ns"] == (docs_dir / "a.md").stat().st_mtime_ns
+
+    async def test_modified_added_and_deleted_files(self, docs_dir, encoder, tmp_path) -> None:
+        """Test only changed files are re-embedded and deleted files are removed."""
+        indexer = await build(docs_dir, encoder, tmp_path)
+        b_chunks = [c.content for c in indexer.chunks if c.file_path.endswith("b.md")]
+
+        (docs_dir / "a.md").write_text("amended " * 15)
+        bump_mtime(docs_dir / "a.md")
+        (docs_dir / "b.md").unlink()
+        (docs_dir / "d.txt").write_text("delta " * 12)
+
+        await indexer.index_directory(docs_dir, chunk_size=10, chunk_overlap=2, incremental=True)
+
+        stats = indexer.last_update_stats
+        assert (stats["added"], stats["modified"], stats["deleted"], stats["unchanged"]) == (
+            1,
+            1,
+            1,
+            1,
+        )
+        assert all("amended" in t or "delta" in t for t in encoder.encoded)
+        assert not any(c.content in b_chunks for c in indexer.chunks)
+        assert not any("alpha" in c.content for c in indexer.chunks)
+        assert str(docs_dir / "b.md") not in indexer.file_records
+        assert_positional(indexer, encoder)
+
+    async def test_incremental_matches_full_rebuild(self, docs_dir, encoder, tmp_path) -> None:
+        """Test an incremental update yields the same chunks as a full rebuild."""
+        indexer = await build(docs_dir, encoder, tmp_path)
+        (docs_dir / "c.py").write_text("changed = 2\n" * 7)
+        bump_mtime(docs_dir / "c.py")
+
+        await indexer.index_directory(docs_dir, chunk_size=10, chunk_overlap=2, incremental=True)
+
+        full = CGRAGIndexer(encoder=CountingEncoder())
+        await full.index_directory(docs_dir, chunk_size=10, chunk_overlap=2)
+        assert sorted(c.content for c in indexer.chunks) == sorted(c.content for c in full.chunks)
+
+    async def test_ivf_index_updated_in_place(self, docs_dir, encoder, tmp_path) -> None:
+        """Test IVF indexes stay positional without re-embedding kept chunks."""
+        indexer = await build(docs_dir, encoder, tmp_path)
+        vectors = indexer.index.reconstruct_n(0, indexer.index.ntotal)
+        quantizer = faiss.IndexFlatL2(EMBEDDING_DIM)
+        ivf = faiss.IndexIVFFlat(quantizer, EMBEDDING_DIM, 2)
+        ivf.train(vectors)
+        ivf.add(vectors)
+        indexer.index = ivf
+
+        (docs_dir / "b.md").unlink()
+        await indexer.index_directory(docs_dir, chunk_size=10, chunk_overlap=2, incremental=True)
+
+        assert encoder.encoded == []
+        assert_positional(indexer, encoder)
+
+    @pytest.mark.parametrize(
+        "profile",
+        [
+            CGRAGIndexProfile(index_type="IVFPQ", nlist=2, pq_m=4, pq_nbits=4),
+            CGRAGIndexProfile(index_type="HNSWSQ", hnsw_m=8),
+        ],
+    )
+    async def test_quantized_codes_do_not_drift(self, tmp_path, encoder, profile) -> None:
+        """Test repeated updates decode unchanged chunks to the exact same vectors."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        for i in range(10):
+            (docs / f"doc{i}.md").write_text(" ".join(f"w{i}_{j}" for j in range(100)))
+        indexer = CGRAGIndexer(encoder=encoder, index_profile=profile)
+        await indexer.index_directory(docs, chunk_size=10, chunk_overlap=2)
+        stable = str(docs / "doc0.md")
+
+        def stable_vectors() -> np.ndarray:
+            positions = [i for i, c in enumerate(indexer.chunks) if c.file_path == stable]
+            ivf = faiss.try_extract_index_ivf(indexer.index)
+            if ivf is not None:
+                ivf.make_direct_map()
+            return np.vstack([indexer.index.reconstruct(p) for p in positions])
+
+        before = stable_vectors()
+        for i in range(1, 4):
+            (docs / f"doc{i}.md").unlink()
+            await indexer.index_directory(docs, chunk_size=10, chunk_overlap=2, incremental=True)
+
+        assert indexer.index.ntotal == len(indexer.chunks)
+        assert np.array_equal(stable_vectors(), before)
+
+    async def test_loaded_chunks_stay_memory_mapped(self, docs_dir, encoder, tmp_path) -> None:
+        """Test updates of a loaded index keep surviving chunks in the chunk store."""
+        indexer = await build(docs_dir, encoder, tmp_path)
+        (docs_dir / "b.md").unlink()
+        (docs_dir / "d.md").write_text("delta " * 30)
+
+        await indexer.index_directory(docs_dir, chunk_size=10, chunk_overlap=2, incremental=True)
+        (docs_dir / "a.md").unlink()
+        await indexer.index_directory(docs_dir, chunk_size=10, chunk_overlap=2, incremental=True)
+
+        assert isinstance(indexer.chunks, ChunkSelection)
+        assert sorted(set(indexer.chunks.file_paths())) == [
+            str(docs_dir / "c.py"),
+            str(docs_dir / "d.md"),
+        ]
+        assert_positional(indexer, encoder)
+
+        indexer.save_index(tmp_path / "docs.index", tmp_path / "docs_metadata.json")
+        reloaded = CGRAGIndexer.load_index(
+            tmp_path / "docs.index",
+            tmp_path / "docs_metadata.json",
+            encoder_provider=lambda name: encoder,
+        )
+        assert [c.content for c in reloaded.chunks] == [c.content for c in indexer.chunks]
+
+    async def test_changed_chunking_falls_back_to_full(self, docs_dir, encoder, tmp_path) -> None:
+        """Test different chunking parameters trigger a full rebuild."""
+        indexer = await build(docs_dir, encoder, tmp_path)
+
+        await indexer.index_directory(docs_dir, chunk_size=20, chunk_overlap=2, incremental=True)
+
+        assert len(encoder.encoded) == len(indexer.chunks)
+        assert indexer.chunk_size == 20
+        assert indexer.last_update_stats["added"] == 3
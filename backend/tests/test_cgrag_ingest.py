@@ -0,0 +1,154 @@
+"""Tests for the streaming CGRAG ingestion pipeline.
+
+Tests cover:
+- Per-file change detection
+- Ordered results and embedding alignment with threads and worker processes
+- Bounded encoder batches and throughput reporting
+- Indexer integration (full and incremental indexing)
+"""
+
+import os
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from app.services.cgrag import CGRAGIndexer
+from app.services.cgrag_ingest import (
+    CHANGED,
+    FAILED,
+    UNCHANGED,
+    IngestionPipeline,
+    process_file,
+)
+
+pytestmark = pytest.mark.usefixtures("stub_token_counter")
+
+DIM = 8
+
+
+class RecordingEncoder:
+    """Encoder stand-in embedding each text as its length, recording batches."""
+
+    def __init__(self) -> None:
+        self.batches: List[List[str]] = []
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return DIM
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        self.batches.append(list(texts))
+        return np.array([[len(text)] * DIM for text in texts], dtype=np.float32)
+
+
+def write_docs(directory: Path, count: int) -> List[Path]:
+    """Write `count` small markdown files."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = directory / f"doc{i:03d}.md"
+        path.write_text(f"file{i} " + "word " * (i % 7 + 5))
+        paths.append(path)
+    return paths
+
+
+class TestProcessFile:
+    """Tests for per-file reading and chunking."""
+
+    def test_unchanged_and_changed(self, tmp_path: Path) -> None:
+        """Test mtime/size and content-hash change detection."""
+        path = write_docs(tmp_path, 1)[0]
+        first = process_file(str(path), 4, 0)
+        assert first.status == CHANGED
+        assert first.record["chunks"] == len(first.chunks)
+
+        assert process_file(str(path), 4, 0, first.record).status == UNCHANGED
+
+        # Touched but identical content
+        os.utime(path, (path.stat().st_mtime + 5,) * 2)
+        touched = process_file(str(path), 4, 0, first.record)
+        assert touched.status == UNCHANGED
+        assert touched.record["mtime_ns"] != first.record["mtime_ns"]
+
+        path.write_text("different content")
+        assert process_file(str(path), 4, 0, first.record).status == CHANGED
+
+    def test_missing_file_fails(self, tmp_path: Path) -> None:
+        """Test unreadable files are reported, not raised."""
+        result = process_file(str(tmp_path / "missing.md"), 4, 0)
+
+        assert result.status == FAILED
+        assert result.error
+
+
+class TestIngestionPipeline:
+    """Tests for IngestionPipeline."""
+
+    @pytest.mark.parametrize("workers, count", [(1, 10), (2, 80)])
+    async def test_results_ordered_and_aligned(self, tmp_path, workers, count) -> None:
+        """Test results keep file order and embeddings align with chunks."""
+        files = write_docs(tmp_path, count)
+        encoder = RecordingEncoder()
+        pipeline = IngestionPipeline(encoder.encode, DIM, batch_size=4, workers=workers)
+
+        result = await pipeline.run(files, chunk_size=3, chunk_overlap=1)
+
+        assert [r.path for r in result.files] == [str(f) for f in files]
+        texts = [span[0] for r in result.files for span in r.chunks]
+        assert result.embeddings.shape == (len(texts), DIM)
+        assert np.array_equal(result.embeddings[:, 0], [len(t) for t in texts])
+        assert all(len(batch) <= 4 for batch in encoder.batches)
+        assert result.stats.workers == (2 if workers == 2 else 0)
+
+    async def test_throughput_stats(self, tmp_path) -> None:
+        """Test files/s, chunks/s and embeddings/s are reported."""
+        files = write_docs(tmp_path, 5)
+        result = await IngestionPipeline(RecordingEncoder().encode, DIM, workers=1).run(
+            files, chunk_size=3, chunk_overlap=0
+        )
+
+        stats = result.stats.as_dict()
+        assert stats["files"] == 5
+        assert stats["embeddings"] == stats["chunks"] > 0
+        assert stats["files_per_sec"] > 0
+        assert stats["embeddings_per_sec"] > 0
+
+    async def test_encoder_error_propagates(self, tmp_path) -> None:
+        """Test an encoder failure stops the pipeline instead of hanging."""
+
+        def failing_encode(texts: List[str]) -> np.ndarray:
+            raise RuntimeError("encoder crashed")
+
+        files = write_docs(tmp_path, 20)
+        pipeline = IngestionPipeline(failing_encode, DIM, batch_size=1, workers=1, queue_size=1)
+
+        with pytest.raises(RuntimeError, match="encoder crashed"):
+            await pipeline.run(files, chunk_size=2, chunk_overlap=0)
+
+
+class TestIndexerIngestion:
+    """Tests for CGRAGIndexer using the pipeline."""
+
+    async def test_full_and_incremental_indexing(self, tmp_path) -> None:
+        """Test only changed files are re-embedded and stats are recorded."""
+        docs = tmp_path / "docs"
+        write_docs(docs, 6)
+        encoder = RecordingEncoder()
+        indexer = CGRAGIndexer(encoder=encoder)
+
+        total = await indexer.index_directory(docs, chunk_size=3, chunk_overlap=1, workers=1)
+        assert total == indexer.index.ntotal == len(indexer.chunks)
+        assert indexer.last_ingest_stats["files"] == 6
+
+        encoder.batches.clear()
+        (docs / "doc000.md").write_text("changed " * 4)
+        await indexer.index_directory(
+            docs, chunk_size=3, chunk_overlap=1, incremental=True, workers=1
+        )
+
+        embedded = [text for batch in encoder.batches for text in batch]
+        assert embedded and all("changed" in text for text in embedded)
+        assert indexer.last_update_stats["modified"] == 1
+        assert indexer.last_update_stats["unchanged"] == 5
+        assert indexer.index.ntotal == len(indexer.chunks)
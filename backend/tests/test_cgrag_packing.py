@@ -0,0 +1,209 @@
+"""Tests for token-budgeted CGRAG artifact packing.
+
+Tests cover:
+- Knapsack packing past chunks that do not fit (was: stop at first overflow)
+- Use of token counts stored at index time
+- At-least-one-artifact guarantee
+- Coarsened packing for large budgets
+- Token counts computed during ingestion and kept in the chunk store
+- Query response artifact metadata reporting the stored counts
+"""
+
+from pathlib import Path
+from typing import List, Optional
+from unittest.mock import patch
+
+import faiss
+import numpy as np
+import pytest
+
+from app.routers import query
+from app.services.cgrag import CGRAGIndexer, CGRAGRetriever, DocumentChunk
+from app.services.cgrag_ingest import CHANGED, process_file
+from app.services.chunk_store import ChunkStore
+
+pytestmark = pytest.mark.usefixtures("stub_token_counter")
+
+DIM = 8
+
+
+class StubEncoder:
+    """Minimal encoder stand-in."""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return DIM
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        return np.ones((len(texts), DIM), dtype=np.float32)
+
+
+def make_chunk(tokens: int, relevance: float, content: Optional[str] = None) -> DocumentChunk:
+    """Chunk with a stored token count and relevance score."""
+    return DocumentChunk(
+        file_path=f"doc_{tokens}_{relevance}.md",
+        content=content or "text",
+        chunk_index=0,
+        start_pos=0,
+        end_pos=4,
+        token_count=tokens,
+        relevance_score=relevance,
+    )
+
+
+@pytest.fixture
+def retriever() -> CGRAGRetriever:
+    indexer = CGRAGIndexer(encoder=StubEncoder())
+    indexer.index = faiss.IndexFlatIP(DIM)
+    return CGRAGRetriever(indexer, min_relevance=0.0)
+
+
+class TestPackArtifacts:
+    """Tests for CGRAGRetriever._pack_artifacts."""
+
+    def test_packs_past_chunk_that_does_not_fit(self, retriever) -> None:
+        """Test smaller chunks after an oversized one are still packed."""
+        candidates = [make_chunk(60, 0.9), make_chunk(80, 0.8), make_chunk(30, 0.7)]
+
+        selected, tokens = retriever._pack_artifacts(candidates, token_budget=100)
+
+        assert [c.relevance_score for c in selected] == [0.9, 0.7]
+        assert tokens == 90
+
+    def test_maximizes_total_relevance(self, retriever) -> None:
+        """Test two chunks beat one slightly more relevant chunk."""
+        candidates = [make_chunk(100, 0.9), make_chunk(50, 0.8), make_chunk(50, 0.75)]
+
+        selected, tokens = retriever._pack_artifacts(candidates, token_budget=100)
+
+        assert [c.relevance_score for c in selected] == [0.8, 0.75]
+        assert tokens == 100
+
+    def test_at_least_one_artifact(self, retriever) -> None:
+        """Test the most relevant chunk is returned when nothing fits."""
+        candidates = [make_chunk(500, 0.6), make_chunk(400, 0.9)]
+
+        selected, tokens = retriever._pack_artifacts(candidates, token_budget=10)
+
+        assert [c.relevance_score for c in selected] == [0.9]
+        assert tokens == 400
+
+    def test_large_budget_stays_within_budget(self, retriever) -> None:
+        """Test coarsened packing never exceeds large budgets."""
+        rng = np.random.default_rng(0)
+        candidates = [
+            make_chunk(int(tokens), float(score))
+            for tokens, score in zip(rng.integers(500, 9000, 100), rng.random(100))
+        ]
+
+        selected, tokens = retriever._pack_artifacts(candidates, token_budget=100_000)
+
+        assert 90_000 <= tokens <= 100_000
+        assert tokens == sum(c.token_count for c in selected)
+
+    def test_empty_candidates(self, retriever) -> None:
+        """Test no candidates pack to nothing."""
+        assert retriever._pack_artifacts([], token_budget=100) == ([], 0)
+
+    def test_stored_token_count_is_used(self, retriever) -> None:
+        """Test stored counts take precedence over re-tokenizing content."""
+        chunk = make_chunk(1234, 0.5, content="short")
+
+        assert retriever._count_tokens(chunk) == 1234
+
+    def test_uncounted_chunk_estimated_without_tokenizer_data(self, retriever) -> None:
+        """Test legacy chunks fall back to the word estimate when offline."""
+        chunk = make_chunk(0, 0.5, content="one two three four five six seven eight nine ten")
+        chunk.token_count = None
+
+        with patch(
+            "app.services.token_counter.tiktoken.get_encoding", side_effect=OSError("offline")
+        ):
+            assert retriever._count_tokens(chunk) == 13
+
+
+class TestIndexTimeTokenCounts:
+    """Tests for token counts computed during indexing."""
+
+    def test_process_file_counts_tokens(self, tmp_path: Path) -> None:
+        """Test each chunk gets a token count when a tokenizer is given."""
+        path = tmp_path / "doc.md"
+        path.write_text("alpha beta gamma delta " * 10)
+
+        result = process_file(str(path), 8, 0, tokenizer="cl100k_base")
+
+        assert result.status == CHANGED
+        assert len(result.token_counts) == len(result.chunks) > 0
+        assert all(count > 0 for count in result.token_counts)
+
+    def test_unavailable_tokenizer_does_not_fail_file(self, tmp_path: Path) -> None:
+        """Test chunks are kept without token counts when the encoding cannot load."""
+        path = tmp_path / "doc.md"
+        path.write_text("alpha beta gamma delta " * 10)
+
+        with patch(
+            "app.services.token_counter.tiktoken.get_encoding", side_effect=OSError("offline")
+        ):
+            result = process_file(str(path), 8, 0, tokenizer="cl100k_base")
+
+        assert result.status == CHANGED
+        assert result.chunks
+        assert result.token_counts == []
+
+    async def test_index_without_tokenizer_data(self, tmp_path: Path) -> None:
+        """Test an offline index build keeps every chunk, uncounted."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        (docs / "a.md").write_text("alpha beta gamma delta " * 10)
+        indexer = CGRAGIndexer(encoder=StubEncoder())
+
+        with patch(
+            "app.services.token_counter.tiktoken.get_encoding", side_effect=OSError("offline")
+        ):
+            total = await indexer.index_directory(docs, chunk_size=8, chunk_overlap=0, workers=1)
+
+        assert total > 0
+        assert indexer.tokenizer is None
+        assert all(chunk.token_count is None for chunk in indexer.chunks)
+
+    def test_chunk_store_round_trip(self, tmp_path: Path) -> None:
+        """Test token counts (and missing counts) survive the chunk store."""
+        chunks = [make_chunk(42, 0.0), make_chunk(7, 0.0)]
+        chunks[1].token_count = None
+        path = tmp_path / "chunks.bin"
+        ChunkStore.write(path, chunks)
+
+        store = ChunkStore(path, DocumentChunk.model_construct)
+
+        assert [chunk.token_count for chunk in store] == [42, None]
+
+
+class TestArtifactInfo:
+    """Tests for the artifact metadata of query responses."""
+
+    def test_reports_stored_token_count(self) -> None:
+        """Test artifacts report the count context packing used."""
+        chunk = DocumentChunk(
+            file_path="doc.md",
+            content="one two three",
+            chunk_index=2,
+            start_pos=0,
+            end_pos=13,
+            relevance_score=0.9,
+            token_count=7,
+        )
+
+        info = query._artifact_info(chunk)
+
+        assert (info.file_path, info.chunk_index, info.token_count) == ("doc.md", 2, 7)
+
+    def test_estimates_uncounted_chunk(self) -> None:
+        """Test chunks indexed without a tokenizer fall back to the estimate."""
+        chunk = DocumentChunk(
+            file_path="doc.md",
+            content=" ".join(["word"] * 10),
+            chunk_index=0,
+            start_pos=0,
+            end_pos=49,
+        )
+
+        assert query._artifact_info(chunk).token_count == 13
@@ -0,0 +1,238 @@
+"""Tests for the resident CGRAG index registry.
+
+Tests cover:
+- Loading all indexes in the index directory at startup
+- Sharing one encoder per embedding model across indexes
+- Atomic hot-swap when index files change on disk
+- Retriever caching and unloading of removed indexes
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List
+
+import faiss
+import numpy as np
+import pytest
+
+from app.services.cgrag import CGRAGIndexer, CGRAGRetriever, DocumentChunk
+from app.services.cgrag_registry import (
+    CGRAGIndexRegistry,
+    get_cgrag_index_registry,
+    init_cgrag_index_registry,
+)
+
+pytestmark = pytest.mark.usefixtures("stub_token_counter")
+
+EMBEDDING_DIM = 16
+
+
+class FakeEncoder:
+    """Minimal stand-in for SentenceTransformer (no model download)."""
+
+    def __init__(self, model_name: str) -> None:
+        self.model_name = model_name
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return EMBEDDING_DIM
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        return np.random.rand(len(texts), EMBEDDING_DIM).astype(np.float32)
+
+
+class CountingFactory:
+    """Encoder factory that records how many encoders were created."""
+
+    def __init__(self) -> None:
+        self.created: List[str] = []
+
+    def __call__(self, model_name: str) -> FakeEncoder:
+        self.created.append(model_name)
+        return FakeEncoder(model_name)
+
+
+def write_index(
+    directory: Path, name: str, n_chunks: int, model_name: str = "all-MiniLM-L6-v2"
+) -> None:
+    """Write a small FAISS index and JSON metadata file to disk."""
+    embeddings = np.random.rand(n_chunks, EMBEDDING_DIM).astype(np.float32)
+    faiss.normalize_L2(embeddings)
+    index = faiss.IndexFlatL2(EMBEDDING_DIM)
+    index.add(embeddings)
+    faiss.write_index(index, str(directory / f"{name}.index"))
+
+    chunks = [
+        DocumentChunk(
+            file_path=f"{name}/file{i}.md",
+            content=f"chunk {i} of {name}",
+            chunk_index=i,
+            start_pos=0,
+            end_pos=10,
+        ).model_dump(mode="json")
+        for i in range(n_chunks)
+    ]
+    metadata = {
+        "embedding_model_name": model_name,
+        "embedding_dim": EMBEDDING_DIM,
+        "chunks": chunks,
+    }
+    with open(directory / f"{name}_metadata.json", "w", encoding="utf-8") as f:
+        json.dump(metadata, f)
+
+
+@pytest.fixture
+def factory() -> CountingFactory:
+    """Create a counting encoder factory."""
+    return CountingFactory()
+
+
+@pytest.fixture
+def registry(tmp_path: Path, factory: CountingFactory) -> CGRAGIndexRegistry:
+    """Create a registry over a temporary index directory."""
+    return CGRAGIndexRegistry(index_directory=tmp_path, check_interval=60, encoder_factory=factory)
+
+
+class TestCGRAGIndexRegistry:
+    """Tests for the CGRAGIndexRegistry class."""
+
+    async def test_start_loads_all_indexes(self, tmp_path, registry) -> None:
+        """Test that start() loads every index found in the directory."""
+        write_index(tmp_path, "docs", 3)
+        write_index(tmp_path, "codebase", 5)
+
+        await registry.start()
+        try:
+            assert registry.list_indexes() == ["codebase", "docs"]
+            assert len(registry.get_indexer("docs").chunks) == 3
+            assert len(registry.get_indexer("codebase").chunks) == 5
+        finally:
+            await registry.stop()
+
+    async def test_encoder_shared_per_model(self, tmp_path, registry, factory) -> None:
+        """Test that indexes with the same embedding model share one encoder."""
+        write_index(tmp_path, "docs", 3)
+        write_index(tmp_path, "codebase", 3)
+        write_index(tmp_path, "other", 3, model_name="other-model")
+
+        await registry.refresh()
+
+        assert sorted(factory.created) == ["all-MiniLM-L6-v2", "other-model"]
+        assert registry.get_indexer("docs").encoder is registry.get_indexer("codebase").encoder
+        assert registry.get_indexer("docs").encoder is not registry.get_indexer("other").encoder
+
+    async def test_missing_index_returns_none(self, registry) -> None:
+        """Test lookups for unknown indexes return None."""
+        await registry.refresh()
+
+        assert registry.get_indexer("docs") is None
+        assert registry.get_retriever("docs") is None
+
+    async def test_unchanged_files_not_reloaded(self, tmp_path, registry) -> None:
+        """Test that refresh() does not reload unchanged indexes."""
+        write_index(tmp_path, "docs", 3)
+        await registry.refresh()
+        indexer = registry.get_indexer("docs")
+
+        reloaded = await registry.refresh()
+
+        assert reloaded == []
+        assert registry.get_indexer("docs") is indexer
+
+    async def test_hot_swap_on_change(self, tmp_path, registry, factory) -> None:
+        """Test that a rebuilt index is swapped in without affecting old readers."""
+        write_index(tmp_path, "docs", 3)
+        await registry.refresh()
+        old_indexer = registry.get_indexer("docs")
+        old_retriever = registry.get_retriever("docs", min_relevance=0.0)
+
+        write_index(tmp_path, "docs", 7)
+        # Ensure the mtime changes even on coarse-grained filesystems
+        future = os.stat(tmp_path / "docs.index").st_mtime + 5
+        os.utime(tmp_path / "docs.index", (future, future))
+
+        reloaded = await registry.refresh()
+
+        assert reloaded == ["docs"]
+        new_indexer = registry.get_indexer("docs")
+        assert new_indexer is not old_indexer
+        assert len(new_indexer.chunks) == 7
+        assert len(old_indexer.chunks) == 3  # In-flight readers keep their snapshot
+        assert registry.get_retriever("docs", min_relevance=0.0) is not old_retriever
+        assert factory.created == ["all-MiniLM-L6-v2"]  # Encoder reused across reloads
+
+    async def test_inconsistent_files_keep_previous_version(self, tmp_path, registry) -> None:
+        """Test that a mismatched index/metadata pair does not replace a good index."""
+        write_index(tmp_path, "docs", 3)
+        await registry.refresh()
+        indexer = registry.get_indexer("docs")
+
+        # Simulate a rebuild caught half-way: new FAISS file, old metadata
+        embeddings = np.random.rand(9, EMBEDDING_DIM).astype(np.float32)
+        index = faiss.IndexFlatL2(EMBEDDING_DIM)
+        index.add(embeddings)
+        faiss.write_index(index, str(tmp_path / "docs.index"))
+
+        reloaded = await registry.refresh()
+
+        assert reloaded == []
+        assert registry.get_indexer("docs") is indexer
+        assert registry.get_stats()["failed_reloads"] == 1
+
+    async def test_removed_index_is_unloaded(self, tmp_path, registry) -> None:
+        """Test that indexes deleted from disk are dropped."""
+        write_index(tmp_path, "docs", 3)
+        await registry.refresh()
+
+        (tmp_path / "docs.index").unlink()
+        await registry.refresh()
+
+        assert registry.get_indexer("docs") is None
+
+    async def test_retriever_cached_per_relevance(self, tmp_path, registry) -> None:
+        """Test that retrievers are reused for the same threshold."""
+        write_index(tmp_path, "docs", 3)
+        await registry.refresh()
+
+        retriever = registry.get_retriever("docs", min_relevance=0.5)
+
+        assert isinstance(retriever, CGRAGRetriever)
+        assert retriever.indexer is registry.get_indexer("docs")
+        assert registry.get_retriever("docs", min_relevance=0.5) is retriever
+        assert registry.get_retriever("docs", min_relevance=0.7) is not retriever
+
+    async def test_resident_retriever_searches(self, tmp_path, registry) -> None:
+        """Test retrieval works against a resident index."""
+        write_index(tmp_path, "docs", 4)
+        await registry.refresh()
+
+        retriever = registry.get_retriever("docs", min_relevance=0.0)
+        result = await retriever.retrieve(query="chunk", token_budget=1000, max_artifacts=2)
+
+        assert len(result.artifacts) > 0
+
+    async def test_save_index_is_picked_up(self, tmp_path, registry) -> None:
+        """Test that an index written by CGRAGIndexer.save_index loads into the registry."""
+        indexer = CGRAGIndexer(encoder=FakeEncoder("all-MiniLM-L6-v2"))
+        indexer.chunks = [
+            DocumentChunk(file_path="a.md", content="alpha", chunk_index=0, start_pos=0, end_pos=5)
+        ]
+        indexer.index = indexer._build_faiss_index(
+            np.random.rand(1, EMBEDDING_DIM).astype(np.float32)
+        )
+        indexer.save_index(tmp_path / "docs.index", tmp_path / "docs_metadata.json")
+
+        await registry.refresh()
+
+        assert len(registry.get_indexer("docs").chunks) == 1
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestRegistrySingleton:
+    """Tests for registry initialization helpers."""
+
+    def test_init_and_get(self, tmp_path) -> None:
+        """Test init_cgrag_index_registry sets the global instance."""
+        registry = init_cgrag_index_registry(index_directory=tmp_path)
+
+        assert get_cgrag_index_registry() is registry
@@ -0,0 +1,251 @@
+"""Tests for the compact memory-mapped CGRAG chunk store.
+
+Tests cover:
+- Round-tripping chunk fields through the binary format
+- Lazy, positional access (len, indexing, slicing, iteration)
+- Rejection of invalid or mismatched store files
+- Selections of surviving and appended chunks after incremental updates
+- CGRAGIndexer save/load using the chunk store manifest
+- Loading and migrating legacy JSON chunk metadata
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from app.services import cgrag as cgrag_module
+from app.services.cgrag import CGRAGIndexer, CGRAGRetriever, DocumentChunk
+from app.services.chunk_store import (
+    ChunkSelection,
+    ChunkStore,
+    chunk_file_paths,
+    get_chunk_store_path,
+    open_chunk_store,
+    select_chunks,
+)
+
+pytestmark = pytest.mark.usefixtures("stub_token_counter")
+
+EMBEDDING_DIM = 16
+
+
+class FakeEncoder:
+    """Minimal stand-in for SentenceTransformer (no model download)."""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return EMBEDDING_DIM
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        return np.random.rand(len(texts), EMBEDDING_DIM).astype(np.float32)
+
+
+def make_chunks(n: int) -> List[DocumentChunk]:
+    """Create chunks with a mix of languages, unicode content and missing fields."""
+    return [
+        DocumentChunk(
+            file_path=f"docs/file{i % 3}.md",
+            content=f"chunk {i} — naïve café ✓ " * (i + 1),
+            chunk_index=i,
+            start_pos=i * 100,
+            end_pos=i * 100 + 50,
+            language=None if i % 4 == 0 else ("markdown" if i % 2 else "python"),
+            modified_time=None if i == 1 else datetime(2025, 1, 2, 3, 4, 5),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def store_path(tmp_path: Path) -> Path:
+    """Path for a chunk store file."""
+    return tmp_path / "docs_chunks.bin"
+
+
+class TestChunkStore:
+    """Tests for the ChunkStore class."""
+
+    def test_round_trip(self, store_path) -> None:
+        """Test every stored field survives a write/read round trip."""
+        chunks = make_chunks(10)
+        ChunkStore.write(store_path, chunks)
+
+        store = ChunkStore(store_path, DocumentChunk.model_construct)
+
+        assert len(store) == 10
+        for original, loaded in zip(chunks, store):
+            assert loaded.model_dump() == original.model_dump()
+
+    def test_positional_access(self, store_path) -> None:
+        """Test indexing with Python, negative and NumPy integer positions and slices."""
+        chunks = make_chunks(5)
+        ChunkStore.write(store_path, chunks)
+        store = ChunkStore(store_path, DocumentChunk.model_construct)
+
+        assert store[np.int64(3)].content == chunks[3].content
+        assert store[-1].id == chunks[4].id
+        assert [c.chunk_index for c in store[1:4]] == [1, 2, 3]
+        assert store.file_paths() == [c.file_path for c in chunks]
+        with pytest.raises(IndexError):
+            store[5]
+
+    def test_empty_store(self, store_path) -> None:
+        """Test an index with no chunks can be written and opened."""
+        ChunkStore.write(store_path, [])
+
+        store = ChunkStore(store_path, DocumentChunk.model_construct)
+
+        assert len(store) == 0
+        assert list(store) == []
+
+    def test_rejects_non_store_file(self, store_path) -> None:
+        """Test opening an arbitrary file raises ValueError."""
+        store_path.write_bytes(b"not a chunk store")
+
+        with pytest.raises(ValueError):
+            ChunkStore(store_path, DocumentChunk.model_construct)
+
+    def test_count_mismatch_rejected(self, store_path) -> None:
+        """Test open_chunk_store verifies the count recorded in the manifest."""
+        ChunkStore.write(store_path, make_chunks(3))
+
+        with pytest.raises(ValueError):
+            open_chunk_store(store_path, DocumentChunk.model_construct, expected_count=4)
+
+    def test_chunk_store_path(self, tmp_path) -> None:
+        """Test the chunk store lives next to the metadata file."""
+        assert get_chunk_store_path(tmp_path / "docs_metadata.json") == tmp_path / "docs_chunks.bin"
+
+
+class TestSelectChunks:
+    """Tests for select_chunks and ChunkSelection."""
+
+    def test_selection_over_store(self, store_path) -> None:
+        """Test repeated selections stay lazy views over the same store."""
+        chunks = make_chunks(6)
+        ChunkStore.write(store_path, chunks)
+        store = ChunkStore(store_path, DocumentChunk.model_construct)
+        extra = make_chunks(8)[6:]
+
+        first = select_chunks(store, np.array([0, 2, 3, 5]), [extra[0]])
+        second = select_chunks(first, np.array([1, 3, 4]), [extra[1]])
+        expected = [chunks[2], chunks[5], extra[0], extra[1]]
+
+        assert isinstance(second, ChunkSelection)
+        assert second.store is store
+        assert len(second) == 4
+        assert [c.id for c in second] == [c.id for c in expected]
+        assert second[-1].id == extra[1].id
+        assert [c.id for c in second[1:3]] == [c.id for c in expected[1:3]]
+        assert chunk_file_paths(second) == [c.file_path for c in expected]
+        with pytest.raises(IndexError):
+            second[4]
+
+    def test_selection_over_list(self) -> None:
+        """Test in-memory chunk lists are filtered into a new list."""
+        chunks = make_chunks(4)
+
+        selected = select_chunks(chunks, np.array([1, 3]), [])
+
+        assert selected == [chunks[1], chunks[3]]
+        assert chunk_file_paths(selected) == [chunks[1].file_path, chunks[3].file_path]
+
+
+class TestIndexerChunkStore:
+    """Tests for CGRAGIndexer persistence through the chunk store."""
+
+    def _indexer(self, n: int) -> CGRAGIndexer:
+        indexer = CGRAGIndexer(encoder=FakeEncoder())
+        indexer.chunks = make_chunks(n)
+        indexer.index = indexer._build_faiss_index(
+            np.random.rand(n, EMBEDDING_DIM).astype(np.float32)
+        )
+        return indexer
+
+    def test_save_writes_manifest_and_store(self, tmp_path) -> None:
+        """Test save_index writes a small manifest instead of inline chunks."""
+        self._indexer(6).save_index(tmp_path / "docs.index", tmp_path / "docs_metadata.json")
+
+        with open(tmp_path / "docs_metadata.json", encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        assert manifest["format"] == "chunk_store"
+        assert manifest["chunk_count"] == 6
+        assert "chunks" not in manifest
+        assert (tmp_path / "docs_chunks.bin").exists()
+        assert not list(tmp_path.glob("*.tmp"))
+
+    async def test_load_is_lazy_and_retrievable(self, tmp_path) -> None:
+        """Test a loaded index exposes a ChunkStore that serves retrieval."""
+        original = self._indexer(6)
+        original.save_index(tmp_path / "docs.index", tmp_path / "docs_metadata.json")
+
+        loaded = CGRAGIndexer.load_index(
+            tmp_path / "docs.index",
+            tmp_path / "docs_metadata.json",
+            encoder_provider=lambda name: FakeEncoder(),
+        )
+
+        assert isinstance(loaded.chunks, ChunkStore)
+        assert loaded.chunks[2].model_dump() == original.chunks[2].model_dump()
+
+        retriever = CGRAGRetriever(indexer=loaded, min_relevance=0.0)
+        result = await retriever.retrieve(query="chunk", token_budget=10000, max_artifacts=3)
+        assert len(result.artifacts) > 0
+
+    def test_legacy_json_still_loads(self, tmp_path) -> None:
+        """Test metadata with inline JSON chunks loads as a plain list."""
+        indexer = self._indexer(4)
+        indexer.save_index(tmp_path / "docs.index", tmp_path / "docs_metadata.json")
+        legacy = {
+            "embedding_model_name": "all-MiniLM-L6-v2",
+            "embedding_dim": EMBEDDING_DIM,
+            "chunks": [c.model_dump(mode="json") for c in indexer.chunks],
+        }
+        (tmp_path / "docs_metadata.json").write_text(json.dumps(legacy))
+
+        loaded = CGRAGIndexer.load_index(
+            tmp_path / "docs.index",
+            tmp_path / "docs_metadata.json",
+            encoder_provider=lambda name: FakeEncoder(),
+        )
+
+        assert isinstance(loaded.chunks, list)
+        assert [c.id for c in loaded.chunks] == [c.id for c in indexer.chunks]
+
+    def test_migrate_json_to_chunk_store(self, tmp_path, monkeypatch) -> None:
+        """Test legacy JSON metadata is converted in place with a backup."""
+        chunks = make_chunks(5)
+        metadata_path = tmp_path / "docs_metadata.json"
+        metadata_path.write_text(
+            json.dumps(
+                {
+                    "embedding_model_name": "all-MiniLM-L6-v2",
+                    "embedding_dim": EMBEDDING_DIM,
+                    "chunks": [c.model_dump(mode="json") for c in chunks],
+                }
+            )
+        )
+        monkeypatch.setattr(
+            cgrag_module,
+            "get_cgrag_index_paths",
+            lambda name="docs": (tmp_path, tmp_path / f"{name}.index", metadata_path),
+        )
+
+        assert cgrag_module.migrate_json_to_chunk_store("docs") is True
+        assert cgrag_module.migrate_json_to_chunk_store("docs") is False
+
+        manifest = json.loads(metadata_path.read_text())
+        assert manifest["format"] == "chunk_store"
+        assert manifest["embedding_model_name"] == "all-MiniLM-L6-v2"
+        assert (tmp_path / "docs_metadata.json.bak").exists()
+
+        store = open_chunk_store(
+            tmp_path / manifest["chunk_store"],
+            DocumentChunk.model_construct,
+            expected_count=manifest["chunk_count"],
+        )
+        assert [c.model_dump() for c in store] == [c.model_dump() for c in chunks]
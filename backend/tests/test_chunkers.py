@@ -0,0 +1,179 @@
+"""Tests for the structure-aware CGRAG chunkers.
+
+Tests cover:
+- Exact source offsets for every chunker
+- Word windows with overlap
+- Markdown heading sections (ignoring headings in fenced code)
+- Python function/class boundaries and syntax-error fallback
+- Chunker selection by language and registration
+- Linear-time chunking of large files
+"""
+
+import time
+
+import pytest
+
+from app.services.chunkers import (
+    MarkdownChunker,
+    PythonChunker,
+    WordChunker,
+    detect_language,
+    get_chunker,
+    register_chunker,
+)
+
+MARKDOWN = """# Title
+
+Intro paragraph with a few words.
+
+## Install
+
+Run the installer.
+
+```bash
+# not a heading
+pip install synapse
+```
+
+## Usage
+
+Call the API.
+"""
+
+PYTHON = '''"""Module docstring."""
+
+import os
+
+CONSTANT = 1
+
+
+@decorator
+def first(a, b):
+    return a + b
+
+
+class Example:
+    """Example class."""
+
+    def method_one(self):
+        return 1
+
+    def method_two(self):
+        return 2
+'''
+
+
+def assert_exact(content: str, spans) -> None:
+    """Assert every chunk is the exact source slice at its offsets."""
+    assert spans
+    for text, _, start, end in spans:
+        assert content[start:end] == text
+
+
+class TestWordChunker:
+    """Tests for fixed-size word windows."""
+
+    def test_overlapping_windows(self) -> None:
+        """Test windows overlap and carry exact offsets."""
+        spans = WordChunker(chunk_size=3, chunk_overlap=1).chunk("a b c d e f g")
+
+        assert [span[0] for span in spans] == ["a b c", "c d e", "e f g"]
+        assert [span[1] for span in spans] == [0, 1, 2]
+        assert (spans[1][2], spans[1][3]) == (4, 9)
+
+    def test_preserves_source_whitespace(self) -> None:
+        """Test chunk text is the source slice, not re-joined words."""
+        content = "alpha\n\n  beta\tgamma   delta"
+        spans = WordChunker(chunk_size=10, chunk_overlap=0).chunk(content)
+
+        assert spans == [(content.strip(), 0, 0, len(content))]
+
+    def test_empty_content(self) -> None:
+        """Test whitespace-only content produces no chunks."""
+        assert WordChunker().chunk("  \n\t ") == []
+
+    def test_large_file_is_linear(self) -> None:
+        """Test a large file chunks quickly (was quadratic)."""
+        content = "word " * 500_000
+        start = time.perf_counter()
+        spans = WordChunker(chunk_size=512, chunk_overlap=50).chunk(content)
+
+        assert time.perf_counter() - start < 5.0
+        assert spans[-1][3] == len(content) - 1
+        assert_exact(content, spans[:3] + spans[-3:])
+
+
+class TestMarkdownChunker:
+    """Tests for heading-aware Markdown chunking."""
+
+    def test_splits_at_headings(self) -> None:
+        """Test each section becomes a chunk when sections do not fit together."""
+        spans = MarkdownChunker(chunk_size=14, chunk_overlap=0).chunk(MARKDOWN)
+
+        assert_exact(MARKDOWN, spans)
+        assert [span[0].splitlines()[0] for span in spans] == ["# Title", "## Install", "## Usage"]
+        assert "# not a heading" in spans[1][0]
+
+    def test_merges_small_sections(self) -> None:
+        """Test adjacent sections are packed together up to chunk_size."""
+        spans = MarkdownChunker(chunk_size=100, chunk_overlap=0).chunk(MARKDOWN)
+
+        assert len(spans) == 1
+        assert_exact(MARKDOWN, spans)
+
+
+class TestPythonChunker:
+    """Tests for AST-aware Python chunking."""
+
+    def test_splits_at_definitions(self) -> None:
+        """Test functions (with decorators) and classes start new chunks."""
+        spans = PythonChunker(chunk_size=12, chunk_overlap=0).chunk(PYTHON)
+
+        assert_exact(PYTHON, spans)
+        starts = [span[0].splitlines()[0] for span in spans]
+        assert "@decorator" in starts
+        assert "class Example:" in starts
+
+    def test_large_class_splits_at_methods(self) -> None:
+        """Test an oversized class is chunked at its methods."""
+        spans = PythonChunker(chunk_size=8, chunk_overlap=0).chunk(PYTHON)
+
+        assert_exact(PYTHON, spans)
+        starts = [span[0].splitlines()[0] for span in spans]
+        assert "class Example:" in starts
+        assert "def method_two(self):" in starts
+
+    def test_syntax_error_falls_back_to_words(self) -> None:
+        """Test unparsable source still chunks."""
+        content = "def broken(:\n    pass " * 5
+        spans = PythonChunker(chunk_size=4, chunk_overlap=1).chunk(content)
+
+        assert_exact(content, spans)
+        assert all(len(span[0].split()) <= 4 for span in spans)
+
+
+class TestChunkerSelection:
+    """Tests for language-based chunker selection."""
+
+    @pytest.mark.parametrize(
+        "extension, chunker_class",
+        [(".md", MarkdownChunker), (".py", PythonChunker), (".json", WordChunker)],
+    )
+    def test_selected_by_language(self, extension, chunker_class) -> None:
+        """Test the chunker follows detect_language."""
+        chunker = get_chunker(detect_language(extension), 100, 10)
+
+        assert type(chunker) is chunker_class
+
+    def test_register_chunker(self, monkeypatch) -> None:
+        """Test new chunkers can be registered for a language."""
+        import app.services.chunkers as chunkers
+
+        monkeypatch.setattr(chunkers, "_CHUNKERS", dict(chunkers._CHUNKERS))
+
+        class YamlChunker(WordChunker):
+            pass
+
+        register_chunker("yaml", YamlChunker)
+
+        assert type(get_chunker("yaml", 100, 10)) is YamlChunker
@@ -8,9 +8,11 @@ Tests cover:
 - Concurrent subscribers
 - Error handling and edge cases
 - Statistics reporting
+- Overflow policies and serialize-once fan-out
 """
 
 import asyncio
+import json
 import time
 from typing import Set
 
@@ -19,6 +21,9 @@ import pytest
 from app.models.events import EventSeverity, EventType, SystemEvent
 from app.services.event_bus import (
     EventBus,
+    EventEnvelope,
+    EventSubscription,
+    OverflowPolicy,
     get_event_bus,
     init_event_bus,
 )
@@ -86,19 +91,19 @@ class TestEventBusInitialization:
 
     @pytest.mark.asyncio
     async def test_stop_clears_subscribers(self):
-        """Stopping EventBus clears all subscriber queues."""
+        """Stopping EventBus closes and clears all subscriptions."""
         bus = EventBus()
         await bus.start()
 
-        # Add a fake subscriber
-        async with bus._lock:
-            bus._subscribers.add(asyncio.Queue())
+        subscription = bus.open_subscription()
 
         assert len(bus._subscribers) == 1
 
         await bus.stop()
 
         assert len(bus._subscribers) == 0
+        assert subscription.closed
+        assert await subscription.next_batch() == []
 
 
 class TestEventPublishing:
@@ -538,34 +543,118 @@ class TestEdgeCases:
 
     @pytest.mark.asyncio
     async def test_slow_subscriber_gets_dropped(self):
-        """Slow subscribers that can't keep up are dropped."""
+        """Slow subscribers with the disconnect policy are dropped."""
         bus = EventBus(history_size=10, max_queue_size=100)
         await bus.start()
 
         try:
-            # Create a slow subscriber that blocks
-            slow_queue: asyncio.Queue[SystemEvent] = asyncio.Queue(maxsize=1)
-
-            async with bus._lock:
-                bus._subscribers.add(slow_queue)
-
-            # Fill the slow subscriber's queue
-            await slow_queue.put(
-                SystemEvent(
-                    timestamp=time.time(),
-                    type=EventType.MODEL_STATE,
-                    message="Blocking event",
-                )
-            )
+            slow = bus.open_subscription(overflow=OverflowPolicy.DISCONNECT, max_pending=1)
 
-            # Publish many events - should eventually drop the slow subscriber
+            # Publish many events - should drop the slow subscriber
             for i in range(20):
                 await bus.publish(EventType.MODEL_STATE, f"Event {i}")
 
-            await asyncio.sleep(2.0)  # Wait for broadcasts and timeout
+            await asyncio.sleep(0.05)
 
             # Slow subscriber should have been removed
-            async with bus._lock:
-                assert slow_queue not in bus._subscribers
+            assert slow not in bus._subscribers
+            assert slow.closed
+            assert bus.get_stats()["subscribers_dropped"] == 1
         finally:
             await bus.stop()
+
+
+def envelope(event_type: EventType = EventType.MODEL_STATE, **metadata) -> EventEnvelope:
+    event = SystemEvent(timestamp=time.time(), type=event_type, message="Test", metadata=metadata)
+    return EventEnvelope(event, event.model_dump_json())
+
+
+class TestSubscriptionOverflow:
+    """Tests for non-blocking subscriber buffers and overflow policies."""
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        subscription = EventSubscription(max_pending=2)
+        first, second, third = envelope(), envelope(), envelope()
+
+        for item in (first, second, third):
+            assert subscription.offer(item)
+
+        assert await subscription.next_batch() == [second, third]
+        assert subscription.take_dropped() == 1
+
+    @pytest.mark.asyncio
+    async def test_drop_newest(self):
+        subscription = EventSubscription(overflow=OverflowPolicy.DROP_NEWEST, max_pending=1)
+        first = envelope()
+
+        subscription.offer(first)
+        subscription.offer(envelope())
+
+        assert await subscription.next_batch() == [first]
+
+    @pytest.mark.asyncio
+    async def test_coalesce_replaces_same_subject(self):
+        subscription = EventSubscription(overflow=OverflowPolicy.COALESCE, max_pending=2)
+        model_a = envelope(model_id="a")
+        model_b = envelope(model_id="b")
+        model_a_newer = envelope(model_id="a")
+
+        for item in (model_a, model_b, model_a_newer):
+            subscription.offer(item)
+
+        assert await subscription.next_batch() == [model_b, model_a_newer]
+
+    @pytest.mark.asyncio
+    async def test_next_batch_limit(self):
+        subscription = EventSubscription()
+        items = [envelope() for _ in range(3)]
+        for item in items:
+            subscription.offer(item)
+
+        assert await subscription.next_batch(max_events=2) == items[:2]
+        assert await subscription.next_batch() == items[2:]
+
+
+class TestBroadcast:
+    """Tests for filtered, serialize-once fan-out."""
+
+    @pytest.mark.asyncio
+    async def test_filters_at_enqueue_and_shares_payload(self, clean_event_bus: EventBus):
+        everything = clean_event_bus.open_subscription()
+        errors = clean_event_bus.open_subscription(min_severity=EventSeverity.ERROR)
+
+        await clean_event_bus.publish(EventType.MODEL_STATE, "Info")
+        await clean_event_bus.publish(EventType.ERROR, "Error", EventSeverity.ERROR)
+        await asyncio.sleep(0.05)
+
+        all_events = await everything.next_batch()
+        error_events = await errors.next_batch()
+        assert [e.event.message for e in all_events] == ["Info", "Error"]
+        assert [e.event.message for e in error_events] == ["Error"]
+        assert error_events[0].payload is all_events[1].payload
+        assert json.loads(error_events[0].payload)["severity"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_does_not_block_others(self, clean_event_bus: EventBus):
+        clean_event_bus.open_subscription(max_pending=1)  # Never read
+        fast = clean_event_bus.open_subscription(max_pending=100)
+
+        for i in range(50):
+            await clean_event_bus.publish(EventType.MODEL_STATE, f"Event {i}")
+        await asyncio.sleep(0.05)
+
+        assert len(await fast.next_batch()) == 50
+        assert clean_event_bus.get_stats()["events_dropped"] == 49
+
+    @pytest.mark.asyncio
+    async def test_publish_nowait_drops_when_full(self):
+        bus = EventBus(history_size=10, max_queue_size=2)  # Not started: queue fills
+        events = [
+            SystemEvent(timestamp=time.time(), type=EventType.LOG, message=f"Log {i}")
+            for i in range(5)
+        ]
+
+        assert bus.publish_nowait(events) == 3
+        assert [e.message for e in bus._event_history] == ["Log 0", "Log 1"]
+        assert bus.get_stats()["publish_dropped"] == 3
@@ -0,0 +1,214 @@
+"""Tests for configurable FAISS index families and the index benchmark.
+
+Tests cover:
+- Building each index family from a CGRAGIndexProfile
+- 'auto' selection and fallbacks when there is too little training data
+- Applying nprobe / efSearch search parameters
+- Inner-product relevance scoring in CGRAGRetriever
+- Profile persistence and incremental-update compatibility
+- Recall/latency benchmark on a small synthetic dataset
+"""
+
+from pathlib import Path
+from typing import List
+
+import faiss
+import numpy as np
+import pytest
+
+from app.cli.benchmark_faiss import make_queries, run_benchmark, synthetic_vectors
+from app.models.runtime_settings import CGRAGIndexProfile, RuntimeSettings
+from app.services.cgrag import CGRAGIndexer, CGRAGRetriever, DocumentChunk
+from app.services.faiss_index import (
+    apply_search_params,
+    build_faiss_index,
+    describe_index,
+    resolve_index_type,
+)
+
+pytestmark = pytest.mark.usefixtures("stub_token_counter")
+
+DIM = 32
+
+
+class FakeEncoder:
+    """Minimal stand-in for SentenceTransformer (no model download)."""
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return DIM
+
+    def encode(self, texts: List[str], **kwargs) -> np.ndarray:
+        rng = np.random.default_rng(abs(hash(tuple(texts))) % (2**32))
+        return rng.standard_normal((len(texts), DIM)).astype(np.float32)
+
+
+@pytest.fixture
+def vectors() -> np.ndarray:
+    """Small clustered, normalized dataset."""
+    return synthetic_vectors(2000, DIM, seed=0)
+
+
+class TestBuildFaissIndex:
+    """Tests for build_faiss_index and profile resolution."""
+
+    @pytest.mark.parametrize(
+        "profile, expected_type",
+        [
+            (CGRAGIndexProfile(index_type="Flat"), "IndexFlat"),
+            (CGRAGIndexProfile(index_type="SQ"), "IndexScalarQuantizer"),
+            (CGRAGIndexProfile(index_type="IVFFlat", nlist=16), "IndexIVFFlat"),
+            (CGRAGIndexProfile(index_type="IVFSQ", nlist=16), "IndexIVFScalarQuantizer"),
+            # 2-dim subquantizers with 64 centroids train well on 2000 vectors
+            (
+                CGRAGIndexProfile(index_type="IVFPQ", nlist=16, pq_m=16, pq_nbits=6),
+                "IndexIVFPQ",
+            ),
+            (CGRAGIndexProfile(index_type="HNSW", hnsw_m=8), "IndexHNSWFlat"),
+            (CGRAGIndexProfile(index_type="HNSWSQ", hnsw_m=8), "IndexHNSWSQ"),
+        ],
+    )
+    def test_builds_each_family(self, vectors, profile, expected_type) -> None:
+        """Test every index family builds, uses inner product and finds exact matches."""
+        index = build_faiss_index(vectors, profile)
+
+        assert describe_index(index)["type"] == expected_type
+        assert describe_index(index)["metric"] == "ip"
+        assert index.ntotal == len(vectors)
+        _, ids = index.search(vectors[:20], 1)
+        assert (ids[:, 0] == np.arange(20)).mean() >= 0.8
+
+    def test_l2_metric(self, vectors) -> None:
+        """Test the L2 metric is still available."""
+        index = build_faiss_index(vectors, CGRAGIndexProfile(index_type="Flat", metric="l2"))
+
+        assert describe_index(index)["metric"] == "l2"
+
+    def test_auto_uses_flat_below_threshold(self) -> None:
+        """Test 'auto' picks exact search for small corpora and IVF for large ones."""
+        profile = CGRAGIndexProfile(auto_flat_threshold=1000)
+
+        assert resolve_index_type(profile, 999, DIM) == "Flat"
+        assert resolve_index_type(profile, 1000, DIM) == "IVFFlat"
+
+    def test_untrainable_sizes_fall_back(self) -> None:
+        """Test families needing training fall back when data is too small."""
+        assert resolve_index_type(CGRAGIndexProfile(index_type="IVFFlat"), 10, DIM) == "Flat"
+        assert resolve_index_type(CGRAGIndexProfile(index_type="IVFPQ", pq_m=8), 100, DIM) == (
+            "IVFFlat"
+        )
+
+    def test_invalid_pq_m_rejected(self) -> None:
+        """Test pq_m must divide the embedding dimension."""
+        with pytest.raises(ValueError):
+            resolve_index_type(CGRAGIndexProfile(index_type="IVFPQ", pq_m=5), 100000, DIM)
+
+    def test_search_params_applied(self, vectors) -> None:
+        """Test nprobe and efSearch are set from the profile."""
+        ivf = build_faiss_index(vectors, CGRAGIndexProfile(index_type="IVFFlat", nlist=16))
+        hnsw = build_faiss_index(vectors, CGRAGIndexProfile(index_type="HNSW", hnsw_m=8))
+
+        apply_search_params(ivf, CGRAGIndexProfile(nprobe=7))
+        apply_search_params(hnsw, CGRAGIndexProfile(ef_search=99))
+
+        assert describe_index(ivf)["nprobe"] == 7
+        assert describe_index(hnsw)["ef_search"] == 99
+
+
+class TestIndexerProfiles:
+    """Tests for CGRAGIndexer / CGRAGRetriever integration."""
+
+    async def test_inner_product_scores_are_cosine(self, tmp_path) -> None:
+        """Test retrieval scores for IP indexes equal cosine similarity."""
+        indexer = CGRAGIndexer(encoder=FakeEncoder())
+        query_vector = FakeEncoder().encode(["query"])
+        indexer.chunks = [
+            DocumentChunk(file_path="a.md", content="a", chunk_index=0, start_pos=0, end_pos=1)
+        ]
+        indexer.index = indexer._build_faiss_index(query_vector.copy())
+
+        retriever = CGRAGRetriever(indexer=indexer, min_relevance=0.0)
+        result = await retriever.retrieve(query="query", token_budget=1000, max_artifacts=1)
+
+        assert result.artifacts[0].relevance_score == pytest.approx(1.0, abs=1e-5)
+
+    async def test_profile_round_trip_and_incremental_compatibility(self, tmp_path) -> None:
+        """Test the build profile is persisted and a new family forces a full rebuild."""
+        docs = tmp_path / "docs"
+        docs.mkdir()
+        for i in range(3):
+            (docs / f"f{i}.md").write_text(f"document {i} " * 20)
+
+        profile = CGRAGIndexProfile(index_type="HNSW", hnsw_m=8, ef_search=40)
+        indexer = CGRAGIndexer(encoder=FakeEncoder(), index_profile=profile)
+        await indexer.index_directory(docs, chunk_size=10, chunk_overlap=0)
+        indexer.save_index(tmp_path / "docs.index", tmp_path / "docs_metadata.json")
+
+        loaded = CGRAGIndexer.load_index(
+            tmp_path / "docs.index",
+            tmp_path / "docs_metadata.json",
+            encoder_provider=lambda name: FakeEncoder(),
+            index_profile=profile.model_copy(update={"ef_search": 80}),
+        )
+        assert loaded.built_profile == profile
+        assert describe_index(loaded.index)["ef_search"] == 80
+        assert loaded.tokenizer == "cl100k_base"
+        # Search parameters alone do not prevent incremental updates
+        assert loaded._can_update_incrementally(10, 0, "cl100k_base")
+        # Stored token counts from another tokenizer are not comparable
+        assert not loaded._can_update_incrementally(10, 0, "p50k_base")
+
+        loaded.apply_index_profile(CGRAGIndexProfile(index_type="Flat"))
+        assert not loaded._can_update_incrementally(10, 0, "cl100k_base")
+
+        await loaded.index_directory(docs, chunk_size=10, chunk_overlap=0, incremental=True)
+        assert isinstance(loaded.index, faiss.IndexFlat)
+
+        # A tokenizer change re-counts every chunk with a full rebuild
+        await loaded.index_directory(
+            docs, chunk_size=10, chunk_overlap=0, incremental=True, tokenizer="p50k_base"
+        )
+        assert loaded.tokenizer == "p50k_base"
+        assert loaded.last_update_stats["added"] == 3
+        assert loaded.last_update_stats["unchanged"] == 0
+
+    def test_runtime_settings_profile_lookup(self) -> None:
+        """Test per-index profiles fall back to the default profile."""
+        settings = RuntimeSettings(
+            cgrag_index_profiles={"codebase": {"index_type": "HNSW", "ef_search": 128}}
+        )
+
+        assert settings.get_cgrag_index_profile("codebase").index_type == "HNSW"
+        assert settings.get_cgrag_index_profile("docs") == CGRAGIndexProfile()
+
+
+class TestBenchmark:
+    """Tests for the FAISS profile benchmark."""
+
+    def test_benchmark_reports_recall_latency_and_memory(self, vectors: np.ndarray) -> None:
+        """Test the benchmark measures every profile and sweep setting."""
+        queries = make_queries(vectors, 50)
+        results = run_benchmark(
+            vectors,
+            queries,
+            {
+                "Flat": CGRAGIndexProfile(index_type="Flat"),
+                "IVF": CGRAGIndexProfile(index_type="IVFFlat", nlist=16),
+                "BadPQ": CGRAGIndexProfile(index_type="IVFPQ", pq_m=5),
+            },
+            k=5,
+            nprobe_values=[1, 16],
+        )
+
+        by_name = {r.name: r for r in results}
+        assert by_name["Flat"].recall_at_k == pytest.approx(1.0)
+        assert by_name["IVF (nprobe=16)"].recall_at_k == pytest.approx(1.0)
+        assert by_name["IVF (nprobe=1)"].recall_at_k <= by_name["IVF (nprobe=16)"].recall_at_k
+        assert by_name["Flat"].memory_mb > 0
+        assert by_name["Flat"].p99_ms >= by_name["Flat"].p50_ms > 0
+        assert by_name["BadPQ"].error is not None
+
+    def test_synthetic_vectors_are_normalized(self, tmp_path: Path) -> None:
+        """Test synthetic data is unit length."""
+        data = synthetic_vectors(100, DIM)
+
+        assert np.allclose(np.linalg.norm(data, axis=1), 1.0, atol=1e-5)
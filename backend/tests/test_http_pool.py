@@ -0,0 +1,99 @@
+"""Tests for the shared llama.cpp HTTP connection pools.
+
+Tests cover:
+- One client per server URL and plane
+- Per-plane limits
+- Request and server error counting in pool stats
+- LlamaCppClient using shared pools without closing them
+- Long-lived clients picking up replacement pools after a discard
+"""
+
+import httpx
+import pytest
+
+import app.services.http_pool as http_pool_module
+from app.services.http_pool import CONTROL_PLANE, DATA_PLANE, HTTPPoolManager
+from app.services.llama_client import LlamaCppClient
+
+
+@pytest.fixture
+async def pool():
+    manager = HTTPPoolManager()
+    yield manager
+    await manager.close()
+
+
+class TestHTTPPoolManager:
+    """Tests for HTTPPoolManager."""
+
+    async def test_client_per_server_and_plane(self, pool) -> None:
+        """Test clients are shared per server and separate per plane."""
+        data = pool.get_client("http://a:8080/", DATA_PLANE)
+
+        assert pool.get_client("http://a:8080", DATA_PLANE) is data
+        assert pool.get_client("http://a:8080", CONTROL_PLANE) is not data
+        assert pool.get_client("http://b:8080", DATA_PLANE) is not data
+
+    async def test_unknown_plane(self, pool) -> None:
+        with pytest.raises(ValueError):
+            pool.get_client("http://a:8080", "bulk")
+
+    async def test_stats_count_requests_and_errors(self, pool) -> None:
+        """Test pool stats report limits, requests and server errors."""
+        client = pool.get_client("http://a:8080", CONTROL_PLANE)
+        responses = [httpx.Response(200), httpx.Response(503)]
+        client._transport = httpx.MockTransport(lambda request: responses.pop(0))
+
+        await client.get("http://a:8080/health")
+        await client.get("http://a:8080/health")
+
+        stats = pool.get_stats()
+        assert stats["total_requests"] == 2
+        (entry,) = stats["pools"]
+        assert entry["plane"] == CONTROL_PLANE
+        assert entry["server_errors"] == 1
+        assert entry["max_connections"] == pool.limits[CONTROL_PLANE].max_connections
+        assert entry["connections"] == 0  # Mock transport has no connection pool
+
+    async def test_recreates_closed_client(self, pool) -> None:
+        client = pool.get_client("http://a:8080")
+        await client.aclose()
+
+        assert pool.get_client("http://a:8080") is not client
+
+
+class TestLlamaCppClientPooling:
+    """Tests for LlamaCppClient on shared pools."""
+
+    async def test_uses_global_pool(self, pool, monkeypatch) -> None:
+        """Test clients of the same server share connections and close() keeps them."""
+        monkeypatch.setattr(http_pool_module, "_http_pool", pool)
+
+        first = LlamaCppClient("http://a:8080")
+        second = LlamaCppClient("http://a:8080")
+        await first.close()
+
+        assert first.data_client is second.data_client
+        assert first.control_client is not first.data_client
+        assert not second.data_client.is_closed
+
+    async def test_discarded_pool_replaced(self, pool) -> None:
+        """Test a long-lived client gets fresh connections after its pool is discarded."""
+        client = LlamaCppClient("http://a:8080", pool=pool)
+        discarded = client.data_client
+
+        await pool.discard("http://a:8080")
+
+        assert discarded.is_closed
+        assert client.data_client is not discarded
+        assert not client.data_client.is_closed
+
+    async def test_private_pool_without_global(self, monkeypatch) -> None:
+        """Test a client without a global pool owns and closes its own."""
+        monkeypatch.setattr(http_pool_module, "_http_pool", None)
+
+        client = LlamaCppClient("http://a:8080")
+        http_client = client.data_client
+        await client.close()
+
+        assert http_client.is_closed
@@ -0,0 +1,200 @@
+"""Tests for streaming completions from llama.cpp.
+
+Tests cover:
+- SSE line parsing
+- Token-by-token streaming with final usage and time to first token
+- Retries before the first token and no retries on client errors
+- Reporting streams that end without the final chunk as truncated
+- Token forwarding from _call_model_direct to a streaming query
+"""
+
+import asyncio
+import json
+from typing import List
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from app.routers import query
+from app.services.llama_client import LlamaCppClient, parse_sse_line
+
+
+def sse_body(*payloads: dict) -> bytes:
+    """Encode payloads as a llama.cpp SSE response body."""
+    return "".join(f"data: {json.dumps(payload)}\n\n" for payload in payloads).encode()
+
+
+STREAM_BODY = sse_body(
+    {"content": "Hello", "stop": False},
+    {"content": " world", "stop": False},
+    {"content": "", "stop": True, "tokens_predicted": 2, "tokens_evaluated": 5},
+)
+
+
+def make_client(handler) -> LlamaCppClient:
+    """LlamaCppClient whose requests are served by `handler`."""
+    client = LlamaCppClient("http://llama", max_retries=2, retry_delay=0)
+    client.data_client._transport = httpx.MockTransport(handler)
+    return client
+
+
+async def collect(client: LlamaCppClient) -> List[dict]:
+    return [chunk async for chunk in client.stream_completion("prompt")]
+
+
+class TestParseSseLine:
+    """Tests for parse_sse_line."""
+
+    def test_data_line(self) -> None:
+        assert parse_sse_line('data: {"content": "hi"}') == {"content": "hi"}
+
+    @pytest.mark.parametrize("line", ["", ": keep-alive", "event: message", "data: [DONE]"])
+    def test_non_data_lines(self, line) -> None:
+        assert parse_sse_line(line) is None
+
+
+class TestStreamCompletion:
+    """Tests for LlamaCppClient.stream_completion."""
+
+    async def test_streams_fragments_then_usage(self) -> None:
+        """Test fragments are yielded in order, followed by the final summary."""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(json.loads(request.content))
+            return httpx.Response(200, content=STREAM_BODY)
+
+        chunks = await collect(make_client(handler))
+
+        assert [c["content"] for c in chunks[:-1]] == ["Hello", " world"]
+        final = chunks[-1]
+        assert final["done"] and final["error"] is None
+        assert final["truncated"] is False
+        assert (final["tokens_predicted"], final["tokens_evaluated"]) == (2, 5)
+        assert final["time_to_first_token_ms"] is not None
+        assert requests[0]["stream"] is True
+
+    async def test_retries_server_errors_before_first_token(self) -> None:
+        """Test a 5xx response is retried."""
+        responses = [
+            httpx.Response(503, content=b"loading"),
+            httpx.Response(200, content=STREAM_BODY),
+        ]
+
+        chunks = await collect(make_client(lambda request: responses.pop(0)))
+
+        assert "".join(c["content"] for c in chunks) == "Hello world"
+        assert chunks[-1]["error"] is None
+
+    async def test_client_error_not_retried(self) -> None:
+        """Test a 4xx response ends the stream with an error."""
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(400, content=b"bad request")
+
+        chunks = await collect(make_client(handler))
+
+        assert len(calls) == 1
+        assert chunks == [chunks[-1]]
+        assert "HTTP 400" in chunks[-1]["error"]
+        assert chunks[-1]["server_error"] is False
+        assert chunks[-1]["time_to_first_token_ms"] is None
+
+    async def test_error_payload_ends_stream(self) -> None:
+        """Test an error event from llama.cpp is reported."""
+        body = sse_body({"content": "Hi", "stop": False}, {"error": {"message": "kv full"}})
+
+        chunks = await collect(make_client(lambda request: httpx.Response(200, content=body)))
+
+        assert chunks[0]["content"] == "Hi"
+        assert "kv full" in chunks[-1]["error"]
+
+    async def test_stream_without_final_chunk_is_truncated(self) -> None:
+        """Test a stream cut off after some text reports truncation, not success."""
+        calls = []
+        body = sse_body({"content": "Hel", "stop": False})
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(200, content=body)
+
+        chunks = await collect(make_client(handler))
+
+        assert len(calls) == 1
+        assert chunks[0]["content"] == "Hel"
+        assert chunks[-1]["truncated"] is True
+        assert "truncated" in chunks[-1]["error"]
+        assert chunks[-1]["server_error"] is False
+
+    async def test_unreachable_server_is_server_error(self) -> None:
+        """Test connection failures are reported as the server's failure."""
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        chunks = await collect(make_client(handler))
+
+        assert "Connection refused" in chunks[-1]["error"]
+        assert chunks[-1]["server_error"] is True
+
+    async def test_empty_stream_retried(self) -> None:
+        """Test a stream closed before any text is retried."""
+        responses = [httpx.Response(200, content=b""), httpx.Response(200, content=STREAM_BODY)]
+
+        chunks = await collect(make_client(lambda request: responses.pop(0)))
+
+        assert "".join(c["content"] for c in chunks) == "Hello world"
+        assert chunks[-1]["error"] is None
+        assert chunks[-1]["truncated"] is False
+
+
+class TestCallModelDirectStreaming:
+    """Tests for token forwarding in _call_model_direct."""
+
+    @pytest.fixture
+    def registry(self, monkeypatch):
+        registry = MagicMock()
+        registry.models = {"model_a": MagicMock(port=8080)}
+        monkeypatch.setattr(query, "model_registry", registry)
+        return registry
+
+    @pytest.fixture
+    def fake_stream(self, monkeypatch):
+        async def stream_completion(self, prompt, max_tokens=512, temperature=0.7, stop=None):
+            yield {"content": "Hel"}
+            yield {"content": "lo"}
+            yield {
+                "content": "",
+                "done": True,
+                "tokens_predicted": 2,
+                "tokens_evaluated": 3,
+                "time_to_first_token_ms": 12.5,
+                "error": None,
+            }
+
+        monkeypatch.setattr(LlamaCppClient, "stream_completion", stream_completion)
+
+    async def test_without_stream(self, registry, fake_stream) -> None:
+        """Test the full response is returned when no stream is bound."""
+        result = await query._call_model_direct("model_a", "prompt")
+
+        assert result == {"content": "Hello", "usage": {"total_tokens": 5}, "error": None}
+
+    async def test_forwards_tokens_to_stream(self, registry, fake_stream) -> None:
+        """Test start, token and end events are queued for a streaming query."""
+        stream: asyncio.Queue = asyncio.Queue()
+        token = query._token_stream.set(stream)
+        try:
+            result = await query._call_model_direct("model_a", "prompt")
+        finally:
+            query._token_stream.reset(token)
+
+        events = [stream.get_nowait() for _ in range(stream.qsize())]
+        assert [e["event"] for e in events] == ["start", "token", "token", "end"]
+        assert "".join(e["content"] for e in events if e["event"] == "token") == "Hello"
+        assert len({e["call_id"] for e in events}) == 1
+        assert events[-1]["time_to_first_token_ms"] == 12.5
+        assert result["content"] == "Hello"
@@ -0,0 +1,124 @@
+"""Tests for llama-server output handling.
+
+Tests cover:
+- Readiness and startup error detection from process output
+- Batched log streaming to the WebSocket manager
+- Stopping the subprocess and its output reader
+"""
+
+import asyncio
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.core.exceptions import SynapseException
+from app.services.llama_server_manager import LlamaServerManager, ServerProcess
+
+
+def fake_model() -> SimpleNamespace:
+    return SimpleNamespace(model_id="test_model", port=8080)
+
+
+async def launch(manager: LlamaServerManager, script: str) -> ServerProcess:
+    """Run a Python script as the 'server' and start its output reader."""
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-u",
+        "-c",
+        script,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    server = ServerProcess(model=fake_model(), process=process)
+    server.reader_task = asyncio.create_task(manager._read_output(server))
+    return server
+
+
+@pytest.fixture
+def websocket_manager() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def manager(websocket_manager) -> LlamaServerManager:
+    with patch("app.services.llama_server_manager.emit_model_state_event", new=AsyncMock()):
+        yield LlamaServerManager(max_startup_time=5, websocket_manager=websocket_manager)
+
+
+class TestReadiness:
+    """Tests for readiness detection."""
+
+    async def test_ready_line(self, manager) -> None:
+        server = await launch(
+            manager,
+            "import sys, time\n"
+            "print('loading model')\n"
+            "print('main: HTTP server listening', file=sys.stderr)\n"
+            "time.sleep(30)",
+        )
+
+        await manager._wait_for_readiness(server)
+
+        assert server.is_ready
+        manager.servers[server.model.model_id] = server
+        await manager.stop_server(server.model.model_id, timeout=5)
+        assert server.process.returncode is not None
+        assert server.reader_task.done()
+
+    async def test_error_line(self, manager) -> None:
+        server = await launch(
+            manager, "import time\nprint('error loading model: bad file')\ntime.sleep(30)"
+        )
+
+        with pytest.raises(SynapseException, match="error loading model"):
+            await manager._wait_for_readiness(server)
+
+        server.process.kill()
+        await server.process.wait()
+
+    async def test_process_exit(self, manager) -> None:
+        server = await launch(manager, "print('starting'); raise SystemExit(1)")
+
+        with pytest.raises(SynapseException, match="died during startup"):
+            await manager._wait_for_readiness(server)
+
+        assert list(server.recent_output) == ["starting"]
+
+
+class TestLogStreaming:
+    """Tests for batched log streaming."""
+
+    async def test_lines_batched(self, manager, websocket_manager) -> None:
+        server = await launch(
+            manager, "for i in range(450): print(f'line {i}')\nprint('warning: low memory')"
+        )
+
+        await server.reader_task
+
+        batches = [call.args[0] for call in websocket_manager.broadcast_logs.await_args_list]
+        entries = [entry for batch in batches for entry in batch]
+        assert len(entries) == 451
+        assert all(len(batch) <= 200 for batch in batches)
+        assert entries[0]["message"] == "line 0"
+        assert entries[-1]["level"] == "WARN"
+        assert entries[-1]["model_id"] == "test_model"
+
+    async def test_partial_batch_flushed_while_running(self, manager, websocket_manager) -> None:
+        server = await launch(manager, "import time\nprint('hello')\ntime.sleep(30)")
+
+        await asyncio.sleep(1.0)
+
+        websocket_manager.broadcast_logs.assert_awaited_once()
+        server.process.kill()
+        await server.process.wait()
+        await server.reader_task
+
+    async def test_reader_drains_without_websocket_manager(self) -> None:
+        manager = LlamaServerManager(websocket_manager=None)
+        server = await launch(manager, "for _ in range(20000): print('x' * 100)")
+
+        await asyncio.wait_for(server.reader_task, timeout=10)
+
+        assert await server.process.wait() == 0
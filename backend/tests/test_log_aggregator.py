@@ -0,0 +1,124 @@
+"""Tests for batched log ingestion.
+
+Tests cover:
+- Ring buffer ingestion drained in batches by the consumer task
+- Per-source rate limiting and sampling
+- Dropped record counters
+- AggregatorHandler feeding the ring from any thread
+"""
+
+import asyncio
+import logging
+import threading
+
+import pytest
+
+from app.core.logging_handler import AggregatorHandler
+from app.services.log_aggregator import LogAggregator, LogEntry
+
+
+def entry(message: str, level: str = "INFO", source: str = "app.test") -> LogEntry:
+    return LogEntry(timestamp="2025-01-01T00:00:00Z", level=level, source=source, message=message)
+
+
+@pytest.fixture
+async def aggregator():
+    aggregator = LogAggregator(max_logs=100, ring_size=50, batch_size=10, flush_interval=0.01)
+    await aggregator.start()
+    yield aggregator
+    await aggregator.stop()
+
+
+class TestIngestion:
+    """Tests for ring buffer ingestion."""
+
+    async def test_submitted_entries_ingested_in_batches(self, aggregator) -> None:
+        for i in range(25):
+            aggregator.submit(entry(f"Message {i}"))
+
+        await asyncio.sleep(0.1)
+
+        logs = await aggregator.get_logs(limit=100)
+        assert [log["message"] for log in reversed(logs)] == [f"Message {i}" for i in range(25)]
+        counters = (await aggregator.get_stats())["ingestion"]
+        assert counters["ingested"] == 25
+        assert counters["batches"] == 3
+
+    async def test_ring_overflow_drops_oldest(self) -> None:
+        aggregator = LogAggregator(ring_size=5)  # Consumer not started
+
+        for i in range(8):
+            aggregator.submit(entry(f"Message {i}"))
+        await aggregator.stop()  # Drains the ring
+
+        logs = await aggregator.get_logs()
+        assert [log["message"] for log in reversed(logs)] == [f"Message {i}" for i in range(3, 8)]
+        assert (await aggregator.get_stats())["ingestion"]["dropped_overflow"] == 3
+
+    async def test_add_log_goes_through_ring(self, aggregator) -> None:
+        await aggregator.add_log(level="INFO", source="app.test", message="Hello")
+
+        await asyncio.sleep(0.05)
+
+        assert (await aggregator.get_logs())[0]["message"] == "Hello"
+
+
+class TestAdmission:
+    """Tests for rate limiting and sampling."""
+
+    def test_rate_limit_per_source(self) -> None:
+        aggregator = LogAggregator(source_rate_limit=1.0, source_burst=3)
+
+        chatty = [aggregator.admit("app.chatty", logging.INFO) for _ in range(10)]
+
+        assert chatty.count(True) == 3
+        assert aggregator.admit("app.quiet", logging.INFO)
+        assert aggregator._counters["dropped_rate_limited"] == 7
+
+    def test_warnings_always_admitted(self) -> None:
+        aggregator = LogAggregator(source_rate_limit=1.0, source_burst=1, sample_rates={"app": 0})
+
+        assert all(aggregator.admit("app.chatty", logging.ERROR) for _ in range(10))
+
+    def test_sampling_longest_prefix(self) -> None:
+        aggregator = LogAggregator(
+            source_rate_limit=0, sample_rates={"app": 0.0, "app.routers": 1.0}
+        )
+
+        assert not aggregator.admit("app.services.cache", logging.DEBUG)
+        assert aggregator.admit("app.routers.query", logging.DEBUG)
+        assert aggregator._counters["dropped_sampled"] == 1
+
+
+class TestAggregatorHandler:
+    """Tests for the logging handler."""
+
+    async def test_records_from_threads(self, aggregator) -> None:
+        handler = AggregatorHandler(aggregator)
+        test_logger = logging.getLogger("app.test_handler")
+        test_logger.addHandler(handler)
+        test_logger.setLevel(logging.INFO)
+        try:
+            thread = threading.Thread(target=lambda: test_logger.info("From %s", "thread"))
+            thread.start()
+            thread.join()
+            test_logger.warning("From loop")
+
+            await asyncio.sleep(0.05)
+        finally:
+            test_logger.removeHandler(handler)
+
+        logs = await aggregator.get_logs(source="app.test_handler")
+        assert [log["message"] for log in reversed(logs)] == ["From thread", "From loop"]
+        assert logs[0]["level"] == "WARNING"
+        assert logs[0]["extra"]["funcName"] == "test_records_from_threads"
+
+    def test_excluded_loggers_skipped(self) -> None:
+        aggregator = LogAggregator()
+        handler = AggregatorHandler(aggregator)
+
+        handler.emit(
+            logging.LogRecord("app.services.event_bus", logging.INFO, __file__, 1, "x", None, None)
+        )
+
+        assert aggregator._counters["accepted"] == 0
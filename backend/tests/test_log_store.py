@@ -0,0 +1,159 @@
+"""Tests for the indexed log store.
+
+Tests cover:
+- Index lookups (level, source, request/trace ID, words) and time seeks
+- Segment eviction and level/source counts
+- Spilling evicted segments to disk and reading them back
+- Request lookups across hundreds of thousands of entries
+"""
+
+import time
+
+import pytest
+
+from app.services.log_aggregator import LogAggregator, LogEntry
+from app.services.log_store import LogQuery, LogStore
+
+
+def entry(
+    i: int,
+    level: str = "INFO",
+    source: str = "app.routers.query",
+    message: str = "",
+    request_id: str = None,
+    trace_id: str = None,
+) -> LogEntry:
+    return LogEntry(
+        timestamp=f"2025-01-01T00:00:00.{i:07d}Z",
+        level=level,
+        source=source,
+        message=message or f"Message {i}",
+        request_id=request_id,
+        trace_id=trace_id,
+    )
+
+
+def messages(entries) -> list:
+    return [e.message for e in entries]
+
+
+class TestLogStoreQueries:
+    """Tests for indexed queries."""
+
+    @pytest.fixture
+    def store(self) -> LogStore:
+        store = LogStore(max_entries=1000, segment_size=10)
+        store.extend(
+            entry(
+                i,
+                level="ERROR" if i % 10 == 0 else "INFO",
+                source="app.services.cache" if i % 2 else "app.routers.query",
+                message=f"Message {i} cache {'hit' if i % 3 else 'miss'}",
+                request_id=f"req-{i % 5}",
+                trace_id="trace-x" if i == 42 else None,
+            )
+            for i in range(100)
+        )
+        return store
+
+    def test_newest_first_with_limit(self, store) -> None:
+        results = store.query(LogQuery(), 2)
+
+        assert messages(results) == ["Message 99 cache miss", "Message 98 cache hit"]
+
+    def test_request_id(self, store) -> None:
+        results = store.query(LogQuery(request_id="req-3"), 100)
+
+        assert len(results) == 20
+        assert all(e.request_id == "req-3" for e in results)
+
+    def test_combined_filters(self, store) -> None:
+        results = store.query(LogQuery(level="error", source="ROUTERS", request_id="req-0"), 100)
+
+        assert [e.message.split()[1] for e in results] == [str(i) for i in range(90, -1, -10)]
+
+    def test_trace_id(self, store) -> None:
+        assert messages(store.query(LogQuery(trace_id="trace-x"), 10)) == ["Message 42 cache miss"]
+
+    def test_text_tokens(self, store) -> None:
+        results = store.query(LogQuery(text="MISS cache", source="services"), 100)
+
+        assert {int(e.message.split()[1]) for e in results} == {
+            i for i in range(100) if i % 3 == 0 and i % 2
+        }
+
+    def test_substring_search(self, store) -> None:
+        assert messages(store.query(LogQuery(search="age 7 "), 10)) == ["Message 7 cache hit"]
+
+    def test_time_range(self, store) -> None:
+        query = LogQuery(start_time=entry(15).timestamp, end_time=entry(24).timestamp)
+
+        assert messages(store.query(query, 100))[::-1][0] == "Message 15 cache miss"
+        assert len(store.query(query, 100)) == 10
+
+
+class TestLogStoreEviction:
+    """Tests for capacity and spilling."""
+
+    def test_evicts_whole_segments(self) -> None:
+        store = LogStore(max_entries=30, segment_size=10)
+
+        store.extend(entry(i, level="ERROR" if i < 10 else "INFO") for i in range(35))
+
+        assert len(store) == 25
+        assert store.oldest.message == "Message 10"
+        assert store.level_counts == {"INFO": 25}
+
+    def test_spill_and_read_back(self, tmp_path) -> None:
+        store = LogStore(max_entries=20, segment_size=10, spill_dir=tmp_path)
+        store.extend(entry(i, request_id="old" if i < 10 else "new") for i in range(35))
+
+        query = LogQuery(request_id="old")
+        assert store.query(query, 100) == []
+
+        candidates = store.spilled_candidates(query)
+        assert len(candidates) == 1
+        found = store.read_spilled(candidates[0], query, 100)
+        assert messages(found) == [f"Message {i}" for i in range(9, -1, -1)]
+        assert store.spilled_candidates(LogQuery(request_id="missing")) == []
+        store.close()
+
+    def test_spilled_files_limited(self, tmp_path) -> None:
+        store = LogStore(
+            max_entries=10, segment_size=10, spill_dir=tmp_path, max_spilled_segments=2
+        )
+
+        store.extend(entry(i) for i in range(60))
+        store.close()
+
+        assert store.get_stats()["spilled_segments"] == 2
+        assert len(list(tmp_path.glob("*.jsonl"))) == 2
+
+
+class TestAggregatorQueries:
+    """Tests for LogAggregator queries over the store."""
+
+    async def test_request_lookup_includes_spilled(self, tmp_path) -> None:
+        aggregator = LogAggregator(max_logs=100, spill_dir=tmp_path)
+        for i in range(250):
+            aggregator.submit(entry(i, request_id="req-a" if i in (5, 240) else None))
+        await aggregator.stop()  # Drains the ring
+
+        logs = await aggregator.get_logs(request_id="req-a")
+
+        assert [log["message"] for log in logs] == ["Message 240", "Message 5"]
+        stats = await aggregator.get_stats()
+        assert stats["store"]["spilled_segments"] > 0
+
+    async def test_request_lookup_is_fast(self) -> None:
+        aggregator = LogAggregator(max_logs=300_000, full_text=False)
+        aggregator.store.extend(
+            entry(i, request_id=f"req-{i // 30}", message="Routing query") for i in range(300_000)
+        )
+
+        started = time.perf_counter()
+        logs = await aggregator.get_logs(request_id="req-4321", limit=2000)
+        elapsed = time.perf_counter() - started
+
+        assert len(logs) == 30
+        assert elapsed < 0.05
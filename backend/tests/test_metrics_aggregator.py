@@ -0,0 +1,269 @@
+"""Tests for the columnar MetricsAggregator storage engine.
+
+Tests cover:
+- Ring buffer growth, eviction and compaction
+- Binary-searched time windows and retention cleanup
+- Filtering, downsampling and summaries
+- Comparison buckets and per-model breakdowns
+- Write-time rollups answering long time ranges
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+from app.models.timeseries import MetricType, TimeRange
+from app.services.metrics_aggregator import MetricColumns, MetricRollups, MetricsAggregator
+
+
+def fill(columns: MetricColumns, timestamps) -> None:
+    for timestamp in timestamps:
+        columns.append(float(timestamp), float(timestamp) * 10, -1, -1, -1)
+
+
+class TestMetricColumns:
+    """Tests for MetricColumns."""
+
+    def test_evicts_oldest_beyond_capacity(self) -> None:
+        """Test the buffer keeps the newest points through growth and compaction."""
+        columns = MetricColumns(capacity=100, initial_size=8)
+
+        fill(columns, range(1000))
+
+        window = columns.window(0.0)
+        assert len(columns) == 100
+        assert window.timestamps.tolist() == [float(t) for t in range(900, 1000)]
+        assert window.values[0] == 9000.0
+
+    def test_window_binary_search(self) -> None:
+        columns = MetricColumns(capacity=100)
+        fill(columns, range(10))
+
+        assert columns.window(7.0).timestamps.tolist() == [7.0, 8.0, 9.0]
+        assert len(columns.window(10.5)) == 0
+
+    def test_window_is_a_snapshot(self) -> None:
+        """Test later appends do not change a snapshot taken earlier."""
+        columns = MetricColumns(capacity=4, initial_size=2)
+        fill(columns, range(4))
+        window = columns.window(0.0)
+
+        fill(columns, range(4, 20))
+
+        assert window.timestamps.tolist() == [0.0, 1.0, 2.0, 3.0]
+
+    def test_timestamps_stay_sorted(self) -> None:
+        columns = MetricColumns(capacity=10)
+        fill(columns, [5, 3])
+
+        assert columns.window(0.0).timestamps.tolist() == [5.0, 5.0]
+
+    def test_drop_before(self) -> None:
+        columns = MetricColumns(capacity=100)
+        fill(columns, range(10))
+
+        assert columns.drop_before(4.0) == 4
+        assert columns.window(0.0).timestamps[0] == 4.0
+
+
+@pytest.fixture
+def aggregator() -> MetricsAggregator:
+    return MetricsAggregator(max_points_per_metric=1000)
+
+
+async def record(aggregator: MetricsAggregator, value: float, **metadata) -> None:
+    await aggregator.record_metric(MetricType.RESPONSE_TIME, value, metadata)
+
+
+class TestQueries:
+    """Tests for MetricsAggregator queries."""
+
+    async def test_time_series_filters(self, aggregator) -> None:
+        await record(aggregator, 100.0, model_id="a", tier="Q2", query_mode="simple")
+        await record(aggregator, 200.0, model_id="b", tier="Q3", query_mode="simple")
+        await record(aggregator, 300.0, model_id="a", tier="Q2", query_mode="two-stage")
+
+        response = await aggregator.get_time_series(
+            MetricType.RESPONSE_TIME, TimeRange.ONE_HOUR, model_id="a"
+        )
+
+        assert [p.value for p in response.data_points] == [100.0, 300.0]
+        assert response.data_points[1].metadata == {
+            "model_id": "a",
+            "tier": "Q2",
+            "query_mode": "two-stage",
+        }
+        assert response.summary.avg == 200.0
+
+    async def test_unknown_filter_value_matches_nothing(self, aggregator) -> None:
+        await record(aggregator, 100.0, model_id="a")
+
+        response = await aggregator.get_time_series(
+            MetricType.RESPONSE_TIME, TimeRange.ONE_HOUR, model_id="missing"
+        )
+
+        assert response.data_points == []
+        assert response.summary.max == 0.0
+
+    async def test_summary_percentiles(self, aggregator) -> None:
+        for value in range(1, 101):
+            await record(aggregator, float(value))
+
+        summary = await aggregator.get_summary(MetricType.RESPONSE_TIME, TimeRange.ONE_HOUR)
+
+        assert (summary.min, summary.max, summary.avg) == (1.0, 100.0, 50.5)
+        assert summary.p50 == 50.5
+        assert summary.p95 == pytest.approx(95.05)
+        assert summary.p99 == pytest.approx(99.01)
+
+    async def test_downsampling_averages_buckets(self, aggregator) -> None:
+        """Test 24h queries average points into 10-minute buckets."""
+        await record(aggregator, 10.0, model_id="a")
+        await record(aggregator, 30.0, model_id="a")
+
+        response = await aggregator.get_time_series(
+            MetricType.RESPONSE_TIME, TimeRange.TWENTY_FOUR_HOURS
+        )
+
+        if len(response.data_points) == 1:  # Not straddling a bucket boundary
+            assert response.data_points[0].value == 20.0
+            assert response.data_points[0].metadata["model_id"] == "a"
+        assert response.summary.avg == 20.0
+
+    async def test_comparison_buckets(self, aggregator) -> None:
+        await record(aggregator, 10.0)
+        await record(aggregator, 20.0)
+
+        response = await aggregator.get_comparison(
+            [MetricType.RESPONSE_TIME, MetricType.TOKENS_PER_SECOND], TimeRange.ONE_HOUR
+        )
+
+        response_times, tokens_per_second = response.chart_data.datasets
+        assert len(response.chart_data.labels) == 61
+        assert len(response_times.data) == 60
+        assert sum(response_times.data) == 15.0
+        assert not any(tokens_per_second.data)
+
+    async def test_model_breakdown(self, aggregator) -> None:
+        await record(aggregator, 100.0, model_id="b", tier="Q3")
+        await record(aggregator, 50.0, model_id="a", tier="Q2")
+        await record(aggregator, 70.0, model_id="a", tier="Q2")
+        await record(aggregator, 999.0)
+
+        response = await aggregator.get_model_breakdown(
+            MetricType.RESPONSE_TIME, TimeRange.ONE_HOUR
+        )
+
+        assert [(m.model_id, m.tier) for m in response.models] == [("a", "Q2"), ("b", "Q3")]
+        assert response.models[0].summary.avg == 60.0
+
+    async def test_cleanup_drops_expired_points(self, aggregator) -> None:
+        columns = aggregator.metrics[MetricType.RESPONSE_TIME]
+        old = time.time() - aggregator.max_retention_seconds - 60
+        columns.append(old, 1.0, -1, -1, -1)
+        await record(aggregator, 2.0)
+
+        await aggregator._cleanup_expired_data()
+
+        assert np.array_equal(columns.window(0.0).values, [2.0])
+
+
+class TestMetricRollups:
+    """Tests for MetricRollups."""
+
+    def test_buckets_per_group(self) -> None:
+        rollups = MetricRollups(resolution=60, retention_seconds=3600)
+
+        rollups.add(0.0, 1.0, (0, -1, -1))
+        rollups.add(30.0, 3.0, (0, -1, -1))
+        rollups.add(61.0, 5.0, (0, -1, -1))
+        rollups.add(10.0, 7.0, (1, -1, -1))
+
+        buckets = rollups.groups[(0, -1, -1)]
+        assert sorted(buckets) == [0, 60]
+        assert (buckets[0].count, buckets[0].total, buckets[0].maximum) == (2, 4.0, 3.0)
+        assert rollups.groups[(1, -1, -1)][0].count == 1
+
+    def test_snapshot_copies_open_buckets(self) -> None:
+        """Test only the newest bucket of a group is copied (older ones are closed)."""
+        rollups = MetricRollups(resolution=60, retention_seconds=3600)
+        rollups.add(0.0, 1.0, (0, -1, -1))
+        rollups.add(60.0, 1.0, (0, -1, -1))
+
+        entries = rollups.snapshot(0.0)
+        rollups.add(61.0, 1.0, (0, -1, -1))
+
+        closed, open_ = sorted(entries, key=lambda entry: entry[1])
+        assert closed[2] is rollups.groups[(0, -1, -1)][0]
+        assert open_[2].count == 1
+        assert len(rollups.snapshot(60.0)) == 1
+
+    def test_expire(self) -> None:
+        rollups = MetricRollups(resolution=60, retention_seconds=120)
+        rollups.add(0.0, 1.0, (0, -1, -1))
+        rollups.add(100.0, 1.0, (0, -1, -1))
+        rollups.add(0.0, 1.0, (1, -1, -1))
+
+        assert rollups.expire(now=200.0) == 2
+        assert list(rollups.groups) == [(0, -1, -1)]
+        assert list(rollups.groups[(0, -1, -1)]) == [60]
+
+
+class TestRollupQueries:
+    """Tests for long time ranges answered from rollups."""
+
+    async def test_long_range_uses_rollups(self, aggregator) -> None:
+        """Test 7d queries return one averaged point per hour with sketch percentiles."""
+        for value in range(1, 101):
+            await record(aggregator, float(value), model_id="a", tier="Q2")
+
+        # Raw points expired early; rollups still answer long ranges
+        aggregator.metrics[MetricType.RESPONSE_TIME].drop_before(time.time() + 1)
+
+        response = await aggregator.get_time_series(
+            MetricType.RESPONSE_TIME, TimeRange.SEVEN_DAYS, model_id="a"
+        )
+
+        assert len(response.data_points) in (1, 2)  # May straddle an hour boundary
+        assert response.data_points[0].metadata["model_id"] == "a"
+        assert (response.summary.min, response.summary.max) == (1.0, 100.0)
+        assert response.summary.avg == 50.5
+        assert response.summary.p95 == pytest.approx(95.0, rel=0.02)
+
+    async def test_long_range_filters_groups(self, aggregator) -> None:
+        await record(aggregator, 10.0, model_id="a", query_mode="simple")
+        await record(aggregator, 30.0, model_id="a", query_mode="two-stage")
+
+        response = await aggregator.get_time_series(
+            MetricType.RESPONSE_TIME, TimeRange.THIRTY_DAYS, query_mode="two-stage"
+        )
+        missing = await aggregator.get_time_series(
+            MetricType.RESPONSE_TIME, TimeRange.THIRTY_DAYS, model_id="missing"
+        )
+
+        assert response.summary.avg == 30.0
+        assert missing.data_points == []
+
+    async def test_long_range_model_breakdown(self, aggregator) -> None:
+        await record(aggregator, 100.0, model_id="b", tier="Q3")
+        await record(aggregator, 50.0, model_id="a", tier="Q2")
+        await record(aggregator, 70.0, model_id="a", tier="Q2")
+
+        response = await aggregator.get_model_breakdown(
+            MetricType.RESPONSE_TIME, TimeRange.THIRTY_DAYS
+        )
+
+        assert [(m.model_id, m.tier) for m in response.models] == [("a", "Q2"), ("b", "Q3")]
+        assert response.models[0].summary.avg == 60.0
+
+    async def test_cleanup_expires_raw_points_early(self) -> None:
+        """Test raw points expire after raw retention while rollups remain."""
+        aggregator = MetricsAggregator(raw_retention_seconds=0)
+        await record(aggregator, 5.0)
+
+        await aggregator._cleanup_expired_data()
+
+        assert len(aggregator.metrics[MetricType.RESPONSE_TIME]) == 0
+        summary = await aggregator.get_summary(MetricType.RESPONSE_TIME, TimeRange.SEVEN_DAYS)
+        assert summary.avg == 5.0
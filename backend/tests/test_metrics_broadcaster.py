@@ -0,0 +1,118 @@
+"""Tests for the shared metrics WebSocket snapshot producer.
+
+Tests cover:
+- JSON Merge Patch deltas
+- Rate negotiation and interval groups
+- Full snapshots for new, reconfigured and lagging delta clients
+"""
+
+import json
+
+import pytest
+
+from app.services.metrics_broadcaster import MetricsBroadcaster, merge_patch
+
+
+def snapshot(cpu: float, queries: int = 1) -> dict:
+    return {
+        "type": "metrics_update",
+        "timestamp": f"t{cpu}",
+        "queries": {"totalQueries": queries},
+        "resources": {"cpu": {"percent": cpu, "cores": 8}},
+    }
+
+
+@pytest.fixture
+def broadcaster() -> MetricsBroadcaster:
+    return MetricsBroadcaster(collector=None)
+
+
+def publish(broadcaster: MetricsBroadcaster, update: dict) -> None:
+    broadcaster._tick += 1
+    broadcaster._publish(update)
+
+
+class TestMergePatch:
+    """Tests for merge_patch."""
+
+    def test_only_changed_members(self) -> None:
+        patch = merge_patch(snapshot(10.0), snapshot(20.0))
+
+        assert patch == {"timestamp": "t20.0", "resources": {"cpu": {"percent": 20.0}}}
+
+    def test_removed_keys_and_lists(self) -> None:
+        patch = merge_patch({"a": 1, "b": [1, 2]}, {"b": [1, 3]})
+
+        assert patch == {"a": None, "b": [1, 3]}
+
+
+class TestMetricsBroadcaster:
+    """Tests for MetricsBroadcaster fan-out."""
+
+    async def test_full_snapshots_serialized_once(self, broadcaster) -> None:
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+
+        publish(broadcaster, snapshot(10.0))
+
+        first_message, second_message = await first.next(), await second.next()
+        assert first_message is second_message
+        assert json.loads(first_message)["resources"]["cpu"]["percent"] == 10.0
+
+    async def test_new_subscriber_gets_latest(self, broadcaster) -> None:
+        broadcaster.subscribe()
+        publish(broadcaster, snapshot(10.0))
+
+        late = broadcaster.subscribe()
+
+        assert await late.next() == broadcaster.latest
+
+    async def test_delta_after_full(self, broadcaster) -> None:
+        subscription = broadcaster.subscribe()
+        broadcaster.configure(subscription, delta=True)
+
+        publish(broadcaster, snapshot(10.0))
+        assert json.loads(await subscription.next())["type"] == "metrics_update"
+
+        publish(broadcaster, snapshot(20.0))
+        message = json.loads(await subscription.next())
+        assert message["type"] == "metrics_delta"
+        assert message["patch"]["resources"] == {"cpu": {"percent": 20.0}}
+
+    async def test_lagging_delta_client_gets_full(self, broadcaster) -> None:
+        subscription = broadcaster.subscribe()
+        broadcaster.configure(subscription, delta=True)
+        publish(broadcaster, snapshot(10.0))
+        await subscription.next()
+
+        publish(broadcaster, snapshot(20.0))  # Not taken
+        publish(broadcaster, snapshot(30.0))
+
+        message = json.loads(await subscription.next())
+        assert message["type"] == "metrics_update"
+        assert broadcaster.get_stats()["skipped"] == 1
+
+    async def test_interval_negotiation(self, broadcaster) -> None:
+        slow = broadcaster.subscribe()
+        broadcaster.configure(slow, interval_ms=3000)
+        broadcaster.configure(broadcaster.subscribe(), interval_ms=10)
+
+        for cpu in (1.0, 2.0, 3.0):
+            publish(broadcaster, snapshot(cpu))
+
+        assert json.loads(await slow.next())["timestamp"] == "t3.0"
+        assert broadcaster.get_stats()["full_sent"] == 4
+
+    def test_interval_clamped(self, broadcaster) -> None:
+        subscription = broadcaster.subscribe()
+
+        broadcaster.configure(subscription, interval_ms=10_000_000)
+
+        assert subscription.interval_ticks == 60
+
+    async def test_closed_subscription_ends_stream(self, broadcaster) -> None:
+        subscription = broadcaster.subscribe()
+
+        broadcaster.unsubscribe(subscription)
+
+        assert await subscription.next() is None
+        assert broadcaster.get_stats()["subscribers"] == 0
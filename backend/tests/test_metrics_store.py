@@ -0,0 +1,143 @@
+"""Tests for the persistent metrics history store.
+
+Tests cover:
+- Batched writes and reads of metric points and query records
+- Retention compaction
+- MetricsAggregator restoring history in the background
+- MetricsCollector restoring query history
+"""
+
+import time
+
+import pytest
+
+from app.models.timeseries import MetricType, TimeRange
+from app.services.metrics_aggregator import MetricsAggregator
+from app.services.metrics_collector import MetricsCollector
+from app.services.metrics_store import MetricsStore
+
+
+@pytest.fixture
+async def store(tmp_path):
+    store = MetricsStore(tmp_path / "history" / "metrics.db", flush_interval=60)
+    await store.start()
+    yield store
+    await store.stop()
+
+
+async def read_points(store: MetricsStore, since: float = 0.0, until: float = float("inf")):
+    return await store.run(
+        lambda: [row for rows in store.iter_points(since, until) for row in rows]
+    )
+
+
+class TestMetricsStore:
+    """Tests for MetricsStore."""
+
+    async def test_buffers_until_flush(self, store) -> None:
+        store.append_point(1.0, "response_time", 10.0, "a", "Q2", "simple")
+        assert await read_points(store) == []
+
+        await store.flush()
+
+        assert await read_points(store) == [(1.0, "response_time", 10.0, "a", "Q2", "simple")]
+        assert store.get_stats()["points_written"] == 1
+
+    async def test_iter_points_range(self, store) -> None:
+        for timestamp in range(10):
+            store.append_point(float(timestamp), "response_time", 1.0)
+        await store.flush()
+
+        rows = await read_points(store, since=3.0, until=6.0)
+
+        assert [row[0] for row in rows] == [3.0, 4.0, 5.0]
+
+    async def test_compact(self, store) -> None:
+        store.append_point(1.0, "response_time", 1.0)
+        store.append_point(5.0, "response_time", 1.0)
+        store.append_query(1.0, "Q2", 100.0, None, False)
+        await store.flush()
+
+        assert await store.compact(cutoff=2.0) == 2
+        assert [row[0] for row in await read_points(store)] == [5.0]
+
+    async def test_stop_flushes(self, tmp_path) -> None:
+        path = tmp_path / "metrics.db"
+        store = MetricsStore(path, flush_interval=60)
+        await store.start()
+        store.append_point(1.0, "response_time", 1.0)
+        await store.stop()
+
+        reopened = MetricsStore(path)
+        await reopened.start()
+        try:
+            assert len(await read_points(reopened)) == 1
+        finally:
+            await reopened.stop()
+
+    async def test_query_history(self, store) -> None:
+        for i in range(5):
+            store.append_query(float(i), "Q2", 100.0 + i, 20.0, i == 4)
+        store.append_query(10.0, "Q3", 300.0, None, False)
+        await store.flush()
+
+        recent, by_tier, totals = await store.load_query_history(
+            since=0.0, recent_limit=3, per_tier_limit=2
+        )
+
+        assert [row[0] for row in recent] == [3.0, 4.0, 10.0]
+        assert [row[2] for row in by_tier["Q2"]] == [103.0, 104.0]
+        assert totals == {"Q2": (5, 1), "Q3": (1, 0)}
+
+
+class TestHistoryRestore:
+    """Tests for restoring in-memory metrics from the store."""
+
+    async def test_aggregator_restores_history(self, store) -> None:
+        now = time.time()
+        store.append_point(now - 60, MetricType.RESPONSE_TIME.value, 10.0, "a", "Q2", None)
+        store.append_point(now - 3 * 86400, MetricType.RESPONSE_TIME.value, 30.0, "a", "Q2", None)
+        store.append_point(now - 60, "removed_metric", 1.0)
+        await store.flush()
+
+        aggregator = MetricsAggregator(max_points_per_metric=1000)
+        await aggregator.load_history(store)
+
+        recent = await aggregator.get_time_series(
+            MetricType.RESPONSE_TIME, TimeRange.ONE_HOUR, model_id="a"
+        )
+        week = await aggregator.get_summary(MetricType.RESPONSE_TIME, TimeRange.SEVEN_DAYS)
+        assert [p.value for p in recent.data_points] == [10.0]
+        assert week.avg == 20.0
+        # Old points only go to rollups
+        assert len(aggregator.metrics[MetricType.RESPONSE_TIME]) == 1
+
+    async def test_points_recorded_during_load_are_kept(self, store) -> None:
+        store.append_point(time.time() - 60, MetricType.RESPONSE_TIME.value, 10.0)
+        aggregator = MetricsAggregator(max_points_per_metric=1000)
+        aggregator.attach_store(store)
+
+        await aggregator.record_metric(MetricType.RESPONSE_TIME, 20.0)
+        await aggregator._history_task
+
+        summary = await aggregator.get_summary(MetricType.RESPONSE_TIME, TimeRange.ONE_HOUR)
+        assert (summary.min, summary.max) == (10.0, 20.0)
+
+        # The live point was persisted once
+        await store.flush()
+        assert [row[2] for row in await read_points(store)] == [10.0, 20.0]
+
+    def test_collector_restores_query_history(self) -> None:
+        collector = MetricsCollector()
+        collector.record_query("Q2", 50.0)
+
+        collector.restore_history(
+            recent=[(1.0, "Q2", 100.0, 20.0, 0)],
+            by_tier={"Q2": [(1.0, "Q2", 100.0, 20.0, 0)]},
+            totals={"Q2": (4, 1)},
+        )
+
+        assert list(collector.query_latencies) == [100.0, 50.0]
+        stats = collector.tier_performance["Q2"]
+        assert list(stats["tokens_per_sec"]) == [20.0]
+        assert (stats["request_count"], stats["error_count"]) == (5, 1)
@@ -0,0 +1,180 @@
+"""Tests for the long-lived per-model llama.cpp client registry.
+
+Tests cover:
+- One client per model and server URL
+- Eviction when the server manager untracks a server
+- Health-aware eviction after consecutive failures
+- In-flight streams surviving an eviction
+- Only server-side failures counting towards eviction
+- Server manager listener notifications
+"""
+
+import asyncio
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+
+from app.routers import query
+from app.services.http_pool import DATA_PLANE, HTTPPoolManager
+from app.services.llama_client import LlamaCppClient
+from app.services.llama_server_manager import LlamaServerManager
+from app.services.model_clients import ModelClientRegistry
+
+
+@pytest.fixture
+async def pool():
+    manager = HTTPPoolManager()
+    yield manager
+    await manager.close()
+
+
+@pytest.fixture
+def registry(pool) -> ModelClientRegistry:
+    return ModelClientRegistry(pool=pool, failure_threshold=2)
+
+
+async def settle() -> None:
+    """Let scheduled evictions run."""
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+
+class TestModelClientRegistry:
+    """Tests for ModelClientRegistry."""
+
+    async def test_client_reused_per_model_and_url(self, registry) -> None:
+        """Test the same client is returned for repeated calls."""
+        client = registry.get_client("model_a", "http://a:8080/")
+
+        assert registry.get_client("model_a", "http://a:8080") is client
+        assert registry.get_client("model_a", "http://b:8080") is not client
+        assert registry.get_stats()["clients"] == 2
+
+    async def test_server_stop_evicts_and_closes_connections(self, registry, pool) -> None:
+        """Test clients and pooled connections are dropped when a server stops."""
+        client = registry.get_client("model_a", "http://a:8080")
+        http_client = client.data_client
+
+        registry.on_server_change("model_a", None)
+        await settle()
+
+        assert registry.get_stats()["clients"] == 0
+        assert http_client.is_closed
+        assert pool.get_client("http://a:8080", DATA_PLANE) is not http_client
+
+    async def test_evicts_after_consecutive_failures(self, registry) -> None:
+        """Test clients are evicted once failures reach the threshold."""
+        client = registry.get_client("model_a", "http://a:8080")
+
+        registry.report_result("model_a", success=False)
+        registry.report_result("model_a", success=True)
+        registry.report_result("model_a", success=False)
+        await settle()
+        assert registry.get_client("model_a", "http://a:8080") is client
+
+        registry.report_result("model_a", success=False)
+        await settle()
+
+        assert registry.get_client("model_a", "http://a:8080") is not client
+        assert registry.get_stats()["evictions"] == 1
+
+    async def test_close_evicts_all(self, registry) -> None:
+        registry.get_client("model_a", "http://a:8080")
+        registry.get_client("model_b", "http://b:8080")
+
+        await registry.close()
+
+        assert registry.get_stats()["clients"] == 0
+
+    async def test_in_flight_stream_survives_eviction(self, registry, pool) -> None:
+        """Test evicting a model does not cut off a response still being streamed."""
+        release = asyncio.Event()
+
+        async def body():
+            yield b"first "
+            await release.wait()
+            yield b"second"
+
+        client = registry.get_client("model_a", "http://a:8080")
+        http_client = client.data_client
+        http_client._transport.transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, content=body())
+        )
+
+        async with http_client.stream("POST", "http://a:8080/completion") as response:
+            chunks = response.aiter_bytes()
+            assert await chunks.__anext__() == b"first "
+
+            registry.on_server_change("model_a", None)
+            await settle()
+            assert registry.get_stats()["clients"] == 0
+            assert pool.get_stats()["draining_clients"] == 1
+            assert not http_client.is_closed
+
+            release.set()
+            assert [chunk async for chunk in chunks] == [b"second"]
+
+        assert http_client.is_closed
+        assert pool.get_stats()["draining_clients"] == 0
+        assert pool.get_client("http://a:8080", DATA_PLANE) is not http_client
+
+    async def test_client_errors_do_not_evict(self, registry, monkeypatch) -> None:
+        """Test rejected requests (4xx) do not count towards eviction."""
+        monkeypatch.setattr(
+            query, "model_registry", MagicMock(models={"model_a": MagicMock(port=8080)})
+        )
+        monkeypatch.setattr(query, "get_model_client_registry", lambda: registry)
+        outcome = {"error": "HTTP 400: prompt too long", "server_error": False}
+
+        async def stream_completion(self, prompt, max_tokens=512, temperature=0.7, stop=None):
+            yield {"content": "", "done": True, **outcome}
+
+        monkeypatch.setattr(LlamaCppClient, "stream_completion", stream_completion)
+        base_url = query._model_base_url(8080)
+        client = registry.get_client("model_a", base_url)
+
+        for _ in range(3):
+            await query._call_model_direct("model_a", "prompt")
+        await settle()
+        assert registry.get_client("model_a", base_url) is client
+
+        outcome.update(error="Connection refused", server_error=True)
+        for _ in range(2):
+            await query._call_model_direct("model_a", "prompt")
+        await settle()
+        assert registry.get_client("model_a", base_url) is not client
+
+
+class TestServerListeners:
+    """Tests for LlamaServerManager listener notifications."""
+
+    async def test_stop_server_notifies_listeners(self, tmp_path) -> None:
+        """Test untracking an external server notifies listeners."""
+        manager = LlamaServerManager(
+            llama_server_path=tmp_path / "llama-server",
+            use_external_servers=True,
+        )
+        listener = MagicMock()
+        manager.add_server_listener(listener)
+        manager.servers["model_a"] = MagicMock(is_external=True)
+
+        await manager.stop_server("model_a")
+
+        listener.assert_called_once_with("model_a", None)
+        assert "model_a" not in manager.servers
+
+    async def test_listener_errors_are_isolated(self, tmp_path) -> None:
+        """Test a failing listener does not break other listeners."""
+        manager = LlamaServerManager(
+            llama_server_path=tmp_path / "llama-server",
+            use_external_servers=True,
+        )
+        failing = MagicMock(side_effect=RuntimeError("boom"))
+        listener = MagicMock()
+        manager.add_server_listener(failing)
+        manager.add_server_listener(listener)
+
+        manager._notify_server_change("model_a", None)
+
+        listener.assert_called_once_with("model_a", None)
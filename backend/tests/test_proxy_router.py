@@ -6,17 +6,50 @@ Tests cover:
 - Proxy POST request handling
 - Health check endpoint
 - Error handling for connection failures
+- Reuse of long-lived model clients
+- Streaming passthrough of request and response bodies
 """
 
+import json
+from contextlib import AsyncExitStack
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 from fastapi import status
 from fastapi.testclient import TestClient
 from httpx import RequestError
 
+import app.services.model_clients as model_clients_module
 from app.main import app
 from app.routers import proxy
+from app.services.http_pool import HTTPPoolManager
+from app.services.model_clients import ModelClientRegistry
+
+
+class UpstreamBody(httpx.AsyncByteStream):
+    """Unread upstream response body, streamed chunk by chunk like a real server's."""
+
+    def __init__(self, *chunks: bytes) -> None:
+        self.chunks = chunks
+        self.closed = False
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def json_response(status_code: int, data: Any) -> httpx.Response:
+    """Upstream JSON response with a streamed (not pre-read) body."""
+    return httpx.Response(
+        status_code,
+        headers={"content-type": "application/json"},
+        stream=UpstreamBody(json.dumps(data).encode()),
+    )
 
 
 @pytest.fixture
@@ -25,6 +58,38 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def model_client_registry():
+    """Inject a fresh model client registry (pooled clients are created lazily)."""
+    original_registry = model_clients_module._model_client_registry
+    registry = ModelClientRegistry(pool=HTTPPoolManager())
+    model_clients_module._model_client_registry = registry
+    yield registry
+    model_clients_module._model_client_registry = original_registry
+
+
+@pytest.fixture
+def upstream(model_client_registry):
+    """Serve the test model's upstream requests with a handler.
+
+    Returns a function that installs the handler and returns the list of
+    requests the model server received.
+    """
+
+    def install(handler):
+        requests = []
+
+        def record(request):
+            requests.append(request)
+            return handler(request)
+
+        model_client = model_client_registry.get_client("test_model", "http://127.0.0.1:8080")
+        model_client.data_client._transport = httpx.MockTransport(record)
+        return requests
+
+    return install
+
+
 @pytest.fixture
 def mock_server():
     """Create a mock server object."""
@@ -102,20 +167,11 @@ class TestGetServerPort:
 class TestProxyChatCompletions:
     """Tests for POST /api/proxy/{model_id}/v1/chat/completions."""
 
-    @patch("app.routers.proxy.httpx.AsyncClient")
-    def test_successful_proxy(self, mock_client_class, client, mock_server_manager):
+    def test_successful_proxy(self, client, mock_server_manager, upstream):
         """Should successfully proxy chat completion request."""
-        # Setup mock response
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b'{"choices": [{"message": {"content": "Hello!"}}]}'
-        mock_response.headers = {"content-type": "application/json"}
-
-        mock_client = MagicMock()
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.post = AsyncMock(return_value=mock_response)
-        mock_client_class.return_value = mock_client
+        upstream(
+            lambda request: json_response(200, {"choices": [{"message": {"content": "Hello!"}}]})
+        )
 
         response = client.post(
             "/api/proxy/test_model/v1/chat/completions",
@@ -125,16 +181,13 @@ class TestProxyChatCompletions:
         assert response.status_code == 200
         assert "choices" in response.json()
 
-    @patch("app.routers.proxy.httpx.AsyncClient")
-    def test_connection_error_returns_502(self, mock_client_class, client, mock_server_manager):
+    def test_connection_error_returns_502(self, client, mock_server_manager, upstream):
         """Should return 502 when connection to model server fails."""
-        mock_client = MagicMock()
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.post = AsyncMock(
-            side_effect=RequestError("Connection refused", request=MagicMock())
-        )
-        mock_client_class.return_value = mock_client
+
+        def refuse(request):
+            raise httpx.ConnectError("Connection refused", request=request)
+
+        upstream(refuse)
 
         response = client.post(
             "/api/proxy/test_model/v1/chat/completions",
@@ -144,23 +197,65 @@ class TestProxyChatCompletions:
         assert response.status_code == status.HTTP_502_BAD_GATEWAY
         assert "Failed to connect to model server" in response.json()["detail"]
 
+    def test_streams_server_sent_events(self, client, mock_server_manager, upstream):
+        """Should pass SSE through unbuffered with the upstream status and type."""
+        events = [
+            b'data: {"choices": [{"delta": {"content": "Hel"}}]}\n\n',
+            b'data: {"choices": [{"delta": {"content": "lo"}}]}\n\n',
+            b"data: [DONE]\n\n",
+        ]
+
+        upstream(
+            lambda request: httpx.Response(
+                200, headers={"content-type": "text/event-stream"}, stream=UpstreamBody(*events)
+            )
+        )
+
+        response = client.post(
+            "/api/proxy/test_model/v1/chat/completions",
+            json={"messages": [], "stream": True},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.headers["x-accel-buffering"] == "no"
+        assert response.content == b"".join(events)
+
+    def test_forwards_upstream_error_status(self, client, mock_server_manager, upstream):
+        """Should forward llama-server error responses unchanged."""
+        upstream(lambda request: json_response(400, {"error": "bad request"}))
+
+        response = client.post("/api/proxy/test_model/v1/chat/completions", json={})
+
+        assert response.status_code == 400
+        assert response.json() == {"error": "bad request"}
+
+    def test_redirect_not_followed(self, client, mock_server_manager, upstream):
+        """Should pass redirects back instead of replaying the streamed body."""
+        requests = upstream(
+            lambda request: httpx.Response(
+                307, headers={"location": "/v1/other"}, stream=UpstreamBody()
+            )
+        )
+
+        response = client.post(
+            "/api/proxy/test_model/v1/chat/completions",
+            json={"messages": []},
+            follow_redirects=False,
+        )
+
+        assert response.status_code == 307
+        assert len(requests) == 1
+
 
 class TestProxyCompletions:
     """Tests for POST /api/proxy/{model_id}/v1/completions."""
 
-    @patch("app.routers.proxy.httpx.AsyncClient")
-    def test_successful_proxy(self, mock_client_class, client, mock_server_manager):
+    def test_successful_proxy(self, client, mock_server_manager, upstream):
         """Should successfully proxy completion request."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b'{"choices": [{"text": "...once upon a time"}]}'
-        mock_response.headers = {"content-type": "application/json"}
-
-        mock_client = MagicMock()
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.post = AsyncMock(return_value=mock_response)
-        mock_client_class.return_value = mock_client
+        requests = upstream(
+            lambda request: json_response(200, {"choices": [{"text": "...once upon a time"}]})
+        )
 
         response = client.post(
             "/api/proxy/test_model/v1/completions",
@@ -169,6 +264,7 @@ class TestProxyCompletions:
 
         assert response.status_code == 200
         assert "choices" in response.json()
+        assert requests[0].url.path == "/v1/completions"
 
 
 class TestProxyHealthCheck:
@@ -238,41 +334,37 @@ class TestProxyHealthCheck:
 class TestProxyPostRequestHelper:
     """Tests for _proxy_post_request helper function."""
 
-    @patch("app.routers.proxy.httpx.AsyncClient")
-    def test_uses_correct_timeout(self, mock_client_class, client, mock_server_manager):
+    def test_uses_correct_timeout(self, client, mock_server_manager, upstream):
         """Should use 300s timeout for LLM inference requests."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b'{"choices": []}'
-        mock_response.headers = {}
-
-        mock_client = MagicMock()
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.post = AsyncMock(return_value=mock_response)
-        mock_client_class.return_value = mock_client
+        requests = upstream(lambda request: json_response(200, {"choices": []}))
 
         client.post(
             "/api/proxy/test_model/v1/chat/completions",
             json={"messages": []},
         )
 
-        # Verify AsyncClient was created with 300s timeout
-        mock_client_class.assert_called_with(timeout=300.0)
+        # Verify the request was sent with a 300s timeout
+        assert requests[0].extensions["timeout"]["read"] == 300.0
 
-    @patch("app.routers.proxy.httpx.AsyncClient")
-    def test_forwards_request_body(self, mock_client_class, client, mock_server_manager):
-        """Should forward the request body to target server."""
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.content = b'{"choices": []}'
-        mock_response.headers = {}
+    def test_reuses_model_client(
+        self, client, mock_server_manager, upstream, model_client_registry
+    ):
+        """Should reuse the model's pooled client instead of one per request."""
+        requests = upstream(lambda request: json_response(200, {"choices": []}))
+        http_client = model_client_registry.get_client(
+            "test_model", "http://127.0.0.1:8080"
+        ).data_client
 
-        mock_client = MagicMock()
-        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-        mock_client.__aexit__ = AsyncMock(return_value=None)
-        mock_client.post = AsyncMock(return_value=mock_response)
-        mock_client_class.return_value = mock_client
+        for _ in range(3):
+            client.post("/api/proxy/test_model/v1/chat/completions", json={"messages": []})
+
+        assert len(requests) == 3
+        assert not http_client.is_closed
+        assert model_client_registry.get_stats()["clients"] == 1
+
+    def test_forwards_request_body(self, client, mock_server_manager, upstream):
+        """Should forward the request body to target server."""
+        requests = upstream(lambda request: json_response(200, {"choices": []}))
 
         request_body = {"messages": [{"role": "user", "content": "Test"}]}
         client.post(
@@ -280,7 +372,25 @@ class TestProxyPostRequestHelper:
             json=request_body,
         )
 
-        # Verify post was called with the body
-        mock_client.post.assert_called_once()
-        call_args = mock_client.post.call_args
-        assert b"Test" in call_args.kwargs.get("content", b"")
+        # Verify the body arrived with its length
+        assert len(requests) == 1
+        assert b"Test" in requests[0].content
+        assert requests[0].headers["content-length"] == str(len(requests[0].content))
+
+
+class TestForwardResponseBody:
+    """Tests for chunk-by-chunk response forwarding."""
+
+    async def test_client_disconnect_closes_upstream(self):
+        """Should close the upstream response when the client goes away."""
+        body = UpstreamBody(*[b"data: {}\n\n"] * 100)
+        response = httpx.Response(200, stream=body)
+        cleanup = AsyncExitStack()
+        cleanup.push_async_callback(response.aclose)
+
+        forwarded = proxy._forward_response_body("test_model", response, cleanup)
+        assert await forwarded.__anext__() == b"data: {}\n\n"
+        await forwarded.aclose()
+
+        assert response.is_closed
+        assert body.closed
@@ -0,0 +1,66 @@
+"""Tests for the DDSketch quantile sketch.
+
+Tests cover:
+- Relative-error quantile estimates
+- Merging sketches
+- Zero and negative values
+"""
+
+import random
+
+import pytest
+
+from app.services.quantile_sketch import QuantileSketch
+
+
+def exact_quantile(values, q: float) -> float:
+    return sorted(values)[int(q * (len(values) - 1))]
+
+
+class TestQuantileSketch:
+    """Tests for QuantileSketch."""
+
+    def test_empty_sketch(self) -> None:
+        assert QuantileSketch().quantile(0.5) == 0.0
+
+    @pytest.mark.parametrize("q", [0.0, 0.5, 0.95, 0.99, 1.0])
+    def test_relative_error(self, q: float) -> None:
+        """Test estimates stay within the configured relative accuracy."""
+        rng = random.Random(42)
+        values = [rng.lognormvariate(3, 1) for _ in range(10_000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.01)
+
+    def test_merge_equals_single_sketch(self) -> None:
+        """Test merging per-bucket sketches gives the sketch of all values."""
+        values = [float(v) for v in range(1, 1001)]
+        whole = QuantileSketch()
+        parts = [QuantileSketch() for _ in range(4)]
+        for i, value in enumerate(values):
+            whole.add(value)
+            parts[i % 4].add(value)
+
+        merged = parts[0].copy()
+        for part in parts[1:]:
+            merged.merge(part)
+
+        assert merged.count == whole.count
+        for q in (0.5, 0.95, 0.99):
+            assert merged.quantile(q) == whole.quantile(q)
+        assert parts[0].count == 250
+
+    def test_zero_and_negative_values(self) -> None:
+        sketch = QuantileSketch()
+        for value in [-5.0, 0.0, 0.0, 3.0, 10.0]:
+            sketch.add(value)
+
+        assert sketch.quantile(0.0) == pytest.approx(-5.0, rel=0.01)
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == pytest.approx(10.0, rel=0.01)
+
+    def test_merge_rejects_different_accuracy(self) -> None:
+        with pytest.raises(ValueError):
+            QuantileSketch(0.01).merge(QuantileSketch(0.02))
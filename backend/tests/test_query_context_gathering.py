@@ -0,0 +1,97 @@
+"""Tests for concurrent context gathering in the query pipeline.
+
+Tests cover:
+- Web search results and failures
+- Per-source deadline for web search
+- Web search overlapping other context sources
+"""
+
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.routers import query
+
+logger = logging.getLogger(__name__)
+
+
+class FakeSearxngClient:
+    """SearXNG client stand-in with a configurable delay."""
+
+    def __init__(self, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.delay = delay
+        self.error = error
+
+    async def search(self, query_text: str) -> SimpleNamespace:
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return SimpleNamespace(
+            results=[SimpleNamespace(title="t", url="u", content="c")],
+            search_time_ms=12.0,
+            engines_used=["fake"],
+        )
+
+
+@pytest.fixture
+def searxng(monkeypatch):
+    """Install a fake SearXNG client and return a function to configure it."""
+
+    def install(**kwargs) -> None:
+        client = FakeSearxngClient(**kwargs)
+        monkeypatch.setattr(query, "get_searxng_client", lambda **_: client)
+
+    return install
+
+
+class TestWebSearch:
+    """Tests for _web_search."""
+
+    async def test_returns_results(self, searxng) -> None:
+        searxng()
+
+        results, search_time_ms = await query._web_search("q", "qid", "simple", 1.0, logger)
+
+        assert len(results) == 1
+        assert search_time_ms == 12.0
+
+    async def test_failure_yields_no_results(self, searxng) -> None:
+        searxng(error=ConnectionError("searxng down"))
+
+        assert await query._web_search("q", "qid", "simple", 1.0, logger) == ([], 0.0)
+
+    async def test_deadline_skips_slow_search(self, searxng) -> None:
+        """Test a search slower than its deadline is abandoned."""
+        searxng(delay=5.0)
+
+        start = time.perf_counter()
+        result = await query._web_search("q", "qid", "simple", 0.05, logger)
+
+        assert result == ([], 0.0)
+        assert time.perf_counter() - start < 1.0
+
+
+class TestConcurrentSources:
+    """Tests for overlapping web search with other context sources."""
+
+    async def test_disabled_search_returns_nothing(self) -> None:
+        task = query._start_web_search(False, "q", "qid", "simple", 1.0, logger)
+
+        assert task is None
+        assert await query._web_search_results(task) == ([], 0.0)
+
+    async def test_search_overlaps_retrieval(self, searxng) -> None:
+        """Test gathering takes the slowest source's time, not the sum."""
+        searxng(delay=0.2)
+
+        start = time.perf_counter()
+        task = query._start_web_search(True, "q", "qid", "simple", 1.0, logger)
+        await asyncio.sleep(0.2)  # Stand-in for CGRAG retrieval
+        results, _ = await query._web_search_results(task)
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 1
+        assert elapsed < 0.35
@@ -0,0 +1,281 @@
+"""Tests for the query response cache.
+
+Tests cover:
+- Keys (normalized query, temperature buckets, context fingerprint)
+- Exact and semantic (embedding similarity) matches
+- Shared Redis tier
+- Invalidation and index reload listeners
+- Requests bypassing the cache
+- Failed model calls not being cached
+"""
+
+import logging
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.models.query import QueryMetadata, QueryResponse
+from app.routers import query
+from app.services import response_cache as response_cache_module
+from app.services.cgrag_registry import CGRAGIndexRegistry
+from app.services.llama_client import LlamaCppClient
+from app.services.response_cache import ResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+class FakeRedis:
+    """Minimal async Redis stand-in."""
+
+    def __init__(self) -> None:
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode() if isinstance(value, str) else value
+
+
+def build_key(cache: ResponseCache, query_text: str = "What is Python?", **overrides):
+    params = {
+        "temperature": 0.7,
+        "context_fingerprint": "v1:models",
+        "mode": "simple",
+        "max_tokens": 512,
+    }
+    params.update(overrides)
+    return cache.build_key(query_text, **params)
+
+
+class TestKeys:
+    """Tests for ResponseCache.build_key."""
+
+    def test_normalized_query_shares_key(self) -> None:
+        cache = ResponseCache()
+
+        assert build_key(cache).key == build_key(cache, "  what IS   python? ").key
+
+    def test_temperature_bucket(self) -> None:
+        """Test temperatures within a bucket share a key, others do not."""
+        cache = ResponseCache()
+
+        assert build_key(cache, temperature=0.71).key == build_key(cache, temperature=0.69).key
+        assert build_key(cache, temperature=0.9).key != build_key(cache, temperature=0.7).key
+
+    def test_context_and_parts_split_keys(self) -> None:
+        cache = ResponseCache()
+        key = build_key(cache)
+
+        assert build_key(cache, context_fingerprint="v2:models").key != key.key
+        assert build_key(cache, mode="two-stage").partition != key.partition
+
+
+class TestLookups:
+    """Tests for exact and semantic lookups."""
+
+    async def test_exact_hit_and_miss(self) -> None:
+        cache = ResponseCache()
+        key = build_key(cache)
+
+        assert await cache.get(key) is None
+        await cache.set(key, '{"response": "cached"}')
+
+        assert await cache.get(build_key(cache, "what is python?")) == '{"response": "cached"}'
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    async def test_semantic_hit_above_threshold(self) -> None:
+        """Test a similar query in the same partition is served the cached response."""
+        cache = ResponseCache(similarity_threshold=0.9)
+        await cache.set(build_key(cache, embedding=np.array([1.0, 0.0])), "cached")
+
+        similar = build_key(cache, "Explain Python", embedding=np.array([0.99, 0.05]))
+        unrelated = build_key(cache, "Explain Rust", embedding=np.array([0.0, 1.0]))
+        other_mode = build_key(
+            cache, "Explain Python", embedding=np.array([0.99, 0.05]), mode="two-stage"
+        )
+
+        assert await cache.get(similar) == "cached"
+        assert await cache.get(unrelated) is None
+        assert await cache.get(other_mode) is None
+        assert cache.get_stats()["semantic_hits"] == 1
+
+    async def test_semantic_matching_disabled_by_default(self) -> None:
+        cache = ResponseCache()
+        await cache.set(build_key(cache, embedding=np.array([1.0, 0.0])), "cached")
+
+        assert await cache.get(build_key(cache, "Other", embedding=np.array([1.0, 0.0]))) is None
+
+    async def test_redis_tier_shared_between_caches(self) -> None:
+        """Test an entry written by one process is found by another."""
+        redis = FakeRedis()
+        writer = ResponseCache(redis_client=redis)
+        reader = ResponseCache(redis_client=redis)
+
+        await writer.set(build_key(writer), "cached")
+
+        assert await reader.get(build_key(reader)) == "cached"
+        assert reader.get_stats()["redis_hits"] == 1
+
+    async def test_invalidate_clears_local_tier(self) -> None:
+        cache = ResponseCache(similarity_threshold=0.9)
+        key = build_key(cache, embedding=np.array([1.0, 0.0]))
+        await cache.set(key, "cached")
+
+        cache.invalidate("test")
+
+        assert await cache.get(key) is None
+        assert cache.get_stats()["semantic_entries"] == 0
+
+
+class TestInvalidationHooks:
+    """Tests for invalidation on index reloads."""
+
+    async def test_registry_notifies_on_reload(self, tmp_path) -> None:
+        """Test indexes appearing and disappearing notify reload listeners."""
+        registry = CGRAGIndexRegistry(index_directory=tmp_path)
+        changes = []
+        registry.add_reload_listener(changes.append)
+        registry._indexes["docs"] = SimpleNamespace()
+
+        await registry.refresh()
+
+        assert changes == [["docs"]]
+
+
+@pytest.fixture
+def response_cache(monkeypatch) -> ResponseCache:
+    cache = ResponseCache()
+    monkeypatch.setattr(response_cache_module, "_response_cache", cache)
+    return cache
+
+
+def make_config(prefer_cached: bool = True) -> SimpleNamespace:
+    return SimpleNamespace(
+        routing=SimpleNamespace(prefer_cached=prefer_cached),
+        cgrag=SimpleNamespace(retrieval=SimpleNamespace(min_relevance=0.7)),
+    )
+
+
+class TestQueryCacheKey:
+    """Tests for requests bypassing the response cache."""
+
+    async def test_cacheable_request(self, response_cache) -> None:
+        request = query.QueryRequest(query="What is Python?", mode="simple", temperature=0.0)
+
+        assert await query._response_cache_key(request, make_config(), logger) is not None
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"mode": "benchmark", "temperature": 0.0},
+            {"use_web_search": True, "temperature": 0.0},
+            {"temperature": 0.7},  # Default sampling is not reproducible
+            {"temperature": 1.5},
+        ],
+    )
+    async def test_bypassed_requests(self, response_cache, overrides) -> None:
+        request = query.QueryRequest(query="What is Python?", **overrides)
+
+        assert await query._response_cache_key(request, make_config(), logger) is None
+
+    async def test_disabled_by_routing_config(self, response_cache) -> None:
+        request = query.QueryRequest(query="What is Python?")
+
+        key = await query._response_cache_key(request, make_config(False), logger)
+
+        assert key is None
+
+    async def test_keyed_on_query_index_version(self, response_cache, monkeypatch) -> None:
+        """Test a new version of the index queries retrieve from changes the key."""
+        registry = SimpleNamespace(
+            get_retriever=lambda name, min_relevance: SimpleNamespace(
+                indexer=SimpleNamespace(index_version=versions[name])
+            )
+        )
+        monkeypatch.setattr(query, "get_cgrag_index_registry", lambda: registry)
+        request = query.QueryRequest(query="What is Python?", temperature=0.0)
+        versions = {query._QUERY_CGRAG_INDEX: "v1", "codebase": "v1"}
+
+        first = await query._response_cache_key(request, make_config(), logger)
+        versions["codebase"] = "v2"
+        unrelated = await query._response_cache_key(request, make_config(), logger)
+        versions[query._QUERY_CGRAG_INDEX] = "v2"
+        rebuilt = await query._response_cache_key(request, make_config(), logger)
+
+        assert first == unrelated
+        assert first != rebuilt
+
+    async def test_keyed_on_index_files_without_registry(
+        self, response_cache, monkeypatch, tmp_path
+    ) -> None:
+        """Test the on-disk index the query would load versions the key."""
+
+        def no_registry():
+            raise RuntimeError("not initialized")
+
+        metadata_path = tmp_path / "docs_metadata.json"
+        monkeypatch.setattr(query, "get_cgrag_index_registry", no_registry)
+        monkeypatch.setattr(
+            query,
+            "get_cgrag_index_paths",
+            lambda name: (tmp_path, tmp_path / "docs.index", metadata_path),
+        )
+        request = query.QueryRequest(query="What is Python?", temperature=0.0)
+
+        missing = await query._response_cache_key(request, make_config(), logger)
+        metadata_path.write_text("{}")
+        os.utime(metadata_path, ns=(1, 1))
+        built = await query._response_cache_key(request, make_config(), logger)
+        os.utime(metadata_path, ns=(2, 2))
+        rebuilt = await query._response_cache_key(request, make_config(), logger)
+
+        assert len({missing.key, built.key, rebuilt.key}) == 3
+
+
+class TestFailedGenerations:
+    """Tests for responses whose model calls failed."""
+
+    @pytest.fixture
+    def pipeline(self, monkeypatch):
+        """Query pipeline calling one model whose first call fails."""
+        registry = SimpleNamespace(models={"model_a": SimpleNamespace(enabled=True, port=8080)})
+        monkeypatch.setattr(query, "model_registry", registry)
+        outcomes = ["Connection refused", None]
+
+        async def stream_completion(self, prompt, max_tokens=512, temperature=0.7, stop=None):
+            error = outcomes.pop(0)
+            if error is None:
+                yield {"content": "Python is a language."}
+            yield {"content": "", "done": True, "error": error}
+
+        async def process(request, model_manager, config, logger):
+            result = await query._call_model_direct("model_a", request.query)
+            return QueryResponse(
+                id="q",
+                query=request.query,
+                response=result["content"],
+                metadata=QueryMetadata(model_tier="fast", model_id="model_a"),
+            )
+
+        monkeypatch.setattr(LlamaCppClient, "stream_completion", stream_completion)
+        monkeypatch.setattr(query, "_process_query", process)
+
+    async def test_failed_call_not_cached(self, response_cache, pipeline) -> None:
+        """Test an empty answer from a failed call is not served to the next query."""
+        request = query.QueryRequest(query="What is Python?", temperature=0.0)
+
+        failed = await query.process_query(request, None, make_config(), logger)
+        retried = await query.process_query(request, None, make_config(), logger)
+        cached = await query.process_query(request, None, make_config(), logger)
+
+        assert failed.response == ""
+        assert failed.metadata.model_errors == ["model_a: Connection refused"]
+        assert not retried.metadata.cache_hit
+        assert retried.response == "Python is a language."
+        assert retried.metadata.model_errors == []
+        assert cached.metadata.cache_hit
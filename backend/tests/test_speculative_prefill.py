@@ -0,0 +1,167 @@
+"""Tests for speculative stage-2 prefill in two-stage mode.
+
+Tests cover:
+- Prefilling the shared prefix, then extending it with stage-1 output
+- At most one prefill request in flight
+- Giving up after a failed prefill
+- Cancelling the prefill when a two-stage query fails
+- Stage-2 prompt layout (prefix + stage-1 response + instructions)
+"""
+
+import asyncio
+import logging
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.query import QueryRequest
+from app.models.runtime_settings import RuntimeSettings
+from app.routers import query
+from app.services.speculative_prefill import SpeculativePrefill
+
+
+class FakeClient:
+    """Stage-2 client stand-in recording prefill prompts."""
+
+    base_url = "http://stage2"
+
+    def __init__(self, ok: bool = True) -> None:
+        self.ok = ok
+        self.prompts: List[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def prefill(self, prompt: str) -> bool:
+        self.prompts.append(prompt)
+        await self.release.wait()
+        return self.ok
+
+
+class TestSpeculativePrefill:
+    """Tests for SpeculativePrefill."""
+
+    async def test_prefix_then_stage1_chunks(self) -> None:
+        """Test the prefix is prefilled first and extended every chunk_tokens."""
+        client = FakeClient()
+        prefill = SpeculativePrefill(client, "PREFIX:", chunk_tokens=2)
+
+        prefill.start()
+        await prefill.finish()
+        for token in ["a", "b", "c"]:
+            prefill.feed(token)
+            await prefill.finish()
+
+        assert client.prompts == ["PREFIX:", "PREFIX:ab"]
+        assert prefill.get_stats()["tokens_prefilled"] == 2
+
+    async def test_one_request_in_flight(self) -> None:
+        """Test tokens arriving during a prefill are sent with the next one."""
+        client = FakeClient()
+        client.release.clear()
+        prefill = SpeculativePrefill(client, "P:", chunk_tokens=1)
+
+        prefill.start()
+        await asyncio.sleep(0)
+        prefill.feed("a")
+        prefill.feed("b")
+        assert client.prompts == ["P:"]
+
+        client.release.set()
+        await prefill.finish()
+        prefill.feed("c")
+        await prefill.finish()
+
+        assert client.prompts == ["P:", "P:abc"]
+
+    async def test_stops_after_failure(self) -> None:
+        client = FakeClient(ok=False)
+        prefill = SpeculativePrefill(client, "P:", chunk_tokens=1)
+
+        prefill.start()
+        await prefill.finish()
+        prefill.feed("a")
+        await prefill.finish()
+
+        assert client.prompts == ["P:"]
+        assert prefill.get_stats()["disabled"]
+
+    async def test_finish_times_out(self) -> None:
+        """Test finish() does not wait for a stuck prefill beyond its timeout."""
+        client = FakeClient()
+        client.release.clear()
+        prefill = SpeculativePrefill(client, "P:")
+
+        prefill.start()
+        await prefill.finish(timeout=0.01)
+
+        assert client.prompts == ["P:"]
+
+    async def test_cancel_stops_in_flight_prefill(self) -> None:
+        """Test cancel() cancels the in-flight prefill and prevents new ones."""
+        client = FakeClient()
+        client.release.clear()
+        prefill = SpeculativePrefill(client, "P:", chunk_tokens=1)
+        prefill.start()
+        await asyncio.sleep(0)
+
+        await prefill.cancel()
+        prefill.feed("a")
+
+        assert prefill._task.cancelled()
+        assert client.prompts == ["P:"]
+        assert prefill.get_stats()["disabled"]
+
+
+class TestTwoStagePrefillLifecycle:
+    """Tests for the prefill of a failing two-stage query."""
+
+    async def test_stage1_failure_cancels_prefill(self, monkeypatch) -> None:
+        """Test a failed Stage 1 call does not leave the Stage 2 prefill running."""
+        client = FakeClient()
+        client.release.clear()
+        prefills: List[SpeculativePrefill] = []
+
+        def start_prefill(model_id, prefix, chunk_tokens):
+            prefill = SpeculativePrefill(client, prefix, chunk_tokens=chunk_tokens)
+            prefill.start()
+            prefills.append(prefill)
+            return prefill
+
+        async def select_model(tier):
+            return SimpleNamespace(model_id=f"{tier}_model")
+
+        async def failing_call(**kwargs):
+            await asyncio.sleep(0)  # Let the prefill request start
+            raise RuntimeError("stage 1 server crashed")
+
+        monkeypatch.setattr(query, "model_selector", SimpleNamespace(select_model=select_model))
+        monkeypatch.setattr(query, "_start_stage2_prefill", start_prefill)
+        monkeypatch.setattr(query, "_call_model_direct", failing_call)
+        monkeypatch.setattr(
+            query.settings_service,
+            "get_runtime_settings",
+            lambda: RuntimeSettings(two_stage_speculative_prefill=True),
+        )
+        config = SimpleNamespace(routing=SimpleNamespace(complexity_thresholds={"powerful": 7.0}))
+        request = QueryRequest(query="What is Python?", mode="two-stage", use_context=False)
+
+        with pytest.raises(HTTPException):
+            await query._process_query(request, None, config, logging.getLogger(__name__))
+
+        (prefill,) = prefills
+        assert client.prompts and prefill._task.cancelled()
+        assert prefill.get_stats()["disabled"]
+
+
+class TestStage2Prompt:
+    """Tests for the stage-2 prompt layout."""
+
+    def test_prompt_starts_with_prefilled_prefix(self) -> None:
+        prefix = query._stage2_prompt_prefix("What is Python?", "Context\n\n===\n\n")
+        prompt = prefix + "Python is a language." + query._STAGE2_INSTRUCTIONS
+
+        assert prompt.startswith("Context\n\n===\n\nYou are refining")
+        assert "Initial Response (from Stage 1 model):\nPython is a language.\n\n" in prompt
+        assert prompt.endswith("Refined Response:")
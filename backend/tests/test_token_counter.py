@@ -7,13 +7,24 @@ This module tests the token counting functionality including:
 - Token truncation
 - Fallback estimation
 - Global singleton access
+- Content-hash count cache and off-loop batch counting
+- Per-model counts from llama.cpp /tokenize with local fallback
 """
 
-from unittest.mock import patch
+import threading
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from app.services.token_counter import TokenCounter, get_token_counter
+from app.services.token_counter import (
+    ModelTokenCounter,
+    ModelTokenCounters,
+    TokenCountCache,
+    TokenCounter,
+    count_tokens_for_model,
+    get_token_counter,
+)
 
 
 class TestTokenCounter:
@@ -194,3 +205,160 @@ class TestTokenCounterErrorHandling:
             result = counter.truncate_to_token_limit(text, max_tokens=10)
             # Should still return truncated text
             assert len(result) < len(text)
+
+
+class TestTokenCountCache:
+    """Tests for the content-hash LRU cache."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test the least recently used count is evicted when full."""
+        cache = TokenCountCache(max_entries=2)
+        cache.put(b"a", 1)
+        cache.put(b"b", 2)
+        assert cache.get(b"a") == 1
+        cache.put(b"c", 3)
+
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") == 1
+        assert cache.get(b"c") == 3
+        assert cache.get_stats()["hits"] == 3
+        assert cache.get_stats()["misses"] == 1
+
+    def test_repeated_text_counted_once(self) -> None:
+        """Test identical text is tokenized only once."""
+        counter = TokenCounter()
+        text = "The quick brown fox jumps over the lazy dog. " * 20
+
+        with patch.object(counter.encoding, "encode", wraps=counter.encoding.encode) as encode:
+            first = counter.count_tokens(text)
+            second = counter.count_tokens(text)
+
+        assert first == second
+        encode.assert_called_once()
+        assert counter.get_stats()["cache"]["hits"] == 1
+
+    def test_fallback_estimate_not_cached(self) -> None:
+        """Test estimates from encoding errors are not cached."""
+        counter = TokenCounter()
+        text = "one two three four five six seven eight"
+
+        with patch.object(counter.encoding, "encode", side_effect=Exception("Encoding error")):
+            estimated = counter.count_tokens(text)
+
+        assert estimated == counter._estimate_tokens(text)
+        assert counter.count_tokens(text) == len(counter.encoding.encode(text))
+
+
+class TestAsyncCounting:
+    """Tests for counting without blocking the event loop."""
+
+    async def test_large_texts_counted_in_thread_pool(self) -> None:
+        """Test only uncached large texts are tokenized off the event loop."""
+        counter = TokenCounter(offload_min_chars=100)
+        small = "Hello world"
+        large = "The quick brown fox jumps over the lazy dog. " * 10
+        threads = {}
+        encode = counter.encoding.encode
+
+        def recording_encode(text):
+            threads[text] = threading.current_thread().name
+            return encode(text)
+
+        with patch.object(counter.encoding, "encode", side_effect=recording_encode):
+            counts = await counter.count_tokens_batch_async([small, "", large])
+
+        assert counts == [len(encode(small)), 0, len(encode(large))]
+        assert threads[small] == threading.current_thread().name
+        assert threads[large].startswith("token-count")
+
+    async def test_cached_texts_not_offloaded(self) -> None:
+        """Test cached large texts are answered inline."""
+        counter = TokenCounter(offload_min_chars=10)
+        text = "The quick brown fox jumps over the lazy dog."
+        expected = counter.count_tokens(text)
+
+        with patch("app.services.token_counter._get_executor") as get_executor:
+            assert await counter.count_tokens_async(text) == expected
+
+        get_executor.assert_not_called()
+
+    async def test_count_tokens_for_model_without_model_counters(self) -> None:
+        """Test the default local counter is used when per-model counts are off."""
+        texts = ["You are a helpful assistant", "", "Hello"]
+
+        counts = await count_tokens_for_model(texts, model_id="any_model")
+
+        assert counts == get_token_counter().count_tokens_batch(texts)
+
+
+def fake_client(tokenize) -> SimpleNamespace:
+    return SimpleNamespace(tokenize=AsyncMock(side_effect=tokenize))
+
+
+async def word_tokens(text: str) -> list:
+    """Fake llama.cpp tokenizer: one token per word."""
+    return list(range(len(text.split())))
+
+
+class TestModelTokenCounter:
+    """Tests for per-model counts from llama.cpp /tokenize."""
+
+    async def test_exact_counts_cached(self) -> None:
+        """Test counts come from the server and are cached per model."""
+        client = fake_client(word_tokens)
+        counter = ModelTokenCounter("model_a", lambda model_id: client, TokenCounter())
+
+        assert await counter.count_tokens_batch(["a b c", "", "d e"]) == [3, 0, 2]
+        assert await counter.count_tokens_batch(["d e"]) == [2]
+
+        assert client.tokenize.await_count == 2
+        assert counter.get_stats()["remote_counts"] == 2
+
+    async def test_no_ready_server_uses_fallback(self) -> None:
+        """Test the local counter is used while the model has no server."""
+        fallback = TokenCounter()
+        counter = ModelTokenCounter("model_a", lambda model_id: None, fallback)
+
+        counts = await counter.count_tokens_batch(["Hello world"])
+
+        assert counts == [fallback.count_tokens("Hello world")]
+        assert counter.fallback_counts == 1
+
+    async def test_failure_falls_back_and_backs_off(self) -> None:
+        """Test a failed /tokenize call falls back and pauses further calls."""
+
+        async def unavailable(text: str) -> list:
+            raise ConnectionError("server down")
+
+        client = fake_client(unavailable)
+        fallback = TokenCounter()
+        counter = ModelTokenCounter("model_a", lambda model_id: client, fallback)
+
+        first = await counter.count_tokens_batch(["Hello world"])
+        second = await counter.count_tokens_batch(["Hello again"])
+
+        assert first == [fallback.count_tokens("Hello world")]
+        assert second == [fallback.count_tokens("Hello again")]
+        assert client.tokenize.await_count == 1
+        assert counter.failures == 1
+
+    async def test_server_change_drops_counter(self) -> None:
+        """Test a model's cached counts are dropped when its server changes."""
+        client = fake_client(word_tokens)
+        counters = ModelTokenCounters(lambda model_id: client)
+        await counters.for_model("model_a").count_tokens_batch(["a b c"])
+
+        counters.on_server_change("model_a", None)
+
+        assert counters.get_stats() == {}
+        assert await counters.for_model("model_a").count_tokens_batch(["a b c"]) == [3]
+        assert client.tokenize.await_count == 2
+
+    async def test_count_tokens_for_model_uses_model_counter(self) -> None:
+        """Test count_tokens_for_model uses initialized per-model counters."""
+        counters = ModelTokenCounters(lambda model_id: fake_client(word_tokens))
+
+        with patch("app.services.token_counter._model_token_counters", counters):
+            counts = await count_tokens_for_model(["a b c d"], model_id="model_a")
+
+        assert counts == [4]
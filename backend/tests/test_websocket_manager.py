@@ -5,11 +5,18 @@ functionality for real-time log streaming.
 """
 
 import asyncio
+import json
 from unittest.mock import AsyncMock
 
 import pytest
 
-from app.services.websocket_manager import WebSocketManager
+from app.services.websocket_manager import LogOverflowPolicy, WebSocketManager
+
+
+def sent(ws) -> list:
+    """Decode the messages sent on a mock WebSocket."""
+    return [json.loads(call.args[0]) for call in ws.send_text.await_args_list]
+
 
 # ============================================================================
 # Fixtures
@@ -167,10 +174,13 @@ class TestLogBroadcasting:
         await websocket_manager.connect(ws3)
 
         await websocket_manager.broadcast_log(sample_log_entry)
+        await websocket_manager.flush()
 
-        ws1.send_json.assert_called_once_with(sample_log_entry)
-        ws2.send_json.assert_called_once_with(sample_log_entry)
-        ws3.send_json.assert_called_once_with(sample_log_entry)
+        assert sent(ws1) == [sample_log_entry]
+        assert sent(ws2) == [sample_log_entry]
+        assert sent(ws3) == [sample_log_entry]
+        # Encoded once for all connections
+        assert ws1.send_text.await_args.args[0] is ws3.send_text.await_args.args[0]
 
     @pytest.mark.asyncio
     async def test_broadcast_stores_in_buffer(self, websocket_manager, sample_log_entry):
@@ -186,7 +196,7 @@ class TestLogBroadcasting:
         """Broadcast should handle clients that fail to receive."""
         ws_good = AsyncMock()
         ws_bad = AsyncMock()
-        ws_bad.send_json.side_effect = Exception("Connection closed")
+        ws_bad.send_text.side_effect = Exception("Connection closed")
 
         await websocket_manager.connect(ws_good)
         await websocket_manager.connect(ws_bad)
@@ -194,9 +204,10 @@ class TestLogBroadcasting:
 
         # Broadcast should succeed and remove dead connection
         await websocket_manager.broadcast_log(sample_log_entry)
+        await websocket_manager.flush()
 
         # Good connection should receive the message
-        ws_good.send_json.assert_called_once_with(sample_log_entry)
+        assert sent(ws_good) == [sample_log_entry]
         # Bad connection should be removed
         assert websocket_manager.get_connection_count() == 1
         assert ws_bad not in websocket_manager.active_connections
@@ -208,9 +219,9 @@ class TestLogBroadcasting:
         """Broadcast should remove all dead connections."""
         ws_good = AsyncMock()
         ws_bad1 = AsyncMock()
-        ws_bad1.send_json.side_effect = Exception("Connection closed")
+        ws_bad1.send_text.side_effect = Exception("Connection closed")
         ws_bad2 = AsyncMock()
-        ws_bad2.send_json.side_effect = Exception("Timeout")
+        ws_bad2.send_text.side_effect = Exception("Timeout")
 
         await websocket_manager.connect(ws_good)
         await websocket_manager.connect(ws_bad1)
@@ -218,6 +229,7 @@ class TestLogBroadcasting:
         assert websocket_manager.get_connection_count() == 3
 
         await websocket_manager.broadcast_log(sample_log_entry)
+        await websocket_manager.flush()
 
         assert websocket_manager.get_connection_count() == 1
         assert ws_good in websocket_manager.active_connections
@@ -382,6 +394,105 @@ class TestLogBuffer:
         websocket_manager.clear_logs("nonexistent_model")
 
 
+# ============================================================================
+# Send Queue Tests
+# ============================================================================
+
+
+def log(i: int, model_id: str = "model") -> dict:
+    return {"timestamp": f"2025-02-03T10:30:{i:02d}Z", "model_id": model_id, "message": str(i)}
+
+
+class TestSendQueues:
+    """Tests for per-connection send queues."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_does_not_wait_for_slow_client(self):
+        """A stalled client should not delay the producer or other clients."""
+        manager = WebSocketManager(send_queue_size=3)
+        stalled = asyncio.Event()
+
+        async def send_slowly(text):
+            await stalled.wait()
+
+        ws_slow = AsyncMock()
+        ws_slow.send_text.side_effect = send_slowly
+        ws_fast = AsyncMock()
+        await manager.connect(ws_slow)
+        await manager.connect(ws_fast)
+
+        for i in range(10):
+            await asyncio.wait_for(manager.broadcast_log(log(i)), timeout=0.1)
+        await asyncio.wait_for(manager._senders[ws_fast].idle.wait(), timeout=1)
+
+        assert [entry["message"] for entry in sent(ws_fast)] == [str(i) for i in range(10)]
+        assert manager.get_buffer_stats()["dropped"] == 6
+        stalled.set()
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        """A full queue should keep the newest lines."""
+        manager = WebSocketManager(send_queue_size=3)
+        ws = AsyncMock()
+        await manager.connect(ws)
+
+        await manager.broadcast_logs([log(i) for i in range(5)])
+        await manager.flush()
+
+        assert [entry["message"] for entry in sent(ws)] == ["2", "3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_coalesce_reports_skipped_lines(self):
+        """Coalesce should send one notice for the dropped lines."""
+        manager = WebSocketManager(send_queue_size=3, overflow=LogOverflowPolicy.COALESCE)
+        ws = AsyncMock()
+        await manager.connect(ws)
+
+        await manager.broadcast_logs([log(i) for i in range(5)])
+        await manager.flush()
+
+        messages = sent(ws)
+        assert messages[0]["level"] == "WARN"
+        assert messages[0]["message"] == "2 log lines skipped (client too slow)"
+        assert [entry["message"] for entry in messages[1:]] == ["2", "3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_model_filter(self, websocket_manager):
+        """A connection with a model filter only receives that model's logs."""
+        ws = AsyncMock()
+        await websocket_manager.connect(ws, model_id="model_a")
+
+        await websocket_manager.broadcast_logs([log(0, "model_a"), log(1, "model_b")])
+        await websocket_manager.flush()
+
+        assert [entry["model_id"] for entry in sent(ws)] == ["model_a"]
+
+    @pytest.mark.asyncio
+    async def test_replay_then_live(self, websocket_manager):
+        """Replayed buffered logs should be sent before new ones."""
+        await websocket_manager.broadcast_log(log(0))
+        ws = AsyncMock()
+        await websocket_manager.connect(ws, replay=True)
+
+        await websocket_manager.broadcast_log(log(1))
+        websocket_manager.send_message(ws, {"type": "ping"})
+        await websocket_manager.flush()
+
+        assert sent(ws) == [log(0), log(1), {"type": "ping"}]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_stops_writer(self, websocket_manager, mock_websocket):
+        """Disconnect should cancel the connection's writer task."""
+        await websocket_manager.connect(mock_websocket)
+        task = websocket_manager._senders[mock_websocket].task
+
+        await websocket_manager.disconnect(mock_websocket)
+
+        assert task.done()
+        assert websocket_manager._senders == {}
+
+
 # ============================================================================
 # Buffer Statistics Tests
 # ============================================================================
@@ -477,9 +588,10 @@ class TestThreadSafety:
         ]
 
         await asyncio.gather(*[websocket_manager.broadcast_log(log) for log in logs])
+        await websocket_manager.flush()
 
-        # All logs should be sent and buffered
-        assert ws.send_json.call_count == 50
+        # All logs should be sent in order and buffered
+        assert sent(ws) == logs
         assert len(websocket_manager.log_buffer["model"]) == 50
 
 